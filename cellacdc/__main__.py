@@ -44,7 +44,7 @@ def run():
     PARAMS_PATH = parser_args['params']
 
     if PARAMS_PATH:
-        _run.run_cli(PARAMS_PATH)
+        _run.run_cli(PARAMS_PATH, workers=parser_args['workers'])
     else:
         run_gui()
 
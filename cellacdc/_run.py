@@ -300,18 +300,62 @@ def _setup_app(splashscreen=False, icon_path=None, logo_path=None, scheme=None):
     
     return app, splashScreen
 
-def run_segm_workflow(workflow_params, logger, log_path):
+def run_segm_workflow(workflow_params, logger, log_path, workers=None):
     logger.info('Initializing segmentation and tracking kernel...')
     from cellacdc import core
     kernel = core.SegmKernel(logger, log_path, is_cli=True)
-    kernel.init_args_from_params(workflow_params, logger.info)
     ch_filepaths = kernel.parse_paths(workflow_params)
     stop_frame_nums = kernel.parse_stop_frame_numbers(workflow_params)
+    
+    # Optional [parallel] section with `workers`, `memory_budget_GB` 
+    # and `resume`. Command-line `--workers` has priority
+    parallel_params = workflow_params.get('parallel', {})
+    if workers is None:
+        workers = parallel_params.get('workers')
+    workers = int(workers) if workers is not None else 1
+    memory_budget_GB = parallel_params.get('memory_budget_GB')
+    if memory_budget_GB is not None:
+        memory_budget_GB = float(memory_budget_GB)
+    resume = parallel_params.get('resume', False)
+    
+    if workers > 1 and len(ch_filepaths) > 1:
+        core.run_segm_workflow_multi_pos(
+            workflow_params, ch_filepaths, stop_frame_nums, log_path, 
+            max_workers=workers, memory_budget_GB=memory_budget_GB, 
+            resume=resume, logger_func=logger.info
+        )
+        return
+    
+    kernel.init_args_from_params(workflow_params, logger.info)
+    init_params = workflow_params['initialization']
+    SizeT = workflow_params['metadata']['SizeT']
     for ch_filepath, stop_frame_n in zip(ch_filepaths, stop_frame_nums):
+        if resume:
+            segm_npz_path = core.get_segm_npz_path(
+                ch_filepath, init_params['user_ch_name'], 
+                init_params['segm_endname']
+            )
+            if core.is_segm_file_complete(segm_npz_path, SizeT, stop_frame_n):
+                logger.info(
+                    f'Skipping "{ch_filepath}" because the segmentation file '
+                    'is already complete.'
+                )
+                continue
         logger.info(f'Processing "{ch_filepath}"...')
         kernel.run(ch_filepath, stop_frame_n)
 
-def run_cli(ini_filepath):
+def run_measurements_workflow(workflow_params, logger, log_path, workers=None):
+    logger.info('Initializing measurements kernel...')
+    from cellacdc import core
+    kernel = core.ComputeMeasurementsKernel(logger, log_path, is_cli=True)
+    kernel.init_args_from_params(workflow_params, max_workers=workers)
+    ch_filepaths = kernel.parse_paths(workflow_params)
+    stop_frame_nums = kernel.parse_stop_frame_numbers(
+        workflow_params, len(ch_filepaths)
+    )
+    kernel.run(ch_filepaths, stop_frame_nums)
+
+def run_cli(ini_filepath, workers=None):
     from cellacdc import myutils
     logger, logs_path, log_path, log_filename = myutils.setupLogger(
         module='cli', logs_path=None
@@ -323,7 +367,11 @@ def run_cli(ini_filepath):
     workflow_type = workflow_params['workflow']['type']
     
     if workflow_type == 'segmentation and/or tracking':
-        run_segm_workflow(workflow_params, logger, log_path)
+        run_segm_workflow(workflow_params, logger, log_path, workers=workers)
+    elif workflow_type == 'measurements':
+        run_measurements_workflow(
+            workflow_params, logger, log_path, workers=workers
+        )
     
     
     
\ No newline at end of file
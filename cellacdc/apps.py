@@ -5739,7 +5739,7 @@ class QDialogMetadata(QDialog):
                 if search:
                     fileName = search[0]
                     acdc_df_path = os.path.join(images_path, fileName)
-                    acdc_df = pd.read_csv(acdc_df_path)
+                    acdc_df = load.read_acdc_df_file(acdc_df_path)
                     yx_pxl_to_um2 = self.PhysicalSizeY*self.PhysicalSizeX
                     vox_to_fl = self.PhysicalSizeY*(self.PhysicalSizeX**2)
                     if 'cell_vol_fl' not in acdc_df.columns:
@@ -387,7 +387,7 @@ def load_acdc_output_only(
                 )[0]
             except IndexError:
                 cc_stage_path = glob.glob(os.path.join(f'{pos_dir}', '*cc_stage.csv'))[0]
-            temp_df = pd.read_csv(cc_stage_path)
+            temp_df = load.read_acdc_df_file(cc_stage_path)
             temp_df['max_frame_pos'] = temp_df.frame_i.max()
             temp_df['file'] = file
             temp_df['selection_subset'] = file_idx
@@ -456,7 +456,7 @@ def _load_files(file_dir, channels, segm_endname):
     except IndexError:
         cc_stage_path = glob.glob(os.path.join(f'{file_dir}', '*cc_stage.csv'))[0]
     # assume cell cycle output of ACDC to be .csv
-    channel_files.append(pd.read_csv(cc_stage_path))
+    channel_files.append(load.read_acdc_df_file(cc_stage_path))
 
     # append metadata if available, else append None
     if len(glob.glob(os.path.join(f'{file_dir}', '*metadata*'))) > 0:
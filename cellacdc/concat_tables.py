@@ -0,0 +1,521 @@
+"""Streaming (out-of-core) concatenation of acdc_output tables of multiple
+Positions and experiments.
+
+Tables are read in parallel (one Position at a time per thread), only the
+requested columns are loaded, and every table is appended to the output
+file as soon as it is ready. Memory usage therefore depends on the size of
+a few Positions, not on the size of the whole dataset. The only exception
+is the Excel output: the Excel writer keeps the entire sheet in memory
+until the file is closed, hence use CSV or Parquet for large datasets.
+
+Usage from the command line:
+
+    acdc-concat <exp_path> [<exp_path> ...] -o <multi_exp_output_filepath>
+
+Run `acdc-concat -h` for all the options.
+"""
+import os
+import argparse
+import collections
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+
+from . import load, myutils, printl
+
+_EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+_EXCEL_MAX_NUM_ROWS = 1048576
+_INT_COLUMNS = ('frame_i', 'Cell_ID')
+
+def get_acdc_output_filepaths(
+        exp_path, acdc_output_endname='acdc_output', pos_foldernames=None
+    ):
+    """Get the acdc_output files of the Positions of one experiment.
+
+    Parameters
+    ----------
+    exp_path : str
+        Path of the experiment folder containing the Position_n folders.
+    acdc_output_endname : str, optional
+        End of the filename (without extension) of the tables to
+        concatenate. Default is 'acdc_output'
+    pos_foldernames : list of str, optional
+        Positions to consider. If None, all the Positions are used.
+        Default is None
+
+    Returns
+    -------
+    list of (str, str)
+        List of (Position folder name, filepath). Positions without the
+        table are skipped.
+    """
+    if pos_foldernames is None:
+        pos_foldernames = myutils.get_pos_foldernames(exp_path)
+
+    filepaths = []
+    for pos in pos_foldernames:
+        images_path = os.path.join(exp_path, pos, 'Images')
+        acdc_output_files = [
+            file for file in myutils.listdir(images_path)
+            if file.endswith(f'{acdc_output_endname}.csv')
+        ]
+        if not acdc_output_files:
+            continue
+        filepaths.append(
+            (pos, os.path.join(images_path, acdc_output_files[0]))
+        )
+    return filepaths
+
+def _is_string_dtype(dtype):
+    return (
+        pd.api.types.is_object_dtype(dtype)
+        or pd.api.types.is_string_dtype(dtype)
+    )
+
+def _is_columnar_copy_readable(filepath):
+    return (
+        load.is_acdc_df_columnar_file_valid(filepath)
+        and load.is_columnar_acdc_df_available()
+    )
+
+def _get_table_schema(filepath, sample_nrows=None, chunksize=100000):
+    """Column names of a table and whether they contain strings.
+    
+    If `sample_nrows` is None, all the rows of CSV files are scanned chunk 
+    by chunk, so that a column is detected as string even if only its 
+    last rows contain strings. Parquet files are never read, since their 
+    schema is stored in the file.
+    """
+    _, ext = os.path.splitext(filepath)
+    if ext in _EXCEL_EXTENSIONS:
+        df = pd.read_excel(filepath, nrows=sample_nrows)
+    elif ext == '.parquet' or _is_columnar_copy_readable(filepath):
+        if ext != '.parquet':
+            filepath = load.get_acdc_df_columnar_path(filepath)
+        import pyarrow
+        import pyarrow.parquet
+        schema = pyarrow.parquet.read_schema(filepath)
+        # Index columns (e.g., frame_i and Cell_ID) are stored last
+        pandas_metadata = schema.pandas_metadata or {}
+        index_columns = [
+            col for col in pandas_metadata.get('index_columns', [])
+            if isinstance(col, str)
+        ]
+        fields = sorted(
+            [field for field in schema if not field.name.startswith('__')],
+            key=lambda field: field.name not in index_columns
+        )
+        return {
+            field.name: (
+                pyarrow.types.is_string(field.type)
+                or pyarrow.types.is_large_string(field.type)
+            )
+            for field in fields
+        }
+    elif sample_nrows is not None:
+        df = pd.read_csv(
+            filepath, nrows=sample_nrows, dtype=load.acdc_df_str_cols
+        )
+    else:
+        chunks = pd.read_csv(
+            filepath, dtype=load.acdc_df_str_cols, chunksize=chunksize
+        )
+        schema = {}
+        for chunk in chunks:
+            for col in chunk.columns:
+                is_string = _is_string_dtype(chunk[col].dtype)
+                schema[col] = schema.get(col, False) or is_string
+        return schema
+    return {col: _is_string_dtype(df[col].dtype) for col in df.columns}
+
+def get_tables_columns(filepaths, sample_nrows=None):
+    """Union of the columns of multiple tables. The tables are scanned 
+    chunk by chunk and never loaded entirely.
+
+    Parameters
+    ----------
+    filepaths : iterable of str
+        Paths of the tables.
+    sample_nrows : int, optional
+        If not None, only the first `sample_nrows` rows of each table are 
+        used to determine if a column contains strings. Default is None
+
+    Returns
+    -------
+    dict
+        Dictionary of {column name: True if column contains strings}
+        ordered by first appearance.
+    """
+    columns = {}
+    for filepath in filepaths:
+        schema = _get_table_schema(filepath, sample_nrows=sample_nrows)
+        for col, is_string in schema.items():
+            columns[col] = columns.get(col, False) or is_string
+    return columns
+
+def _read_table(filepath, columns):
+    _, ext = os.path.splitext(filepath)
+    if ext in _EXCEL_EXTENSIONS:
+        usecols = None
+        if columns is not None:
+            columns = set(columns)
+            usecols = lambda col: col in columns
+        return pd.read_excel(filepath, usecols=usecols)
+
+    return load.read_acdc_df_file(filepath, columns=columns)
+
+class _TableAppender:
+    """Append DataFrames with the same columns to a CSV, Excel or Parquet
+    file. 
+    
+    CSV and Parquet files are written as the tables are appended, while 
+    the Excel writer keeps the entire sheet in memory until `close`.
+    """
+    def __init__(self, filepath, columns, string_columns):
+        self.filepath = filepath
+        self.columns = columns
+        self.string_columns = string_columns
+        self._ext = os.path.splitext(filepath)[1]
+        self._num_rows = 0
+        if self._ext in _EXCEL_EXTENSIONS:
+            self._writer = pd.ExcelWriter(filepath)
+        elif self._ext == '.parquet':
+            import pyarrow
+            import pyarrow.parquet
+            self._schema = pyarrow.schema([
+                (col, self._get_parquet_type(col)) for col in columns
+            ])
+            self._writer = pyarrow.parquet.ParquetWriter(
+                filepath, self._schema, compression='zstd'
+            )
+        else:
+            self._writer = open(filepath, 'w', newline='')
+
+    def _get_parquet_type(self, col):
+        import pyarrow
+        if col in self.string_columns:
+            return pyarrow.string()
+        elif col in _INT_COLUMNS:
+            return pyarrow.int64()
+        else:
+            return pyarrow.float64()
+
+    def _cast_to_schema(self, df):
+        # Every table must have the same types in a Parquet file
+        for col in self.columns:
+            if col in self.string_columns:
+                values = df[col]
+                df[col] = values.where(values.isna(), values.astype(str))
+            elif col in _INT_COLUMNS:
+                df[col] = pd.to_numeric(df[col]).astype(np.int64)
+            else:
+                values = pd.to_numeric(df[col], errors='coerce')
+                is_coerced = values.isna() & df[col].notna()
+                if is_coerced.any():
+                    raise TypeError(
+                        f'Column "{col}" of "{self.filepath}" was '
+                        'detected as numeric but it contains non-numeric '
+                        f'values (e.g., "{df[col][is_coerced].iloc[0]}").'
+                    )
+                df[col] = values.astype(float)
+        return df
+
+    def append(self, df):
+        df = df.reindex(columns=self.columns)
+        if self._ext in _EXCEL_EXTENSIONS:
+            if self._num_rows + len(df) >= _EXCEL_MAX_NUM_ROWS:
+                raise ValueError(
+                    f'The concatenated table has more than '
+                    f'{_EXCEL_MAX_NUM_ROWS-1} rows, which is the maximum '
+                    'supported by Excel. Save it as CSV or Parquet instead.'
+                )
+            df.to_excel(
+                self._writer, index=False, header=self._num_rows == 0,
+                startrow=self._num_rows + int(self._num_rows > 0)
+            )
+        elif self._ext == '.parquet':
+            import pyarrow
+            df = self._cast_to_schema(df)
+            table = pyarrow.Table.from_pandas(
+                df, schema=self._schema, preserve_index=False
+            )
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self._writer, index=False, header=self._num_rows == 0)
+        self._num_rows += len(df)
+
+    def close(self):
+        if self._ext in _EXCEL_EXTENSIONS and self._num_rows == 0:
+            # Excel files require at least one sheet
+            pd.DataFrame(columns=self.columns).to_excel(
+                self._writer, index=False
+            )
+        self._writer.close()
+
+def concat_acdc_output_files(
+        tables, output_filepath, key_name='Position_n',
+        leading_columns=('Cell_ID',), columns=None,
+        constant_columns=None, max_workers=4, logger_func=printl,
+        progress_callback=None, abort_callback=None
+    ):
+    """Concatenate tables appending them one by one to the output file.
+
+    Parameters
+    ----------
+    tables : list of (str, str)
+        List of (key, filepath) where key is the value of the `key_name`
+        column for the rows of the table at filepath (e.g., the Position
+        folder name).
+    output_filepath : str
+        Path of the output file. The format is determined by the extension
+        ('.csv', '.parquet', '.xlsx'). Parquet requires `pyarrow`. 
+        Excel files are not streamed (the entire sheet is kept in memory) 
+        and are limited to 1048575 rows.
+    key_name : str, optional
+        Name of the column with the keys. Default is 'Position_n'
+    leading_columns : tuple of str, optional
+        Columns that are written right after the key column (like the index
+        of `pd.concat(..., keys=keys)`). Default is ('Cell_ID',)
+    columns : list of str, optional
+        If not None, only these columns (plus the key and leading columns)
+        are read and written. Default is None
+    constant_columns : dict, optional
+        Dictionary of {column name: value} added to every row (only if the
+        column is part of `columns`, when `columns` is not None).
+        Default is None
+    max_workers : int, optional
+        Number of threads reading the tables. At most `2*max_workers`
+        tables are kept in memory. Default is 4
+    logger_func : callable, optional
+        Function used to log progress. Default is `printl`
+    progress_callback : callable, optional
+        Called with no arguments every time a table has been written.
+        Default is None
+    abort_callback : callable, optional
+        Called before reading every table. If it returns True the
+        concatenation stops. Default is None
+
+    Returns
+    -------
+    bool
+        False if the concatenation was aborted or if there were no tables
+        to concatenate, True otherwise.
+    """
+    if constant_columns is None:
+        constant_columns = {}
+
+    if not tables:
+        return False
+
+    # Parquet requires the same types for all the tables --> scan all the 
+    # rows. Other formats need only the names of the columns
+    is_parquet = os.path.splitext(output_filepath)[1] == '.parquet'
+    sample_nrows = None if is_parquet else 1
+    tables_columns = get_tables_columns(
+        [filepath for _, filepath in tables], sample_nrows=sample_nrows
+    )
+    for col, value in constant_columns.items():
+        tables_columns[col] = isinstance(value, str)
+    tables_columns[key_name] = True
+
+    other_columns = [
+        col for col in tables_columns
+        if col != key_name and col not in leading_columns
+    ]
+    if columns is not None:
+        columns_set = set(columns)
+        other_columns = [col for col in other_columns if col in columns_set]
+    output_columns = [
+        key_name,
+        *[col for col in leading_columns if col in tables_columns],
+        *other_columns
+    ]
+    string_columns = {
+        col for col in output_columns if tables_columns[col]
+    }
+    read_columns = None
+    if columns is not None:
+        read_columns = [
+            col for col in output_columns if col not in constant_columns
+        ]
+
+    appender = _TableAppender(output_filepath, output_columns, string_columns)
+    aborted = False
+    max_workers = max(1, max_workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        tables_iter = iter(tables)
+        pending = collections.deque()
+
+        def submit_next():
+            if abort_callback is not None and abort_callback():
+                return False
+            try:
+                key, filepath = next(tables_iter)
+            except StopIteration:
+                return False
+            future = executor.submit(_read_table, filepath, read_columns)
+            pending.append((key, filepath, future))
+            return True
+
+        for _ in range(2*max_workers):
+            if not submit_next():
+                break
+
+        try:
+            while pending:
+                key, filepath, future = pending.popleft()
+                df = future.result()
+                submit_next()
+                logger_func(f'Appending "{filepath}"...')
+                df[key_name] = key
+                for col, value in constant_columns.items():
+                    df[col] = value
+                appender.append(df)
+                if progress_callback is not None:
+                    progress_callback()
+            aborted = abort_callback is not None and abort_callback()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            appender.close()
+
+    return not aborted
+
+def concat_experiments_acdc_output(
+        exp_paths, acdc_output_endname='acdc_output',
+        allpos_filename=None, multi_exp_filepath=None, columns=None,
+        ext='.csv', max_workers=4, logger_func=printl
+    ):
+    """Concatenate the acdc_output tables of all Positions of each
+    experiment into `<exp_path>/AllPos_acdc_output/<allpos_filename>`
+    and, optionally, all the experiments into one file.
+
+    Parameters
+    ----------
+    exp_paths : list of str
+        Paths of the experiment folders.
+    acdc_output_endname : str, optional
+        End of the filename (without extension) of the tables to
+        concatenate. Default is 'acdc_output'
+    allpos_filename : str, optional
+        Filename of the table with all the Positions of each experiment.
+        If None, it is `AllPos_<acdc_output_endname><ext>`. Default is None
+    multi_exp_filepath : str, optional
+        Path of the table with all the experiments. If None, the
+        experiments are not concatenated together. Default is None
+    columns : list of str, optional
+        If not None, only these columns are concatenated. Default is None
+    ext : {'.csv', '.parquet', '.xlsx'}, optional
+        Format of the output tables. Excel files are not streamed (see 
+        `concat_acdc_output_files`). Default is '.csv'
+    max_workers : int, optional
+        Number of threads reading the tables. Default is 4
+    logger_func : callable, optional
+        Function used to log progress. Default is `printl`
+
+    Returns
+    -------
+    list of str
+        Paths of the tables with all the Positions of each experiment.
+    """
+    if allpos_filename is None:
+        allpos_filename = f'AllPos_{acdc_output_endname}{ext}'
+
+    allpos_filepaths = []
+    for exp_path in exp_paths:
+        tables = get_acdc_output_filepaths(
+            exp_path, acdc_output_endname=acdc_output_endname
+        )
+        if not tables:
+            logger_func(
+                f'Experiment "{exp_path}" does not contain any '
+                f'{acdc_output_endname}.csv file. Skipping it.'
+            )
+            continue
+
+        allpos_dir = os.path.join(exp_path, 'AllPos_acdc_output')
+        os.makedirs(allpos_dir, exist_ok=True)
+        allpos_filepath = os.path.join(allpos_dir, allpos_filename)
+        logger_func(
+            f'Saving all positions concatenated file to "{allpos_filepath}"'
+        )
+        concat_acdc_output_files(
+            tables, allpos_filepath, columns=columns,
+            constant_columns={'experiment_folderpath': exp_path},
+            max_workers=max_workers, logger_func=logger_func
+        )
+        allpos_filepaths.append(allpos_filepath)
+
+    if multi_exp_filepath is not None and allpos_filepaths:
+        logger_func(
+            'Saving multiple experiments concatenated file to '
+            f'"{multi_exp_filepath}"'
+        )
+        tables = [
+            (os.path.basename(os.path.dirname(os.path.dirname(filepath))),
+             filepath)
+            for filepath in allpos_filepaths
+        ]
+        concat_acdc_output_files(
+            tables, multi_exp_filepath, key_name='experiment_foldername',
+            leading_columns=('Position_n', 'Cell_ID'),
+            max_workers=max_workers, logger_func=logger_func
+        )
+
+    return allpos_filepaths
+
+def run():
+    ap = argparse.ArgumentParser(
+        prog='acdc-concat',
+        description=(
+            'Concatenate the acdc_output tables of all the Positions of '
+            'one or more experiments.'
+        ),
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    ap.add_argument(
+        'exp_paths', nargs='+', metavar='EXP_PATH',
+        help='Path(s) of the experiment folder(s) containing the Positions'
+    )
+    ap.add_argument(
+        '-e', '--endname', default='acdc_output', type=str,
+        help=(
+            'End of the filename (without extension) of the tables to '
+            'concatenate. Default is "acdc_output"'
+        )
+    )
+    ap.add_argument(
+        '-c', '--columns', default=None, nargs='+', metavar='COLUMN',
+        help='Concatenate only these columns. Default is all columns'
+    )
+    ap.add_argument(
+        '-f', '--format', default='csv', choices=('csv', 'parquet', 'xlsx'),
+        help=(
+            'Format of the output tables. Default is "csv". Note that '
+            'Excel files are\nnot streamed, i.e., the entire table is kept '
+            'in memory while writing'
+        )
+    )
+    ap.add_argument(
+        '-o', '--output', default=None, type=str, metavar='FILEPATH',
+        help=(
+            'Path of the table with all the experiments. If not provided, '
+            'only the tables with all the Positions of each experiment are '
+            'saved (in the "AllPos_acdc_output" folder of each experiment)'
+        )
+    )
+    ap.add_argument(
+        '-w', '--workers', default=4, type=int, metavar='N',
+        help='Number of threads reading the tables. Default is 4'
+    )
+    args = ap.parse_args()
+
+    concat_experiments_acdc_output(
+        args.exp_paths, acdc_output_endname=args.endname,
+        multi_exp_filepath=args.output, columns=args.columns,
+        ext=f'.{args.format}', max_workers=args.workers
+    )
+
+if __name__ == '__main__':
+    run()
@@ -55,6 +55,17 @@ try:
         help=('Path of the ".ini" workflow file')
     )
     
+    ap.add_argument(
+        '-w', '--workers',
+        default=None,
+        type=int,
+        metavar='N',
+        help=(
+            'Number of parallel processes used to process the Positions '
+            'of the workflow'
+        )
+    )
+    
     ap.add_argument(
         '-d', '--debug', action='store_true',
         help=(
@@ -73,3 +84,4 @@ except:
     print('Importing from notebook, ignoring Cell-ACDC argument parser...')
     parser_args = {}
     parser_args['debug'] = False
+    parser_args['workers'] = None
@@ -1,6 +1,13 @@
 import traceback
 import os
+import logging
 import time
+import shutil
+import tempfile
+import concurrent.futures
+import threading
+import queue
+from collections import OrderedDict
 from importlib import import_module
 import numpy as np
 import cv2
@@ -18,6 +25,7 @@ from math import sqrt
 from scipy.stats import norm
 
 import pandas as pd
+import h5py
 
 from tqdm import tqdm
 
@@ -42,10 +50,23 @@ class ProgressCliSignal:
     def emit(self, text):
         self.logger_func(text)
 
+class ErrorsCollectorSignal:
+    """Signal-like object storing the emitted errors (traceback, key) in 
+    the dictionary `errors` of {key: traceback}"""
+    def __init__(self, errors, logger_func=None):
+        self.errors = errors
+        self.logger_func = logger_func
+    
+    def emit(self, traceback_format, key):
+        if self.logger_func is not None:
+            self.logger_func(traceback_format)
+        self.errors[key] = traceback_format
+
 class KernelCliSignals:
     def __init__(self, logger_func):
         self.finished = HeadlessSignal(float)
         self.progress = ProgressCliSignal(logger_func)
+        self.initProgressBar = HeadlessSignal(int)
         self.progressBar = HeadlessSignal(int)
         self.innerProgressBar = HeadlessSignal(int)
         self.resetInnerPbar = HeadlessSignal(int)
@@ -151,42 +172,721 @@ def nearest_nonzero_z_idx_from_z_centroid(obj, current_z=-1):
     nearest_nonzero_z_global = nearest_nonzero_z_local + obj.bbox[0]
     return nearest_nonzero_z_global
 
-def compute_twoframes_velocity(prev_lab, lab, spacing=None):
-    prev_rp = skimage.measure.regionprops(prev_lab)
-    rp = skimage.measure.regionprops(lab)
-    prev_IDs = [obj.label for obj in prev_rp]
-    velocities_pxl = [0]*len(rp)
-    velocities_um = [0]*len(rp)
-    for i, obj in enumerate(rp):
-        if obj.label not in prev_IDs:
+def get_labels_table(lab):
+    """Compute a column-oriented table with the basic properties of all the 
+    objects in `lab` without creating one `RegionProperties` per object.
+
+    Area and centroids are computed with weighted `np.bincount` and 
+    bounding boxes with one `scipy.ndimage.find_objects` pass.
+
+    Parameters
+    ----------
+    lab : numpy.ndarray of ints
+        Labelled 2D or 3D image.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following keys (one element per object, sorted 
+        by label):
+        'label': (N,) array of IDs
+        'area': (N,) array of number of pixels
+        'centroid': (N, lab.ndim) array like `regionprops` centroid
+        'bbox': (N, 2*lab.ndim) array like `regionprops` bbox
+        'slice': list of tuples of slices like `regionprops` slice
+    """
+    max_ID = int(lab.max(initial=0))
+    if max_ID >= 2**24:
+        # Huge IDs --> compute on consecutive IDs and map them back
+        uniqueIDs, inverse = np.unique(lab, return_inverse=True)
+        compact_lab = inverse.reshape(lab.shape)
+        if uniqueIDs[0] != 0:
+            compact_lab = compact_lab + 1
+            uniqueIDs = np.concatenate(([0], uniqueIDs))
+        table = get_labels_table(compact_lab)
+        table['label'] = uniqueIDs[table['label']].astype(np.int64)
+        return table
+    
+    lab_ravel = lab.ravel()
+    areas = np.bincount(lab_ravel, minlength=max_ID+1)
+    labels = np.flatnonzero(areas)
+    labels = labels[labels > 0]
+    
+    centroids = np.zeros((len(labels), lab.ndim), dtype=float)
+    for axis, size in enumerate(lab.shape):
+        shape = [1]*lab.ndim
+        shape[axis] = size
+        coords = np.broadcast_to(
+            np.arange(size).reshape(shape), lab.shape
+        ).ravel()
+        coords_sums = np.bincount(
+            lab_ravel, weights=coords, minlength=max_ID+1
+        )
+        centroids[:, axis] = coords_sums[labels]/areas[labels]
+    
+    objs_slices = scipy.ndimage.find_objects(lab)
+    slices = [objs_slices[ID-1] for ID in labels]
+    bboxes = np.array([
+        [sl.start for sl in obj_slice] + [sl.stop for sl in obj_slice]
+        for obj_slice in slices
+    ], dtype=np.int64).reshape(-1, 2*lab.ndim)
+    return {
+        'label': labels.astype(np.int64),
+        'area': areas[labels],
+        'centroid': centroids,
+        'bbox': bboxes,
+        'slice': slices
+    }
+
+class RegionpropsCache:
+    """Memoized `skimage.measure.regionprops` and labels table (see 
+    `get_labels_table`) of labelled frames.
+
+    Frames are identified by a hashable key (e.g., frame_i) and each key has 
+    a mutation counter that is increased by `invalidate`. Cached results are 
+    valid as long as the counter is not increased. The labels are never 
+    compared with the cached ones, hence call `invalidate(key)` every time 
+    the labels of a frame are modified (in place or replaced with 
+    different labels). 
+    
+    Note that the `RegionProperties` objects keep a reference to the labels 
+    they were computed from, hence at most `max_size` frames are cached 
+    (least recently used are dropped first).
+    """
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._versions = {}
+        self._cache = OrderedDict()
+    
+    def version(self, key):
+        return self._versions.get(key, 0)
+    
+    def invalidate(self, key=None):
+        """Increase the mutation counter of `key` (or of all the keys if 
+        None) and remove its cached results.
+        """
+        keys = list(self._cache.keys()) if key is None else [key]
+        for _key in keys:
+            self._versions[_key] = self.version(_key) + 1
+            self._cache.pop(_key, None)
+    
+    def _get_entry(self, key):
+        entry = self._cache.get(key)
+        if entry is None or entry['version'] != self.version(key):
+            entry = {'version': self.version(key)}
+            self._cache[key] = entry
+        
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return entry
+    
+    def get_regionprops(self, lab, key):
+        """Get `skimage.measure.regionprops(lab)` computed only once until 
+        `key` is invalidated. A new list is returned at every call while 
+        the `RegionProperties` objects are shared.
+        """
+        entry = self._get_entry(key)
+        rp = entry.get('rp')
+        if rp is None:
+            rp = skimage.measure.regionprops(lab)
+            entry['rp'] = rp
+        return list(rp)
+    
+    def get_labels_table(self, lab, key):
+        """Get `get_labels_table(lab)` computed only once until `key` is 
+        invalidated.
+        """
+        entry = self._get_entry(key)
+        table = entry.get('table')
+        if table is None:
+            table = get_labels_table(lab)
+            entry['table'] = table
+        return table
+
+def compute_twoframes_velocity(
+        prev_lab, lab, spacing=None, prev_table=None, table=None
+    ):
+    """Compute the velocity of each object in `lab` as the displacement of 
+    its centroid from `prev_lab`.
+
+    `prev_table` and `table` are the labels tables of `prev_lab` and `lab` 
+    (see `get_labels_table`). If None, they are computed.
+
+    Returns two lists (velocity in pixels and in physical units) with one 
+    element per object in `lab` sorted by ID. Objects that are not present 
+    in `prev_lab` have velocity 0.
+    """
+    if prev_table is None:
+        prev_table = get_labels_table(prev_lab)
+    if table is None:
+        table = get_labels_table(lab)
+    
+    IDs = table['label']
+    prev_IDs = prev_table['label']
+    velocities_pxl = np.zeros(len(IDs))
+    velocities_um = np.zeros(len(IDs))
+    _, idx, prev_idx = np.intersect1d(IDs, prev_IDs, return_indices=True)
+    diff = table['centroid'][idx] - prev_table['centroid'][prev_idx]
+    velocities_pxl[idx] = np.linalg.norm(diff, axis=1)
+    if spacing is not None:
+        velocities_um[idx] = np.linalg.norm(diff*spacing, axis=1)
+    return velocities_pxl.tolist(), velocities_um.tolist()
+
+
+def _get_centroids_colnames(ndim):
+    return ['z_centroid', 'y_centroid', 'x_centroid'][-ndim:]
+
+def get_video_centroids_df(segm_data, frames=None):
+    """Get the centroids of all the objects in all the frames.
+
+    Parameters
+    ----------
+    segm_data : sequence of numpy.ndarray of ints
+        Labelled 2D or 3D frames (e.g., 3D or 4D array). Frames that are 
+        None are skipped.
+    frames : iterable of ints, optional
+        If not None, compute only these frames. Default is None
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with ['frame_i', 'Cell_ID'] as index and the columns 
+        ['z_centroid'], 'y_centroid', and 'x_centroid'.
+    """
+    if frames is None:
+        frames = range(len(segm_data))
+    
+    frames_idxs = []
+    IDs = []
+    centroids = []
+    ndim = None
+    for frame_i in frames:
+        lab = segm_data[frame_i]
+        if lab is None:
             continue
+        
+        ndim = lab.ndim
+        table = get_labels_table(lab)
+        frames_idxs.append(np.full(len(table['label']), frame_i))
+        IDs.append(table['label'])
+        centroids.append(table['centroid'])
+    
+    if ndim is None:
+        index = pd.MultiIndex.from_arrays([[], []], names=['frame_i', 'Cell_ID'])
+        return pd.DataFrame(
+            index=index, columns=_get_centroids_colnames(2), dtype=float
+        )
+    
+    index = pd.MultiIndex.from_arrays(
+        [np.concatenate(frames_idxs), np.concatenate(IDs)], 
+        names=['frame_i', 'Cell_ID']
+    )
+    centroids_df = pd.DataFrame(
+        data=np.concatenate(centroids), index=index, 
+        columns=_get_centroids_colnames(ndim)
+    )
+    return centroids_df
+
+def _join_centroids_with_lag(centroids_df, lag=1):
+    # Join each (frame_i, Cell_ID) with (frame_i-lag, Cell_ID)
+    cols = [col for col in centroids_df.columns if col.endswith('_centroid')]
+    df = centroids_df[cols].reset_index()
+    prev_df = df.copy()
+    prev_df['frame_i'] = prev_df['frame_i'] + lag
+    joined = df.merge(
+        prev_df, on=['frame_i', 'Cell_ID'], how='left', 
+        suffixes=('', '_prev'), sort=False
+    )
+    diff = (
+        joined[cols].to_numpy() 
+        - joined[[f'{col}_prev' for col in cols]].to_numpy()
+    )
+    return joined[['frame_i', 'Cell_ID']], diff
 
-        prev_obj = prev_rp[prev_IDs.index(obj.label)]
-        diff = np.subtract(obj.centroid, prev_obj.centroid)
-        v_pixel = np.linalg.norm(diff)
-        velocities_pxl[i] = v_pixel
-        if spacing is not None:
-            v_um = np.linalg.norm(diff*spacing)
-            velocities_um[i] = v_um
-    return velocities_pxl, velocities_um
+def compute_video_velocity(centroids_df, spacing=None):
+    """Compute the velocity of every object in every frame as the 
+    displacement of its centroid from the previous frame.
 
+    Parameters
+    ----------
+    centroids_df : pd.DataFrame
+        Centroids table returned by `get_video_centroids_df`.
+    spacing : array-like, optional
+        Physical size of the voxels/pixels in the same order as the 
+        centroids columns ((z), y, x). If None, 'velocity_um' is 0. 
+        Default is None
 
-def lab_replace_values(lab, rp, oldIDs, newIDs, in_place=True):
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with same index of `centroids_df` and the columns 
+        'velocity_pixel' and 'velocity_um'. Objects that are not present 
+        in the previous frame have velocity 0.
+    """
+    index_df, diff = _join_centroids_with_lag(centroids_df)
+    is_in_prev_frame = ~np.isnan(diff).any(axis=1)
+    velocities_pxl = np.zeros(len(diff))
+    velocities_um = np.zeros(len(diff))
+    diff = diff[is_in_prev_frame]
+    velocities_pxl[is_in_prev_frame] = np.linalg.norm(diff, axis=1)
+    if spacing is not None:
+        velocities_um[is_in_prev_frame] = np.linalg.norm(
+            diff*np.asarray(spacing), axis=1
+        )
+    velocity_df = pd.DataFrame({
+        'velocity_pixel': velocities_pxl,
+        'velocity_um': velocities_um
+    }, index=pd.MultiIndex.from_frame(index_df))
+    return velocity_df
+
+def compute_tracks_displacement(centroids_df, spacing=None, max_lag=None):
+    """Compute the displacement of every track (i.e., Cell_ID) and its 
+    mean squared displacement (MSD) as a function of the time lag.
+
+    Parameters
+    ----------
+    centroids_df : pd.DataFrame
+        Centroids table returned by `get_video_centroids_df`.
+    spacing : array-like, optional
+        Physical size of the voxels/pixels in the same order as the 
+        centroids columns ((z), y, x). If None, the '_um' columns are NaN. 
+        Default is None
+    max_lag : int, optional
+        Maximum time lag in number of frames of the MSD. If None, use the 
+        longest track. Default is None
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        The first DataFrame has 'Cell_ID' as index and the columns 
+        'first_frame_i', 'last_frame_i', 'num_frames', 
+        'displacement_pixel', 'path_length_pixel', 'displacement_um', 
+        and 'path_length_um', where displacement is between first and 
+        last frame and path length is the sum of the displacements 
+        between consecutive observations of the track.
+        The second DataFrame has ['Cell_ID', 'lag'] as index and the 
+        columns 'msd_pixel', 'msd_um', and 'num_pairs'.
+    """
+    cols = [col for col in centroids_df.columns if col.endswith('_centroid')]
+    scale = np.ones(len(cols)) if spacing is None else np.asarray(spacing)
+    df = centroids_df[cols].reset_index().sort_values(['Cell_ID', 'frame_i'])
+    grouped = df.groupby('Cell_ID')
+    first_df = grouped.first()
+    last_df = grouped.last()
+    net_diff = last_df[cols].to_numpy() - first_df[cols].to_numpy()
+    
+    # Steps between consecutive observations of each track (also across 
+    # frames where the object is missing)
+    steps = grouped[cols].diff().to_numpy()
+    is_step = ~np.isnan(steps).any(axis=1)
+    steps_IDs = df['Cell_ID'].to_numpy()[is_step]
+    steps = steps[is_step]
+    path_lengths = pd.DataFrame({
+        'path_length_pixel': np.linalg.norm(steps, axis=1),
+        'path_length_um': np.linalg.norm(steps*scale, axis=1)
+    }, index=pd.Index(steps_IDs, name='Cell_ID')).groupby(level=0).sum()
+    
+    tracks_df = pd.DataFrame({
+        'first_frame_i': first_df['frame_i'],
+        'last_frame_i': last_df['frame_i'],
+        'num_frames': grouped.size(),
+        'displacement_pixel': np.linalg.norm(net_diff, axis=1),
+        'displacement_um': np.linalg.norm(net_diff*scale, axis=1)
+    })
+    tracks_df = tracks_df.join(path_lengths).fillna(
+        {'path_length_pixel': 0, 'path_length_um': 0}
+    )
+    tracks_df = tracks_df[[
+        'first_frame_i', 'last_frame_i', 'num_frames', 
+        'displacement_pixel', 'path_length_pixel', 
+        'displacement_um', 'path_length_um'
+    ]]
+    if spacing is None:
+        tracks_df[['displacement_um', 'path_length_um']] = np.nan
+    
+    if max_lag is None:
+        tracks_spans = tracks_df['last_frame_i'] - tracks_df['first_frame_i']
+        max_lag = int(tracks_spans.max()) if len(tracks_df) > 0 else 0
+    
+    # Pair every observation with the one `offset` rows below in the table 
+    # sorted by Cell_ID and frame_i. The time lag of a pair is at least 
+    # `offset` frames, hence offsets larger than `max_lag` or than the 
+    # longest track are not needed
+    IDs = df['Cell_ID'].to_numpy()
+    frames = df['frame_i'].to_numpy()
+    positions = df[cols].to_numpy()
+    max_num_frames = int(tracks_df['num_frames'].max()) if max_lag > 0 else 1
+    max_offset = min(max_lag, max_num_frames - 1)
+    msd_dfs = []
+    for offset in range(1, max_offset+1):
+        is_pair = IDs[offset:] == IDs[:-offset]
+        lags = frames[offset:] - frames[:-offset]
+        is_pair = is_pair & (lags <= max_lag)
+        if not np.any(is_pair):
+            continue
+        diff = (positions[offset:] - positions[:-offset])[is_pair]
+        msd_dfs.append(pd.DataFrame({
+            'Cell_ID': IDs[offset:][is_pair],
+            'lag': lags[is_pair],
+            'sq_disp_pixel': np.square(diff).sum(axis=1),
+            'sq_disp_um': np.square(diff*scale).sum(axis=1),
+        }).groupby(['Cell_ID', 'lag']).agg(
+            sum_sq_disp_pixel=('sq_disp_pixel', 'sum'),
+            sum_sq_disp_um=('sq_disp_um', 'sum'),
+            num_pairs=('sq_disp_pixel', 'size')
+        ))
+    
+    if msd_dfs:
+        msd_df = pd.concat(msd_dfs).groupby(level=['Cell_ID', 'lag']).sum()
+        msd_df = pd.DataFrame({
+            'msd_pixel': msd_df['sum_sq_disp_pixel']/msd_df['num_pairs'],
+            'msd_um': msd_df['sum_sq_disp_um']/msd_df['num_pairs'],
+            'num_pairs': msd_df['num_pairs']
+        })
+    else:
+        index = pd.MultiIndex.from_arrays([[], []], names=['Cell_ID', 'lag'])
+        msd_df = pd.DataFrame(
+            index=index, columns=['msd_pixel', 'msd_um', 'num_pairs'], 
+            dtype=float
+        )
+    if spacing is None:
+        msd_df['msd_um'] = np.nan
+    return tracks_df, msd_df
+
+def relabel_IDs(lab, oldIDs, newIDs, in_place=True):
+    """Replace all the `oldIDs` with the corresponding `newIDs` in a single
+    vectorized pass using a lookup table (or a binary search on the sorted
+    IDs when the IDs are too large for a lookup table).
+
+    All the substitutions are applied simultaneously, i.e., swapping
+    IDs (e.g., 1 --> 2 and 2 --> 1) is allowed.
+
+    Args:
+        lab (ndarray): 2D, 3D or 4D array of `int` type with the labels.
+        oldIDs (list of ints): IDs to replace. If an ID is present more than
+            once, only the first occurrence is used. Negative IDs are ignored.
+        newIDs (list of ints): New IDs with the same length as `oldIDs`.
+            They must be non-negative and fit into the data type of `lab`.
+        in_place (bool, optional): If False, `lab` is copied before
+            replacing the IDs. Defaults to True.
+
+    Returns:
+        ndarray: The relabelled array.
+    
+    Raises:
+        ValueError: If any of the new IDs is negative or larger than the 
+            maximum value of the data type of `lab`, or if `lab` contains 
+            negative labels.
+    """
     if not in_place:
         lab = lab.copy()
-    for obj in rp:
-        try:
-            idx = oldIDs.index(obj.label)
-        except ValueError:
-            continue
 
-        if obj.label == newIDs[idx]:
-            # Skip assigning ID to same ID
-            continue
+    if len(oldIDs) == 0 or lab.size == 0:
+        return lab
+
+    oldIDs = np.asarray(oldIDs, dtype=np.int64)
+    newIDs = np.asarray(newIDs, dtype=np.int64)
+    oldIDs, first_idx = np.unique(oldIDs, return_index=True)
+    newIDs = newIDs[first_idx]
+
+    to_replace_mask = (oldIDs >= 0) & (oldIDs != newIDs)
+    oldIDs = oldIDs[to_replace_mask]
+    newIDs = newIDs[to_replace_mask]
+    if len(oldIDs) == 0:
+        return lab
+    
+    if newIDs.min() < 0:
+        raise ValueError(
+            f'New IDs cannot be negative (got {newIDs.min()}).'
+        )
+    
+    max_dtype_ID = np.iinfo(lab.dtype).max
+    if newIDs.max() > max_dtype_ID:
+        raise ValueError(
+            f'New ID {newIDs.max()} does not fit into the data type '
+            f'"{lab.dtype}" of the labels (max value is {max_dtype_ID}).'
+        )
+    
+    is_signed = np.issubdtype(lab.dtype, np.signedinteger)
+    if is_signed and lab.min() < 0:
+        raise ValueError('Labels cannot be negative.')
+
+    # Process one frame (or z-slice) at the time to limit the memory of the
+    # temporary arrays on large 3D and 4D arrays
+    lab_chunks = [lab[idx] for idx in np.ndindex(lab.shape[:-2])]
+    max_ID = int(lab.max())
+    if max_ID < 2**24:
+        lut = np.arange(max_ID+1, dtype=lab.dtype)
+        is_in_lab = oldIDs <= max_ID
+        lut[oldIDs[is_in_lab]] = newIDs[is_in_lab]
+        for lab_chunk in lab_chunks:
+            lab_chunk[...] = lut[lab_chunk]
+        return lab
 
-        lab[obj.slice][obj.image] = newIDs[idx]
+    # Huge IDs --> binary search on the sorted IDs (already sorted by unique)
+    for lab_chunk in lab_chunks:
+        pos = np.searchsorted(oldIDs, lab_chunk)
+        pos[pos == len(oldIDs)] = 0
+        is_old_ID = oldIDs[pos] == lab_chunk
+        lab_chunk[is_old_ID] = newIDs[pos[is_old_ID]]
     return lab
 
+def lab_replace_values(lab, rp, oldIDs, newIDs, in_place=True):
+    # NOTE: `rp` is not needed anymore, kept for backwards compatibility
+    return relabel_IDs(lab, oldIDs, newIDs, in_place=in_place)
+
+def _map_IDs_to_indices(arr, IDs):
+    """Map every pixel of `arr` to the index of its value in `IDs`.
+
+    Args:
+        arr (ndarray): Array of `int` type with the labels.
+        IDs (ndarray): 1D array of unique IDs to map.
+
+    Returns:
+        ndarray: 1D array of `int` with the same number of elements as `arr`
+            where each element is the index of the corresponding label in
+            `IDs` or -1 if the label is not in `IDs`.
+    """
+    arr = arr.ravel()
+    indices = np.full(arr.size, -1, dtype=np.int64)
+    if len(IDs) == 0 or arr.size == 0:
+        return indices
+
+    max_ID = max(int(IDs.max()), int(arr.max()))
+    if max_ID < 2**24:
+        # Small IDs --> direct lookup table
+        lut = np.full(max_ID+1, -1, dtype=np.int64)
+        lut[IDs] = np.arange(len(IDs))
+        return lut[arr]
+
+    # Huge IDs --> binary search on the sorted IDs
+    sorter = np.argsort(IDs)
+    sorted_IDs = IDs[sorter]
+    pos = np.searchsorted(sorted_IDs, arr)
+    pos[pos == len(sorted_IDs)] = 0
+    is_in_IDs = sorted_IDs[pos] == arr
+    indices[is_in_IDs] = sorter[pos[is_in_IDs]]
+    return indices
+
+def get_IDs_at_points(lab, points_coords):
+    """Get the IDs of the objects at the given points with vectorized 
+    fancy indexing.
+
+    Args:
+        lab (ndarray): 2D or 3D array of `int` type with the labels.
+        points_coords (ndarray): (N, lab.ndim) array with the (z), y, x 
+            coordinates of the points. Floats are truncated to `int`.
+
+    Returns:
+        ndarray: 1D array of `int` with N elements where each element is 
+            the ID at the corresponding point or 0 if the point is outside 
+            of `lab`.
+    """
+    points_coords = np.asarray(points_coords)
+    IDs = np.zeros(len(points_coords), dtype=np.int64)
+    if len(points_coords) == 0:
+        return IDs
+    
+    coords = points_coords.astype(np.int64)
+    is_inside = np.logical_and.reduce(
+        (coords >= 0) & (coords < lab.shape), axis=1
+    )
+    IDs[is_inside] = lab[tuple(coords[is_inside].T)]
+    return IDs
+
+def apply_tracks_to_segm_video(
+        segm_video, frames, tracked_IDs, old_IDs=None, points_coords=None, 
+        keep_untracked_frames=False, progress_callback=None
+    ):
+    """Relabel every frame of `segm_video` according to tracks.
+
+    Tracks are passed flattened into one row per (frame, tracked ID). The 
+    rows are grouped by frame in one shot and each frame is relabelled 
+    with a single lookup table pass (see `relabel_IDs`). Like in 
+    `CellACDC_tracker.indexAssignment` the objects that are not tracked 
+    get new unique IDs.
+
+    Args:
+        segm_video (ndarray): 3D (T, Y, X) or 4D (T, Z, Y, X) array of 
+            `int` type with the labels.
+        frames (array-like of ints): Frame index of every row.
+        tracked_IDs (array-like of ints): Tracked ID of every row.
+        old_IDs (array-like of ints, optional): ID in `segm_video` of every 
+            row. If None, it is determined from `points_coords`. Defaults 
+            to None.
+        points_coords (array-like, optional): (N, segm_video.ndim-1) array 
+            with the (z), y, x coordinates of every row (e.g., the 
+            centroid of the tracked object). Points that fall outside of 
+            the objects are ignored. Required if `old_IDs` is None. 
+            Defaults to None.
+        keep_untracked_frames (bool, optional): If True, the frames without 
+            any tracked object are copied from `segm_video`, otherwise 
+            they are left empty. Defaults to False.
+        progress_callback (callable, optional): Called with no arguments 
+            after each frame. Defaults to None.
+
+    Returns:
+        ndarray: The tracked video with same shape and dtype of `segm_video`.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    tracked_IDs = np.asarray(tracked_IDs, dtype=np.int64)
+    map_points_to_IDs = old_IDs is None
+    if map_points_to_IDs:
+        points_coords = np.asarray(points_coords)
+    else:
+        old_IDs = np.asarray(old_IDs, dtype=np.int64)
+    
+    if keep_untracked_frames:
+        tracked_video = segm_video.copy()
+    else:
+        tracked_video = np.zeros_like(segm_video)
+    
+    # Group rows by frame keeping the input order within each frame
+    sorter = np.argsort(frames, kind='stable')
+    tracked_frames, start_idxs = np.unique(frames[sorter], return_index=True)
+    rows_per_frame = dict(zip(
+        tracked_frames, np.split(sorter, start_idxs[1:])
+    ))
+    
+    for frame_i, lab in enumerate(segm_video):
+        rows = rows_per_frame.get(frame_i)
+        if rows is None:
+            if progress_callback is not None:
+                progress_callback()
+            continue
+        
+        if map_points_to_IDs:
+            frame_old_IDs = get_IDs_at_points(lab, points_coords[rows])
+        else:
+            frame_old_IDs = old_IDs[rows]
+        frame_tracked_IDs = tracked_IDs[rows]
+        
+        is_on_object = frame_old_IDs > 0
+        frame_old_IDs = frame_old_IDs[is_on_object]
+        frame_tracked_IDs = frame_tracked_IDs[is_on_object]
+        
+        IDs_curr_untracked = np.unique(lab)
+        IDs_curr_untracked = IDs_curr_untracked[IDs_curr_untracked > 0]
+        if len(frame_tracked_IDs) == 0 or len(IDs_curr_untracked) == 0:
+            # No cells segmented or tracked
+            if progress_callback is not None:
+                progress_callback()
+            continue
+        
+        uniqueID = max(
+            frame_tracked_IDs.max(), IDs_curr_untracked.max()
+        ) + 1
+        new_untracked_IDs = IDs_curr_untracked[
+            ~np.isin(IDs_curr_untracked, frame_old_IDs)
+        ]
+        new_tracked_IDs = np.arange(
+            uniqueID, uniqueID+len(new_untracked_IDs), dtype=np.int64
+        )
+        
+        tracked_video[frame_i] = relabel_IDs(
+            lab.copy(), 
+            np.concatenate((new_untracked_IDs, frame_old_IDs)), 
+            np.concatenate((new_tracked_IDs, frame_tracked_IDs))
+        )
+        if progress_callback is not None:
+            progress_callback()
+    
+    return tracked_video
+
+def compute_overlap_matrix(
+        lab, other_lab, IDs=None, other_IDs=None, return_sparse=False
+    ):
+    """Count the number of pixels shared by every pair of objects of two
+    label arrays in a single pass (joint histogram of the label pairs).
+
+    Args:
+        lab (ndarray): 2D or 3D array of `int` type with the objects
+            corresponding to the rows of the output matrix.
+        other_lab (ndarray): Array with same shape as `lab` with the objects
+            corresponding to the columns of the output matrix.
+        IDs (list of ints, optional): IDs in `lab` in the order of the rows.
+            Include 0 to count the overlap with the background.
+            Defaults to None --> non-zero IDs in `lab` sorted ascending.
+        other_IDs (list of ints, optional): IDs in `other_lab` in the order
+            of the columns. Include 0 to count the overlap with the
+            background. Defaults to None --> non-zero IDs in `other_lab`
+            sorted ascending.
+        return_sparse (bool, optional): If True, return the overlap as a
+            `scipy.sparse.csr_matrix`. Defaults to False.
+
+    Returns:
+        tuple: A tuple `(overlap_matrix, IDs, other_IDs, other_areas)`
+            where `overlap_matrix` has shape `(len(IDs), len(other_IDs))`,
+            and `other_areas` is a 1D array with the number of pixels of
+            each object in `other_IDs`.
+    """
+    if IDs is None:
+        IDs = np.unique(lab)
+        IDs = IDs[IDs != 0]
+    if other_IDs is None:
+        other_IDs = np.unique(other_lab)
+        other_IDs = other_IDs[other_IDs != 0]
+
+    IDs_arr = np.asarray(IDs, dtype=np.int64)
+    other_IDs_arr = np.asarray(other_IDs, dtype=np.int64)
+    nrows, ncols = len(IDs_arr), len(other_IDs_arr)
+
+    rows = _map_IDs_to_indices(lab, IDs_arr)
+    cols = _map_IDs_to_indices(other_lab, other_IDs_arr)
+
+    other_areas = np.bincount(cols[cols >= 0], minlength=ncols)
+
+    is_pair_valid = (rows >= 0) & (cols >= 0)
+    keys = rows[is_pair_valid]*ncols + cols[is_pair_valid]
+
+    if nrows*ncols <= 2**25:
+        counts = np.bincount(keys, minlength=nrows*ncols)
+        nonzero_keys = np.flatnonzero(counts)
+        nonzero_counts = counts[nonzero_keys]
+    else:
+        nonzero_keys, nonzero_counts = np.unique(keys, return_counts=True)
+
+    pairs_rows, pairs_cols = np.divmod(nonzero_keys, max(ncols, 1))
+    if return_sparse:
+        import scipy.sparse
+        overlap_matrix = scipy.sparse.csr_matrix(
+            (nonzero_counts, (pairs_rows, pairs_cols)), shape=(nrows, ncols)
+        )
+    else:
+        overlap_matrix = np.zeros((nrows, ncols), dtype=np.int64)
+        overlap_matrix[pairs_rows, pairs_cols] = nonzero_counts
+
+    return overlap_matrix, IDs, other_IDs, other_areas
+
+def compute_IoA_matrix(
+        lab, prev_lab, IDs=None, prev_IDs=None, return_sparse=False
+    ):
+    """Compute the Intersection over Area (IoA) between all the objects of
+    `lab` and all the objects of `prev_lab`, where the area is the area of
+    the objects in `prev_lab`.
+
+    See `compute_overlap_matrix` for details on the arguments.
+
+    Returns:
+        tuple: A tuple `(IoA_matrix, IDs, prev_IDs)` where the rows of
+            `IoA_matrix` are the `IDs` in `lab` and the columns are the
+            `prev_IDs` in `prev_lab`.
+    """
+    overlap_matrix, IDs, prev_IDs, prev_areas = compute_overlap_matrix(
+        lab, prev_lab, IDs=IDs, other_IDs=prev_IDs,
+        return_sparse=return_sparse
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_prev_areas = np.where(prev_areas > 0, 1/prev_areas, 0.0)
+    if return_sparse:
+        import scipy.sparse
+        IoA_matrix = overlap_matrix @ scipy.sparse.diags(inv_prev_areas)
+        IoA_matrix = scipy.sparse.csr_matrix(IoA_matrix)
+    else:
+        IoA_matrix = overlap_matrix*inv_prev_areas
+    return IoA_matrix, IDs, prev_IDs
+
 def post_process_segm(labels, return_delIDs=False, **kwargs):
     min_solidity = kwargs.get('min_solidity')
     min_area = kwargs.get('min_area')
@@ -200,8 +900,8 @@ def post_process_segm(labels, return_delIDs=False, **kwargs):
                     np.count_nonzero(obj.image, axis=(1, 2)).astype(bool)
                 )
                 if obj_no_zslices < min_obj_no_zslices:
-                    labels[obj.slice][obj.image] = 0
                     delIDs.add(obj.label)
+            relabel_IDs(labels, list(delIDs), [0]*len(delIDs))
         
         for z, lab in enumerate(labels):
             _result = post_process_segm_lab2D(
@@ -231,6 +931,37 @@ def post_process_segm(labels, return_delIDs=False, **kwargs):
         labels = result
         return labels
 
+def _get_labels_area_and_axes(lab):
+    """Compute area, major and minor axis length (as defined in 
+    `skimage.measure.regionprops`) of all the objects at once from the 
+    first and second order moments of the pixels coordinates.
+    """
+    flat = lab.ravel()
+    pixels_idx = np.flatnonzero(flat)
+    IDs, inverse, areas = np.unique(
+        flat[pixels_idx], return_inverse=True, return_counts=True
+    )
+    rr, cc = np.unravel_index(pixels_idx, lab.shape)
+    rr = rr.astype(np.float64)
+    cc = cc.astype(np.float64)
+    mean_r = np.bincount(inverse, weights=rr)/areas
+    mean_c = np.bincount(inverse, weights=cc)/areas
+    # Subtract the centroid before squaring to avoid cancellation errors
+    dr = rr - mean_r[inverse]
+    dc = cc - mean_c[inverse]
+    var_r = np.bincount(inverse, weights=dr*dr)/areas
+    var_c = np.bincount(inverse, weights=dc*dc)/areas
+    cov_rc = np.bincount(inverse, weights=dr*dc)/areas
+    
+    # Eigenvalues of the 2x2 inertia tensor
+    half_trace = (var_r + var_c)/2
+    delta = np.sqrt(((var_r - var_c)/2)**2 + cov_rc**2)
+    major_eigval = np.clip(half_trace + delta, 0, None)
+    minor_eigval = np.clip(half_trace - delta, 0, None)
+    major_axis_lengths = 4*np.sqrt(major_eigval)
+    minor_axis_lengths = 4*np.sqrt(minor_eigval)
+    return IDs, areas, major_axis_lengths, minor_axis_lengths
+
 def post_process_segm_lab2D(
         lab, min_solidity=None, min_area=None, max_elongation=None,
         return_delIDs=False
@@ -238,39 +969,91 @@ def post_process_segm_lab2D(
     """
     function to remove cells with area<min_area or solidity<min_solidity
     or elongation>max_elongation
+    
+    Area and elongation are computed for all the objects at once. Solidity 
+    requires the convex hull of each object, hence it is computed only 
+    for the objects that passed the other filters and only if 
+    `min_solidity` is not None.
     """
-    rp = skimage.measure.regionprops(lab.astype(int))
-    if return_delIDs:
-        delIDs = []
-    for obj in rp:
-        if min_area is not None:
-            if obj.area < min_area:
-                lab[obj.slice][obj.image] = 0
-                if return_delIDs:
-                    delIDs.append(obj.label)
+    if min_solidity is None and min_area is None and max_elongation is None:
+        if return_delIDs:
+            return lab, []
+        else:
+            return lab
+    
+    IDs, areas, major_axis_lengths, minor_axis_lengths = (
+        _get_labels_area_and_axes(lab)
+    )
+    to_delete = np.zeros(len(IDs), dtype=bool)
+    if min_area is not None:
+        to_delete |= areas < min_area
+    
+    if max_elongation is not None:
+        # NOTE: single pixel horizontal or vertical lines minor_axis_length=0
+        elongations = major_axis_lengths/np.maximum(1, minor_axis_lengths)
+        to_delete |= elongations > max_elongation
+    
+    delIDs = IDs[to_delete].tolist()
+    
+    if min_solidity is not None:
+        remaining_IDs = set(IDs[~to_delete].tolist())
+        rp = skimage.measure.regionprops(lab.astype(int))
+        for obj in rp:
+            if obj.label not in remaining_IDs:
                 continue
-
-        if min_solidity is not None:
             if obj.solidity < min_solidity:
-                lab[obj.slice][obj.image] = 0
-                if return_delIDs:
-                    delIDs.append(obj.label)
-                continue
-
-        if max_elongation is not None:
-            # NOTE: single pixel horizontal or vertical lines minor_axis_length=0
-            minor_axis_length = max(1, obj.minor_axis_length)
-            elongation = obj.major_axis_length/minor_axis_length
-            if elongation > max_elongation:
-                lab[obj.slice][obj.image] = 0
-                if return_delIDs:
-                    delIDs.append(obj.label)
+                delIDs.append(obj.label)
+    
+    relabel_IDs(lab, delIDs, [0]*len(delIDs))
 
     if return_delIDs:
         return lab, delIDs
     else:
         return lab
 
+def post_process_segm_timelapse(
+        segm_data, post_process_func=None, max_workers=None, 
+        progress_callback=None, **kwargs
+    ):
+    """Post-process all the frames of `segm_data` in parallel threads. 
+    The frames are modified in-place.
+
+    Args:
+        segm_data (ndarray): Array of shape (T, Y, X) or (T, Z, Y, X) with 
+            the segmentation masks of each frame.
+        post_process_func (callable, optional): Function called with 
+            `(frame_i, lab)` that returns the processed `lab`. Defaults to 
+            None, i.e., `post_process_segm(lab, **kwargs)`.
+        max_workers (int, optional): Number of threads. Defaults to None, 
+            i.e., the default of `concurrent.futures.ThreadPoolExecutor`.
+        progress_callback (callable, optional): Called with no arguments 
+            every time a frame is done. Defaults to None.
+
+    Returns:
+        ndarray: The post-processed `segm_data`.
+    """
+    if post_process_func is None:
+        def post_process_func(frame_i, lab):
+            return post_process_segm(lab, **kwargs)
+    
+    def _post_process_frame(frame_i):
+        segm_data[frame_i] = post_process_func(frame_i, segm_data[frame_i])
+        return frame_i
+    
+    pbar = tqdm(total=len(segm_data), ncols=100)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(_post_process_frame, frame_i) 
+            for frame_i in range(len(segm_data))
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+            if progress_callback is not None:
+                progress_callback()
+            pbar.update()
+    pbar.close()
+    return segm_data
+
 def connect_3Dlab_zboundaries(lab):
     connected_lab = np.zeros_like(lab)
     rp = skimage.measure.regionprops(lab)
@@ -442,15 +1225,20 @@ def track_sub_cell_objects(
         cells_IDs_with_sub_obj = []
         tracked_sub_obj_original_IDs = []
         untracked_sub_objs_frame_i = set()
-        for sub_obj in rp_sub:
-            intersect_mask = lab[sub_obj.slice][sub_obj.image]
-            intersect_IDs, intersections = np.unique(
-                intersect_mask, return_counts=True
-            )
-            argmax = intersections.argmax()
-            intersect_ID = intersect_IDs[argmax]
-            intersection = intersections[argmax]
-            
+
+        # Overlap of every sub-obj with every cell (background included)
+        cells_IDs = [0, *num_objects_per_cells.keys()]
+        overlap_matrix, _, _, _ = compute_overlap_matrix(
+            lab_sub, lab, IDs=[sub_obj.label for sub_obj in rp_sub],
+            other_IDs=cells_IDs
+        )
+        sub_IDs_mapper = {}
+        for i, sub_obj in enumerate(rp_sub):
+            sub_IDs_mapper[sub_obj.label] = 0
+            argmax = overlap_matrix[i].argmax()
+            intersect_ID = cells_IDs[argmax]
+            intersection = overlap_matrix[i, argmax]
+
             if intersect_ID == 0:
                 untracked_sub_objs_frame_i.add(sub_obj.label)
                 continue
@@ -462,12 +1250,18 @@ def track_sub_cell_objects(
                 continue
             
             all_old_sub_ids[frame_i][sub_obj.label] = intersect_ID
-            tracked_lab_sub[sub_obj.slice][sub_obj.image] = intersect_ID
+            sub_IDs_mapper[sub_obj.label] = intersect_ID
             num_objects_per_cells[intersect_ID] += 1
             old_tracked_sub_obj_IDs.add(sub_obj.label)
             cells_IDs_with_sub_obj.append(intersect_ID)
             tracked_sub_obj_original_IDs.append(sub_obj.label)
         
+        # Untracked sub-objs are mapped to 0
+        tracked_lab_sub[...] = relabel_IDs(
+            lab_sub, list(sub_IDs_mapper.keys()), 
+            list(sub_IDs_mapper.values()), in_place=False
+        )
+        
         # assignments = []
         # for sub_obj_ID, cell_ID in zip(tracked_sub_obj_original_IDs, cells_IDs_with_sub_obj):
         #     assignments.append(f'  * {sub_obj_ID} --> {cell_ID}')
@@ -490,19 +1284,20 @@ def track_sub_cell_objects(
         for frame_i, lab in enumerate(tracked_cells_segm_data):
             rp = skimage.measure.regionprops(lab)
             tracked_lab = tracked_cells_segm_data[frame_i]
-            cells_IDs_with_sub_obj = all_cells_IDs_with_sub_obj[frame_i]
-            for obj in rp:
-                if obj.label in cells_IDs_with_sub_obj:
-                    # Cell has sub-object do not delete
-                    continue
-                    
-                tracked_lab[obj.slice][obj.image] = 0
+            cells_IDs_with_sub_obj = set(all_cells_IDs_with_sub_obj[frame_i])
+            delIDs = [
+                obj.label for obj in rp 
+                if obj.label not in cells_IDs_with_sub_obj
+            ]
+            relabel_IDs(tracked_lab, delIDs, [0]*len(delIDs))
     
     if how == 'only_track' or how == 'delete_cells':
         # Assign unique IDs to untracked sub-cellular objects and add them 
         # to all_old_sub_ids
         maxSubObjID = tracked_subobj_segm_data.max() + 1
-        for sub_obj_ID in np.unique(subobj_segm_data):
+        sub_obj_IDs = np.unique(subobj_segm_data).tolist()
+        untracked_IDs_mapper = {}
+        for sub_obj_ID in sub_obj_IDs:
             if sub_obj_ID == 0:
                 continue
 
@@ -510,13 +1305,26 @@ def track_sub_cell_objects(
                 # sub_obj_ID has already ben tracked
                 continue
             
-            tracked_subobj_segm_data[subobj_segm_data == sub_obj_ID] = maxSubObjID
-            
-            for frame_i, lab_sub in enumerate(subobj_segm_data):
-                if sub_obj_ID not in lab_sub:
-                    continue
-                all_old_sub_ids[frame_i][sub_obj_ID] = maxSubObjID
+            untracked_IDs_mapper[sub_obj_ID] = maxSubObjID
             maxSubObjID += 1
+        
+        # Map untracked to new unique IDs and everything else to 0
+        untracked_subobj_segm_data = relabel_IDs(
+            subobj_segm_data, sub_obj_IDs, 
+            [untracked_IDs_mapper.get(ID, 0) for ID in sub_obj_IDs],
+            in_place=False
+        )
+        untracked_mask = untracked_subobj_segm_data > 0
+        tracked_subobj_segm_data[untracked_mask] = (
+            untracked_subobj_segm_data[untracked_mask]
+        )
+        
+        for frame_i, lab_sub in enumerate(subobj_segm_data):
+            for sub_obj_ID in np.unique(lab_sub).tolist():
+                newID = untracked_IDs_mapper.get(sub_obj_ID)
+                if newID is None:
+                    continue
+                all_old_sub_ids[frame_i][sub_obj_ID] = newID
 
     if SizeT == 1:
         tracked_subobj_segm_data = tracked_subobj_segm_data[0]
@@ -705,6 +1513,173 @@ def get_obj_contours(
         contour += [min_x, min_y]
     return contour
 
+def _get_enclosed_holes_owners(lab):
+    # Background regions not touching the border are holes. Holes enclosed 
+    # by a single object are returned with the ID of that object
+    # (drawing external contours ignores the contour of these holes)
+    holes_lab, num_holes = scipy.ndimage.label(lab == 0)
+    if num_holes == 0:
+        return holes_lab, np.zeros(1, dtype=lab.dtype)
+    
+    border_holes = np.unique(np.concatenate((
+        holes_lab[0], holes_lab[-1], holes_lab[:, 0], holes_lab[:, -1]
+    )))
+    is_enclosed = np.ones(num_holes+1, dtype=bool)
+    is_enclosed[border_holes] = False
+    is_enclosed[0] = False
+    
+    # Pairs of (hole, neighbouring ID) for the 4-connected neighbours
+    pairs = []
+    for hole_sl, lab_sl in (
+            ((slice(1, None), slice(None)), (slice(None, -1), slice(None))),
+            ((slice(None, -1), slice(None)), (slice(1, None), slice(None))),
+            ((slice(None), slice(1, None)), (slice(None), slice(None, -1))),
+            ((slice(None), slice(None, -1)), (slice(None), slice(1, None)))
+        ):
+        holes_shifted = holes_lab[hole_sl]
+        lab_shifted = lab[lab_sl]
+        mask = is_enclosed[holes_shifted] & (lab_shifted > 0)
+        pairs.append(np.column_stack(
+            (holes_shifted[mask], lab_shifted[mask])
+        ))
+    pairs = np.unique(np.concatenate(pairs), axis=0)
+    holes, num_neigh_IDs = np.unique(pairs[:, 0], return_counts=True)
+    
+    owners = np.zeros(num_holes+1, dtype=lab.dtype)
+    single_owner_holes = holes[num_neigh_IDs == 1]
+    is_single_owner = np.isin(pairs[:, 0], single_owner_holes)
+    owners[pairs[is_single_owner, 0]] = pairs[is_single_owner, 1]
+    return holes_lab, owners
+
+def get_labels_contours_mask(lab):
+    """Get the external contours of all the objects in `lab` in one pass.
+
+    The result is the same as drawing the contours returned by 
+    `get_obj_contours(obj, all_external=True)` of every object with 
+    thickness 1, i.e., the pixels of each object that have at least one 
+    4-connected neighbour with a different ID (or outside of the image), 
+    excluding the contours of the holes inside the objects. The only 
+    difference is that the contour of an object along another object 
+    entirely enclosed by it is also included.
+
+    Parameters
+    ----------
+    lab : (Y, X) numpy.ndarray of ints
+        Labelled 2D image.
+
+    Returns
+    -------
+    (Y, X) numpy.ndarray of bools
+        Mask with True on the contours of the objects.
+    """
+    if not np.any(lab):
+        return np.zeros(lab.shape, dtype=bool)
+    
+    holes_lab, owners = _get_enclosed_holes_owners(lab)
+    filled_lab = np.where(lab > 0, lab, owners[holes_lab])
+    
+    padded = np.pad(filled_lab, 1)
+    center = padded[1:-1, 1:-1]
+    contours_mask = (
+        (center != padded[:-2, 1:-1]) | (center != padded[2:, 1:-1])
+        | (center != padded[1:-1, :-2]) | (center != padded[1:-1, 2:])
+    )
+    contours_mask &= lab > 0
+    return contours_mask
+
+class ObjContoursCache:
+    """Cache of the external contours of every object of labelled 2D 
+    images (see `get_obj_contours` with `all_external=True`) and of their 
+    mask with thickness 1 (see `get_labels_contours_mask`).
+
+    Images are identified by a key (e.g., (pos_i, frame_i, z)) and a 
+    version (e.g., the mutation counter of `RegionpropsCache`). Cached 
+    results are valid as long as the version of the key does not change, 
+    the labels are never compared with the cached ones. At most `max_size` 
+    images are cached (least recently used are dropped first).
+    """
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._cache = OrderedDict()
+    
+    def _compute_contours(self, lab):
+        if lab.max(initial=0) >= 2**24:
+            # Huge IDs --> avoid the list of slices of `find_objects`
+            return {
+                obj.label: get_obj_contours(obj, all_external=True) 
+                for obj in skimage.measure.regionprops(lab)
+            }
+        
+        contours = {}
+        objs_slices = scipy.ndimage.find_objects(lab)
+        for ID, obj_slice in enumerate(objs_slices, start=1):
+            if obj_slice is None:
+                continue
+            obj_image = (lab[obj_slice] == ID).astype(np.uint8)
+            obj_bbox = (
+                obj_slice[0].start, obj_slice[1].start, 
+                obj_slice[0].stop, obj_slice[1].stop
+            )
+            contours[ID] = get_obj_contours(
+                obj_image=obj_image, obj_bbox=obj_bbox, all_external=True
+            )
+        return contours
+    
+    def _get_entry(self, key, version):
+        entry = self._cache.get(key)
+        if entry is None or entry['version'] != version:
+            entry = {'version': version}
+            self._cache[key] = entry
+        
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return entry
+    
+    def get_contours(self, lab, key, version=0):
+        """Get the contours of all the objects in `lab`.
+
+        Parameters
+        ----------
+        lab : (Y, X) numpy.ndarray of ints
+            Labelled 2D image.
+        key : hashable
+            Identifier of `lab`, e.g. (pos_i, frame_i, z).
+        version : int, optional
+            Mutation counter of `lab` (e.g., `RegionpropsCache.version`). 
+            The contours are recomputed when it changes. Default is 0
+
+        Returns
+        -------
+        dict
+            Dictionary of {ID: list of (N, 2) arrays of (x, y) contours 
+            coordinates}.
+        """
+        entry = self._get_entry(key, version)
+        contours = entry.get('contours')
+        if contours is None:
+            contours = self._compute_contours(lab)
+            entry['contours'] = contours
+        return contours
+    
+    def get_contours_mask(self, lab, key, version=0):
+        """Get `get_labels_contours_mask(lab)` computed only once until 
+        `version` changes (see `get_contours` for the parameters).
+        """
+        entry = self._get_entry(key, version)
+        contours_mask = entry.get('contours_mask')
+        if contours_mask is None:
+            contours_mask = get_labels_contours_mask(lab)
+            entry['contours_mask'] = contours_mask
+        return contours_mask
+    
+    def invalidate(self, key=None):
+        """Remove `key` from the cache (or all of the keys if None)."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
 def smooth_contours(lab, radius=2):
     sigma = 2*radius + 1
     smooth_lab = np.zeros_like(lab)
@@ -832,142 +1807,162 @@ def getBaseCca_df(IDs, with_tree_cols=False):
     cca_df.index.name = 'Cell_ID'
     return cca_df
 
-def apply_tracking_from_table(
-        segmData, trackColsInfo, src_df, signal=None, logger=print, 
-        pbarMax=None, debug=False
+def _get_tracking_table_frame_mapping(
+        lab, df_frame, trackIDsCol, maskIDsCol, xCentroidCol, yCentroidCol, 
+        deleteUntrackedIDs
     ):
-    frameIndexCol = trackColsInfo['frameIndexCol']
-
-    if trackColsInfo['isFirstFrameOne']:
-        # Zeroize frames since first frame starts at 1
-        src_df[frameIndexCol] = src_df[frameIndexCol] - 1
+    """Build the complete old --> new IDs mapping of one frame from the 
+    rows of the tracking table.
 
-    logger('Applying tracking info...')  
-
-    grouped = src_df.groupby(frameIndexCol)
-    iterable = grouped if signal is not None else tqdm(grouped, ncols=100)
-    trackIDsCol = trackColsInfo['trackIDsCol']
-    maskIDsCol = trackColsInfo['maskIDsCol']
-    xCentroidCol = trackColsInfo['xCentroidCol']
-    yCentroidCol = trackColsInfo['yCentroidCol']
-    deleteUntrackedIDs = trackColsInfo['deleteUntrackedIDs']
-    trackedIDsMapper = {}
-    deleteIDsMapper = {}
-
-    for frame_i, df_frame in iterable:
-        if frame_i == len(segmData):
-            print('')
-            logger(
-                '[WARNING]: segmentation data has less frames than the '
-                f'frames in the "{frameIndexCol}" column.'
-            )
-            if signal is not None and pbarMax is not None:
-                signal.emit(pbarMax-frame_i)
-            break
-
-        lab = segmData[frame_i]
-        if debug:
-            origLab = segmData[frame_i].copy()
-
-        maxTrackID = df_frame[trackIDsCol].max()
-        trackIDs = df_frame[trackIDsCol].values
-
-        # print('')
-        # print('='*40)
-        # print(f'Unique IDs = {np.unique(lab)}')
-        # if xCentroidCol == 'None':
-        #     print(f'Mask IDs = {df_frame[maskIDsCol].values}')
-        # print(f'Frame_i = {frame_i}')
+    Tracked objects are mapped to their tracked ID. Existing objects whose 
+    ID is one of the tracked IDs but that are not tracked themselves are 
+    moved to unique IDs in one offset pass (see `first_pass` of the 
+    mapper returned by `apply_tracking_from_table`).
+    """
+    IDs = np.unique(lab)
+    IDs = IDs[IDs > 0]
+    
+    trackIDs = df_frame[trackIDsCol].to_numpy(dtype=float)
+    if xCentroidCol == 'None':
+        maskIDs = df_frame[maskIDsCol].to_numpy(dtype=float)
+    else:
+        yx = df_frame[[yCentroidCol, xCentroidCol]].to_numpy(dtype=float)
+        is_valid = ~np.isnan(yx).any(axis=1)
+        maskIDs = np.zeros(len(yx), dtype=float)
+        maskIDs[is_valid] = get_IDs_at_points(lab, np.round(yx[is_valid]))
+    
+    deleteIDs = np.zeros(0, dtype=np.int64)
+    if deleteUntrackedIDs:
+        maskIDsTracked = np.round(maskIDs[~np.isnan(maskIDs)])
+        deleteIDs = IDs[~np.isin(IDs, maskIDsTracked)]
+        IDs = IDs[np.isin(IDs, maskIDsTracked)]
+    
+    is_valid = (
+        ~np.isnan(trackIDs) & ~np.isnan(maskIDs) & np.isin(maskIDs, IDs)
+    )
+    maskIDs = maskIDs[is_valid].astype(np.int64)
+    trackIDs = trackIDs[is_valid].astype(np.int64)
+    
+    # If a mask ID is present more than once only the first row is used
+    maskIDs, first_idx = np.unique(maskIDs, return_index=True)
+    trackIDs = trackIDs[first_idx]
+    
+    is_relabelled = maskIDs != trackIDs
+    secondPassMapper = dict(zip(
+        maskIDs[is_relabelled].tolist(), trackIDs[is_relabelled].tolist()
+    ))
+    
+    # Existing IDs that are tracked IDs of other objects
+    collidingIDs = IDs[
+        np.isin(IDs, trackIDs[is_relabelled]) & ~np.isin(IDs, maskIDs)
+    ]
+    maxID = max(
+        int(IDs.max(initial=0)), int(trackIDs.max(initial=0)), 
+        int(df_frame[trackIDsCol].max(skipna=True)) 
+        if df_frame[trackIDsCol].notna().any() else 0
+    )
+    uniqueIDs = np.arange(maxID+1, maxID+1+len(collidingIDs), dtype=np.int64)
+    firstPassMapper = dict(zip(collidingIDs.tolist(), uniqueIDs.tolist()))
+    
+    oldIDs = np.concatenate((
+        deleteIDs, collidingIDs, maskIDs[is_relabelled]
+    ))
+    newIDs = np.concatenate((
+        np.zeros(len(deleteIDs), dtype=np.int64), uniqueIDs, 
+        trackIDs[is_relabelled]
+    ))
+    return (
+        oldIDs, newIDs, firstPassMapper, secondPassMapper, 
+        deleteIDs.tolist()
+    )
 
-        deleteIDs = []
-        if deleteUntrackedIDs:
-            if xCentroidCol == 'None':
-                maskIDsTracked = df_frame[maskIDsCol].dropna().apply(round).values
-            else:
-                xx = df_frame[xCentroidCol].dropna().apply(round).values
-                yy = df_frame[yCentroidCol].dropna().apply(round).values
-                maskIDsTracked = lab[yy, xx]
-            for obj in skimage.measure.regionprops(lab):
-                if obj.label in maskIDsTracked:
-                    continue
-                lab[obj.slice][obj.image] = 0
-                deleteIDs.append(obj.label)
-
-        if deleteIDs:
-            deleteIDsMapper[str(frame_i)] = deleteIDs
-
-        firstPassMapper_i = {}
-        # First iterate IDs and make sure there are no overlapping IDs
-        for row in df_frame.itertuples():
-            trackedID = getattr(row, trackIDsCol)
-            if xCentroidCol == 'None':
-                maskID = getattr(row, maskIDsCol)
-            else:
-                xc = getattr(row, xCentroidCol)
-                yc = getattr(row, yCentroidCol)
-                maskID = lab[round(yc), round(xc)]
-            
-            if not maskID > 0:
-                continue
-            
-            if maskID == trackedID:
-                continue
+def apply_tracking_from_table(
+        segmData, trackColsInfo, src_df, signal=None, logger=print, 
+        pbarMax=None, debug=False, max_workers=4
+    ):
+    """Relabel `segmData` in place according to a table with tracking 
+    information (e.g., from a CSV file or from a TrackMate XML file).
 
-            if trackedID == 0:
-                continue
+    For every frame the complete old --> new IDs mapping is built first 
+    (see `_get_tracking_table_frame_mapping`) and then applied with one 
+    lookup table pass (see `relabel_IDs`). Frames are processed in 
+    parallel with `max_workers` threads.
 
-            if trackedID not in lab:
-                continue
+    Returns
+    -------
+    tuple
+        The tracked `segmData`, the `trackedIDsMapper` with 
+        {'frame_i': {'first_pass': {ID: uniqueID}, 'second_pass': 
+        {maskID: trackedID}}} and the `deleteIDsMapper` with 
+        {'frame_i': deletedIDs}.
+    """
+    frameIndexCol = trackColsInfo['frameIndexCol']
 
-            # Assign unique ID to existing tracked ID
-            uniqueID = lab.max() + 1
-            if uniqueID in trackIDs:
-                uniqueID = maxTrackID + 1
-                maxTrackID += 1
-            
-            lab[lab==trackedID] = uniqueID
-            firstPassMapper_i[int(trackedID)] = int(uniqueID)
-            if xCentroidCol == 'None':
-                mask = df_frame[maskIDsCol]==trackedID
-                df_frame.loc[mask, maskIDsCol] = int(uniqueID)
-            
-            # print(f'First = {int(trackedID)} --> {int(uniqueID)}')
+    if trackColsInfo['isFirstFrameOne']:
+        # Zeroize frames since first frame starts at 1
+        src_df[frameIndexCol] = src_df[frameIndexCol] - 1
 
-        if firstPassMapper_i:
-            trackedIDsMapper[str(frame_i)] = {'first_pass': firstPassMapper_i}
+    logger('Applying tracking info...')  
 
-        secondPassMapper_i = {}
-        for row in df_frame.itertuples():
-            trackedID = getattr(row, trackIDsCol)
-            if xCentroidCol == 'None':
-                maskID = getattr(row, maskIDsCol)
-            else:
-                xc = getattr(row, xCentroidCol)
-                yc = getattr(row, yCentroidCol)
-                maskID = lab[round(yc), round(xc)]
-            
-            if not maskID > 0:
-                continue
+    trackIDsCol = trackColsInfo['trackIDsCol']
+    maskIDsCol = trackColsInfo['maskIDsCol']
+    xCentroidCol = trackColsInfo['xCentroidCol']
+    yCentroidCol = trackColsInfo['yCentroidCol']
+    deleteUntrackedIDs = trackColsInfo['deleteUntrackedIDs']
+    trackedIDsMapper = {}
+    deleteIDsMapper = {}
+    
+    grouped = list(src_df.groupby(frameIndexCol))
+    numFramesTable = len(grouped)
+    grouped = [
+        (frame_i, df_frame) for frame_i, df_frame in grouped 
+        if frame_i < len(segmData)
+    ]
+    if len(grouped) < numFramesTable:
+        logger(
+            '[WARNING]: segmentation data has less frames than the '
+            f'frames in the "{frameIndexCol}" column.'
+        )
+        if signal is not None and pbarMax is not None:
+            signal.emit(numFramesTable-len(grouped))
+    
+    def relabel_frame(frame_i, df_frame):
+        lab = segmData[int(frame_i)]
+        mapping = _get_tracking_table_frame_mapping(
+            lab, df_frame, trackIDsCol, maskIDsCol, xCentroidCol, 
+            yCentroidCol, deleteUntrackedIDs
+        )
+        oldIDs, newIDs = mapping[:2]
+        relabel_IDs(lab, oldIDs, newIDs, in_place=True)
+        return mapping[2:]
+    
+    pbar = tqdm(total=len(grouped), ncols=100) if signal is None else None
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = {
+            executor.submit(relabel_frame, frame_i, df_frame): frame_i
+            for frame_i, df_frame in grouped
+        }
+        for future in concurrent.futures.as_completed(futures):
+            frame_i = futures[future]
+            firstPassMapper_i, secondPassMapper_i, deleteIDs = future.result()
+            if deleteIDs:
+                deleteIDsMapper[str(frame_i)] = deleteIDs
             
-            if maskID == trackedID:
-                continue
-
-            lab[lab==maskID] = trackedID
-            secondPassMapper_i[int(maskID)] = int(trackedID)   
-
-            # print(f'Second = {int(maskID)} --> {int(trackedID)}')    
-        
-        if secondPassMapper_i:
+            frameMapper = {}
             if firstPassMapper_i:
-                trackedIDsMapper[str(frame_i)]['second_pass'] = secondPassMapper_i
+                frameMapper['first_pass'] = firstPassMapper_i
+            if secondPassMapper_i:
+                frameMapper['second_pass'] = secondPassMapper_i
+            if frameMapper:
+                trackedIDsMapper[str(frame_i)] = frameMapper
+            
+            if signal is not None:
+                signal.emit(1)
             else:
-                trackedIDsMapper[str(frame_i)] = {'second_pass': secondPassMapper_i}
-
-        if signal is not None:
-            signal.emit(1)
-
-        # print('*'*40)
-        # import pdb; pdb.set_trace()
+                pbar.update()
+    
+    if pbar is not None:
+        pbar.close()
   
     return segmData, trackedIDsMapper, deleteIDsMapper
 
@@ -1200,6 +2195,415 @@ def cca_df_to_acdc_df(cca_df, rp, acdc_df=None):
     acdc_df = acdc_df.join(cca_df, how='left')
     return acdc_df
 
+def get_obj_contour_2D(obj):
+    """Outer contour (x, y coordinates) of an object. For 3D objects the
+    contour of the max projection is returned. Returns None if the contour
+    cannot be computed.
+    """
+    obj_image = obj.image
+    obj_bbox = obj.bbox
+    if obj_image.ndim == 3:
+        obj_image = obj_image.max(axis=0)
+        obj_bbox = (obj_bbox[1], obj_bbox[2], obj_bbox[4], obj_bbox[5])
+    try:
+        return get_obj_contours(
+            obj_image=obj_image.astype(np.uint8), obj_bbox=obj_bbox
+        )
+    except Exception as err:
+        return
+
+def _get_contours_bboxes(contours):
+    bboxes = np.full((len(contours), 4), np.nan)
+    for i, contour in enumerate(contours):
+        if contour is None or len(contour) == 0:
+            continue
+        bboxes[i, :2] = contour.min(axis=0)
+        bboxes[i, 2:] = contour.max(axis=0)
+    return bboxes
+
+def compute_bud_mother_cost_matrix(
+        mothers_contours, buds_contours, max_dist=None
+    ):
+    """Compute the cost of assigning each bud to each mother as the minimum
+    distance between their contours.
+
+    The boundary points of each bud are indexed with a KD-tree and each
+    mother contour is queried against it (O(N log M) instead of the O(N*M)
+    of the all pairs distance). Pairs whose bounding boxes are further
+    apart than `max_dist` are not queried.
+
+    Parameters
+    ----------
+    mothers_contours : list of (N, 2) numpy.ndarray or None
+        Contours of the candidate mothers (see `get_obj_contour_2D`).
+    buds_contours : list of (M, 2) numpy.ndarray or None
+        Contours of the new buds.
+    max_dist : float, optional
+        Maximum distance between a bud and its mother. Pairs further apart
+        get infinite cost. If None, all pairs are considered.
+        Default is None
+
+    Returns
+    -------
+    (len(mothers_contours), len(buds_contours)) numpy.ndarray
+        Cost matrix. Rows are mothers and columns are buds.
+    """
+    from scipy.spatial import cKDTree
+
+    cost = np.full((len(mothers_contours), len(buds_contours)), np.inf)
+    if cost.size == 0:
+        return cost
+
+    # Lower bound of the contours distance from the bounding boxes gap
+    mothers_bboxes = _get_contours_bboxes(mothers_contours)
+    buds_bboxes = _get_contours_bboxes(buds_contours)
+    gap_min = buds_bboxes[np.newaxis, :, :2] - mothers_bboxes[:, np.newaxis, 2:]
+    gap_max = mothers_bboxes[:, np.newaxis, :2] - buds_bboxes[np.newaxis, :, 2:]
+    gap = np.maximum(np.maximum(gap_min, gap_max), 0)
+    bboxes_dist = np.sqrt((gap**2).sum(axis=2))
+
+    if max_dist is None:
+        max_dist = np.inf
+
+    # NaN bboxes_dist (missing contours) are excluded by the comparison
+    candidates = bboxes_dist <= max_dist
+    for j, bud_contour in enumerate(buds_contours):
+        mothers_idxs = np.nonzero(candidates[:, j])[0]
+        if len(mothers_idxs) == 0:
+            continue
+        bud_tree = cKDTree(bud_contour)
+        for i in mothers_idxs:
+            dist, _ = bud_tree.query(
+                mothers_contours[i], k=1, distance_upper_bound=max_dist
+            )
+            cost[i, j] = dist.min()
+    return cost
+
+def assign_buds_to_mothers(cost, mothers_IDs, buds_IDs):
+    """Assign each bud to a mother minimizing the total cost with scipy
+    linear sum assignment (Hungarian or Munkres algorithm).
+
+    Parameters
+    ----------
+    cost : (len(mothers_IDs), len(buds_IDs)) numpy.ndarray
+        Cost matrix (see `compute_bud_mother_cost_matrix`).
+    mothers_IDs : list of int
+        IDs of the candidate mothers.
+    buds_IDs : list of int
+        IDs of the buds.
+
+    Returns
+    -------
+    list of (int, int)
+        List of (mother ID, bud ID). Buds that cannot be assigned (more
+        buds than mothers or infinite cost with all the mothers) are not
+        in the list.
+    """
+    import scipy.optimize
+
+    if cost.size == 0:
+        return []
+
+    is_finite = np.isfinite(cost)
+    if not is_finite.any():
+        return []
+
+    # Infinite costs make the assignment unfeasible --> replace them with
+    # a cost higher than any feasible assignment
+    max_cost = cost[is_finite].max()
+    penalty = (max_cost + 1)*(min(cost.shape) + 1)
+    finite_cost = np.where(is_finite, cost, penalty)
+    row_idx, col_idx = scipy.optimize.linear_sum_assignment(finite_cost)
+    assignments = [
+        (mothers_IDs[i], buds_IDs[j]) for i, j in zip(row_idx, col_idx)
+        if is_finite[i, j]
+    ]
+    return assignments
+
+def annotate_bud_mother_assignments(
+        cca_df, assignments, frame_i, prev_cca_df=None
+    ):
+    """Write the bud-mother assignments in `cca_df` (modified in place).
+
+    Parameters
+    ----------
+    cca_df : pd.DataFrame
+        Cell cycle annotations of frame `frame_i` (index is Cell_ID).
+    assignments : list of (int, int)
+        List of (mother ID, bud ID) (see `assign_buds_to_mothers`).
+    frame_i : int
+        Frame index where the buds emerged.
+    prev_cca_df : pd.DataFrame, optional
+        Cell cycle annotations of the previous frame. If provided and a bud
+        was already assigned to another mother, the annotations of that
+        mother are restored from `prev_cca_df`. Default is None
+    """
+    for mothID, budID in assignments:
+        # If we are repeating assignment for the bud then we also have to
+        # correct the possibily wrong mother first
+        if budID in cca_df.index and prev_cca_df is not None:
+            relID = cca_df.at[budID, 'relative_ID']
+            if relID in prev_cca_df.index:
+                cca_df.loc[relID] = prev_cca_df.loc[relID]
+
+        cca_df.at[mothID, 'relative_ID'] = budID
+        cca_df.at[mothID, 'cell_cycle_stage'] = 'S'
+
+        bud_cca_dict = base_cca_dict.copy()
+        bud_cca_dict['cell_cycle_stage'] = 'S'
+        bud_cca_dict['generation_num'] = 0
+        bud_cca_dict['relative_ID'] = mothID
+        bud_cca_dict['relationship'] = 'bud'
+        bud_cca_dict['emerg_frame_i'] = frame_i
+        bud_cca_dict['is_history_known'] = True
+        bud_cca_dict['corrected_assignment'] = False
+        cca_df.loc[budID] = pd.Series(bud_cca_dict)
+    return cca_df
+
+def _annotate_division_disappeared_relative(
+        cca_dfs, cca_df, ID, IDgone, frame_i
+    ):
+    # Same annotations as the GUI when accepting automatic division of the 
+    # cells in S whose relative disappeared (see `guiWin.checkScellsGone`): 
+    # division is annotated at the previous frame and the past frames of 
+    # the cell cycle are flagged. `cca_dfs` are modified in place.
+    prev_cca_df = cca_dfs[-1]
+    gen_num = prev_cca_df.at[ID, 'generation_num']
+    for past_cca_df in reversed(cca_dfs[:-1]):
+        if ID not in past_cca_df.index:
+            # ID is a bud and it did not emerge yet here
+            break
+        if past_cca_df.at[ID, 'generation_num'] != gen_num:
+            # The cell cycle is finished here
+            break
+        past_cca_df.at[ID, 'will_divide'] = 1
+        past_cca_df.at[ID, 'daughter_disappears_before_division'] = 1
+        if IDgone in past_cca_df.index:
+            past_cca_df.at[IDgone, 'will_divide'] = 1
+            past_cca_df.at[IDgone, 'disappears_before_division'] = 1
+
+    division_IDs = [ID]
+    if IDgone in prev_cca_df.index:
+        division_IDs.append(IDgone)
+    division_frame_i = frame_i-1
+    prev_cca_df.loc[division_IDs, 'cell_cycle_stage'] = 'G1'
+    if division_frame_i > 0:
+        gen_nums = prev_cca_df.loc[division_IDs, 'generation_num']
+        prev_cca_df.loc[division_IDs, 'generation_num'] = gen_nums + 1
+        prev_cca_df.loc[division_IDs, 'division_frame_i'] = division_frame_i
+        # The cell with the lower generation number was the bud
+        budID = gen_nums.idxmin() if len(division_IDs) > 1 else ID
+        prev_cca_df.at[budID, 'relationship'] = 'mother'
+    else:
+        prev_cca_df.loc[division_IDs, 'generation_num'] = 2
+        prev_cca_df.loc[division_IDs, 'division_frame_i'] = -1
+        prev_cca_df.loc[division_IDs, 'relationship'] = 'mother'
+
+    cca_df.loc[ID] = prev_cca_df.loc[ID]
+
+def auto_cca_annotate_video(
+        segm_data, first_frame_cca_df=None, max_bud_mother_dist=None,
+        logger_func=printl, progress_callback=None
+    ):
+    """Automatically annotate bud-mother assignments over a tracked
+    timelapse without the GUI.
+
+    For every frame, the new objects are considered buds and they are
+    assigned to the cells in G1 at the previous frame by minimizing the
+    total contour distance (see `compute_bud_mother_cost_matrix`).
+    Objects that reappear get back their last annotations. If a bud or a
+    mother in S phase disappears, division is annotated on the other cell
+    (as the GUI does when accepting automatic division). New objects that
+    cannot be assigned (not enough cells in G1 or all of them further than
+    `max_bud_mother_dist`) are annotated as cells in G1 with unknown
+    history. Division of cells that are still present must be annotated
+    manually.
+
+    Parameters
+    ----------
+    segm_data : (T, Y, X) or (T, Z, Y, X) numpy.ndarray of ints
+        Tracked segmentation masks.
+    first_frame_cca_df : pd.DataFrame, optional
+        Cell cycle annotations of the first frame (index is Cell_ID). If
+        None, all the cells of the first frame are annotated as cells in
+        G1 with unknown history. Default is None
+    max_bud_mother_dist : float, optional
+        Maximum distance in pixels between a bud and its mother. If None,
+        there is no limit. Default is None
+    logger_func : callable, optional
+        Function used to log warnings. Default is `printl`
+    progress_callback : callable, optional
+        Called with no arguments after every frame. Default is None
+
+    Returns
+    -------
+    pd.DataFrame
+        Cell cycle annotations with ['frame_i', 'Cell_ID'] as index.
+    """
+    cca_dfs = []
+    last_seen_cca = {}
+    prev_cca_df = None
+    for frame_i, lab in enumerate(tqdm(segm_data, ncols=100)):
+        rp = skimage.measure.regionprops(lab)
+        IDs = [obj.label for obj in rp]
+        if prev_cca_df is None:
+            if first_frame_cca_df is None:
+                cca_df = getBaseCca_df(IDs)
+            else:
+                cca_df = first_frame_cca_df[cca_df_colnames].copy()
+                missing_IDs = [ID for ID in IDs if ID not in cca_df.index]
+                cca_df = pd.concat([cca_df, getBaseCca_df(missing_IDs)])
+                cca_df = cca_df.loc[IDs]
+        else:
+            IDs_set = set(IDs)
+            cca_df = prev_cca_df[prev_cca_df.index.isin(IDs_set)].copy()
+
+            # Cells in S whose relative disappeared --> annotate division
+            for ID, relID in cca_df[['relative_ID']].itertuples():
+                if cca_df.at[ID, 'cell_cycle_stage'] != 'S':
+                    continue
+                if relID == -1 or relID in IDs_set:
+                    continue
+                _annotate_division_disappeared_relative(
+                    cca_dfs, cca_df, ID, relID, frame_i
+                )
+                if relID in prev_cca_df.index:
+                    last_seen_cca[relID] = prev_cca_df.loc[relID]
+
+            # Objects that reappear get back their last annotations
+            reappeared = [
+                last_seen_cca[ID] for ID in IDs
+                if ID not in cca_df.index and ID in last_seen_cca
+            ]
+            if reappeared:
+                cca_df = pd.concat([cca_df, pd.DataFrame(reappeared)])
+
+            new_IDs = [ID for ID in IDs if ID not in cca_df.index]
+            mothers_IDs = [
+                ID for ID in cca_df.index
+                if cca_df.at[ID, 'cell_cycle_stage'] == 'G1'
+                and ID in prev_cca_df.index
+            ]
+
+            objs = {obj.label: obj for obj in rp}
+            mothers_contours = [
+                get_obj_contour_2D(objs[ID]) for ID in mothers_IDs
+            ]
+            buds_contours = [get_obj_contour_2D(objs[ID]) for ID in new_IDs]
+            cost = compute_bud_mother_cost_matrix(
+                mothers_contours, buds_contours, max_dist=max_bud_mother_dist
+            )
+            assignments = assign_buds_to_mothers(cost, mothers_IDs, new_IDs)
+            annotate_bud_mother_assignments(cca_df, assignments, frame_i)
+
+            assigned_buds_IDs = {budID for _, budID in assignments}
+            unassigned_IDs = [
+                ID for ID in new_IDs if ID not in assigned_buds_IDs
+            ]
+            if unassigned_IDs:
+                logger_func(
+                    f'[WARNING]: Frame n. {frame_i+1}: the new objects '
+                    f'{unassigned_IDs} could not be assigned to any mother '
+                    'cell. They will be annotated as cells in G1 with '
+                    'unknown history.'
+                )
+                for ID in unassigned_IDs:
+                    cca_df.loc[ID] = pd.Series(base_cca_dict)
+
+            cca_df = cca_df.loc[IDs]
+
+        cca_df.index.name = 'Cell_ID'
+        for ID, row in cca_df.iterrows():
+            last_seen_cca[ID] = row
+        cca_dfs.append(cca_df)
+        prev_cca_df = cca_df
+        if progress_callback is not None:
+            progress_callback()
+
+    if not cca_dfs:
+        return
+
+    keys = list(range(len(cca_dfs)))
+    cca_df_video = pd.concat(cca_dfs, keys=keys, names=['frame_i'])
+    return cca_df_video
+
+def auto_cca_annotate_position(
+        images_path, segm_endname='segm', max_bud_mother_dist=None,
+        logger_func=printl
+    ):
+    """Run `auto_cca_annotate_video` on the segmentation file of a Position
+    folder and save the annotations in the acdc_output table linked to it.
+
+    Parameters
+    ----------
+    images_path : str
+        Path of the Images folder of the Position.
+    segm_endname : str, optional
+        End of the segmentation filename (without extension). The table is
+        saved in the file with the same end name where 'segm' is replaced
+        by 'acdc_output'. Default is 'segm'
+    max_bud_mother_dist : float, optional
+        See `auto_cca_annotate_video`. Default is None
+    logger_func : callable, optional
+        Function used to log progress. Default is `printl`
+
+    Returns
+    -------
+    str
+        Path of the saved acdc_output table.
+    """
+    segm_data, segm_filepath = load.load_segm_file(
+        images_path, end_name_segm_file=segm_endname, return_path=True
+    )
+    if segm_data is None:
+        raise FileNotFoundError(
+            f'Segmentation file ending with "{segm_endname}" not found in '
+            f'"{images_path}"'
+        )
+
+    acdc_output_endname = segm_endname.replace('segm', 'acdc_output')
+    acdc_df, acdc_df_filepath = load.load_acdc_df_file(
+        images_path, end_name_acdc_df_file=acdc_output_endname,
+        return_path=True
+    )
+    if segm_data.ndim == 2:
+        # Single frame. NOTE: 3D arrays are considered (T, Y, X) timelapses
+        segm_data = segm_data[np.newaxis]
+
+    first_frame_cca_df = None
+    if acdc_df is not None:
+        acdc_df = acdc_df.set_index(['frame_i', 'Cell_ID'])
+        if 'cell_cycle_stage' in acdc_df.columns:
+            first_frame_df = acdc_df.loc[0]
+            if first_frame_df['cell_cycle_stage'].notna().all():
+                first_frame_cca_df = first_frame_df[cca_df_colnames]
+    else:
+        basename = os.path.basename(segm_filepath)[:-len(f'{segm_endname}.npz')]
+        acdc_df_filepath = os.path.join(
+            images_path, f'{basename}{acdc_output_endname}.csv'
+        )
+
+    logger_func(f'Annotating cell cycle of "{segm_filepath}"...')
+    cca_df = auto_cca_annotate_video(
+        segm_data, first_frame_cca_df=first_frame_cca_df,
+        max_bud_mother_dist=max_bud_mother_dist, logger_func=logger_func
+    )
+    if acdc_df is None:
+        acdc_dfs = []
+        for frame_i, lab in enumerate(segm_data):
+            rp = skimage.measure.regionprops(lab)
+            acdc_dfs.append(cca_df_to_acdc_df(cca_df.loc[frame_i], rp))
+        acdc_df = pd.concat(
+            acdc_dfs, keys=range(len(acdc_dfs)), names=['frame_i']
+        )
+    else:
+        acdc_df = acdc_df.drop(columns=cca_df_colnames, errors='ignore')
+        acdc_df = acdc_df.join(cca_df, how='left')
+
+    logger_func(f'Saving "{acdc_df_filepath}"...')
+    load.save_acdc_df_file(acdc_df, acdc_df_filepath)
+    return acdc_df_filepath
+
 class LineageTree:
     def __init__(self, acdc_df, logging_func=print) -> None:
         acdc_df = load.pd_bool_to_int(acdc_df).reset_index()
@@ -1619,6 +3023,45 @@ def segm_model_segment(model, image, model_kwargs, frame_i=None):
         lab = model.segment(image, frame_i, **model_kwargs)
     return lab
 
+def iter_prefetched(iterable, maxsize=2):
+    """Iterate `iterable` in a background thread keeping at most `maxsize` 
+    items ready. Use this to overlap I/O and preprocessing with the 
+    processing of the items in the main thread. Exceptions raised while 
+    iterating are re-raised in the main thread.
+    """
+    items_queue = queue.Queue(maxsize=maxsize)
+    sentinel = object()
+    stop_event = threading.Event()
+
+    def _producer():
+        try:
+            for item in iterable:
+                if stop_event.is_set():
+                    return
+                items_queue.put(item)
+        except Exception as error:
+            items_queue.put(error)
+        items_queue.put(sentinel)
+    
+    thread = threading.Thread(target=_producer, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items_queue.get()
+            if item is sentinel:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop_event.set()
+        # Unblock the producer if it is waiting on a full queue
+        while thread.is_alive():
+            try:
+                items_queue.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.01)
+
 class _WorkflowKernel:
     def __init__(self, logger, log_path, is_cli=False):
         self.logger = logger
@@ -1761,7 +3204,8 @@ class SegmKernel(_WorkflowKernel):
             signals=None,
             logger_func=print,
             innerPbar_available=False,
-            is_segment3DT_available=False
+            is_segment3DT_available=False,
+            batch_size=1
         ):
         self.user_ch_name = user_ch_name
         self.segm_endname = segm_endname
@@ -1784,6 +3228,7 @@ class SegmKernel(_WorkflowKernel):
         self.init_model_kwargs = init_model_kwargs
         self.init_tracker_kwargs = init_tracker_kwargs
         self.is_segment3DT_available = is_segment3DT_available
+        self.batch_size = int(batch_size) if batch_size else 1
         if signals is None:
             self.signals = KernelCliSignals(logger_func)
         else:
@@ -1844,6 +3289,121 @@ class SegmKernel(_WorkflowKernel):
         self.track_params = track_params
         self.tracker = tracker
     
+    def _is_streaming_available(self):
+        if self.is_segment3DT_available:
+            return False
+        
+        if not self.do_tracking:
+            return True
+        
+        if self.image_channel_tracker is not None:
+            return False
+        
+        return hasattr(self.tracker, 'track_iter')
+    
+    def _post_process_frame(self, posData, lab, postprocess_img, frame_i):
+        lab_cleaned = post_process_segm(
+            lab, **self.standard_postrocess_kwargs
+        )
+        if not self.custom_postproc_features:
+            return lab_cleaned
+        
+        lab_filtered = features.custom_post_process_segm(
+            posData, self.custom_postproc_grouped_features, 
+            lab_cleaned, postprocess_img, frame_i, posData.filename, 
+            self.user_ch_name, self.custom_postproc_features
+        )
+        return lab_filtered
+    
+    def _iter_frames_batches(self, img_data, second_ch_data):
+        num_frames = len(img_data)
+        for start in range(0, num_frames, self.batch_size):
+            stop = min(start+self.batch_size, num_frames)
+            # np.asarray reads the frames from disk for h5 and memmaps
+            images = [np.asarray(img_data[t]) for t in range(start, stop)]
+            if second_ch_data is not None:
+                images = [
+                    self.model.to_rgb_stack(img, second_ch_data[t]) 
+                    for t, img in enumerate(images, start=start)
+                ]
+            yield start, images
+    
+    def _post_process_batch(
+            self, posData, labs, postprocess_img, start, do_postprocess
+        ):
+        processed_labs = []
+        for t, lab in enumerate(labs, start=start):
+            if do_postprocess:
+                lab = self._post_process_frame(
+                    posData, lab, postprocess_img, t
+                )
+            processed_labs.append(lab.astype(np.uint32, copy=False))
+        return processed_labs
+    
+    def _iter_segment_frames(
+            self, img_data, second_ch_data, posData, postprocess_img, 
+            do_postprocess=True
+        ):
+        """Segment (and post-process if `do_postprocess` and 
+        `self.do_postprocess` are True) the frames in batches of 
+        `self.batch_size` frames. Loading and preparing batch k+1 (background 
+        thread) and post-processing batch k-1 (worker thread) run while the 
+        model is segmenting batch k.
+        """
+        do_postprocess = do_postprocess and self.do_postprocess
+        pbar = tqdm(total=len(img_data), ncols=100)
+        batches = iter_prefetched(
+            self._iter_frames_batches(img_data, second_ch_data)
+        )
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        pending = None
+        try:
+            for start, images in batches:
+                labs = [
+                    segm_model_segment(
+                        self.model, image, self.model_kwargs, frame_i=t
+                    )
+                    for t, image in enumerate(images, start=start)
+                ]
+                for _ in range(len(images)):
+                    if self.innerPbar_available:
+                        self.signals.innerProgressBar.emit(1)
+                    else:
+                        self.signals.progressBar.emit(1)
+                pbar.update(len(images))
+                if pending is not None:
+                    yield from pending.result()
+                pending = executor.submit(
+                    self._post_process_batch, posData, labs, 
+                    postprocess_img, start, do_postprocess
+                )
+            if pending is not None:
+                yield from pending.result()
+        finally:
+            executor.shutdown(wait=True)
+            pbar.close()
+    
+    def _open_lab_stack_store(self, posData, shape):
+        self._lab_stack_store_folderpath = tempfile.mkdtemp(
+            prefix='.acdc_segm_', dir=posData.images_path
+        )
+        store_filepath = os.path.join(
+            self._lab_stack_store_folderpath, 'lab_stack.npy'
+        )
+        lab_stack = np.lib.format.open_memmap(
+            store_filepath, mode='w+', dtype=np.uint32, shape=shape
+        )
+        return lab_stack
+    
+    def _close_lab_stack_store(self):
+        try:
+            shutil.rmtree(self._lab_stack_store_folderpath)
+        except Exception as e:
+            self.logger_func(
+                '[WARNING]: Could not remove temporary folder '
+                f'"{self._lab_stack_store_folderpath}"'
+            )
+    
     @exception_handler_cli
     def run(
             self,
@@ -1881,6 +3441,10 @@ class SegmKernel(_WorkflowKernel):
 
         segmFilename = os.path.basename(posData.segm_npz_path)
         self.logger_func(f'Segmentation file {segmFilename}...')
+        if self.do_save:
+            # The marker is written back only when the tracked masks and 
+            # the acdc_df are saved (see `is_segm_file_complete`)
+            load.remove_segm_completed_marker(posData.segm_npz_path)
 
         posData.SizeT = self.SizeT
         if self.SizeZ > 1:
@@ -2053,6 +3617,7 @@ class SegmKernel(_WorkflowKernel):
         """Segmentation routine"""
         self.logger_func(f'Segmenting with {self.model_name}...')
         t0 = time.perf_counter()
+        is_streamed = False
         # self.logger_func(f'Segmenting with {model} (Ctrl+C to abort)...')
         if posData.SizeT > 1:
             if self.innerPbar_available and self.signals is not None:
@@ -2070,23 +3635,54 @@ class SegmKernel(_WorkflowKernel):
                 if self.innerPbar_available:
                     # emit one pos done
                     self.signals.progressBar.emit(1)
-            else:
-                lab_stack = []
-                pbar = tqdm(total=len(img_data), ncols=100)
-                for t, img in enumerate(img_data):
-                    if self.second_channel_name is not None:
-                        img = self.model.to_rgb_stack(img, second_ch_data[t])
-                    lab = segm_model_segment(
-                        self.model, img, self.model_kwargs, frame_i=t
+            elif self._is_streaming_available():
+                # Segment, post-process and track frame-by-frame writing 
+                # to an on-disk store --> only a few frames in memory
+                if self.second_channel_name is None:
+                    second_ch_data = None
+                frames = self._iter_segment_frames(
+                    img_data, second_ch_data, posData, postprocess_img
+                )
+                if self.do_tracking:
+                    self.logger_func(
+                        f'Tracking with {self.tracker_name} tracker '
+                        'while segmenting...'
                     )
-                    lab_stack.append(lab)
-                    if self.innerPbar_available:
-                        self.signals.innerProgressBar.emit(1)
-                    else:
-                        self.signals.progressBar.emit(1)
-                    pbar.update()
-                pbar.close()
-                lab_stack = np.array(lab_stack, dtype=np.uint32)
+                    self.signals.innerPbar_available = self.innerPbar_available
+                    self.track_params['signals'] = self.signals
+                    frames = self.tracker.track_iter(
+                        frames, **self.track_params
+                    )
+                lab_stack = None
+                frame_pad_info = pad_info[1:] if isROIactive else None
+                for t, lab in enumerate(frames):
+                    if frame_pad_info is not None:
+                        lab = np.pad(lab, frame_pad_info, mode='constant')
+                    if lab_stack is None:
+                        lab_stack = self._open_lab_stack_store(
+                            posData, (len(img_data), *lab.shape)
+                        )
+                    lab_stack[t] = lab
+                is_streamed = True
+                if self.innerPbar_available:
+                    # emit one pos done
+                    self.signals.progressBar.emit(1)
+            else:
+                if self.second_channel_name is None:
+                    second_ch_data = None
+                # Post-processing is done later on the entire stack
+                frames = self._iter_segment_frames(
+                    img_data, second_ch_data, posData, postprocess_img, 
+                    do_postprocess=False
+                )
+                lab_stack = None
+                for t, lab in enumerate(frames):
+                    if lab_stack is None:
+                        # Preallocate the output to avoid copying
+                        lab_stack = np.zeros(
+                            (len(img_data), *lab.shape), dtype=np.uint32
+                        )
+                    lab_stack[t] = lab
                 if self.innerPbar_available:
                     # emit one pos done
                     self.signals.progressBar.emit(1)
@@ -2098,23 +3694,15 @@ class SegmKernel(_WorkflowKernel):
             self.signals.progressBar.emit(1)
             # lab_stack = smooth_contours(lab_stack, radius=2)
 
-        if self.do_postprocess:
+        if self.do_postprocess and not is_streamed:
             if posData.SizeT > 1:
-                pbar = tqdm(total=len(lab_stack), ncols=100)
-                for t, lab in enumerate(lab_stack):
-                    lab_cleaned = post_process_segm(
-                        lab, **self.standard_postrocess_kwargs
+                def post_process_func(frame_i, lab):
+                    return self._post_process_frame(
+                        posData, lab, postprocess_img, frame_i
                     )
-                    lab_stack[t] = lab_cleaned
-                    if self.custom_postproc_features:
-                        lab_filtered = features.custom_post_process_segm(
-                            posData, self.custom_postproc_grouped_features, 
-                            lab_cleaned, postprocess_img, t, posData.filename, 
-                            posData.self.user_ch_name, self.custom_postproc_features
-                        )
-                        lab_stack[t] = lab_filtered
-                    pbar.update()
-                pbar.close()
+                lab_stack = post_process_segm_timelapse(
+                    lab_stack, post_process_func=post_process_func
+                )
             else:
                 lab_stack = post_process_segm(
                     lab_stack, **self.standard_postrocess_kwargs
@@ -2123,11 +3711,15 @@ class SegmKernel(_WorkflowKernel):
                     lab_stack = features.custom_post_process_segm(
                         posData, self.custom_postproc_grouped_features, 
                         lab_stack, postprocess_img, 0, posData.filename, 
-                        posData.self.user_ch_name, self.custom_postproc_features
+                        self.user_ch_name, self.custom_postproc_features
                     )
             
 
-        if posData.SizeT > 1 and self.do_tracking:     
+        if is_streamed and self.do_tracking:
+            # Tracking was already performed frame-by-frame
+            tracked_stack = lab_stack
+            posData.fromTrackerToAcdcDf(self.tracker, tracked_stack, save=True)
+        elif posData.SizeT > 1 and self.do_tracking:     
             self.logger_func(f'\nTracking with {self.tracker_name} tracker...')       
             if self.do_save:
                 # Since tracker could raise errors we save the not-tracked 
@@ -2178,38 +3770,255 @@ class SegmKernel(_WorkflowKernel):
                 else:
                     self.signals.progressBar.emit(1)
 
-        if isROIactive:
+        if isROIactive and not is_streamed:
             self.logger_func(f'Padding with zeros {pad_info}...')
             tracked_stack = np.pad(tracked_stack, pad_info, mode='constant')
 
         if self.do_save:
             self.logger_func(f'Saving {posData.relPath}...')
-            np.savez_compressed(posData.segm_npz_path, tracked_stack)
+            load.save_npz_atomic(posData.segm_npz_path, tracked_stack)
+            num_frames = len(tracked_stack) if posData.SizeT > 1 else 1
+            load.write_segm_completed_marker(posData.segm_npz_path, num_frames)
+        
+        if is_streamed:
+            del lab_stack, tracked_stack
+            self._close_lab_stack_store()
 
         t_end = time.perf_counter()
 
         self.logger_func(f'{posData.relPath} segmented!')
         self.signals.finished.emit(t_end-t0)
 
-def filter_segm_objs_from_table_coords(lab, df):
-    cols = []
-    if lab.ndim == 3:
-        cols = ['z']
-    cols.extend(('y', 'x'))
-    coords = df[cols].values.T
-    IDs_to_keep = lab[tuple(coords)]
-    mask_to_keep = np.isin(lab, IDs_to_keep)
-    filtered_lab = lab.copy()
-    filtered_lab[~mask_to_keep] = 0
-    return filtered_lab
-
-def tracker_track(
-        video_to_track, tracker, track_params, intensity_img=None,
+def get_segm_npz_path(ch_filepath, user_ch_name, segm_endname):
+    posData = load.loadData(ch_filepath, user_ch_name)
+    posData.getBasenameAndChNames()
+    posData.buildPaths()
+    # Get only name from the string 'segm_<name>.npz'
+    endName = (
+        segm_endname.replace('segm', '', 1)
+        .replace('_', '', 1)
+        .split('.')[0]
+    )
+    if endName:
+        posData.setFilePaths(endName)
+    return posData.segm_npz_path
+
+def is_segm_file_complete(segm_npz_path, SizeT, stop_frame_n):
+    """Check that the segmentation file exists, that `SegmKernel.run` 
+    completed (i.e., masks are tracked and the acdc_df is saved), and (for 
+    timelapse data) that at least `stop_frame_n` frames were segmented.
+    
+    Files without the completed marker (see 
+    `load.write_segm_completed_marker`) are never complete since they 
+    could contain the NON-tracked masks saved before tracking.
+    """
+    if not os.path.exists(segm_npz_path):
+        return False
+    
+    marker = load.read_segm_completed_marker(segm_npz_path)
+    if marker is None:
+        return False
+    
+    if SizeT == 1:
+        return True
+    
+    return marker.get('num_frames', 0) >= stop_frame_n
+
+def _get_position_log_name(ch_filepath):
+    images_path = os.path.dirname(ch_filepath)
+    pos_path = os.path.dirname(images_path)
+    pos_foldername = os.path.basename(pos_path)
+    exp_foldername = os.path.basename(os.path.dirname(pos_path))
+    return f'{exp_foldername}_{pos_foldername}'
+
+def _get_workflow_logger(log_path, name):
+    # One log file per Position in a folder with the name of the main log
+    logs_folderpath = os.path.splitext(log_path)[0]
+    os.makedirs(logs_folderpath, exist_ok=True)
+    pos_log_path = os.path.join(logs_folderpath, f'{name}.log')
+    
+    logger = logging.getLogger(f'cellacdc-logger-cli-{name}')
+    logger.setLevel(logging.INFO)
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+    output_file_handler = logging.FileHandler(pos_log_path, mode='w')
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s:\n'
+        '------------------------\n'
+        '%(message)s\n'
+        '------------------------\n',
+        datefmt='%d-%m-%Y, %H:%M:%S')
+    output_file_handler.setFormatter(formatter)
+    logger.addHandler(output_file_handler)
+    return logger, pos_log_path
+
+# Kernel of each worker process of `run_segm_workflow_multi_pos`. The 
+# segmentation model is initialized at the first Position and then re-used
+_SEGM_WORKER_KERNEL = None
+
+def _init_segm_worker(workflow_params, log_path):
+    global _SEGM_WORKER_KERNEL
+    logger, _ = _get_workflow_logger(log_path, f'worker_{os.getpid()}')
+    kernel = SegmKernel(logger, log_path, is_cli=True)
+    # Errors must be returned to the main process instead of exiting
+    kernel.is_cli = False
+    kernel.init_args_from_params(workflow_params, logger.info)
+    _SEGM_WORKER_KERNEL = kernel
+
+def _run_segm_worker(ch_filepath, stop_frame_n, log_path):
+    kernel = _SEGM_WORKER_KERNEL
+    logger, pos_log_path = _get_workflow_logger(
+        log_path, _get_position_log_name(ch_filepath)
+    )
+    kernel.logger = logger
+    kernel.logger_func = logger.info
+    kernel.signals = KernelCliSignals(logger.info)
+    try:
+        logger.info(f'Processing "{ch_filepath}"...')
+        kernel.run(ch_filepath, stop_frame_n)
+        error_msg = None
+    except Exception as error:
+        logger.exception(traceback.format_exc())
+        error_msg = str(error)
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+    return ch_filepath, pos_log_path, error_msg
+
+def _estimate_position_memory(ch_filepath):
+    # Rough estimate: image data, its float copy for the model and the 
+    # uint32 labels. Files on disk could be compressed, hence the factor
+    try:
+        file_size = os.path.getsize(ch_filepath)
+    except Exception as err:
+        return 0
+    return 4*file_size
+
+def run_segm_workflow_multi_pos(
+        workflow_params, ch_filepaths, stop_frame_nums, log_path, 
+        max_workers=None, memory_budget_GB=None, resume=False, 
         logger_func=print
     ):
-    if intensity_img is not None:
-        try:
-            tracked_video = tracker.track(
+    """Run the segmentation workflow on multiple Positions in parallel 
+    processes. Each process initializes the segmentation model only once 
+    and writes one log file per Position.
+
+    Args:
+        workflow_params (dict): Parameters read from the workflow file.
+        ch_filepaths (list of str): Paths of the channel file to segment 
+            of each Position.
+        stop_frame_nums (list of int): Stop frame number of each Position.
+        log_path (str): Path of the main log file. The logs of the 
+            Positions are saved in a folder with the same name.
+        max_workers (int, optional): Number of processes. Defaults to 
+            None, i.e., the number of processors on the machine.
+        memory_budget_GB (float, optional): If not None, the number of 
+            processes is reduced to fit the largest Position in memory 
+            this many times. Defaults to None.
+        resume (bool, optional): If True, Positions whose segmentation 
+            file is already complete are skipped. Defaults to False.
+        logger_func (callable, optional): Function used to log. Defaults 
+            to print.
+
+    Returns:
+        dict: Dictionary of {ch_filepath: error message} of the failed 
+            Positions.
+    """    
+    init_params = workflow_params['initialization']
+    SizeT = workflow_params['metadata']['SizeT']
+    tasks = []
+    for ch_filepath, stop_frame_n in zip(ch_filepaths, stop_frame_nums):
+        if resume:
+            segm_npz_path = get_segm_npz_path(
+                ch_filepath, init_params['user_ch_name'], 
+                init_params['segm_endname']
+            )
+            if is_segm_file_complete(segm_npz_path, SizeT, stop_frame_n):
+                logger_func(
+                    f'Skipping "{ch_filepath}" because the segmentation file '
+                    f'"{segm_npz_path}" is already complete.'
+                )
+                continue
+        tasks.append((ch_filepath, stop_frame_n))
+    
+    if not tasks:
+        logger_func('All the Positions are already segmented.')
+        return {}
+    
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    max_workers = min(max_workers, len(tasks))
+    if memory_budget_GB is not None:
+        pos_memory = max(
+            [_estimate_position_memory(path) for path, _ in tasks]
+        )
+        if pos_memory > 0:
+            memory_budget = memory_budget_GB*1024**3
+            max_workers = max(1, min(max_workers, int(memory_budget//pos_memory)))
+    
+    logger_func(
+        f'Segmenting {len(tasks)} Positions with {max_workers} processes...'
+    )
+    failed = {}
+    pbar = tqdm(total=len(tasks), desc='Positions', ncols=100)
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers, initializer=_init_segm_worker, 
+            initargs=(workflow_params, log_path)
+        ) as executor:
+        futures = {
+            executor.submit(
+                _run_segm_worker, path, stop_frame_n, log_path
+            ): path
+            for path, stop_frame_n in tasks
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                ch_filepath, pos_log_path, error_msg = future.result()
+            except concurrent.futures.process.BrokenProcessPool as error:
+                # A worker process died (e.g., initialization of the model 
+                # failed or out of memory) --> all pending Positions fail
+                ch_filepath = futures[future]
+                failed[ch_filepath] = str(error)
+                logger_func(
+                    f'[ERROR]: "{ch_filepath}" failed because a worker '
+                    f'process terminated abruptly ("{error}"). See log '
+                    f'file "{log_path}"'
+                )
+                pbar.update()
+                continue
+            
+            if error_msg is None:
+                logger_func(f'"{ch_filepath}" done (log: "{pos_log_path}")')
+            else:
+                failed[ch_filepath] = error_msg
+                logger_func(
+                    f'[ERROR]: "{ch_filepath}" failed with error "{error_msg}". '
+                    f'See log file "{pos_log_path}"'
+                )
+            pbar.update()
+    pbar.close()
+    return failed
+
+def filter_segm_objs_from_table_coords(lab, df):
+    cols = []
+    if lab.ndim == 3:
+        cols = ['z']
+    cols.extend(('y', 'x'))
+    coords = df[cols].values.T
+    IDs_to_keep = lab[tuple(coords)]
+    mask_to_keep = np.isin(lab, IDs_to_keep)
+    filtered_lab = lab.copy()
+    filtered_lab[~mask_to_keep] = 0
+    return filtered_lab
+
+def tracker_track(
+        video_to_track, tracker, track_params, intensity_img=None,
+        logger_func=print
+    ):
+    if intensity_img is not None:
+        try:
+            tracked_video = tracker.track(
                 video_to_track, intensity_img, **track_params
             )
         except TypeError:
@@ -2262,17 +4071,19 @@ def _relabel_sequential_timelapse(segm_data):
             relabelled[frame_i] = relab
             continue
         
-        rp = skimage.measure.regionprops(lab)
-        for obj in rp:
-            newID = mapper_old_to_new_IDs.get(obj.label)
-            if newID is not None:
-                # ID was already mapped in prev iter --> use it
-                relabelled[frame_i][obj.slice][obj.image] = newID
-            else:
+        IDs = np.unique(lab)
+        IDs = IDs[IDs != 0]
+        newIDs_i = []
+        for ID in IDs.tolist():
+            newID = mapper_old_to_new_IDs.get(ID)
+            if newID is None:
+                # ID was not mapped in prev iter --> assign next ID
                 newID = lastID + 1
-                mapper_old_to_new_IDs[obj.label] = newID
+                mapper_old_to_new_IDs[ID] = newID
                 lastID += 1
-            relabelled[frame_i][obj.slice][obj.image] = newID
+            newIDs_i.append(newID)
+        relabelled[frame_i] = lab
+        relabel_IDs(relabelled[frame_i], IDs, newIDs_i)
         pbar.update()
     pbar.close()
     oldIDs = list(mapper_old_to_new_IDs.keys())
@@ -2286,6 +4097,902 @@ def relabel_sequential(segm_data, is_timelapse=False):
         relabelled, oldIDs, newIDs = _relabel_sequential(segm_data)
     return relabelled, oldIDs, newIDs
 
+class _FramesRange:
+    """Frames from `start` to `stop` of timelapse data, indexed with the 
+    frame index of the entire timelapse (e.g., `frames[start]`). 
+
+    Arrays in memory are copied to keep only the frames of the range. 
+    Memory-mapped arrays and h5py datasets are read only when a frame 
+    is indexed. If `squeeze` is True each frame is squeezed.
+    """
+    def __init__(self, data, start, stop, squeeze=False):
+        stop = min(stop, len(data))
+        self._offset = 0
+        if isinstance(data, np.ndarray) and not isinstance(data, np.memmap):
+            data = data[start:stop].copy()
+            self._offset = start
+        self._data = data
+        self.start = start
+        self.stop = stop
+        self._squeeze = squeeze
+        frame = self[start]
+        self.shape = (stop, *frame.shape)
+        self.ndim = len(self.shape)
+        self.dtype = frame.dtype
+    
+    def __len__(self):
+        return self.stop
+    
+    def __getitem__(self, frame_i):
+        if not self.start <= frame_i < self.stop:
+            raise IndexError(
+                f'Frame {frame_i} is outside of the loaded frames '
+                f'({self.start}-{self.stop-1})'
+            )
+        frame = np.asarray(self._data[frame_i-self._offset])
+        if self._squeeze:
+            frame = np.squeeze(frame)
+        return frame
+
+def _load_measurements_channel(posData, chName, frames_range=None):
+    ls = myutils.listdir(posData.images_path)
+    endnames = {f[len(posData.basename):]:f for f in ls}
+    validEnds = ['_aligned.npz', '_aligned.h5', '.h5', '.tif', '.npz']
+    for end in validEnds:
+        files = [
+            filename for endname, filename in endnames.items()
+            if endname == f'{chName}{end}'
+        ]
+        if files:
+            filename = files[0]
+            break
+    else:
+        return None, None, None
+    
+    fluo_path = os.path.join(posData.images_path, filename)
+    filename_noEXT, ext = os.path.splitext(filename)
+    if ext == '.tif':
+        aligned_path = os.path.join(
+            posData.images_path, f'{filename_noEXT}_aligned.npz'
+        )
+        if os.path.exists(aligned_path):
+            fluo_path = aligned_path
+            filename_noEXT = f'{filename_noEXT}_aligned'
+        elif posData.filename.find('aligned') != -1:
+            # Non-aligned data is not allowed with aligned cells channel
+            return None, None, None
+    
+    if frames_range is None:
+        fluo_data = load.load_image_file(fluo_path)
+    elif fluo_path.endswith('.h5'):
+        # Read only the frames of the range from the h5 file
+        fluo_dset = h5py.File(fluo_path, 'r')['data']
+        fluo_data = _FramesRange(fluo_dset, *frames_range, squeeze=True)
+    else:
+        fluo_data = _FramesRange(
+            load.load_image_file(fluo_path), *frames_range
+        )
+    bkgrData = None
+    bkgrData_path = os.path.join(
+        posData.images_path, f'{filename_noEXT}_bkgrRoiData.npz'
+    )
+    if os.path.exists(bkgrData_path):
+        bkgrData = np.load(bkgrData_path)
+    return fluo_data, bkgrData, filename_noEXT
+
+def _init_measurements_segmInfo_df(posData, logger_func=print):
+    if posData.SizeZ == 1:
+        return
+    
+    # Same as `guiWin.init_segmInfo_df` but we never write to disk since 
+    # multiple processes could access the same file
+    if posData.segmInfo_df is not None:
+        if 'z_slice_used_gui' not in posData.segmInfo_df.columns:
+            posData.segmInfo_df['z_slice_used_gui'] = (
+                posData.segmInfo_df['z_slice_used_dataPrep']
+            )
+        if 'which_z_proj_gui' not in posData.segmInfo_df.columns:
+            posData.segmInfo_df['which_z_proj_gui'] = (
+                posData.segmInfo_df['which_z_proj']
+            )
+        if 'resegmented_in_gui' not in posData.segmInfo_df.columns:
+            posData.segmInfo_df['resegmented_in_gui'] = False
+    
+    for filename in posData.fluo_data_dict.keys():
+        NO_segmInfo = (
+            posData.segmInfo_df is None
+            or filename not in posData.segmInfo_df.index
+        )
+        if not NO_segmInfo:
+            continue
+        
+        logger_func(
+            f'[WARNING]: z-slice for "{filename}" absent. '
+            'Using the middle z-slice.'
+        )
+        df = myutils.getDefault_SegmInfo_df(posData, filename)
+        if posData.segmInfo_df is None:
+            posData.segmInfo_df = df
+        else:
+            posData.segmInfo_df = pd.concat([df, posData.segmInfo_df])
+
+def load_position_measurements_data(
+        file_path, chName, end_filename_segm='', chNamesToSkip=None, 
+        channels=None, frames_range=None, logger_func=print
+    ):
+    """Load segmentation and channels data of one Position folder required 
+    to compute the measurements without the GUI.
+
+    Args:
+        file_path (str): Path of the file of the channel `chName`.
+        chName (str): Name of the channel used to load the Position.
+        end_filename_segm (str, optional): End name of the segmentation 
+            file to load. Defaults to ''.
+        chNamesToSkip (list of str, optional): Channels that will not be 
+            loaded. Defaults to None.
+        channels (list of str, optional): If not None, only these channels 
+            are loaded. Defaults to None.
+        frames_range (tuple of ints, optional): If not None, (start, stop) 
+            frame index of the timelapse frames to load. The frames are 
+            still indexed with the frame index of the entire timelapse. 
+            Files that can be read frame by frame (chunked segmentation 
+            file, .h5 and memory-mapped files) are read only when a frame is 
+            indexed. The other files are loaded entirely and then only 
+            the frames of the range are kept. Defaults to None.
+        logger_func (callable, optional): Function used to log. Defaults 
+            to print.
+
+    Returns:
+        load.loadData: The loaded data. `posData.segmFound` is False when 
+            the segmentation file was not found.
+    """    
+    if chNamesToSkip is None:
+        chNamesToSkip = []
+    
+    posData = load.loadData(file_path, chName)
+    posData.getBasenameAndChNames(useExt=('.tif', '.h5'))
+    posData.buildPaths()
+    posData.loadImgData()
+    posData.loadOtherFiles(
+        load_segm_data=True,
+        load_acdc_df=True,
+        load_shifts=True,
+        loadSegmInfo=True,
+        load_delROIsInfo=True,
+        load_bkgr_data=True,
+        loadBkgrROIs=True,
+        load_last_tracked_i=True,
+        load_metadata=True,
+        load_customAnnot=True,
+        load_customCombineMetrics=True,
+        end_filename_segm=end_filename_segm,
+        load_dataPrep_ROIcoords=True,
+        lazy_segm_data=frames_range is not None
+    )
+    if not posData.segmFound:
+        return posData
+    
+    if posData.ext == '.h5' and not hasattr(posData, 'img_data'):
+        posData.loadSizeT = posData.SizeT
+        posData.loadSizeZ = posData.SizeZ
+        posData.loadImgData()
+    
+    posData.labelSegmData()
+
+    # Allow single 2D/3D image
+    if posData.SizeT == 1:
+        posData.img_data = posData.img_data[np.newaxis]
+        posData.segm_data = np.asarray(posData.segm_data)[np.newaxis]
+        frames_range = None
+    
+    if frames_range is not None:
+        posData.img_data = _FramesRange(posData.img_data, *frames_range)
+        posData.segm_data = _FramesRange(posData.segm_data, *frames_range)
+    
+    # Load the other channels
+    posData.loadedChNames = []
+    for fluoChName in posData.chNames:
+        if fluoChName in chNamesToSkip:
+            continue
+        
+        if channels is not None and fluoChName not in channels:
+            continue
+
+        if fluoChName == chName:
+            filename = posData.filename
+            posData.fluo_data_dict[filename] = posData.img_data
+            posData.fluo_bkgrData_dict[filename] = posData.bkgrData
+            posData.loadedChNames.append(chName)
+            continue
+        
+        logger_func(f'Loading {fluoChName} data...')
+        fluo_data, bkgrData, filename = _load_measurements_channel(
+            posData, fluoChName, frames_range=frames_range
+        )
+        if fluo_data is None:
+            logger_func(
+                f'[WARNING]: Channel "{fluoChName}" not found or not aligned '
+                f'in "{posData.images_path}". Skipping it.'
+            )
+            continue
+
+        if posData.SizeT == 1:
+            # Add single frame for snapshot data
+            fluo_data = fluo_data[np.newaxis]
+
+        posData.loadedChNames.append(fluoChName)
+        posData.loadedFluoChannels.add(fluoChName)
+        posData.fluo_data_dict[filename] = fluo_data
+        posData.fluo_bkgrData_dict[filename] = bkgrData
+    
+    _init_measurements_segmInfo_df(posData, logger_func=logger_func)
+    
+    return posData
+
+def _get_metric_base_name(col, chName):
+    """Get the name of a channel metric without the channel name prefix 
+    and the 3D to 2D suffix (e.g., 'mNeon_mean_maxProj' --> 'mean').
+    """
+    # measurements imports core, hence it is imported here
+    from . import measurements
+    base_name = col[len(chName)+1:] if col.startswith(f'{chName}_') else col
+    how_3Dto2D, _ = measurements.get_how_3Dto2D(True, True)
+    for how in how_3Dto2D:
+        if base_name.endswith(how):
+            return base_name[:-len(how)]
+    return base_name
+
+def compute_position_measurements(pos_inputs, logger_func=print):
+    """Compute the measurements of one Position folder (or of a chunk of 
+    frames of it) without the GUI. This is the function executed by 
+    each process of `compute_measurements_multi_pos` and it must stay at 
+    the module level to be picklable.
+
+    Args:
+        pos_inputs (dict): Dictionary with the following keys:
+            'file_path', 'chName', 'stopFrameNum', 'end_filename_segm', 
+            'frames_range' (tuple of (start, stop) frame index, optional), 
+            'metrics_to_save' (dict, optional, default all metrics), 
+            'size_metrics_to_save' (list, optional, default all), 
+            'regionprops_to_save' (list, optional, default all), 
+            'chNamesToSkip' (list, optional), 'channels' (list, optional, 
+            default all channels), 'metrics_names' (list of metrics names 
+            with or without the channel name used to filter the default 
+            metrics, optional).
+        logger_func (callable, optional): Function used to log. Defaults 
+            to print.
+
+    Returns:
+        dict: Dictionary with keys 'acdc_df' (None if there are no objects 
+            or the segmentation file was not found), 'loadedChNames', 
+            'frames_range', 'errors' (dict of {error, custom metric or 
+            region property: traceback}) and 'failed_frames' (list of 
+            the frames missing from 'acdc_df' because of an error).
+    """    
+    # measurements imports core, hence it is imported here
+    from . import measurements
+    np.seterr(invalid='ignore')
+    result = {
+        'acdc_df': None, 'loadedChNames': [], 'errors': {},
+        'frames_range': pos_inputs.get('frames_range'), 'failed_frames': []
+    }
+    errorsCollector = ErrorsCollectorSignal(
+        result['errors'], logger_func=logger_func
+    )
+    load_frames_range = None
+    if pos_inputs.get('frames_range') is not None:
+        # Previous frame is needed for velocity of the first frame
+        start_frame_i, stop_frame_n = pos_inputs['frames_range']
+        load_frames_range = (max(0, start_frame_i-1), stop_frame_n)
+    posData = load_position_measurements_data(
+        pos_inputs['file_path'], pos_inputs['chName'], 
+        end_filename_segm=pos_inputs.get('end_filename_segm', ''), 
+        chNamesToSkip=pos_inputs.get('chNamesToSkip'), 
+        channels=pos_inputs.get('channels'), frames_range=load_frames_range,
+        logger_func=logger_func
+    )
+    if not posData.segmFound:
+        logger_func(
+            f'Skipping "{posData.pos_path}" because segm. file was not found.'
+        )
+        return result
+    
+    result['loadedChNames'] = posData.loadedChNames
+    isSegm3D = posData.getIsSegm3D()
+    
+    stopFrameNum = pos_inputs.get('stopFrameNum')
+    if stopFrameNum is None:
+        stopFrameNum = posData.SizeT
+    start_frame_i, stop_frame_n = pos_inputs.get(
+        'frames_range', (0, stopFrameNum)
+    )
+    stop_frame_n = min(stop_frame_n, stopFrameNum)
+    
+    all_channels_metrics = pos_inputs.get('metrics_to_save')
+    if all_channels_metrics is None:
+        all_channels_metrics = measurements.get_default_metrics_to_save(
+            posData, isSegm3D
+        )
+    metrics_names = pos_inputs.get('metrics_names')
+    if metrics_names is not None:
+        all_channels_metrics = {
+            chName: [
+                col for col in metrics 
+                if col in metrics_names 
+                or _get_metric_base_name(col, chName) in metrics_names
+            ]
+            for chName, metrics in all_channels_metrics.items()
+        }
+    size_metrics_to_save = pos_inputs.get('size_metrics_to_save')
+    if size_metrics_to_save is None:
+        size_metrics_to_save = list(
+            measurements.get_size_metrics_desc(
+                isSegm3D, posData.SizeT>1
+            ).keys()
+        )
+    regionprops_to_save = pos_inputs.get('regionprops_to_save')
+    if regionprops_to_save is None:
+        if isSegm3D:
+            regionprops_to_save = measurements.get_props_names_3D()
+        else:
+            regionprops_to_save = measurements.get_props_names()
+    
+    metrics_func, _ = measurements.standard_metrics_func()
+    custom_func_dict = measurements.get_custom_metrics_func()
+    params = measurements.get_metrics_params(
+        all_channels_metrics, metrics_func, custom_func_dict
+    )
+    (bkgr_metrics_params, foregr_metrics_params, 
+    concentration_metrics_params, custom_metrics_params) = params
+    
+    is_volume_required = (
+        'cell_vol_vox' in size_metrics_to_save 
+        or 'cell_vol_fl' in size_metrics_to_save
+        or not posData.fluo_data_dict
+    )
+    is_velocity_required = 'velocity_pixel' in size_metrics_to_save
+    
+    acdc_df_li = []
+    keys = []
+    # Previous frame is needed for velocity of the first frame of the chunk
+    prev_lab = None
+    prev_labels_table = None
+    if start_frame_i > 0:
+        prev_lab = posData.segm_data[start_frame_i-1]
+    for frame_i in range(start_frame_i, stop_frame_n):
+        lab = posData.segm_data[frame_i]
+        if not np.any(lab):
+            # Empty segmentation mask --> skip
+            prev_lab = lab
+            prev_labels_table = None
+            continue
+        
+        rp = skimage.measure.regionprops(lab)
+        if is_volume_required:
+            rp = features.add_rotational_volume_regionprops(
+                rp, PhysicalSizeY=posData.PhysicalSizeY, 
+                PhysicalSizeX=posData.PhysicalSizeX
+            )
+        posData.lab = lab
+        posData.rp = rp
+        labels_table = None
+
+        acdc_df = None
+        if posData.acdc_df is not None:
+            try:
+                acdc_df = posData.acdc_df.loc[frame_i].copy()
+            except Exception as err:
+                acdc_df = None
+        if acdc_df is None:
+            acdc_df = myutils.getBaseAcdcDf(rp)
+        
+        try:
+            if posData.fluo_data_dict:
+                acdc_df = measurements.add_metrics_acdc_df(
+                    acdc_df, rp, frame_i, lab, posData, isSegm3D, 
+                    all_channels_metrics, size_metrics_to_save, 
+                    regionprops_to_save, metrics_func, 
+                    bkgr_metrics_params, foregr_metrics_params, 
+                    concentration_metrics_params, custom_metrics_params, 
+                    logger_func=logger_func, 
+                    customMetricsCritical=errorsCollector, 
+                    regionPropsCritical=errorsCollector
+                )
+            else:
+                acdc_df = measurements.add_volume_metrics(
+                    acdc_df, rp, posData, isSegm3D
+                )
+            if prev_lab is not None and is_velocity_required:
+                # Labels table of current frame is reused at next frame
+                labels_table = get_labels_table(lab)
+                acdc_df = measurements.add_velocity_measurement(
+                    acdc_df, prev_lab, lab, posData, isSegm3D, 
+                    size_metrics_to_save, 
+                    prev_labels_table=prev_labels_table, 
+                    labels_table=labels_table
+                )
+            acdc_df_li.append(acdc_df)
+            keys.append((frame_i, posData.TimeIncrement*frame_i))
+        except Exception as error:
+            traceback_format = traceback.format_exc()
+            logger_func(traceback_format)
+            result['errors'][str(error)] = traceback_format
+            result['failed_frames'].append(frame_i)
+        
+        prev_lab = lab
+        prev_labels_table = labels_table
+    
+    posData.closeSegmChunks()
+    
+    if not acdc_df_li:
+        return result
+    
+    result['acdc_df'] = pd.concat(
+        acdc_df_li, keys=keys, names=['frame_i', 'time_seconds', 'Cell_ID']
+    )
+    return result
+
+def _get_frames_ranges(stopFrameNum, frames_chunk_size):
+    if not frames_chunk_size or frames_chunk_size >= stopFrameNum:
+        return [(0, stopFrameNum)]
+    
+    return [
+        (start, min(start+frames_chunk_size, stopFrameNum)) 
+        for start in range(0, stopFrameNum, frames_chunk_size)
+    ]
+
+def _estimate_measurements_task_memory(pos_inputs):
+    # Upper bound: each task could load the segmentation and all the 
+    # channels of the Position (compressed files are always read entirely)
+    images_path = os.path.dirname(pos_inputs['file_path'])
+    data_exts = ('.tif', '.tiff', '.h5', '.npz', '.npy')
+    memory = 0
+    for file in myutils.listdir(images_path):
+        if not file.endswith(data_exts):
+            continue
+        memory += _estimate_position_memory(os.path.join(images_path, file))
+    return memory
+
+def _get_measurements_max_workers(
+        all_pos_inputs, max_workers, memory_budget_GB, logger_func=print
+    ):
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    
+    if memory_budget_GB is None:
+        import psutil
+        memory_budget = psutil.virtual_memory().available
+    else:
+        memory_budget = memory_budget_GB*1024**3
+    
+    task_memory = max([
+        _estimate_measurements_task_memory(pos_inputs) 
+        for pos_inputs in all_pos_inputs
+    ], default=0)
+    if task_memory == 0:
+        return max_workers
+    
+    max_workers_memory = max(1, int(memory_budget//task_memory))
+    if max_workers_memory < max_workers:
+        logger_func(
+            f'Number of processes reduced to {max_workers_memory} to fit '
+            'the data in memory.'
+        )
+        max_workers = max_workers_memory
+    return max_workers
+
+def _init_measurements_segm_chunks(
+        posData, end_filename_segm, logger_func=print
+    ):
+    # Create the chunked segmentation file (if not up to date) to let each 
+    # chunk of frames read only its masks
+    if end_filename_segm:
+        segm_filename = f'{posData.basename}{end_filename_segm}.npz'
+        segm_npz_path = os.path.join(posData.images_path, segm_filename)
+    else:
+        segm_npz_path = posData.segm_npz_path
+    if not os.path.exists(segm_npz_path):
+        return
+    
+    if load.is_segm_chunks_file_valid(segm_npz_path):
+        return
+    
+    try:
+        load.import_segm_npz_to_chunks(segm_npz_path)
+    except Exception as err:
+        logger_func(
+            '[WARNING]: Could not create the chunked segmentation file of '
+            f'"{segm_npz_path}". Each chunk of frames will load the entire '
+            f'segmentation file.\n{traceback.format_exc()}'
+        )
+
+def compute_measurements_multi_pos(
+        all_pos_inputs, max_workers=None, frames_chunk_size=None, 
+        metricsToSkip=None, mixedChCombineMetricsToSkip=None, 
+        equations=None, logger_func=print, signals=None, save=True, 
+        memory_budget_GB=None, abort_func=None
+    ):
+    """Compute the measurements of multiple Position folders in parallel 
+    using a pool of processes. Each task computes one Position (or one 
+    chunk of frames of a Position when `frames_chunk_size` is not None) 
+    and the results are merged into the `acdc_output.csv` table of each 
+    Position. Positions where any task failed are not saved since their 
+    table would miss frames.
+
+    Args:
+        all_pos_inputs (list of dict): One dictionary per Position. See 
+            `compute_position_measurements` for the keys.
+        max_workers (int, optional): Maximum number of processes. If 1 
+            the Positions are computed in the current process. Defaults 
+            to None, i.e., the number of processors on the machine. 
+            The number of processes is further reduced to fit the data 
+            loaded by each of them in `memory_budget_GB`.
+        frames_chunk_size (int, optional): If not None, timelapse 
+            Positions are split into chunks of frames of this size. Each 
+            chunk loads only its frames (see 
+            `load_position_measurements_data`). The chunked segmentation 
+            file is created if needed so that the masks can be read frame 
+            by frame. Defaults to None.
+        metricsToSkip (dict, optional): Combined metrics to skip for each 
+            channel. Defaults to None.
+        mixedChCombineMetricsToSkip (list, optional): Mixed channels 
+            combined metrics to skip. Defaults to None.
+        equations (dict, optional): Additional combined metrics 
+            {new column name: equation}. An equation is evaluated only if 
+            all its columns are present. Defaults to None.
+        logger_func (callable, optional): Function used to log. Defaults 
+            to print.
+        signals (object, optional): Object with an `initProgressBar` 
+            signal emitted with the number of tasks and a `progressBar` 
+            signal emitted every time a task (Position or chunk of frames) 
+            is done. Defaults to None.
+        save (bool, optional): If True, the tables are saved to the 
+            `acdc_output.csv` file of each Position. Defaults to True.
+        memory_budget_GB (float, optional): Memory available to the 
+            processes. Defaults to None, i.e., the available memory of 
+            the machine.
+        abort_func (callable, optional): Function called without arguments 
+            while the tasks are running. If it returns True the pending 
+            tasks are cancelled and nothing is saved. Defaults to None.
+
+    Returns:
+        tuple: List of `acdc_df` (None for Positions without objects, 
+            where any task failed, or when aborted), 
+            list of paths of the `acdc_output.csv` files (both in the same 
+            order as `all_pos_inputs`) and dictionary of errors 
+            {error: traceback}.
+    """    
+    # measurements imports core, hence it is imported here
+    from . import measurements
+    tasks = []
+    posDatas = []
+    for p, pos_inputs in enumerate(all_pos_inputs):
+        posData = load.loadData(pos_inputs['file_path'], pos_inputs['chName'])
+        posData.getBasenameAndChNames(useExt=('.tif', '.h5'))
+        posData.buildPaths()
+        posData.loadOtherFiles(
+            load_segm_data=False,
+            load_acdc_df=False,
+            load_metadata=True,
+            load_customCombineMetrics=True,
+            end_filename_segm=pos_inputs.get('end_filename_segm', '')
+        )
+        posDatas.append(posData)
+        stopFrameNum = pos_inputs.get('stopFrameNum')
+        if stopFrameNum is None:
+            stopFrameNum = posData.SizeT
+        frames_ranges = _get_frames_ranges(stopFrameNum, frames_chunk_size)
+        if len(frames_ranges) > 1:
+            _init_measurements_segm_chunks(
+                posData, pos_inputs.get('end_filename_segm', ''), 
+                logger_func=logger_func
+            )
+        for frames_range in frames_ranges:
+            task_inputs = {**pos_inputs, 'frames_range': frames_range}
+            tasks.append((p, task_inputs))
+    
+    if abort_func is None:
+        abort_func = lambda: False
+    
+    results = [[] for _ in all_pos_inputs]
+    num_pos_tasks = [0 for _ in all_pos_inputs]
+    for p, _ in tasks:
+        num_pos_tasks[p] += 1
+    errors = {}
+    aborted = False
+    pbar = tqdm(total=len(tasks), desc='Computing measurements', ncols=100)
+    if signals is not None:
+        signals.initProgressBar.emit(len(tasks))
+    if max_workers != 1:
+        max_workers = _get_measurements_max_workers(
+            all_pos_inputs, max_workers, memory_budget_GB, 
+            logger_func=logger_func
+        )
+    if max_workers == 1:
+        for p, task_inputs in tasks:
+            if abort_func():
+                aborted = True
+                break
+            try:
+                results[p].append(
+                    compute_position_measurements(
+                        task_inputs, logger_func=logger_func
+                    )
+                )
+            except Exception as error:
+                traceback_format = traceback.format_exc()
+                logger_func(traceback_format)
+                errors[str(error)] = traceback_format
+            pbar.update()
+            if signals is not None:
+                signals.progressBar.emit(1)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            futures = {
+                executor.submit(compute_position_measurements, inputs): p
+                for p, inputs in tasks
+            }
+            pending = set(futures.keys())
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=0.5, 
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    p = futures[future]
+                    try:
+                        results[p].append(future.result())
+                    except Exception as error:
+                        traceback_format = traceback.format_exc()
+                        logger_func(traceback_format)
+                        errors[str(error)] = traceback_format
+                    pbar.update()
+                    if signals is not None:
+                        signals.progressBar.emit(1)
+                if pending and abort_func():
+                    aborted = True
+                    for future in pending:
+                        future.cancel()
+                    break
+    pbar.close()
+    
+    all_acdc_dfs = []
+    acdc_output_csv_paths = []
+    if aborted:
+        logger_func('Computing measurements aborted. Nothing was saved.')
+        for posData in posDatas:
+            acdc_output_csv_paths.append(posData.acdc_output_csv_path)
+            all_acdc_dfs.append(None)
+        return all_acdc_dfs, acdc_output_csv_paths, errors
+    
+    iter_pos = zip(posDatas, results, num_pos_tasks)
+    for posData, pos_results, num_tasks in iter_pos:
+        acdc_output_csv_paths.append(posData.acdc_output_csv_path)
+        pos_results = sorted(pos_results, key=lambda r: r['frames_range'])
+        acdc_dfs = []
+        loadedChNames = []
+        failed_frames = []
+        for result in pos_results:
+            errors.update(result['errors'])
+            failed_frames.extend(result['failed_frames'])
+            if result['loadedChNames']:
+                loadedChNames = result['loadedChNames']
+            if result['acdc_df'] is not None:
+                acdc_dfs.append(result['acdc_df'])
+        
+        if len(pos_results) < num_tasks or failed_frames:
+            # Saving would overwrite the existing table with a partial one
+            failed_frames_n = [frame_i+1 for frame_i in failed_frames]
+            logger_func(
+                f'[WARNING]: Measurements of Position "{posData.pos_path}" '
+                f'failed ({num_tasks-len(pos_results)} failed chunks of '
+                f'frames, failed frames n. {failed_frames_n}). '
+                'Metrics will not be saved.'
+            )
+            all_acdc_dfs.append(None)
+            continue
+        
+        if not acdc_dfs:
+            logger_func(
+                f'Position "{posData.pos_path}" has EMPTY segmentation mask. '
+                'Metrics will not be saved.'
+            )
+            all_acdc_dfs.append(None)
+            continue
+        
+        all_frames_acdc_df = pd.concat(acdc_dfs)
+        measurements.add_combine_metrics_acdc_df(
+            all_frames_acdc_df, posData.combineMetricsConfig, loadedChNames, 
+            metricsToSkip=metricsToSkip, 
+            mixedChCombineMetricsToSkip=mixedChCombineMetricsToSkip
+        )
+        if equations is not None:
+            measurements.add_combine_metrics_acdc_df(
+                all_frames_acdc_df, {
+                    'equations': {}, 'user_path_equations': {},
+                    'mixed_channels_equations': equations
+                }, []
+            )
+        measurements.add_additional_metadata(
+            posData.additionalMetadataValues(), all_frames_acdc_df
+        )
+        all_acdc_dfs.append(all_frames_acdc_df)
+        if not save:
+            continue
+        
+        logger_func(
+            f'Saving acdc_output to: "{posData.acdc_output_csv_path}"'
+        )
+        load.save_acdc_df_file(
+            all_frames_acdc_df, posData.acdc_output_csv_path
+        )
+    
+    return all_acdc_dfs, acdc_output_csv_paths, errors
+
+def _parse_ini_list(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    values = [
+        val.strip() for line in value.split('\n') for val in line.split(',')
+    ]
+    return [val for val in values if val]
+
+class ComputeMeasurementsKernel(_WorkflowKernel):
+    """Kernel of the "measurements" workflow run with `acdc -p <ini_file>`.
+    Example of workflow file (lists can be comma or new line separated, 
+    `None` means everything):
+
+    [workflow]
+    type = measurements
+
+    [paths_to_measure]
+    paths = 
+        path/to/experiment_folder
+    stop_frame_numbers = 
+
+    [measurements]
+    end_filename_segm = segm
+    channels = None
+    metrics = mean, median, amount_autoBkgr
+    size_metrics = None
+    regionprops = area, eccentricity
+    frames_chunk_size = None
+    workers = 4
+
+    [combine_metrics_equations]
+    mNeon_mean_per_area = mNeon_mean/cell_area_pxl
+    """
+    def __init__(self, logger, log_path, is_cli):
+        super().__init__(logger, log_path, is_cli=is_cli)
+    
+    @exception_handler_cli
+    def init_args_from_params(self, workflow_params, max_workers=None):
+        params = workflow_params.get('measurements', {})
+        self.channels = _parse_ini_list(params.get('channels'))
+        self.end_filename_segm = params.get('end_filename_segm', '')
+        if self.end_filename_segm is None:
+            self.end_filename_segm = ''
+        self.metrics_names = _parse_ini_list(params.get('metrics'))
+        self.size_metrics_to_save = _parse_ini_list(
+            params.get('size_metrics')
+        )
+        self.regionprops_to_save = _parse_ini_list(
+            params.get('regionprops')
+        )
+        frames_chunk_size = params.get('frames_chunk_size')
+        if frames_chunk_size is not None:
+            frames_chunk_size = int(frames_chunk_size)
+        self.frames_chunk_size = frames_chunk_size
+        
+        # Command-line `--workers` has priority over the workflow file
+        if max_workers is None:
+            max_workers = params.get('workers')
+        if max_workers is not None:
+            max_workers = int(max_workers)
+        self.max_workers = max_workers
+        
+        self.equations = workflow_params.get('combine_metrics_equations')
+    
+    @exception_handler_cli
+    def parse_paths(self, workflow_params):
+        paths_to_measure = workflow_params['paths_to_measure']['paths']
+        parsed_paths = []
+        # Index of the workflow file path of each parsed path (an 
+        # experiment folder is expanded into its positions)
+        self.paths_entry_idxs = []
+        for p, path in enumerate(paths_to_measure):
+            if os.path.isfile(path):
+                parsed_paths.append(path)
+                self.paths_entry_idxs.append(p)
+                continue
+            
+            images_paths = load.get_images_paths(path)
+            for images_path in images_paths:
+                _, chNames = myutils.getBasenameAndChNames(
+                    images_path, useExt=('.tif', '.h5')
+                )
+                if self.channels is not None:
+                    chNames = [ch for ch in self.channels if ch in chNames]
+                if not chNames:
+                    self.logger.info(
+                        f'[WARNING]: No channel found in "{images_path}". '
+                        'Skipping it.'
+                    )
+                    continue
+                file_path = myutils.getChannelFilePath(
+                    images_path, chNames[0]
+                )
+                parsed_paths.append(file_path)
+                self.paths_entry_idxs.append(p)
+        return parsed_paths
+    
+    @exception_handler_cli
+    def parse_stop_frame_numbers(self, workflow_params, num_paths):
+        stop_frames_param = (
+            workflow_params['paths_to_measure'].get('stop_frame_numbers', [])
+        )
+        stop_frames_param = [n for n in stop_frames_param if n]
+        if not stop_frames_param:
+            # Compute all the frames
+            return [None]*num_paths
+        
+        paths_to_measure = workflow_params['paths_to_measure']['paths']
+        if len(stop_frames_param) != len(paths_to_measure):
+            raise ValueError(
+                f'The number of stop frame numbers ({len(stop_frames_param)}) '
+                f'is different from the number of paths '
+                f'({len(paths_to_measure)}) in the workflow file.'
+            )
+        
+        # Every position of an experiment folder gets the stop frame 
+        # number of the folder
+        stop_frame_nums = [int(n) for n in stop_frames_param]
+        return [stop_frame_nums[p] for p in self.paths_entry_idxs]
+    
+    @exception_handler_cli
+    def run(self, ch_filepaths, stop_frame_nums):
+        if len(ch_filepaths) != len(stop_frame_nums):
+            raise ValueError(
+                f'The number of stop frame numbers ({len(stop_frame_nums)}) '
+                f'is different from the number of positions '
+                f'({len(ch_filepaths)}).'
+            )
+        
+        all_pos_inputs = []
+        for file_path, stop_frame_n in zip(ch_filepaths, stop_frame_nums):
+            images_path = os.path.dirname(file_path)
+            basename, _ = myutils.getBasenameAndChNames(
+                images_path, useExt=('.tif', '.h5')
+            )
+            chName = myutils.get_chname_from_basename(
+                os.path.basename(file_path), basename
+            )
+            all_pos_inputs.append({
+                'file_path': file_path,
+                'chName': chName,
+                'stopFrameNum': stop_frame_n,
+                'end_filename_segm': self.end_filename_segm,
+                'size_metrics_to_save': self.size_metrics_to_save,
+                'regionprops_to_save': self.regionprops_to_save,
+                'channels': self.channels,
+                'metrics_names': self.metrics_names
+            })
+        
+        self.logger.info(
+            f'Computing measurements of {len(all_pos_inputs)} positions '
+            f'(max number of processes = {self.max_workers})...'
+        )
+        outputs = compute_measurements_multi_pos(
+            all_pos_inputs, max_workers=self.max_workers, 
+            frames_chunk_size=self.frames_chunk_size, 
+            equations=self.equations, logger_func=self.logger.info
+        )
+        _, _, errors = outputs
+        for error, traceback_format in errors.items():
+            self.logger.info(f'[WARNING]: {error}\n{traceback_format}')
+
 class CcaIntegrityChecker:
     def __init__(self, cca_df, lab, lab_IDs):
         self.lab = lab
@@ -2312,21 +5019,9 @@ class CcaIntegrityChecker:
         return mother_IDs_with_multiple_buds.values
     
     def get_IDs_cycles_without_G1(self, global_cca_df):
-        global_cca_df_moths_hist_known = (
-            global_cca_df[
-                (global_cca_df['relationship'] == 'mother') 
-                & (global_cca_df['is_history_known'] > 0)
-            ]
-        )
-        grouped_cycles = global_cca_df_moths_hist_known.reset_index().groupby(
-            ['Cell_ID', 'generation_num']
-        )
-        G1_not_present_mask = (
-            grouped_cycles['cell_cycle_stage']
-            .agg(lambda x: ~x.eq('G1').any())
-        )
-        IDs_cycles_without_G1 = (
-            G1_not_present_mask[G1_not_present_mask].index.to_list()
+        violations = get_cca_cycles_without_G1(global_cca_df)
+        IDs_cycles_without_G1 = list(
+            zip(violations['Cell_ID'], violations['generation_num'])
         )
         return IDs_cycles_without_G1
     
@@ -2366,25 +5061,680 @@ class CcaIntegrityChecker:
         return cell_S_rel_ID_zero
     
     def get_ID_rel_ID_mismatches(self):
-        ID_rel_ID_mismatches = []
-        for row in self.cca_df_S.itertuples():
-            ID = row.Index
-            relID = row.relative_ID
-            relID_of_relID = self.cca_df.at[relID, 'relative_ID']
-            
-            if relID_of_relID != ID:
-                ID_rel_ID_mismatches.append((ID, relID, relID_of_relID))
-        
+        cca_df_S = self.cca_df_S.reset_index()
+        relIDs_of_relIDs = self.cca_df['relative_ID'].reindex(
+            cca_df_S['relative_ID']
+        ).to_numpy()
+        mismatches_mask = relIDs_of_relIDs != cca_df_S['Cell_ID'].to_numpy()
+        ID_rel_ID_mismatches = list(zip(
+            cca_df_S['Cell_ID'][mismatches_mask], 
+            cca_df_S['relative_ID'][mismatches_mask], 
+            relIDs_of_relIDs[mismatches_mask]
+        ))
         return ID_rel_ID_mismatches
 
     def get_lonely_cells_in_S(self):
-        lonely_cells_in_S = []
-        for row in self.cca_df_S.itertuples():
-            ID = row.Index            
-            if row.relative_ID in self.lab_IDs:
+        # IDs in S whose relative_ID does not exist in lab
+        is_rel_ID_in_lab = self.cca_df_S['relative_ID'].isin(self.lab_IDs)
+        lonely_cells_in_S = (
+            self.cca_df_S.index[~is_rel_ID_in_lab.to_numpy()].to_list()
+        )
+        return lonely_cells_in_S
+
+
+# Checks performed on every frame, in the order they are reported
+CCA_INTEGRITY_FRAME_CHECKS = (
+    'lonely_cells_in_S',
+    'num_mothers_buds_in_S',
+    'mothers_with_multiple_buds',
+    'buds_gen_num_nonzero',
+    'mothers_gen_num_less_than_one',
+    'buds_in_G1',
+    'cells_in_S_rel_ID_less_than_one',
+    'ID_rel_ID_mismatches'
+)
+
+# Checks performed on the entire timelapse
+CCA_INTEGRITY_GLOBAL_CHECKS = ('cycles_without_G1',)
+
+CCA_INTEGRITY_VIOLATIONS_COLUMNS = [
+    'check', 'frame_i', 'Cell_ID', 'relative_ID', 
+    'relative_ID_of_relative_ID', 'generation_num', 'num_mothers_in_S', 
+    'num_buds'
+]
+
+def _get_cca_violations_table(check, df):
+    violations = df.reindex(columns=CCA_INTEGRITY_VIOLATIONS_COLUMNS)
+    violations['check'] = check
+    return violations
+
+def _get_long_cca_df(global_cca_df):
+    cols = [
+        'cell_cycle_stage', 'relationship', 'relative_ID', 'generation_num', 
+        'is_history_known'
+    ]
+    cols = [col for col in cols if col in global_cca_df.columns]
+    long_cca_df = global_cca_df[cols].reset_index()
+    return long_cca_df
+
+def check_cca_integrity_frames(global_cca_df, frames_IDs=None):
+    """Check the cell cycle annotations of all the frames at once.
+
+    Parameters
+    ----------
+    global_cca_df : pd.DataFrame
+        Cell cycle annotations with ['frame_i', 'Cell_ID'] as index.
+    frames_IDs : dict, optional
+        Dictionary of {frame_i: IDs existing in the segmentation masks}. 
+        If None, the IDs in `global_cca_df` are considered the existing 
+        ones. Default is None
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per violation with columns 
+        `CCA_INTEGRITY_VIOLATIONS_COLUMNS`. The 'check' column is one of 
+        `CCA_INTEGRITY_FRAME_CHECKS`. Rows are sorted by frame and then 
+        by check order.
+    """
+    df = _get_long_cca_df(global_cca_df)
+    df_S = df[df['cell_cycle_stage'] == 'S']
+    S_buds = df_S[df_S['relationship'] == 'bud']
+    S_moths = df_S[df_S['relationship'] == 'mother']
+    
+    violations = []
+    
+    # Cells in S whose relative_ID does not exist
+    if frames_IDs is None:
+        existing = df[['frame_i', 'Cell_ID']]
+    else:
+        existing = pd.DataFrame({
+            'frame_i': np.concatenate([
+                np.full(len(IDs), frame_i, dtype=np.int64) 
+                for frame_i, IDs in frames_IDs.items()
+            ] or [np.zeros(0, dtype=np.int64)]),
+            'Cell_ID': np.concatenate([
+                np.asarray(IDs, dtype=np.int64) 
+                for IDs in frames_IDs.values()
+            ] or [np.zeros(0, dtype=np.int64)])
+        })
+    existing = existing.rename(columns={'Cell_ID': 'relative_ID'})
+    existing['_rel_ID_exists'] = True
+    df_S_rel = df_S.merge(existing, on=['frame_i', 'relative_ID'], how='left')
+    lonely = df_S_rel[df_S_rel['_rel_ID_exists'].isna().to_numpy()]
+    violations.append(_get_cca_violations_table('lonely_cells_in_S', lonely))
+    
+    # Number of mothers in S different from number of buds
+    counts = pd.DataFrame({
+        'num_mothers_in_S': S_moths.groupby('frame_i').size(),
+        'num_buds': S_buds.groupby('frame_i').size()
+    }).fillna(0).astype(int)
+    counts = counts[counts['num_mothers_in_S'] != counts['num_buds']]
+    violations.append(_get_cca_violations_table(
+        'num_mothers_buds_in_S', counts.reset_index()
+    ))
+    
+    # Mothers with multiple buds (one row per additional bud like 
+    # `CcaIntegrityChecker.get_mother_IDs_with_multiple_buds`)
+    duplicated = S_buds.duplicated(['frame_i', 'relative_ID'])
+    multiple_buds = S_buds.loc[duplicated, ['frame_i', 'relative_ID']]
+    multiple_buds = multiple_buds.rename(columns={'relative_ID': 'Cell_ID'})
+    violations.append(_get_cca_violations_table(
+        'mothers_with_multiple_buds', multiple_buds
+    ))
+    
+    violations.append(_get_cca_violations_table(
+        'buds_gen_num_nonzero', S_buds[S_buds['generation_num'] != 0]
+    ))
+    violations.append(_get_cca_violations_table(
+        'mothers_gen_num_less_than_one', S_moths[S_moths['generation_num'] < 1]
+    ))
+    
+    # NOTE: buds must be in S (at division the bud becomes a mother)
+    buds_G1 = df[
+        (df['relationship'] == 'bud') & (df['cell_cycle_stage'] == 'G1')
+    ]
+    violations.append(_get_cca_violations_table('buds_in_G1', buds_G1))
+    
+    violations.append(_get_cca_violations_table(
+        'cells_in_S_rel_ID_less_than_one', df_S[df_S['relative_ID'] < 1]
+    ))
+    
+    # Self-join on (frame_i, relative_ID) to get the relative of the relative
+    relatives = df[['frame_i', 'Cell_ID', 'relative_ID']].rename(columns={
+        'Cell_ID': 'relative_ID', 'relative_ID': 'relative_ID_of_relative_ID'
+    })
+    df_S_rel = df_S.merge(relatives, on=['frame_i', 'relative_ID'])
+    mismatches = df_S_rel[
+        df_S_rel['relative_ID_of_relative_ID'] != df_S_rel['Cell_ID']
+    ]
+    violations.append(_get_cca_violations_table(
+        'ID_rel_ID_mismatches', mismatches
+    ))
+    
+    violations = pd.concat(violations, ignore_index=True)
+    checks_order = {
+        check: i for i, check in enumerate(CCA_INTEGRITY_FRAME_CHECKS)
+    }
+    violations['_check_order'] = violations['check'].map(checks_order)
+    violations = (
+        violations.sort_values(['frame_i', '_check_order'], kind='stable')
+        .drop(columns='_check_order')
+        .reset_index(drop=True)
+    )
+    return violations
+
+def get_cca_cycles_without_G1(global_cca_df):
+    """Get the cell cycles (Cell_ID, generation_num) of mother cells with 
+    known history that do not have any frame in G1.
+
+    Parameters
+    ----------
+    global_cca_df : pd.DataFrame
+        Cell cycle annotations with ['frame_i', 'Cell_ID'] as index.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per violation with columns 
+        `CCA_INTEGRITY_VIOLATIONS_COLUMNS` (check is 'cycles_without_G1' 
+        and frame_i is the first frame of the cycle).
+    """
+    df = _get_long_cca_df(global_cca_df)
+    df = df[
+        (df['relationship'] == 'mother') & (df['is_history_known'] > 0)
+    ]
+    df = df.assign(_is_G1=(df['cell_cycle_stage'] == 'G1').to_numpy())
+    grouped_cycles = df.groupby(['Cell_ID', 'generation_num'])
+    cycles = grouped_cycles.agg(
+        _has_G1=('_is_G1', 'any'), frame_i=('frame_i', 'min')
+    )
+    cycles_without_G1 = cycles[~cycles['_has_G1']].reset_index()
+    return _get_cca_violations_table('cycles_without_G1', cycles_without_G1)
+
+def _reduce_hashes_per_frame(hashes, frames, lengths):
+    hashes_sums = np.zeros(len(frames), dtype=np.uint64)
+    non_empty = lengths > 0
+    if hashes.size > 0:
+        offsets = np.cumsum(lengths) - lengths
+        hashes_sums[non_empty] = np.add.reduceat(hashes, offsets[non_empty])
+    return hashes_sums
+
+def _get_cca_dfs_fingerprints(
+        global_cca_df, frames, lengths, frames_IDs=None
+    ):
+    lengths = np.asarray(lengths)
+    cols = [
+        col for col in 
+        ('cell_cycle_stage', 'relationship', 'relative_ID', 
+         'generation_num', 'is_history_known')
+        if col in global_cca_df.columns
+    ]
+    # Rows hashes are summed per frame (frames are contiguous in 
+    # `global_cca_df`) so that we hash everything in one vectorized pass
+    hashes = pd.util.hash_pandas_object(
+        global_cca_df[cols], index=True
+    ).to_numpy()
+    fingerprints = zip(lengths, _reduce_hashes_per_frame(
+        hashes, frames, lengths
+    ))
+    if frames_IDs is None:
+        return dict(zip(frames, fingerprints))
+    
+    IDs_lengths = np.array([len(frames_IDs[frame_i]) for frame_i in frames])
+    IDs = np.concatenate(
+        [np.asarray(frames_IDs[frame_i], dtype=np.int64) for frame_i in frames]
+        or [np.zeros(0, dtype=np.int64)]
+    )
+    IDs_hashes = _reduce_hashes_per_frame(
+        pd.util.hash_array(IDs), frames, IDs_lengths
+    )
+    fingerprints = zip(fingerprints, IDs_lengths, IDs_hashes)
+    return dict(zip(frames, fingerprints))
+
+class VideoCcaIntegrityChecker:
+    """Check the integrity of the cell cycle annotations of all the frames 
+    at once (see `check_cca_integrity_frames`), re-checking only the frames 
+    that changed since the previous call of `check`.
+    """
+    def __init__(self):
+        self._frames_fingerprints = {}
+        self._frames_violations = {}
+        self._global_violations = None
+        self.checked_frames = []
+    
+    def check(self, cca_dfs, frames_IDs=None, check_globally=True):
+        """Check the annotations.
+
+        Parameters
+        ----------
+        cca_dfs : dict
+            Dictionary of {frame_i: cca_df} where cca_df is indexed by 
+            Cell_ID.
+        frames_IDs : dict, optional
+            Dictionary of {frame_i: IDs existing in the segmentation masks}. 
+            If None, the IDs of the cca_dfs are considered the existing 
+            ones. Default is None
+        check_globally : bool, optional
+            If True, also perform the checks in 
+            `CCA_INTEGRITY_GLOBAL_CHECKS`. Default is True
+
+        Returns
+        -------
+        pd.DataFrame
+            Violations table (see `check_cca_integrity_frames`). Per frame 
+            violations come first, then the global ones.
+        """
+        frames = list(cca_dfs.keys())
+        global_cca_df = None
+        fingerprints = {}
+        if frames:
+            global_cca_df = pd.concat(
+                cca_dfs.values(), keys=frames, names=['frame_i']
+            )
+            fingerprints = _get_cca_dfs_fingerprints(
+                global_cca_df, frames, 
+                [len(cca_df) for cca_df in cca_dfs.values()], 
+                frames_IDs=frames_IDs
+            )
+        
+        changed_frames = [
+            frame_i for frame_i in frames
+            if self._frames_fingerprints.get(frame_i) != fingerprints[frame_i]
+        ]
+        removed_frames = [
+            frame_i for frame_i in self._frames_fingerprints 
+            if frame_i not in cca_dfs
+        ]
+        for frame_i in removed_frames:
+            self._frames_fingerprints.pop(frame_i)
+            self._frames_violations.pop(frame_i, None)
+        
+        self.checked_frames = changed_frames
+        if changed_frames:
+            changed_cca_df = global_cca_df
+            if len(changed_frames) < len(frames):
+                frames_col = global_cca_df.index.get_level_values('frame_i')
+                changed_cca_df = global_cca_df[
+                    frames_col.isin(changed_frames)
+                ]
+            changed_frames_IDs = None
+            if frames_IDs is not None:
+                changed_frames_IDs = {
+                    frame_i: frames_IDs[frame_i] for frame_i in changed_frames
+                }
+            violations = check_cca_integrity_frames(
+                changed_cca_df, frames_IDs=changed_frames_IDs
+            )
+            grouped = dict(list(violations.groupby('frame_i')))
+            for frame_i in changed_frames:
+                self._frames_fingerprints[frame_i] = fingerprints[frame_i]
+                self._frames_violations[frame_i] = grouped.get(frame_i)
+        
+        all_violations = [
+            self._frames_violations[frame_i] 
+            for frame_i in sorted(self._frames_violations)
+            if self._frames_violations[frame_i] is not None
+        ]
+        
+        if check_globally:
+            is_global_check_needed = (
+                changed_frames or removed_frames 
+                or self._global_violations is None
+            )
+            if is_global_check_needed and global_cca_df is None:
+                self._global_violations = None
+            elif is_global_check_needed:
+                self._global_violations = get_cca_cycles_without_G1(
+                    global_cca_df
+                )
+            if self._global_violations is not None:
+                all_violations.append(self._global_violations)
+        
+        if not all_violations:
+            return pd.DataFrame(columns=CCA_INTEGRITY_VIOLATIONS_COLUMNS)
+        
+        return pd.concat(all_violations, ignore_index=True)
+
+
+def encode_labels_delta(old_lab, new_lab):
+    """Encode the difference between two label images as the bounding box 
+    of the changed voxels and a run-length encoding (RLE) of the values 
+    of `old_lab` at the changed voxels.
+
+    Parameters
+    ----------
+    old_lab : numpy.ndarray
+        Label image to be recovered with `decode_labels_delta`.
+    new_lab : numpy.ndarray
+        Reference label image with the same shape as `old_lab`.
+
+    Returns
+    -------
+    dict
+        Dictionary with keys 'bbox' (tuple of slices or None if 
+        nothing changed), 'starts', 'lengths' and 'values' of the runs 
+        of voxels in the flattened bounding box.
+    """
+    changed = old_lab != new_lab
+    bbox_slices = []
+    for axis in range(changed.ndim):
+        other_axes = tuple(a for a in range(changed.ndim) if a != axis)
+        changed_along_axis = np.flatnonzero(changed.any(axis=other_axes))
+        if len(changed_along_axis) == 0:
+            return {'bbox': None}
+        bbox_slices.append(
+            slice(changed_along_axis[0], changed_along_axis[-1]+1)
+        )
+    bbox = tuple(bbox_slices)
+    
+    changed_idx = np.flatnonzero(changed[bbox])
+    changed_values = old_lab[bbox].ravel()[changed_idx]
+    
+    # A run ends where the voxels are not contiguous or the value changes
+    run_breaks = np.flatnonzero(
+        (np.diff(changed_idx) != 1) | (np.diff(changed_values) != 0)
+    ) + 1
+    run_starts_idx = np.concatenate(([0], run_breaks))
+    lengths = np.diff(np.concatenate((run_starts_idx, [len(changed_idx)])))
+    delta = {
+        'bbox': bbox,
+        'starts': changed_idx[run_starts_idx],
+        'lengths': lengths.astype(np.int32),
+        'values': changed_values[run_starts_idx]
+    }
+    return delta
+
+def decode_labels_delta(new_lab, delta):
+    """Recover in-place the label image encoded by `encode_labels_delta` 
+    from the reference `new_lab`.
+    """
+    bbox = delta['bbox']
+    if bbox is None:
+        return new_lab
+    
+    lengths = delta['lengths']
+    runs_offsets = np.cumsum(lengths) - lengths
+    changed_idx = (
+        np.arange(lengths.sum()) 
+        + np.repeat(delta['starts'] - runs_offsets, lengths)
+    )
+    bbox_lab = new_lab[bbox]
+    coords = np.unravel_index(changed_idx, bbox_lab.shape)
+    bbox_lab[coords] = np.repeat(delta['values'], lengths)
+    return new_lab
+
+def _get_nbytes(obj):
+    if obj is None:
+        return 0
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    if isinstance(obj, dict):
+        return sum(_get_nbytes(value) for value in obj.values())
+    try:
+        return 64*len(obj)
+    except TypeError:
+        return 64
+
+class _FrameUndoRedoStates:
+    """List-like view of the undo/redo states of a single frame stored in 
+    `UndoRedoStatesStore`. Index 0 is the most recent state.
+    """
+    def __init__(self, store, frame_i):
+        self._store = store
+        self._frame_i = frame_i
+    
+    def _entries(self):
+        return self._store._frames.get(self._frame_i, [])
+    
+    def insert(self, index, state):
+        if index != 0:
+            raise IndexError(
+                'Undo/redo states can only be inserted at index 0'
+            )
+        self._store._insert(self._frame_i, state)
+    
+    def pop(self, index=-1):
+        if index != -1:
+            raise IndexError(
+                'Only the oldest undo/redo state can be removed'
+            )
+        return self._store._pop_oldest(self._frame_i)
+    
+    def __getitem__(self, index):
+        return self._store._get_state(self._frame_i, index)
+    
+    def __len__(self):
+        return len(self._entries())
+    
+    def __bool__(self):
+        return len(self) > 0
+
+class UndoRedoMemoryBudget:
+    """Memory budget shared by the `UndoRedoStatesStore` of all the loaded 
+    Positions.
+
+    The budget keeps track of the memory used by all the stores and of 
+    the order in which their frames were used. When the total memory 
+    exceeds `max_bytes` the oldest states of the least recently used 
+    frames (of any store) are removed first.
+    """
+    def __init__(self, max_bytes=2*1024**3):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # (store, frame_i) ordered from the least to the most recently used
+        self._frames = OrderedDict()
+    
+    def touch(self, store, frame_i):
+        key = (store, frame_i)
+        self._frames[key] = None
+        self._frames.move_to_end(key)
+    
+    def discard(self, store, frame_i):
+        self._frames.pop((store, frame_i), None)
+    
+    def evict(self, keep_store=None, keep_frame_i=None):
+        """Remove the oldest states of the least recently used frames until 
+        the memory used is below `max_bytes`. The most recent state of 
+        frame `keep_frame_i` of `keep_store` is never removed.
+        """
+        keep_key = (keep_store, keep_frame_i)
+        for key in list(self._frames.keys()):
+            if self.nbytes <= self.max_bytes:
+                return
+            if key == keep_key:
                 continue
-            
-            # ID is in S but its relative_ID does not exist in lab
-            lonely_cells_in_S.append(ID)
+            store, frame_i = key
+            while frame_i in store._frames:
+                if self.nbytes <= self.max_bytes:
+                    break
+                store._remove_oldest(frame_i)
+        
+        if keep_store is None:
+            return
+        
+        entries = keep_store._frames.get(keep_frame_i, [])
+        while len(entries) > 1 and self.nbytes > self.max_bytes:
+            keep_store._remove_oldest(keep_frame_i)
+
+class UndoRedoStatesStore:
+    """Bounded-memory store of the GUI undo/redo states of every frame.
+
+    Each state is a dictionary with the 'labels' and the other annotations 
+    of the frame (see `guiWin.addCurrentState`). Only the most recent 
+    state of each frame keeps the full labels array, while the older ones 
+    store only the difference with the next more recent state 
+    (see `encode_labels_delta`). This includes the states storing only 
+    the zoomed-in region of the labels (i.e., with a 'crop_slice') when 
+    the next more recent state has the same 'crop_slice' or no 
+    'crop_slice'.
+    
+    The memory is limited by `budget` (see `UndoRedoMemoryBudget`), which 
+    can be shared between the stores of multiple Positions. When the 
+    memory used exceeds the budget the oldest states of the least 
+    recently used frames are removed first.
+
+    Indexing with a frame index returns a list-like object that supports 
+    `insert(0, state)`, `pop(-1)`, indexing and `len`. Assigning an empty 
+    list to a frame index removes all its states.
+    """
+    def __init__(
+            self, num_frames, max_bytes=2*1024**3, max_states_per_frame=50,
+            budget=None
+        ):
+        self.num_frames = num_frames
+        if budget is None:
+            budget = UndoRedoMemoryBudget(max_bytes=max_bytes)
+        self.budget = budget
+        self.max_states_per_frame = max_states_per_frame
+        self.nbytes = 0
+        # Map frame_i to list of entries, most recent first
+        self._frames = {}
+    
+    @property
+    def max_bytes(self):
+        return self.budget.max_bytes
+    
+    def __len__(self):
+        return self.num_frames
+    
+    def __getitem__(self, frame_i):
+        if frame_i < 0:
+            frame_i += self.num_frames
+        return _FrameUndoRedoStates(self, frame_i)
+    
+    def __setitem__(self, frame_i, states):
+        if frame_i < 0:
+            frame_i += self.num_frames
+        self._clear_frame(frame_i)
+        for state in reversed(list(states)):
+            self._insert(frame_i, state)
+    
+    def _add_nbytes(self, nbytes):
+        self.nbytes += nbytes
+        self.budget.nbytes += nbytes
+    
+    def _clear_frame(self, frame_i):
+        entries = self._frames.pop(frame_i, [])
+        for entry in entries:
+            self._add_nbytes(-entry['nbytes'])
+        self.budget.discard(self, frame_i)
+    
+    def _touch(self, frame_i):
+        if frame_i in self._frames:
+            self.budget.touch(self, frame_i)
+    
+    @staticmethod
+    def _get_delta_ref_slice(prev_state, state):
+        """Determine if the labels of `prev_state` can be stored as 
+        difference to the labels of the more recent `state`.
+
+        Returns
+        -------
+        tuple
+            (is_delta_possible, ref_slice) where `ref_slice` is the slice 
+            of the labels of `state` to compare with the labels of 
+            `prev_state` (None for the entire labels).
+        """
+        prev_crop_slice = prev_state.get('crop_slice')
+        crop_slice = state.get('crop_slice')
+        if prev_crop_slice == crop_slice:
+            ref_slice = None
+            ref_labels = state['labels']
+        elif crop_slice is None:
+            ref_slice = prev_crop_slice
+            ref_labels = state['labels'][ref_slice]
+        else:
+            return False, None
+        
+        is_delta_possible = ref_labels.shape == prev_state['labels'].shape
+        return is_delta_possible, ref_slice
+    
+    def _insert(self, frame_i, state):
+        entries = self._frames.setdefault(frame_i, [])
+        self._touch(frame_i)
+        
+        # Store the previous most recent state as difference to the new one
+        if entries and entries[0]['delta'] is None:
+            prev_entry = entries[0]
+            prev_state = prev_entry['state']
+            is_delta_possible, ref_slice = self._get_delta_ref_slice(
+                prev_state, state
+            )
+            if is_delta_possible:
+                ref_labels = state['labels']
+                if ref_slice is not None:
+                    ref_labels = ref_labels[ref_slice]
+                delta = encode_labels_delta(prev_state['labels'], ref_labels)
+                delta['ref_slice'] = ref_slice
+                prev_state = {
+                    key: value for key, value in prev_state.items() 
+                    if key != 'labels'
+                }
+                self._add_nbytes(-prev_entry['nbytes'])
+                prev_entry['state'] = prev_state
+                prev_entry['delta'] = delta
+                prev_entry['nbytes'] = (
+                    _get_nbytes(prev_state) + _get_nbytes(delta)
+                )
+                self._add_nbytes(prev_entry['nbytes'])
+        
+        entry = {'state': state, 'delta': None, 'nbytes': _get_nbytes(state)}
+        entries.insert(0, entry)
+        self._add_nbytes(entry['nbytes'])
+        
+        while len(entries) > self.max_states_per_frame:
+            self._remove_oldest(frame_i)
+        
+        self.budget.evict(keep_store=self, keep_frame_i=frame_i)
+    
+    def _pop_oldest(self, frame_i):
+        entries = self._frames.get(frame_i)
+        if not entries:
+            raise IndexError('pop from empty list')
+        
+        state = self._get_state(frame_i, len(entries)-1)
+        self._remove_oldest(frame_i)
+        return state
+    
+    def _remove_oldest(self, frame_i):
+        # No other state depends on the oldest one, hence it can be 
+        # removed without decoding anything
+        entries = self._frames[frame_i]
+        entry = entries.pop(-1)
+        self._add_nbytes(-entry['nbytes'])
+        if not entries:
+            self._frames.pop(frame_i)
+            self.budget.discard(self, frame_i)
+    
+    def _get_state(self, frame_i, index):
+        entries = self._frames.get(frame_i, [])
+        if index < 0:
+            index += len(entries)
+        if index < 0 or index >= len(entries):
+            raise IndexError('undo/redo state index out of range')
+        
+        self._touch(frame_i)
+        
+        entry = entries[index]
+        if entry['delta'] is None:
+            return entry['state']
+        
+        # Find the closest more recent state with full labels and apply the 
+        # differences from there
+        start_index = index
+        while entries[start_index]['delta'] is not None:
+            start_index -= 1
+        labels = entries[start_index]['state']['labels'].copy()
+        for i in range(start_index+1, index+1):
+            delta = entries[i]['delta']
+            ref_slice = delta.get('ref_slice')
+            if ref_slice is not None:
+                labels = labels[ref_slice].copy()
+            labels = decode_labels_delta(labels, delta)
         
-        return lonely_cells_in_S
\ No newline at end of file
+        state = entry['state'].copy()
+        state['labels'] = labels
+        return state
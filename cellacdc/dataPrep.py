@@ -862,10 +862,10 @@ class dataPrepWin(QMainWindow):
                 df['x_centroid'] -= x0
                 df['y_centroid'] -= y0
                 try:
-                    df.to_csv(acdc_output_csv_path)
+                    load.save_acdc_df_file(df, acdc_output_csv_path)
                 except PermissionError:
                     self.permissionErrorCritical(acdc_output_csv_path)
-                    df.to_csv(acdc_output_csv_path)
+                    load.save_acdc_df_file(df, acdc_output_csv_path)
         except Exception as e:
             pass
     
@@ -1400,7 +1400,8 @@ class dataPrepWin(QMainWindow):
                 posData = load.loadData(file_path, user_ch_name, QParent=self)
                 posData.getBasenameAndChNames()
                 posData.buildPaths()
-                posData.loadImgData()
+                # Cropping overwrites the image files --> do not memory-map
+                posData.loadImgData(memmap=False)
                 posData.loadOtherFiles(
                     load_segm_data=True,
                     load_acdc_df=True,
@@ -24,7 +24,6 @@ import math
 import numpy as np
 import pandas as pd
 import matplotlib
-import scipy.optimize
 import scipy.interpolate
 import scipy.ndimage
 import skimage
@@ -75,6 +74,7 @@ from . import load, prompts, apps, workers, html_utils
 from . import core, myutils, dataPrep, widgets
 from . import _warnings, issues_url
 from . import measurements, printl
+from . import _core
 from . import colors, filters, annotate
 from . import user_manual_url
 from . import recentPaths_path, settings_folderpath, settings_csv_path
@@ -351,112 +351,23 @@ class saveDataWorker(QObject):
         self.mutex.unlock()
 
     def addMetrics_acdc_df(self, stored_df, rp, frame_i, lab, posData):
-        yx_pxl_to_um2 = posData.PhysicalSizeY*posData.PhysicalSizeX
-        vox_to_fl_3D = (
-            posData.PhysicalSizeY*posData.PhysicalSizeX*posData.PhysicalSizeZ
-        )
-
-        manualBackgrLab = posData.manualBackgroundLab
-        manualBackgrRp = None
-        if manualBackgrLab is not None:
-            manualBackgrRp = skimage.measure.regionprops(manualBackgrLab)
-        isZstack = posData.SizeZ > 1
-        isSegm3D = self.mainWin.isSegm3D
-        all_channels_metrics = self.mainWin.metricsToSave
-        size_metrics_to_save = self.mainWin.sizeMetricsToSave
-        regionprops_to_save = self.mainWin.regionPropsToSave
-        metrics_func = self.mainWin.metrics_func
-        custom_func_dict = self.mainWin.custom_func_dict
-        bkgr_metrics_params = self.mainWin.bkgr_metrics_params
-        
-        foregr_metrics_params = self.mainWin.foregr_metrics_params
-        concentration_metrics_params = self.mainWin.concentration_metrics_params
-        custom_metrics_params = self.mainWin.custom_metrics_params
-
-        # Pre-populate columns with zeros
-        all_columns = list(size_metrics_to_save)
-        for channel, metrics in all_channels_metrics.items():
-            all_columns.extend(metrics)
-        all_columns.extend(regionprops_to_save)
-
-        df_shape = (len(stored_df), len(all_columns))
-        data = np.zeros(df_shape)
-        df = pd.DataFrame(data=data, index=stored_df.index, columns=all_columns)
-        df = df.combine_first(stored_df)
-
         # Check if z-slice is present for 3D z-stack data
         proceed = self._check_zSlice(posData, frame_i)
         if not proceed:
             return
 
-        df = measurements.add_size_metrics(
-            df, rp, size_metrics_to_save, isSegm3D, yx_pxl_to_um2, 
-            vox_to_fl_3D
-        )
-        
-        # Get background masks
-        autoBkgr_masks = measurements.get_autoBkgr_mask(
-            lab, isSegm3D, posData, frame_i
-        )
-        # self._emitSigDebug((lab, frame_i, autoBkgr_masks))
-        
-        autoBkgr_mask, autoBkgr_mask_proj = autoBkgr_masks
-        dataPrepBkgrROI_mask = measurements.get_bkgrROI_mask(posData, isSegm3D)
-
-        # Iterate channels
-        iter_channels = zip(posData.loadedChNames, posData.fluo_data_dict.items())
-        for channel, (filename, channel_data) in iter_channels:
-            foregr_img = channel_data[frame_i]
-
-            # Get the z-slice if we have z-stacks
-            z = posData.zSliceSegmentation(filename, frame_i)
-            
-            # Get the background data
-            bkgr_data = measurements.get_bkgr_data(
-                foregr_img, posData, filename, frame_i, autoBkgr_mask, z,
-                autoBkgr_mask_proj, dataPrepBkgrROI_mask, isSegm3D, lab
-            )
-            
-            foregr_data = measurements.get_foregr_data(foregr_img, isSegm3D, z)
-
-            # Compute background values
-            df = measurements.add_bkgr_values(
-                df, bkgr_data, bkgr_metrics_params[channel], metrics_func,
-                manualBackgrRp=manualBackgrRp, foregr_data=foregr_data
-            )
-
-            # Iterate objects and compute foreground metrics
-            df = measurements.add_foregr_metrics(
-                df, rp, channel, foregr_data, foregr_metrics_params[channel], 
-                metrics_func, custom_metrics_params[channel], isSegm3D, 
-                lab, foregr_img, manualBackgrRp=manualBackgrRp,
-                customMetricsCritical=self.customMetricsCritical,
-                z_slice=z
-            )
-
-        df = measurements.add_concentration_metrics(
-            df, concentration_metrics_params
+        df = measurements.add_metrics_acdc_df(
+            stored_df, rp, frame_i, lab, posData, self.mainWin.isSegm3D, 
+            self.mainWin.metricsToSave, self.mainWin.sizeMetricsToSave, 
+            self.mainWin.regionPropsToSave, self.mainWin.metrics_func, 
+            self.mainWin.bkgr_metrics_params, 
+            self.mainWin.foregr_metrics_params, 
+            self.mainWin.concentration_metrics_params, 
+            self.mainWin.custom_metrics_params, 
+            logger_func=self.progress.emit,
+            customMetricsCritical=self.customMetricsCritical,
+            regionPropsCritical=self.regionPropsCritical
         )
-
-        # Add region properties
-        try:
-            df, rp_errors = measurements.add_regionprops_metrics(
-                df, lab, regionprops_to_save, logger_func=self.progress.emit
-            )
-            if rp_errors:
-                print('')
-                self.progress.emit(
-                    'WARNING: Some objects had the following errors:\n'
-                    f'{rp_errors}\n'
-                    'Region properties with errors were saved as `Not A Number`.'
-                )
-        except Exception as error:
-            traceback_format = traceback.format_exc()
-            self.regionPropsCritical.emit(traceback_format, str(error))
-
-        # Remove 0s columns
-        df = df.loc[:, (df != -2).any(axis=0)]
-
         return df
 
     def _dfEvalEquation(self, df, newColName, expr):
@@ -492,115 +403,79 @@ class saveDataWorker(QObject):
         return df
 
     def addCombineMetrics_acdc_df(self, posData, df):
-        # Add channel specifc combined metrics (from equations and 
-        # from user_path_equations sections)
-        config = posData.combineMetricsConfig
-        for chName in posData.loadedChNames:
-            metricsToSkipChannel = self.mainWin.metricsToSkip.get(chName, [])
-            posDataEquations = config['equations']
-            userPathChEquations = config['user_path_equations']
-            for newColName, equation in posDataEquations.items():
-                if not newColName.startswith(chName):
-                    continue
-                if newColName in metricsToSkipChannel:
-                    continue
-                self._dfEvalEquation(df, newColName, equation)
-            for newColName, equation in userPathChEquations.items():
-                if not newColName.startswith(chName):
-                    continue
-                if newColName in metricsToSkipChannel:
-                    continue
-                self._dfEvalEquation(df, newColName, equation)
-
-        # Add mixed channels combined metrics
-        mixedChannelsEquations = config['mixed_channels_equations']
-        for newColName, equation in mixedChannelsEquations.items():
-            if newColName in self.mainWin.mixedChCombineMetricsToSkip:
-                continue
-            cols = re.findall(r'[A-Za-z0-9]+_[A-Za-z0-9_]+', equation)
-            if all([col in df.columns for col in cols]):
-                self._dfEvalEquation(df, newColName, equation)
-    
-    def addVelocityMeasurement(self, acdc_df, prev_lab, lab, posData):
-        if 'velocity_pixel' not in self.mainWin.sizeMetricsToSave:
-            return acdc_df
-        
-        if 'velocity_um' not in self.mainWin.sizeMetricsToSave:
-            spacing = None 
-        elif self.mainWin.isSegm3D:
-            spacing = np.array([
-                posData.PhysicalSizeZ, 
-                posData.PhysicalSizeY, 
-                posData.PhysicalSizeX
-            ])
-        else:
-            spacing = np.array([
-                posData.PhysicalSizeY, 
-                posData.PhysicalSizeX
-            ])
-        velocities_pxl, velocities_um = core.compute_twoframes_velocity(
-            prev_lab, lab, spacing=spacing
-        )
-        acdc_df['velocity_pixel'] = velocities_pxl
-        acdc_df['velocity_um'] = velocities_um
-        return acdc_df
+        measurements.add_combine_metrics_acdc_df(
+            df, posData.combineMetricsConfig, posData.loadedChNames, 
+            metricsToSkip=self.mainWin.metricsToSkip, 
+            mixedChCombineMetricsToSkip=self.mainWin.mixedChCombineMetricsToSkip,
+            eval_equation_func=self._dfEvalEquation
+        )
+    
+    def addVelocityMeasurements(self, acdc_dfs, posData):
+        segm_data = [
+            data_dict['labels'] for data_dict in posData.allData_li
+        ]
+        measurements.add_video_velocity_measurements(
+            acdc_dfs, segm_data, posData, self.mainWin.isSegm3D, 
+            self.mainWin.sizeMetricsToSave
+        )
 
     def addVolumeMetrics(self, df, rp, posData):
-        PhysicalSizeY = posData.PhysicalSizeY
-        PhysicalSizeX = posData.PhysicalSizeX
-        yx_pxl_to_um2 = PhysicalSizeY*PhysicalSizeX
-        vox_to_fl_3D = PhysicalSizeY*PhysicalSizeX*posData.PhysicalSizeZ
-
-        init_list = [-2]*len(rp)
-        IDs = init_list.copy()
-        IDs_vol_vox = init_list.copy()
-        IDs_area_pxl = init_list.copy()
-        IDs_vol_fl = init_list.copy()
-        IDs_area_um2 = init_list.copy()
-        if self.mainWin.isSegm3D:
-            IDs_vol_vox_3D = init_list.copy()
-            IDs_vol_fl_3D = init_list.copy()
-
-        for i, obj in enumerate(rp):
-            IDs[i] = obj.label
-            IDs_vol_vox[i] = obj.vol_vox
-            IDs_vol_fl[i] = obj.vol_fl
-            IDs_area_pxl[i] = obj.area
-            IDs_area_um2[i] = obj.area*yx_pxl_to_um2
-            if self.mainWin.isSegm3D:
-                IDs_vol_vox_3D[i] = obj.area
-                IDs_vol_fl_3D[i] = obj.area*vox_to_fl_3D
-
-        df['cell_area_pxl'] = pd.Series(data=IDs_area_pxl, index=IDs, dtype=float)
-        df['cell_vol_vox'] = pd.Series(data=IDs_vol_vox, index=IDs, dtype=float)
-        df['cell_area_um2'] = pd.Series(data=IDs_area_um2, index=IDs, dtype=float)
-        df['cell_vol_fl'] = pd.Series(data=IDs_vol_fl, index=IDs, dtype=float)
-        if self.mainWin.isSegm3D:
-            df['cell_vol_vox_3D'] = pd.Series(data=IDs_vol_vox_3D, index=IDs, dtype=float)
-            df['cell_vol_fl_3D'] = pd.Series(data=IDs_vol_fl_3D, index=IDs, dtype=float)
-
-        return df
+        return measurements.add_volume_metrics(
+            df, rp, posData, self.mainWin.isSegm3D
+        )
 
     def addAdditionalMetadata(self, posData: load.loadData, df: pd.DataFrame):
-        for col, val in posData.additionalMetadataValues().items():
-            if col in df.columns:
-                df.pop(col)
-            df.insert(0, col, val)
+        measurements.add_additional_metadata(
+            posData.additionalMetadataValues(), df
+        )
+
+    def saveSegmData(self, posData, segm_npz_path, saved_segm_data, frames_i):
+        """Save the segmentation masks (see `load.save_segm_data`). Only 
+        `frames_i`, i.e., the frames edited since last save, are written to 
+        the chunked segmentation file (None to write all the frames).
+        """
+        is_timelapse = posData.SizeT > 1
+        if not frames_i and frames_i is not None:
+            if os.path.exists(segm_npz_path):
+                return
+            frames_i = None
         
         try:
-            df.pop('time_minutes')
-        except Exception as e:
-            pass
-        try:
-            df.pop('time_hours')
-        except Exception as e:
-            pass
+            load.save_segm_data(
+                segm_npz_path, saved_segm_data, frames_i=frames_i, 
+                is_timelapse=is_timelapse
+            )
+        except Exception as err:
+            self.sigLog.emit(traceback.format_exc())
+            np.savez_compressed(segm_npz_path, np.squeeze(saved_segm_data))
+    
+    def _getMetricsSignature(self, posData, mode):
+        """Signature of the measurements settings. If it changes since the 
+        last save all the frames are measured again.
+        """
+        mainWin = self.mainWin
         try:
-            time_seconds = df.index.get_level_values('time_seconds')
-            df.insert(0, 'time_minutes', time_seconds/60)
-            df.insert(1, 'time_hours', time_seconds/3600)
-        except Exception as e:
-            pass
+            bkgrROIs = [
+                (tuple(roi.pos()), tuple(roi.size())) 
+                for roi in posData.bkgrROIs
+            ]
+            segmInfo_hash = None
+            if posData.segmInfo_df is not None:
+                segmInfo_hash = hash(
+                    pd.util.hash_pandas_object(posData.segmInfo_df)
+                    .values.tobytes()
+                )
+            signature = repr((
+                mainWin.save_metrics, mode, 
+                mainWin.metricsToSave, mainWin.sizeMetricsToSave, 
+                mainWin.regionPropsToSave, mainWin.metricsToSkip, 
+                posData.loadedChNames, posData.PhysicalSizeX, 
+                posData.PhysicalSizeY, posData.PhysicalSizeZ, 
+                posData.TimeIncrement, bkgrROIs, segmInfo_hash
+            ))
+        except Exception as err:
+            return None
+        return signature
 
     @workers.worker_exception_handler
     def run(self):
@@ -642,9 +517,18 @@ class saveDataWorker(QObject):
             acdc_output_csv_path = posData.acdc_output_csv_path
             last_tracked_i_path = posData.last_tracked_i_path
             end_i = self.mainWin.save_until_frame_i
+            # Only the frames edited since last save are written and 
+            # measured again (see `posData.setFramesEdited`)
+            saveEditVersion = posData.editVersion
+            editedFrames = None
+            if posData.savedEditVersion is not None:
+                editedFrames = posData.getFramesEditedSince(
+                    posData.savedEditVersion
+                )
             if end_i < len(posData.segm_data):
                 saved_segm_data = posData.segm_data
             else:
+                editedFrames = None
                 frame_shape = posData.segm_data.shape[1:]
                 segm_shape = (end_i+1, *frame_shape)
                 saved_segm_data = np.zeros(segm_shape, dtype=np.uint32)
@@ -670,6 +554,18 @@ class saveDataWorker(QObject):
 
             posData.setLoadedChannelNames()
             self.mainWin.initMetricsToSave(posData)
+            
+            # Frames not edited since they were last measured are not 
+            # measured again (their acdc_df is stored in savedAcdcDfCache)
+            metrics_signature = self._getMetricsSignature(posData, mode)
+            if metrics_signature != posData.savedMetricsSignature:
+                posData.savedAcdcDfCache = {}
+            editedFramesSet = None
+            if editedFrames is not None:
+                editedFramesSet = set(editedFrames)
+            num_reused_frames = 0
+            # Velocity of measured frames is added after the loop in one pass
+            measured_acdc_dfs = {}
 
             self.progress.emit(f'Saving {posData.relPath}')
             for frame_i, data_dict in enumerate(posData.allData_li[:end_i+1]):
@@ -683,9 +579,19 @@ class saveDataWorker(QObject):
                     break
                 
                 posData.lab = lab
+                # Velocity depends on the previous frame too
+                cache_key = (
+                    posData.getFrameEditVersion(frame_i), 
+                    posData.getFrameEditVersion(frame_i-1)
+                )
 
                 if posData.SizeT > 1:
-                    saved_segm_data[frame_i] = lab
+                    isFrameEdited = (
+                        editedFramesSet is None or frame_i in editedFramesSet
+                    )
+                    # Not edited frames are already in saved_segm_data
+                    if isFrameEdited:
+                        saved_segm_data[frame_i] = lab
                 else:
                     saved_segm_data = lab
                     if 'manualBackgroundLab' in data_dict:
@@ -702,6 +608,22 @@ class saveDataWorker(QObject):
 
                 if not np.any(lab):
                     continue
+                
+                cached = posData.savedAcdcDfCache.get(frame_i)
+                is_cache_valid = (
+                    cached is not None 
+                    and metrics_signature is not None
+                    and cached[0] == cache_key
+                )
+                if is_cache_valid:
+                    acdc_df_li.append(cached[1])
+                    keys.append((frame_i, posData.TimeIncrement*frame_i))
+                    num_reused_frames += 1
+                    t = time.perf_counter()
+                    exec_time = t - self.time_last_pbar_update
+                    self.progressBar.emit(1, -1, exec_time)
+                    self.time_last_pbar_update = t
+                    continue
 
                 # Build acdc_df and index it in each frame_i of acdc_df_li
                 try:
@@ -709,12 +631,6 @@ class saveDataWorker(QObject):
                     rp = data_dict['regionprops']
                     acdc_df['num_objects'] = len(acdc_df)
                     if save_metrics:
-                        if frame_i > 0:
-                            prev_data_dict = posData.allData_li[frame_i-1]
-                            prev_lab = prev_data_dict['labels']
-                            acdc_df = self.addVelocityMeasurement(
-                                acdc_df, prev_lab, lab, posData
-                            )
                         acdc_df = self.addMetrics_acdc_df(
                             acdc_df, rp, frame_i, lab, posData
                         )
@@ -722,6 +638,7 @@ class saveDataWorker(QObject):
                             self.progress.emit(f'Saving process aborted.')
                             self.finished.emit()
                             return
+                        measured_acdc_dfs[frame_i] = acdc_df
                     elif mode == 'Cell cycle analysis':
                         acdc_df = self.addVolumeMetrics(
                             acdc_df, rp, posData
@@ -729,18 +646,7 @@ class saveDataWorker(QObject):
                     acdc_df_li.append(acdc_df)
                     key = (frame_i, posData.TimeIncrement*frame_i)
                     keys.append(key)
-                except Exception as error:
-                    self.addMetricsCritical.emit(
-                        traceback.format_exc(), str(error)
-                    )
-                
-                try:
-                    if save_metrics and frame_i > 0:
-                        prev_data_dict = posData.allData_li[frame_i-1]
-                        prev_lab = prev_data_dict['labels']
-                        acdc_df = self.addVelocityMeasurement(
-                            acdc_df, prev_lab, lab, posData
-                        )
+                    posData.savedAcdcDfCache[frame_i] = (cache_key, acdc_df)
                 except Exception as error:
                     self.addMetricsCritical.emit(
                         traceback.format_exc(), str(error)
@@ -750,14 +656,37 @@ class saveDataWorker(QObject):
                 exec_time = t - self.time_last_pbar_update
                 self.progressBar.emit(1, -1, exec_time)
                 self.time_last_pbar_update = t
+            
+            # The acdc_dfs are modified in place, hence the cached ones too
+            try:
+                self.addVelocityMeasurements(measured_acdc_dfs, posData)
+            except Exception as error:
+                self.addMetricsCritical.emit(
+                    traceback.format_exc(), str(error)
+                )
 
-            # Save segmentation file
-            np.savez_compressed(segm_npz_path, np.squeeze(saved_segm_data))
+            # Save only the frames edited since last save to the 
+            # chunked segmentation file and export to .npz in the background
+            self.saveSegmData(
+                posData, segm_npz_path, saved_segm_data, editedFrames
+            )
             posData.segm_data = saved_segm_data
+            posData.savedEditVersion = saveEditVersion
             try:
                 os.remove(posData.segm_npz_temp_path)
             except Exception as e:
                 pass
+            
+            # Saved data is the new reference for the autosave journal. 
+            # Hold the lock so that an autosave running in the meantime 
+            # cannot append changes relative to the old journal state
+            try:
+                posData.setTempPaths(createFolder=False)
+                with load.get_autosave_journal_lock():
+                    load.remove_autosave_journal(posData.autosave_journal_path)
+                    posData.resetAutosaveJournalState()
+            except Exception as e:
+                pass
 
             if posData.segmInfo_df is not None:
                 try:
@@ -786,6 +715,13 @@ class saveDataWorker(QObject):
 
             posData.fluo_bkgrData_dict.pop(posData.filename)
 
+            if num_reused_frames > 0:
+                self.progress.emit(
+                    f'Measurements of {num_reused_frames} unchanged frames '
+                    'were re-used from last save.'
+                )
+            posData.savedMetricsSignature = metrics_signature
+
             if posData.SizeT > 1:
                 self.progress.emit('Almost done...')
                 self.progressBar.emit(0, 0, 0)
@@ -814,7 +750,9 @@ class saveDataWorker(QObject):
                         posData, acdc_output_csv_path, 
                         log_func=self.progress.emit
                     )
-                    all_frames_acdc_df.to_csv(acdc_output_csv_path)
+                    load.save_acdc_df_file(
+                        all_frames_acdc_df, acdc_output_csv_path
+                    )
                     posData.acdc_df = all_frames_acdc_df
                 except PermissionError:
                     err_msg = (
@@ -829,7 +767,9 @@ class saveDataWorker(QObject):
                     self.mutex.unlock()
 
                     # Save segmentation metadata
-                    all_frames_acdc_df.to_csv(acdc_output_csv_path)
+                    load.save_acdc_df_file(
+                        all_frames_acdc_df, acdc_output_csv_path
+                    )
                     posData.acdc_df = all_frames_acdc_df
                 except Exception as e:
                     self.mutex.lock()
@@ -972,6 +912,7 @@ class guiWin(QMainWindow):
         self.dataIsLoaded = False
         self.highlightedID = 0
         self.hoverLabelID = 0
+        self.currentLab2DDelIDs = frozenset()
         self.expandingID = -1
         self.count = 0
         self.isDilation = True
@@ -5261,6 +5202,7 @@ class guiWin(QMainWindow):
 
         self.update_rp()
         self.currentLab2D = lab_2D
+        self.currentLab2DDelIDs = frozenset()
         if self.labelsGrad.showLabelsImgAction.isChecked():
             self.img2.setImage(img=self.currentLab2D, autoLevels=False)
 
@@ -5326,6 +5268,7 @@ class guiWin(QMainWindow):
             posData.lab[yy, xx] = self.movingID
         
         self.currentLab2D = self.get_2Dlab(posData.lab)
+        self.currentLab2DDelIDs = frozenset()
         if self.labelsGrad.showLabelsImgAction.isChecked():
             self.img2.setImage(self.currentLab2D, autoLevels=False)
         
@@ -7739,6 +7682,8 @@ class guiWin(QMainWindow):
         for frame_i, cleared_lab in enumerate(cleared_segm_data):
             # Store change
             posData.allData_li[frame_i]['labels'] = cleared_lab
+            self.getRegionpropsCache(posData).invalidate(frame_i)
+            posData.setFramesEdited((frame_i,))
             # Get the rest of the stored metadata based on the new lab
             posData.frame_i = frame_i
             self.get_data()
@@ -7770,7 +7715,26 @@ class guiWin(QMainWindow):
         self.progressWin.mainPbar.setMaximum(0)
         self.progressWin.show(self.app)
     
+    def prefetchFramesLazyLoader(self):
+        if self.lazyLoader is None:
+            return
+        
+        posData = self.data[self.pos_i]
+        if not posData.isImgDataMemmap:
+            return
+        
+        # Read the frames around the current one from the memory-mapped 
+        # file in the background
+        self.lazyLoader.setArgs(
+            posData, posData.frame_i, 0, updateImgOnFinished=False
+        )
+        self.lazyLoaderWaitCond.wakeAll()
+    
     def lazyLoaderFinished(self):
+        if not self.lazyLoader.updateImgOnFinished:
+            # Frames prefetched in the background, nothing to update
+            return
+        
         self.logger.info('Load chunk data worker done.')
         if self.lazyLoader.updateImgOnFinished:
             self.updateAllImages()
@@ -8377,6 +8341,8 @@ class guiWin(QMainWindow):
                         posData.lab = posData.allData_li[i]['labels']
                         self.restoreAnnotDelROI(self.roi_to_del, enforce=True)
                         posData.allData_li[i]['labels'] = posData.lab
+                        self.getRegionpropsCache(posData).invalidate(i)
+                        posData.setFramesEdited((i,))
                         self.get_data()
                         self.store_data(autosave=False)
                 delROIs_info['rois'].pop(idx)
@@ -11368,6 +11334,8 @@ class guiWin(QMainWindow):
                 if store:
                     posData.frame_i = frame_i
                     posData.allData_li[frame_i]['labels'] = lab.copy()
+                    self.getRegionpropsCache(posData).invalidate(frame_i)
+                    posData.setFramesEdited((frame_i,))
                     self.get_data()
                     self.store_data(autosave=False)
             
@@ -12542,9 +12510,8 @@ class guiWin(QMainWindow):
             # visited are not valid anymore. Undo changes there
             self.reInitLastSegmFrame()
         
-        # Keep only 5 Undo/Redo states
-        if len(posData.UndoRedoStates[posData.frame_i]) > 5:
-            posData.UndoRedoStates[posData.frame_i].pop(-1)
+        # NOTE: the number of Undo/Redo states and their memory is limited 
+        # by posData.UndoRedoStates (see core.UndoRedoStatesStore)
 
         # Restart count from the most recent state (index 0)
         # NOTE: index 0 is most recent state before doing last change
@@ -13483,6 +13450,7 @@ class guiWin(QMainWindow):
             new_name = self.addAnnotWin.state['name']
             acdc_df = acdc_df.rename(columns={old_name: new_name})
             posData.allData_li[posData.frame_i]['acdc_df'] = acdc_df
+            posData.setFramesEdited()
 
         self.customAnnotDict[button]['state'] = self.addAnnotWin.state
 
@@ -13568,6 +13536,7 @@ class guiWin(QMainWindow):
             scatterPlotItem.setData(xx, yy)
 
             posData.allData_li[posData.frame_i]['acdc_df'] = acdc_df
+            posData.setFramesEdited()
         
         if self.highlightedID != 0:
             self.highlightedID = 0
@@ -13620,6 +13589,7 @@ class guiWin(QMainWindow):
                     continue
                 acdc_df = acdc_df.drop(columns=name, errors='ignore')
                 posData.allData_li[frame_i]['acdc_df'] = acdc_df
+                posData.setFramesEdited((frame_i,))
 
         self.clearScatterPlotCustomAnnotButton(button)
 
@@ -14441,6 +14411,8 @@ class guiWin(QMainWindow):
                 self.update_rp()
             else:
                 posData.allData_li[posData.frame_i]['labels'] = lab
+                self.getRegionpropsCache(posData).invalidate(posData.frame_i)
+                posData.setFramesEdited()
                 self.get_data()
 
     def next_pos(self):
@@ -14613,6 +14585,7 @@ class guiWin(QMainWindow):
             self.computeSegm()
             self.initGhostObject()
             self.zoomToCells()
+            self.prefetchFramesLazyLoader()
         else:
             # Store data for current frame
             if mode != 'Viewer':
@@ -14657,6 +14630,7 @@ class guiWin(QMainWindow):
             self.zoomToCells()
             self.initGhostObject()
             self.updateViewerWindow()
+            self.prefetchFramesLazyLoader()
         else:
             msg = 'You reached the first frame!'
             self.logger.info(msg)
@@ -14684,7 +14658,9 @@ class guiWin(QMainWindow):
         posData.getBasenameAndChNames()
         posData.buildPaths()
 
-        if posData.ext != '.h5':
+        # Memory-mapped .tif and .npy files use the lazy loader to prefetch 
+        # the frames around the current one
+        if posData.ext not in ('.h5', '.tif', '.npy'):
             self.lazyLoader.salute = False
             self.lazyLoader.exit = True
             self.lazyLoaderWaitCond.wakeAll()
@@ -14904,7 +14880,13 @@ class guiWin(QMainWindow):
     
     def askRecoverNotSavedData(self, posData):
         last_modified_time_unsaved = 'NEVER'
-        if os.path.exists(posData.segm_npz_temp_path):
+        if os.path.exists(posData.autosave_journal_path):
+            last_modified_time_unsaved = (
+                datetime.fromtimestamp(
+                    os.path.getmtime(posData.autosave_journal_path)
+                ).strftime("%a %d. %b. %y - %H:%M:%S")
+            )
+        elif os.path.exists(posData.segm_npz_temp_path):
             recovered_file_path = posData.segm_npz_temp_path
             if os.path.exists(posData.segm_npz_path):
                 last_modified_time_unsaved = (
@@ -16004,23 +15986,9 @@ class guiWin(QMainWindow):
         if self.metricsToSave is None:
             # self.metricsToSave means that the user did not set 
             # through setMeasurements dialog --> save all measurements
-            self.metricsToSave = {chName:[] for chName in posData.loadedChNames}
-            isManualBackgrPresent = posData.manualBackgroundLab is not None
-            for chName in posData.loadedChNames:
-                metrics_desc, bkgr_val_desc = measurements.standard_metrics_desc(
-                    posData.SizeZ>1, chName, isSegm3D=self.isSegm3D,
-                    isManualBackgrPresent=isManualBackgrPresent
-                )
-                self.metricsToSave[chName].extend(metrics_desc.keys())
-                self.metricsToSave[chName].extend(bkgr_val_desc.keys())
-
-                custom_metrics_desc = measurements.custom_metrics_desc(
-                    posData.SizeZ>1, chName, posData=posData, 
-                    isSegm3D=self.isSegm3D, return_combine=False
-                )
-                self.metricsToSave[chName].extend(
-                    custom_metrics_desc.keys()
-                )
+            self.metricsToSave = measurements.get_default_metrics_to_save(
+                posData, self.isSegm3D
+            )
         
         # Get metrics parameters --> function name, how etc
         self.metrics_func, _ = measurements.standard_metrics_func()
@@ -16086,6 +16054,8 @@ class guiWin(QMainWindow):
         else:
             self.loadPosAction.setDisabled(False)
 
+        # The undo/redo states of all the Positions share the same memory
+        undoRedoMemoryBudget = core.UndoRedoMemoryBudget()
         for p, posData in enumerate(self.data):
             self.pos_i = p
             posData.curvPlotItems = []
@@ -16127,7 +16097,9 @@ class guiWin(QMainWindow):
             posData.new_IDs = []
             posData.lost_IDs = []
             posData.multiBud_mothIDs = [2]
-            posData.UndoRedoStates = [[] for _ in range(posData.SizeT)]
+            posData.UndoRedoStates = core.UndoRedoStatesStore(
+                posData.SizeT, budget=undoRedoMemoryBudget
+            )
             posData.UndoRedoCcaStates = [[] for _ in range(posData.SizeT)]
 
             posData.ol_data_dict = {}
@@ -16339,6 +16311,16 @@ class guiWin(QMainWindow):
         if mode == 'Viewer' and not enforce:
             return
 
+        storedLab = posData.allData_li[posData.frame_i]['labels']
+        isLabEdited = (
+            storedLab is None or not np.array_equal(storedLab, posData.lab)
+        )
+        if isLabEdited:
+            self.getRegionpropsCache(posData).invalidate(posData.frame_i)
+        prevAcdcDf = posData.allData_li[posData.frame_i]['acdc_df']
+        if prevAcdcDf is not None:
+            # Copy because store_cca_df modifies the stored df in place
+            prevAcdcDf = prevAcdcDf.copy()
         posData.allData_li[posData.frame_i]['regionprops'] = posData.rp.copy()
         posData.allData_li[posData.frame_i]['labels'] = posData.lab.copy()
         posData.allData_li[posData.frame_i]['IDs'] = posData.IDs.copy()
@@ -16404,26 +16386,12 @@ class guiWin(QMainWindow):
     
         self.pointsLayerDataToDf(posData)
         self.store_cca_df(pos_i=pos_i, mainThread=mainThread, autosave=autosave)
-
-    def nearest_point_2Dyx(self, points, all_others):
-        """
-        Given 2D array of [y, x] coordinates points and all_others return the
-        [y, x] coordinates of the two points (one from points and one from all_others)
-        that have the absolute minimum distance
-        """
-        # Compute 3D array where each ith row of each kth page is the element-wise
-        # difference between kth row of points and ith row in all_others array.
-        # (i.e. diff[k,i] = points[k] - all_others[i])
-        diff = points[:, np.newaxis] - all_others
-        # Compute 2D array of distances where
-        # dist[i, j] = euclidean dist (points[i],all_others[j])
-        dist = np.linalg.norm(diff, axis=2)
-        # Compute i, j indexes of the absolute minimum distance
-        i, j = np.unravel_index(dist.argmin(), dist.shape)
-        nearest_point = all_others[j]
-        point = points[i]
-        min_dist = np.min(dist)
-        return min_dist, nearest_point
+        
+        # Mark the frame only if something changed so that autosave and 
+        # save skip the frames that were only visited
+        acdc_df = posData.allData_li[posData.frame_i]['acdc_df']
+        if isLabEdited or prevAcdcDf is None or not prevAcdcDf.equals(acdc_df):
+            posData.setFramesEdited((posData.frame_i,))
 
     def isCurrentFrameCcaVisited(self):
         posData = self.data[self.pos_i]
@@ -16629,6 +16597,7 @@ class guiWin(QMainWindow):
                 continue
             
             acdc_df[self.cca_df_colnames] = ''
+            posData.setFramesEdited((frame_i,))
         
         annotated_cca_dfs = [
             posData.allData_li[i]['acdc_df'][self.cca_df_colnames]
@@ -16815,60 +16784,30 @@ class guiWin(QMainWindow):
             self.ccaFailedScatterItem.setData([], [])
             return notEnoughG1Cells, proceed
 
-        # Compute new IDs contours
-        newIDs_contours = []
+        # Compute contours of new IDs and cells in G1
+        newIDs_contours = [None]*numNewCells
+        G1_contours = [None]*numCellsG1
+        newIDs_idx = {ID: j for j, ID in enumerate(posData.new_IDs)}
+        G1_idx = {ID: i for i, ID in enumerate(IDsCellsG1)}
         for obj in posData.rp:
             ID = obj.label
-            if ID in posData.new_IDs:
-                cont = self.getObjContours(obj)
-                newIDs_contours.append(cont)
-
-        # Compute cost matrix
-        cost = np.full((numCellsG1, numNewCells), np.inf)
-        for obj in posData.rp:
-            ID = obj.label
-            try:
-                i = IDsCellsG1.index(ID)
-            except ValueError:
-                continue
+            if ID in newIDs_idx:
+                newIDs_contours[newIDs_idx[ID]] = self.getObjContours(obj)
+            if ID in G1_idx:
+                G1_contours[G1_idx[ID]] = self.getObjContours(obj)
 
-            cont = self.getObjContours(obj)
-            i = IDsCellsG1.index(ID)
-            
-            # Get distance from cell in G1 and all other new cells
-            for j, newID_cont in enumerate(newIDs_contours):
-                min_dist, nearest_xy = self.nearest_point_2Dyx(
-                    cont, newID_cont
-                )
-                cost[i, j] = min_dist
-
-        # Run hungarian (munkres) assignment algorithm
-        row_idx, col_idx = scipy.optimize.linear_sum_assignment(cost)
-
-        # Assign buds to mothers
-        for i, j in zip(row_idx, col_idx):
-            mothID = IDsCellsG1[i]
-            budID = posData.new_IDs[j]
-
-            # If we are repeating assignment for the bud then we also have to
-            # correct the possibily wrong mother first
-            if budID in posData.cca_df.index:
-                relID = posData.cca_df.at[budID, 'relative_ID']
-                if relID in prev_cca_df.index:
-                    posData.cca_df.loc[relID] = prev_cca_df.loc[relID]
-
-            posData.cca_df.at[mothID, 'relative_ID'] = budID
-            posData.cca_df.at[mothID, 'cell_cycle_stage'] = 'S'
-
-            bud_cca_dict = base_cca_dict.copy()
-            bud_cca_dict['cell_cycle_stage'] = 'S'
-            bud_cca_dict['generation_num'] = 0
-            bud_cca_dict['relative_ID'] = mothID
-            bud_cca_dict['relationship'] = 'bud'
-            bud_cca_dict['emerg_frame_i'] = posData.frame_i
-            bud_cca_dict['is_history_known'] = True
-            bud_cca_dict['corrected_assignment'] = False
-            posData.cca_df.loc[budID] = pd.Series(bud_cca_dict)
+        # Compute cost matrix and assign buds to mothers with hungarian 
+        # (munkres) assignment algorithm
+        cost = core.compute_bud_mother_cost_matrix(
+            G1_contours, newIDs_contours
+        )
+        assignments = core.assign_buds_to_mothers(
+            cost, IDsCellsG1, posData.new_IDs
+        )
+        core.annotate_bud_mother_assignments(
+            posData.cca_df, assignments, posData.frame_i, 
+            prev_cca_df=prev_cca_df
+        )
 
         # Keep only existing IDs
         posData.cca_df = posData.cca_df.loc[posData.IDs]
@@ -17102,8 +17041,6 @@ class guiWin(QMainWindow):
         posData = self.data[self.pos_i]
         proceed_cca = True
         if posData.frame_i > 2:
-            # Remove undo states from 4 frames back to avoid memory issues
-            posData.UndoRedoStates[posData.frame_i-4] = []
             # Check if current frame contains undo states (not empty list)
             if posData.UndoRedoStates[posData.frame_i]:
                 self.undoAction.setDisabled(False)
@@ -17134,7 +17071,11 @@ class guiWin(QMainWindow):
                 return proceed_cca, never_visited
             # Requested frame was never visited before. Load from HDD
             posData.lab = self.get_labels()
-            posData.rp = skimage.measure.regionprops(posData.lab)
+            regionpropsCache = self.getRegionpropsCache(posData)
+            regionpropsCache.invalidate(posData.frame_i)
+            posData.rp = regionpropsCache.get_regionprops(
+                posData.lab, posData.frame_i
+            )
             self.setManualBackgroundLab()
             if posData.acdc_df is not None:
                 frames = posData.acdc_df.index.get_level_values(0)
@@ -17168,7 +17109,10 @@ class guiWin(QMainWindow):
             # Requested frame was already visited. Load from RAM.
             never_visited = False
             posData.lab = self.get_labels(from_store=True)
-            posData.rp = skimage.measure.regionprops(posData.lab)
+            # Regionprops are recomputed only if labels changed
+            posData.rp = self.getRegionpropsCache(posData).get_regionprops(
+                posData.lab, posData.frame_i
+            )
             df = posData.allData_li[posData.frame_i]['acdc_df']
             binnedIDs_df = df[df['is_cell_excluded']>0]
             posData.binnedIDs = set(binnedIDs_df.index)
@@ -17488,6 +17432,7 @@ class guiWin(QMainWindow):
 
             df = df.drop(columns=self.cca_df_colnames)
             posData.allData_li[i]['acdc_df'] = df
+            posData.setFramesEdited((i,))
         
         if posData.acdc_df is not None:
             frames = posData.acdc_df.index.get_level_values(0)
@@ -17598,6 +17543,10 @@ class guiWin(QMainWindow):
             self.store_data()
             acdc_df = posData.allData_li[i]['acdc_df']
         
+        prev_cca_df = None
+        if 'cell_cycle_stage' in acdc_df.columns:
+            prev_cca_df = acdc_df.reindex(columns=self.cca_df_colnames)
+        
         if 'cell_cycle_stage' in acdc_df.columns:
             # Cell cycle info already present --> overwrite with new
             acdc_df[self.cca_df_colnames] = cca_df[self.cca_df_colnames]
@@ -17606,6 +17555,14 @@ class guiWin(QMainWindow):
             df = acdc_df.join(cca_df, how='left')
             posData.allData_li[i]['acdc_df'] = acdc_df.copy()
         
+        if cca_df is not None:
+            stored_cca_df = (
+                posData.allData_li[i]['acdc_df']
+                .reindex(columns=self.cca_df_colnames)
+            )
+            if prev_cca_df is None or not prev_cca_df.equals(stored_cca_df):
+                posData.setFramesEdited((i,))
+        
         if autosave:
             self.enqAutosave()
             self.enqCcaIntegrityChecker()
@@ -17702,11 +17659,23 @@ class guiWin(QMainWindow):
         objOpts = self.getObjTextAnnotOpts(obj, 'Draw only IDs', ax=1)
         return objOpts
 
+    def getRegionpropsCache(self, posData=None):
+        if posData is None:
+            posData = self.data[self.pos_i]
+        if not hasattr(posData, 'regionpropsCache'):
+            # Keys are the frame indexes
+            posData.regionpropsCache = core.RegionpropsCache()
+        return posData.regionpropsCache
+    
     @exception_handler
     def update_rp(self, draw=True, debug=False, update_IDs=True):
         posData = self.data[self.pos_i]
         # Update rp for current posData.lab (e.g. after any change)
-        posData.rp = skimage.measure.regionprops(posData.lab)
+        regionpropsCache = self.getRegionpropsCache(posData)
+        regionpropsCache.invalidate(posData.frame_i)
+        posData.rp = regionpropsCache.get_regionprops(
+            posData.lab, posData.frame_i
+        )
         if update_IDs:
             IDs = []
             IDs_idxs = {}
@@ -17904,6 +17873,8 @@ class guiWin(QMainWindow):
                     keepLab = self._keepObjects(lab=lab, rp=rp)
                     # Store change
                     posData.allData_li[i]['labels'] = keepLab.copy()
+                    self.getRegionpropsCache(posData).invalidate(i)
+                    posData.setFramesEdited((i,))
                     # Get the rest of the stored metadata based on the new lab
                     posData.frame_i = i
                     self.get_data()
@@ -17958,6 +17929,8 @@ class guiWin(QMainWindow):
 
                     # Store change
                     posData.allData_li[i]['labels'] = keepLab.copy()
+                    self.getRegionpropsCache(posData).invalidate(i)
+                    posData.setFramesEdited((i,))
                     # Get the rest of the stored metadata based on the new lab
                     posData.frame_i = i
                     self.get_data()
@@ -19065,14 +19038,15 @@ class guiWin(QMainWindow):
         posData = self.data[self.pos_i]
         if self.isSegm3D:
             self.currentLab2D = posData.lab[self.z_lab()]
+            self.currentLab2DDelIDs = frozenset()
             self.setOverlaySegmMasks()
             self.doCustomAnnotation(0)
             self.update_rp_metadata()
         else:
             self.currentLab2D = posData.lab
+            self.currentLab2DDelIDs = frozenset()
             self.setOverlaySegmMasks()
-        self.updateContoursImage(0)
-        self.updateContoursImage(1)
+        self.updateAllContoursImages()
 
     def initContoursImage(self):
         posData = self.data[self.pos_i]
@@ -19081,6 +19055,7 @@ class guiWin(QMainWindow):
         else:
             Y, X = posData.img_data.shape[-2:]
         self.contoursImage = np.zeros((Y, X, 4), dtype=np.uint8)
+        self.objContoursCache = core.ObjContoursCache()
     
     def initManualBackgroundImage(self):
         posData = self.data[self.pos_i]
@@ -19701,6 +19676,7 @@ class guiWin(QMainWindow):
         if self.labelsGrad.showLabelsImgAction.isChecked() and set_image:
             self.img2.setImage(DelROIlab, z=self.z_lab(), autoLevels=False)
         self.currentLab2D = DelROIlab
+        self.currentLab2DDelIDs = frozenset(allDelIDs)
         if updateLookuptable:
             self.updateLookuptable(delIDs=allDelIDs)
 
@@ -19757,6 +19733,8 @@ class guiWin(QMainWindow):
                     for delID in delIDs:
                         lab[lab==delID] = 0
                 posData.allData_li[frame_i]['labels'] = lab
+                self.getRegionpropsCache(posData).invalidate(frame_i)
+                posData.setFramesEdited((frame_i,))
                 # Get the rest of the metadata and store data based on the new lab
                 posData.frame_i = frame_i
                 self.get_data()
@@ -20457,6 +20435,7 @@ class guiWin(QMainWindow):
         mask = posData.manualBackgroundLab==ID
         posData.manualBackgroundImage[mask, :] = 0
         posData.manualBackgroundLab[mask] = 0
+        posData.setFramesEdited()
     
     def addManualBackgroundObject(self, x, y):
         posData = self.data[self.pos_i]
@@ -20485,6 +20464,7 @@ class guiWin(QMainWindow):
         ID = self.manualBackgroundObj.label
         self.clearManualBackgroundObject(ID)
         posData.manualBackgroundLab[obj_slice][obj_image] = ID
+        posData.setFramesEdited()
         
         if ID in self.manualBackgroundTextItems:
             self.manualBackgroundTextItems[ID].setPos(x, y)
@@ -20510,24 +20490,68 @@ class guiWin(QMainWindow):
                 continue
             self.manualBackgroundTextItems[obj.label] = textItem
     
-    def updateContoursImage(self, ax, delROIsIDs=None):
+    def updateContoursImage(self, ax):
         imageItem = self.getContoursImageItem(ax)
         if imageItem is None:
             return
         
+        self.drawAllObjContoursImage()
+        imageItem.setImage(self.contoursImage)
+    
+    def updateAllContoursImages(self):
+        imageItems = [self.getContoursImageItem(ax) for ax in (0, 1)]
+        imageItems = [item for item in imageItems if item is not None]
+        if not imageItems:
+            return
+        
+        # Contours image is shared between left and right image
+        self.drawAllObjContoursImage()
+        for imageItem in imageItems:
+            imageItem.setImage(self.contoursImage)
+    
+    def getObjContoursCacheKey(self):
+        posData = self.data[self.pos_i]
+        z = None
+        zProjHow = None
+        if self.isSegm3D:
+            z = self.z_lab()
+            zProjHow = self.zProjComboBox.currentText()
+        # Objects removed by the deletion ROIs are not in currentLab2D
+        delIDs = self.currentLab2DDelIDs
+        return (self.pos_i, posData.frame_i, z, zProjHow, delIDs)
+    
+    def getObjContoursCacheVersion(self):
+        # Every write to the labels increases the mutation counter (see 
+        # core.RegionpropsCache.invalidate) --> contours are recomputed
+        posData = self.data[self.pos_i]
+        return self.getRegionpropsCache(posData).version(posData.frame_i)
+    
+    def drawAllObjContoursImage(self):
         if not hasattr(self, 'contoursImage'):
             self.initContoursImage()
         else:
             self.contoursImage[:] = 0
-
-        contours = []
-        for obj in skimage.measure.regionprops(self.currentLab2D):    
-            obj_contours = self.getObjContours(obj, all_external=True)  
-            contours.extend(obj_contours)
-
+        
         thickness = self.contLineWeight
         color = self.contLineColor
-        self.setContoursImage(imageItem, contours, thickness, color)
+        key = self.getObjContoursCacheKey()
+        version = self.getObjContoursCacheVersion()
+        if thickness == 1:
+            # Fast path --> contours of all the objects in one pass
+            contoursMask = self.objContoursCache.get_contours_mask(
+                self.currentLab2D, key, version=version
+            )
+            self.contoursImage[contoursMask] = color
+            return
+        
+        objsContours = self.objContoursCache.get_contours(
+            self.currentLab2D, key, version=version
+        )
+        contours = [
+            contour for objContours in objsContours.values() 
+            for contour in objContours
+        ]
+        cv2.drawContours(self.contoursImage, contours, -1, color, thickness)
     
     def setContoursImage(self, imageItem, contours, thickness, color):
         cv2.drawContours(self.contoursImage, contours, -1, color, thickness)
@@ -20677,9 +20701,8 @@ class guiWin(QMainWindow):
         self.textAnnot[1].update()
         return delROIsIDs
     
-    def setAllContoursImages(self, delROIsIDs=None):
-        self.updateContoursImage(ax=0, delROIsIDs=delROIsIDs)
-        self.updateContoursImage(ax=1, delROIsIDs=delROIsIDs)
+    def setAllContoursImages(self):
+        self.updateAllContoursImages()
 
     def nextFrameImage(self, current_frame_i=None):
         if not self.labelsGrad.showNextFrameAction.isEnabled():
@@ -20793,8 +20816,8 @@ class guiWin(QMainWindow):
         # self.update_rp()
 
         # Annotate ID and draw contours
-        delROIsIDs = self.setAllTextAnnotations()    
-        self.setAllContoursImages(delROIsIDs=delROIsIDs)
+        self.setAllTextAnnotations()    
+        self.setAllContoursImages()
 
         self.drawAllMothBudLines()
         self.highlightLostNew()
@@ -20842,6 +20865,8 @@ class guiWin(QMainWindow):
 
                     # Store change
                     posData.allData_li[i]['labels'] = lab.copy()
+                    self.getRegionpropsCache(posData).invalidate(i)
+                    posData.setFramesEdited((i,))
                     # Get the rest of the stored metadata based on the new lab
                     posData.frame_i = i
                     self.get_data()
@@ -21622,6 +21647,7 @@ class guiWin(QMainWindow):
                 acdc_df_i = acdc_df.loc[frame_i].dropna(axis=1, how='all')
             
             posData.allData_li[frame_i]['acdc_df'] = acdc_df_i
+            posData.setFramesEdited((frame_i,))
             pbar.update()
         pbar.close()
         
@@ -23101,6 +23127,7 @@ class guiWin(QMainWindow):
                         drop_cols_rp = drop_df_rp.columns
                         acdc_df = acdc_df.drop(columns=drop_cols_rp, errors='ignore')
                     _posData.allData_li[frame_i]['acdc_df'] = acdc_df
+                    _posData.setFramesEdited((frame_i,))
         self.setMeasWinState = self.measurementsWin.state()
         self.logger.info('Setting measurements...')
         self._setMetrics(self.measurementsWin)
@@ -23283,9 +23310,8 @@ class guiWin(QMainWindow):
         if 'cell_vol_vox' not in self.sizeMetricsToSave:
             return
 
-        # We compute the cell volume in the main thread because calling
-        # skimage.transform.rotate in a separate thread causes crashes
-        # with segmentation fault on macOS. I don't know why yet.
+        # Volumes of objects whose mask did not change since the last save 
+        # are retrieved from posData.rotationalVolumeCache
         self.logger.info('Computing cell volume...')
         end_i = self.save_until_frame_i
         pos_iter = tqdm(self.data, ncols=100)
@@ -23304,13 +23330,10 @@ class guiWin(QMainWindow):
                 if lab is None:
                     break
                 rp = data_dict['regionprops']
-                obj_iter = tqdm(rp, ncols=100, position=2, leave=False)
-                for i, obj in enumerate(obj_iter):
-                    vol_vox, vol_fl = _calc_rot_vol(
-                        obj, PhysicalSizeY, PhysicalSizeX
-                    )
-                    obj.vol_vox = vol_vox
-                    obj.vol_fl = vol_fl
+                rp = _core.compute_rotational_volumes(
+                    rp, PhysicalSizeY, PhysicalSizeX, frame_i=frame_i, 
+                    cache=posData.rotationalVolumeCache
+                )
                 posData.allData_li[frame_i]['regionprops'] = rp
 
     def askSaveLastVisitedSegmMode(self, isQuickSave=False):
@@ -23582,7 +23605,8 @@ class guiWin(QMainWindow):
     def saveData(self, checked=False, finishedCallback=None, isQuickSave=False):
         self.store_data(autosave=False)
         self.applyDelROIs()
-        self.store_data()
+        # The autosave journal is reset at the end of saving
+        self.store_data(autosave=False)
         self._isQuickSave = isQuickSave
 
         # Wait autosave worker to finish
@@ -23630,7 +23654,7 @@ class guiWin(QMainWindow):
                 return True
 
         if self.isSnapshot:
-            self.store_data(mainThread=False)
+            self.store_data(mainThread=False, autosave=False)
 
         proceed = self.askSaveLastVisitedSegmMode(isQuickSave=isQuickSave)
         if not proceed:
@@ -1,5 +1,6 @@
 import os
 import sys
+import importlib.util
 import traceback
 import tempfile
 import re
@@ -18,6 +19,10 @@ from datetime import datetime
 from tifffile import TiffFile
 import tifffile
 import zipfile
+import threading
+import io
+import struct
+import zlib
 from natsort import natsorted
 
 import skimage
@@ -179,7 +184,7 @@ def read_segm_workflow_from_config(filepath):
         options = dict(configPars[section])
         ini_items[section] = {}
         for option, value in options.items():
-            if section == 'paths_to_segment':
+            if section == 'paths_to_segment' or section == 'paths_to_measure':
                 value = value.strip('\n')
                 value = value.split('\n')
                 ini_items[section][option] = value
@@ -207,7 +212,7 @@ def read_segm_workflow_from_config(filepath):
             ini_items[section][option] = value
     return ini_items
 
-def get_images_paths(self, folder_path):
+def get_images_paths(folder_path):
     folder_type = myutils.determine_folder_type(folder_path)     
     is_pos_folder, is_images_folder, folder_path = folder_type     
     if not is_pos_folder and not is_images_folder:
@@ -295,7 +300,7 @@ def load_segm_file(images_path, end_name_segm_file='segm', return_path=False):
     for file in myutils.listdir(images_path):
         if file.endswith(end_name_segm_file):
             filepath = os.path.join(images_path, file)
-            segm_data = np.load(filepath)['arr_0'].astype(np.uint32)
+            segm_data = read_segm_data(filepath).astype(np.uint32)
             if return_path:
                 return segm_data, filepath
             else:
@@ -386,8 +391,210 @@ def _remove_redundant_columns(acdc_df):
     acdc_df = acdc_df.drop(columns=['index', 'level_0'], errors='ignore')
     return acdc_df
 
+def is_columnar_acdc_df_available():
+    """Check if the package required to read and write the columnar copy
+    of the acdc_output tables (pyarrow) is installed"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+def get_acdc_df_columnar_path(acdc_df_csv_path):
+    """Path of the columnar (Parquet) copy of an acdc_output CSV file"""
+    return f'{os.path.splitext(acdc_df_csv_path)[0]}.parquet'
+
+def _remove_acdc_df_columnar_file(acdc_df_csv_path):
+    columnar_path = get_acdc_df_columnar_path(acdc_df_csv_path)
+    try:
+        os.remove(columnar_path)
+    except FileNotFoundError:
+        pass
+
+def save_acdc_df_file(
+        acdc_df, acdc_df_csv_path, save_columnar=True,
+        columnar_row_group_size=65536
+    ):
+    """Save acdc_df to CSV and, if pyarrow is installed, to a typed and
+    compressed columnar copy (Parquet) next to it (same filename with
+    `.parquet` extension).
+
+    Parameters
+    ----------
+    acdc_df : pd.DataFrame
+        Table to save. Typically indexed by ['frame_i', 'Cell_ID'].
+    acdc_df_csv_path : str
+        Path of the CSV file.
+    save_columnar : bool, optional
+        If False, only the CSV is saved and any existing columnar copy is
+        removed. Default is True
+    columnar_row_group_size : int, optional
+        Number of rows per row group of the Parquet file. Readers skip
+        the row groups whose `frame_i` and `Cell_ID` ranges do not match
+        the requested ones. Default is 65536
+    """
+    acdc_df.to_csv(acdc_df_csv_path)
+    if not save_columnar or not is_columnar_acdc_df_available():
+        # Make sure readers do not load an outdated columnar copy
+        _remove_acdc_df_columnar_file(acdc_df_csv_path)
+        return
+
+    columnar_path = get_acdc_df_columnar_path(acdc_df_csv_path)
+    try:
+        acdc_df.to_parquet(
+            columnar_path, engine='pyarrow', compression='zstd',
+            index=True, row_group_size=columnar_row_group_size
+        )
+    except Exception as err:
+        # Some object columns cannot be typed (e.g., mixed types).
+        # The CSV is still valid
+        printl(
+            '[WARNING]: Columnar copy of acdc_output could not be saved '
+            f'({err}). Only the CSV file will be used.'
+        )
+        _remove_acdc_df_columnar_file(acdc_df_csv_path)
+
+def is_acdc_df_columnar_file_valid(acdc_df_csv_path):
+    """Check that the columnar copy exists and that it is not older than
+    the CSV file (e.g., CSV edited by the user or saved by an older
+    version of Cell-ACDC)
+    """
+    columnar_path = get_acdc_df_columnar_path(acdc_df_csv_path)
+    if not os.path.exists(columnar_path):
+        return False
+
+    if not os.path.exists(acdc_df_csv_path):
+        return True
+
+    columnar_mtime = os.path.getmtime(columnar_path)
+    return columnar_mtime >= os.path.getmtime(acdc_df_csv_path)
+
+def _get_acdc_df_read_columns(columns, available_columns):
+    if columns is None:
+        return
+
+    # Always read the index columns
+    read_columns = [
+        col for col in ('frame_i', 'Cell_ID') if col not in columns
+    ]
+    read_columns.extend(columns)
+    return [col for col in read_columns if col in available_columns]
+
+def _read_acdc_df_columnar_file(columnar_path, columns, frames, IDs):
+    import pyarrow.parquet
+
+    schema_names = pyarrow.parquet.read_schema(columnar_path).names
+    read_columns = _get_acdc_df_read_columns(columns, schema_names)
+    filters = []
+    if frames is not None and 'frame_i' in schema_names:
+        filters.append(('frame_i', 'in', [int(i) for i in frames]))
+    if IDs is not None and 'Cell_ID' in schema_names:
+        filters.append(('Cell_ID', 'in', [int(ID) for ID in IDs]))
+    table = pyarrow.parquet.read_table(
+        columnar_path, columns=read_columns, filters=filters or None,
+        use_pandas_metadata=True
+    )
+    acdc_df = table.to_pandas()
+    if any(name is not None for name in acdc_df.index.names):
+        acdc_df = acdc_df.reset_index()
+    else:
+        acdc_df = acdc_df.reset_index(drop=True)
+
+    # Missing strings are NaN like in the CSV
+    for col in acdc_df_str_cols:
+        if col not in acdc_df.columns:
+            continue
+        acdc_df[col] = acdc_df[col].where(acdc_df[col].notna(), np.nan)
+    return acdc_df
+
+def _read_acdc_df_csv_file(
+        acdc_df_csv_path, columns, frames, IDs, chunksize=100000
+    ):
+    usecols = None
+    if columns is not None:
+        columns = set(columns)
+        columns.update(('frame_i', 'Cell_ID'))
+        usecols = lambda col: col in columns
+
+    if frames is None and IDs is None:
+        return pd.read_csv(
+            acdc_df_csv_path, dtype=acdc_df_str_cols, usecols=usecols
+        )
+
+    # Filter chunk by chunk to avoid loading the rows that are not requested
+    chunks = pd.read_csv(
+        acdc_df_csv_path, dtype=acdc_df_str_cols, usecols=usecols,
+        chunksize=chunksize
+    )
+    filtered_chunks = []
+    for chunk in chunks:
+        mask = np.ones(len(chunk), dtype=bool)
+        if frames is not None and 'frame_i' in chunk.columns:
+            mask &= chunk['frame_i'].isin(frames).to_numpy()
+        if IDs is not None and 'Cell_ID' in chunk.columns:
+            mask &= chunk['Cell_ID'].isin(IDs).to_numpy()
+        filtered_chunks.append(chunk[mask])
+    return pd.concat(filtered_chunks, ignore_index=True)
+
+def read_acdc_df_file(
+        acdc_df_file_path, columns=None, frames=None, IDs=None,
+        prefer_columnar=True
+    ):
+    """Read an acdc_output table without any further processing (same
+    output as `pd.read_csv`).
+
+    If a valid columnar copy (see `save_acdc_df_file`) is present and
+    pyarrow is installed, it is read instead of the CSV file.
+
+    Parameters
+    ----------
+    acdc_df_file_path : str
+        Path of the CSV file (or directly of the `.parquet` file).
+    columns : list of str, optional
+        Load only these columns (plus 'frame_i' and 'Cell_ID').
+        Non-existing columns are ignored. If None, load all columns.
+        Default is None
+    frames : iterable of int, optional
+        Load only the rows whose 'frame_i' is in `frames`. If None, load
+        all frames. Default is None
+    IDs : iterable of int, optional
+        Load only the rows whose 'Cell_ID' is in `IDs`. If None, load
+        all IDs. Default is None
+    prefer_columnar : bool, optional
+        If False, always read the CSV file. Default is True
+
+    Returns
+    -------
+    pd.DataFrame
+        The loaded table.
+    """
+    if frames is not None:
+        frames = list(frames)
+    if IDs is not None:
+        IDs = list(IDs)
+
+    if acdc_df_file_path.endswith('.parquet'):
+        return _read_acdc_df_columnar_file(
+            acdc_df_file_path, columns, frames, IDs
+        )
+
+    use_columnar = (
+        prefer_columnar
+        and is_acdc_df_columnar_file_valid(acdc_df_file_path)
+        and is_columnar_acdc_df_available()
+    )
+    if use_columnar:
+        columnar_path = get_acdc_df_columnar_path(acdc_df_file_path)
+        try:
+            return _read_acdc_df_columnar_file(
+                columnar_path, columns, frames, IDs
+            )
+        except Exception as err:
+            printl(
+                f'[WARNING]: Reading "{columnar_path}" failed ({err}). '
+                'Reading the CSV file instead.'
+            )
+
+    return _read_acdc_df_csv_file(acdc_df_file_path, columns, frames, IDs)
+
 def _load_acdc_df_file(acdc_df_file_path):
-    acdc_df = pd.read_csv(acdc_df_file_path, dtype=acdc_df_str_cols)
+    acdc_df = read_acdc_df_file(acdc_df_file_path)
     acdc_df = _remove_redundant_columns(acdc_df)
     try:
         acdc_df_drop_cca = acdc_df.drop(columns=cca_df_colnames).fillna(0)
@@ -422,7 +629,7 @@ def store_copy_acdc_df(posData, acdc_output_csv_path, log_func=printl):
             return
         
         df = (
-            pd.read_csv(acdc_output_csv_path, dtype=acdc_df_str_cols)
+            read_acdc_df_file(acdc_output_csv_path)
             .set_index(['frame_i', 'Cell_ID'])
         )
         posData.setTempPaths()
@@ -499,6 +706,210 @@ def get_last_stored_unsaved_acdc_df(posData):
     acdc_df = read_acdc_df_from_archive(zip_path, csv_name)
     return acdc_df
 
+# Serialize appending to and compacting the autosave journal files
+_AUTOSAVE_JOURNAL_LOCK = threading.RLock()
+_JOURNAL_RECORD_HEADER = struct.Struct('<II')
+
+def get_autosave_journal_lock():
+    """Lock to hold while comparing the data with the journal state of a 
+    Position (e.g., `journaledAcdcDfs`) and appending to the journal, or 
+    while removing the journal and resetting that state.
+    """
+    return _AUTOSAVE_JOURNAL_LOCK
+
+def encode_journal_labels_record(frame_i, lab):
+    """Journal record with the segmentation masks of frame `frame_i`"""
+    header = {
+        'kind': 'labels', 'frame_i': int(frame_i), 
+        'dtype': str(lab.dtype), 'shape': list(lab.shape)
+    }
+    payload = zlib.compress(np.ascontiguousarray(lab).tobytes(), 1)
+    return header, payload
+
+def encode_journal_acdc_df_record(
+        frame_i, acdc_df, prev_acdc_df=None
+    ):
+    """Journal record with the rows of the acdc_df of frame `frame_i` 
+    (index is Cell_ID) that changed compared to `prev_acdc_df`. 
+    
+    If `prev_acdc_df` is None or has different columns, all the rows are 
+    stored. Returns None if nothing changed.
+    """
+    is_full = (
+        prev_acdc_df is None 
+        or not acdc_df.columns.equals(prev_acdc_df.columns)
+    )
+    if is_full:
+        header = {'kind': 'acdc_df_full', 'frame_i': int(frame_i)}
+        changed_rows = acdc_df
+    else:
+        deleted_IDs = prev_acdc_df.index.difference(acdc_df.index)
+        common_IDs = acdc_df.index.intersection(prev_acdc_df.index)
+        new_IDs = acdc_df.index.difference(prev_acdc_df.index)
+        curr = acdc_df.loc[common_IDs]
+        prev = prev_acdc_df.loc[common_IDs]
+        are_values_equal = (curr == prev) | (curr.isna() & prev.isna())
+        changed_IDs = common_IDs[~are_values_equal.all(axis=1).to_numpy()]
+        if deleted_IDs.empty and new_IDs.empty and changed_IDs.empty:
+            return
+        header = {
+            'kind': 'acdc_df_delta', 'frame_i': int(frame_i), 
+            'deleted_IDs': [int(ID) for ID in deleted_IDs]
+        }
+        changed_rows = acdc_df.loc[changed_IDs.append(new_IDs)]
+    
+    payload = zlib.compress(changed_rows.to_csv().encode(), 1)
+    return header, payload
+
+def append_autosave_journal(journal_path, records):
+    """Append records (tuples of (header, payload) where header is a 
+    JSON serializable dictionary and payload are bytes) to the journal file.
+    
+    Each record is written as the length of the header and of the payload 
+    followed by the header and the payload. A record that was not completely 
+    written (e.g., crash) is ignored when reading.
+    """
+    with _AUTOSAVE_JOURNAL_LOCK:
+        with open(journal_path, 'ab') as journal:
+            for header, payload in records:
+                header_bytes = json.dumps(header).encode()
+                journal.write(
+                    _JOURNAL_RECORD_HEADER.pack(len(header_bytes), len(payload))
+                )
+                journal.write(header_bytes)
+                journal.write(payload)
+            journal.flush()
+            os.fsync(journal.fileno())
+
+def iter_autosave_journal(journal_path):
+    """Iterate the (header, payload) records of the journal file"""
+    with open(journal_path, 'rb') as journal:
+        while True:
+            record_header = journal.read(_JOURNAL_RECORD_HEADER.size)
+            if len(record_header) < _JOURNAL_RECORD_HEADER.size:
+                return
+            header_len, payload_len = _JOURNAL_RECORD_HEADER.unpack(
+                record_header
+            )
+            header_bytes = journal.read(header_len)
+            payload = journal.read(payload_len)
+            if len(header_bytes) < header_len or len(payload) < payload_len:
+                # Incomplete last record
+                return
+            yield json.loads(header_bytes), payload
+
+def _decode_journal_acdc_df(payload):
+    csv_text = zlib.decompress(payload).decode()
+    return pd.read_csv(io.StringIO(csv_text)).set_index('Cell_ID')
+
+def read_autosave_journal(journal_path, base_acdc_dfs=None):
+    """Replay the journal file.
+
+    Parameters
+    ----------
+    journal_path : str
+        Path of the journal file.
+    base_acdc_dfs : dict of {int: pd.DataFrame}, optional
+        acdc_df (index is Cell_ID) of each frame used as base of the 
+        changed rows of frames without full acdc_df in the journal. Changed 
+        rows without any base are skipped. Default is None
+
+    Returns
+    -------
+    tuple of (dict, dict)
+        Dictionary of {frame_i: segmentation masks} and dictionary of 
+        {frame_i: acdc_df} with the most recent data of every frame in 
+        the journal.
+    """
+    labels = {}
+    acdc_dfs = {}
+    with _AUTOSAVE_JOURNAL_LOCK:
+        for header, payload in iter_autosave_journal(journal_path):
+            frame_i = header['frame_i']
+            kind = header['kind']
+            if kind == 'labels':
+                lab = np.frombuffer(
+                    zlib.decompress(payload), dtype=header['dtype']
+                )
+                labels[frame_i] = lab.reshape(header['shape']).copy()
+            elif kind == 'acdc_df_full':
+                acdc_dfs[frame_i] = _decode_journal_acdc_df(payload)
+            elif kind == 'acdc_df_delta':
+                base_acdc_df = acdc_dfs.get(frame_i)
+                if base_acdc_df is None and base_acdc_dfs is not None:
+                    base_acdc_df = base_acdc_dfs.get(frame_i)
+                if base_acdc_df is None:
+                    print(
+                        '[WARNING]: Skipping changes of the table of frame '
+                        f'n. {frame_i+1} in the autosave journal because '
+                        'the table they refer to is missing.'
+                    )
+                    continue
+                changed_rows = _decode_journal_acdc_df(payload)
+                acdc_df = base_acdc_df.drop(
+                    index=header['deleted_IDs'] + changed_rows.index.to_list(), 
+                    errors='ignore'
+                )
+                acdc_dfs[frame_i] = pd.concat(
+                    [acdc_df, changed_rows]
+                ).sort_index()
+    return labels, acdc_dfs
+
+def compact_autosave_journal(journal_path):
+    """Rewrite the journal keeping only the most recent data of each frame"""
+    with _AUTOSAVE_JOURNAL_LOCK:
+        if not os.path.exists(journal_path):
+            return
+        labels, acdc_dfs = read_autosave_journal(journal_path)
+        records = [
+            encode_journal_labels_record(frame_i, lab) 
+            for frame_i, lab in labels.items()
+        ]
+        records.extend([
+            encode_journal_acdc_df_record(frame_i, acdc_df)
+            for frame_i, acdc_df in acdc_dfs.items()
+        ])
+        folderpath, filename = os.path.split(journal_path)
+        temp_journal_path = os.path.join(folderpath, f'.{filename}.tmp')
+        if os.path.exists(temp_journal_path):
+            os.remove(temp_journal_path)
+        append_autosave_journal(temp_journal_path, records)
+        os.replace(temp_journal_path, journal_path)
+
+def compact_autosave_journal_async(journal_path):
+    """Same as `compact_autosave_journal` but in a background thread. 
+    Returns the started `threading.Thread`.
+    """
+    thread = threading.Thread(
+        target=compact_autosave_journal, args=(journal_path,)
+    )
+    thread.start()
+    return thread
+
+def remove_autosave_journal(journal_path):
+    with _AUTOSAVE_JOURNAL_LOCK:
+        try:
+            os.remove(journal_path)
+        except FileNotFoundError:
+            pass
+
+def get_discarded_autosave_journal_path(journal_path):
+    return f'{journal_path}.discarded'
+
+def discard_autosave_journal(journal_path):
+    """Rename the journal to `get_discarded_autosave_journal_path` 
+    (replacing the previously discarded one) when the user does not recover 
+    it. This way the discarded changes are never replayed together with 
+    the changes of the new session.
+    """
+    with _AUTOSAVE_JOURNAL_LOCK:
+        try:
+            os.replace(
+                journal_path, get_discarded_autosave_journal_path(journal_path)
+            )
+        except FileNotFoundError:
+            pass
+
 def read_acdc_df_from_archive(archive_path, key):
     if not key.endswith('.csv'):
         csv_name = f'{key}.csv'
@@ -509,6 +920,237 @@ def read_acdc_df_from_archive(archive_path, key):
     acdc_df = _parse_loaded_acdc_df(acdc_df)
     return acdc_df
 
+def save_npz_atomic(npz_path, arr):
+    """Save `arr` to a temporary file and then rename it to `npz_path` to 
+    never leave a partially written file at `npz_path`.
+    """
+    folderpath, filename = os.path.split(npz_path)
+    # Unique temp file name so that concurrent saves do not clobber it
+    fd, temp_npz_path = tempfile.mkstemp(
+        suffix='.tmp.npz', prefix=f'.{filename}.', dir=folderpath
+    )
+    os.close(fd)
+    try:
+        np.savez_compressed(temp_npz_path, arr)
+        os.replace(temp_npz_path, npz_path)
+    except Exception as err:
+        if os.path.exists(temp_npz_path):
+            os.remove(temp_npz_path)
+        raise err
+
+def get_segm_completed_marker_path(segm_npz_path):
+    """Path of the file marking that the segmentation workflow of 
+    `segm_npz_path` completed (e.g., `basename_segm.npz` --> 
+    `.basename_segm.completed.json`).
+    """
+    folderpath, filename = os.path.split(segm_npz_path)
+    name = os.path.splitext(filename)[0]
+    return os.path.join(folderpath, f'.{name}.completed.json')
+
+def write_segm_completed_marker(segm_npz_path, num_frames):
+    marker_path = get_segm_completed_marker_path(segm_npz_path)
+    with open(marker_path, 'w') as json_file:
+        json.dump({'num_frames': int(num_frames)}, json_file)
+
+def read_segm_completed_marker(segm_npz_path):
+    """Returns the content of the completed marker of `segm_npz_path` or 
+    None if the segmentation workflow did not complete.
+    """
+    marker_path = get_segm_completed_marker_path(segm_npz_path)
+    try:
+        with open(marker_path, 'r') as json_file:
+            return json.load(json_file)
+    except Exception as err:
+        return
+
+def remove_segm_completed_marker(segm_npz_path):
+    marker_path = get_segm_completed_marker_path(segm_npz_path)
+    try:
+        os.remove(marker_path)
+    except FileNotFoundError:
+        pass
+
+# Serialize access to the chunked segmentation files since h5py cannot 
+# open the same file for reading and writing at the same time
+_SEGM_CHUNKS_LOCK = threading.RLock()
+
+def get_segm_chunks_path(segm_npz_path):
+    """Path of the chunked segmentation file stored next to `segm_npz_path`
+    (e.g., `basename_segm.npz` --> `basename_segm.chunks.hdf5`). 
+    
+    The `.hdf5` extension is not an image extension, hence the file is 
+    never detected as a channel.
+    """
+    return f'{os.path.splitext(segm_npz_path)[0]}.chunks.hdf5'
+
+def _get_file_stamp(filepath):
+    stat = os.stat(filepath)
+    return f'{stat.st_mtime_ns}_{stat.st_size}'
+
+def save_segm_chunks(segm_npz_path, segm_data, frames_i=None, is_timelapse=True):
+    """Save segmentation masks to the chunked HDF5 file associated with 
+    `segm_npz_path` (see `get_segm_chunks_path`). 
+    
+    Each frame (or each z-slice for 3D snapshots) is stored in its own 
+    chunk compressed with the fast LZF codec, hence frames can be read and 
+    written independently.
+
+    Parameters
+    ----------
+    segm_npz_path : str
+        Path of the segmentation .npz file. 
+    segm_data : numpy.ndarray
+        Segmentation masks. First axis is time if `is_timelapse` is True.
+    frames_i : iterable of ints, optional
+        If not None, write only these frames. If the file does not exist 
+        or its shape is different from `segm_data` all frames are written.
+        Default is None
+    is_timelapse : bool, optional
+        Whether the first axis of `segm_data` is time. Default is True
+    
+    Returns
+    -------
+    int
+        Version of the chunked file, incremented at every write.
+    """
+    chunks_path = get_segm_chunks_path(segm_npz_path)
+    chunks = [1]*segm_data.ndim
+    chunks[-2:] = segm_data.shape[-2:]
+    if not is_timelapse:
+        frames_i = None
+    with _SEGM_CHUNKS_LOCK:
+        with h5py.File(chunks_path, 'a') as h5f:
+            dset = h5f.get('segm')
+            is_full_write = (
+                frames_i is None or dset is None 
+                or dset.shape != segm_data.shape 
+                or dset.dtype != segm_data.dtype
+            )
+            if is_full_write:
+                if dset is not None:
+                    del h5f['segm']
+                dset = h5f.create_dataset(
+                    'segm', data=segm_data, chunks=tuple(chunks), 
+                    compression='lzf'
+                )
+            else:
+                for frame_i in frames_i:
+                    dset[frame_i] = segm_data[frame_i]
+            version = int(h5f.attrs.get('version', 0)) + 1
+            h5f.attrs['version'] = version
+            h5f.attrs['is_timelapse'] = is_timelapse
+    return version
+
+def _set_segm_chunks_npz_stamp(segm_npz_path, version):
+    # Mark the chunked file as in sync with the .npz file unless it was 
+    # written again in the meantime
+    chunks_path = get_segm_chunks_path(segm_npz_path)
+    with _SEGM_CHUNKS_LOCK:
+        with h5py.File(chunks_path, 'a') as h5f:
+            if h5f.attrs.get('version', 0) != version:
+                return
+            h5f.attrs['npz_stamp'] = _get_file_stamp(segm_npz_path)
+
+def save_segm_data(segm_npz_path, segm_data, frames_i=None, is_timelapse=True):
+    """Save segmentation masks to `segm_npz_path` and to the chunked 
+    file (see `save_segm_chunks`). 
+    
+    The .npz file is written before returning, hence it is never stale 
+    and the tools that read it do not need to know about the chunked file. 
+    The chunked file allows reading single frames without loading the 
+    entire .npz file (see `loadData.loadOtherFiles` with 
+    `lazy_segm_data=True`).
+
+    Parameters
+    ----------
+    segm_npz_path : str
+        Path of the segmentation .npz file. 
+    segm_data : numpy.ndarray
+        Segmentation masks. First axis is time if `is_timelapse` is True.
+    frames_i : iterable of ints, optional
+        Frames that changed since last save. Only these frames are written 
+        to the chunked file. Default is None (write all frames)
+    is_timelapse : bool, optional
+        Whether the first axis of `segm_data` is time. Default is True
+    """
+    version = save_segm_chunks(
+        segm_npz_path, segm_data, frames_i=frames_i, 
+        is_timelapse=is_timelapse
+    )
+    save_npz_atomic(segm_npz_path, np.squeeze(segm_data))
+    _set_segm_chunks_npz_stamp(segm_npz_path, version)
+
+def open_segm_chunks(segm_npz_path):
+    """Open the chunked segmentation file for lazy reading. 
+
+    Returns
+    -------
+    tuple of (h5py.File, h5py.Dataset)
+        The file (to be closed by the caller) and the dataset that 
+        reads the frames from disk only when indexed (e.g., `dset[frame_i]`).
+    """
+    chunks_path = get_segm_chunks_path(segm_npz_path)
+    with _SEGM_CHUNKS_LOCK:
+        h5f = h5py.File(chunks_path, 'r')
+    return h5f, h5f['segm']
+
+def read_segm_chunks(segm_npz_path, frames_i=None):
+    with _SEGM_CHUNKS_LOCK:
+        h5f, dset = open_segm_chunks(segm_npz_path)
+        with h5f:
+            if frames_i is None:
+                return dset[()]
+            return np.array([dset[frame_i] for frame_i in frames_i])
+
+def is_segm_chunks_file_valid(segm_npz_path):
+    """Check whether the chunked segmentation file has the same masks as 
+    the .npz file. 
+    
+    This is the case when the .npz file does not exist or when it was 
+    saved together with the chunked file (same stamp, see 
+    `save_segm_data`). If the .npz file was modified by other means 
+    (e.g., a segmentation workflow) the chunked file is stale.
+    """
+    chunks_path = get_segm_chunks_path(segm_npz_path)
+    if not os.path.exists(chunks_path):
+        return False
+    
+    try:
+        with _SEGM_CHUNKS_LOCK:
+            with h5py.File(chunks_path, 'r') as h5f:
+                if 'segm' not in h5f:
+                    return False
+                npz_stamp = h5f.attrs.get('npz_stamp')
+    except Exception as err:
+        return False
+    
+    if not os.path.exists(segm_npz_path):
+        return True
+    
+    return npz_stamp == _get_file_stamp(segm_npz_path)
+
+def import_segm_npz_to_chunks(segm_npz_path, is_timelapse=True):
+    """Create the chunked segmentation file from `segm_npz_path`"""
+    archive = np.load(segm_npz_path)
+    segm_data = archive[archive.files[0]]
+    version = save_segm_chunks(
+        segm_npz_path, segm_data, is_timelapse=is_timelapse
+    )
+    _set_segm_chunks_npz_stamp(segm_npz_path, version)
+
+def read_segm_data(segm_npz_path):
+    """Load segmentation masks from the chunked file if valid (see 
+    `is_segm_chunks_file_valid`) or from the .npz file.
+    """
+    if is_segm_chunks_file_valid(segm_npz_path):
+        try:
+            return read_segm_chunks(segm_npz_path)
+        except Exception as err:
+            traceback.print_exc()
+    
+    archive = np.load(segm_npz_path)
+    return archive[archive.files[0]]
+
 def get_user_ch_paths(images_paths, user_ch_name):
     user_ch_file_paths = []
     for images_path in images_paths:
@@ -619,6 +1261,22 @@ def imread(path):
     else:
         return skimage.io.imread(path)
 
+def imread_memmap(path):
+    """Memory-map a .npy or a .tif file. Returns None if the file cannot 
+    be memory-mapped (e.g., compressed TIFF).
+
+    The returned numpy.memmap is a numpy.ndarray whose data is read from 
+    disk only when accessed. It is opened in copy-on-write mode, i.e., 
+    modifying it does not modify the file.
+    """
+    try:
+        if path.endswith('.npy'):
+            return np.load(path, mmap_mode='c')
+        elif path.endswith('.tif') or path.endswith('.tiff'):
+            return tifffile.memmap(path, mode='c')
+    except Exception as err:
+        return
+
 def load_image_file(filepath):
     if filepath.endswith('.h5'):
         h5f = h5py.File(filepath, 'r')
@@ -627,10 +1285,12 @@ def load_image_file(filepath):
         archive = np.load(filepath)
         files = archive.files
         img_data = archive[files[0]]
-    elif filepath.endswith('.npy'):
-        img_data = np.load(filepath)
     else:
-        img_data = imread(filepath)
+        img_data = imread_memmap(filepath)
+        if img_data is None and filepath.endswith('.npy'):
+            img_data = np.load(filepath)
+        elif img_data is None:
+            img_data = imread(filepath)
     return np.squeeze(img_data)
 
 def get_existing_segm_endnames(basename, segm_files):
@@ -756,6 +1416,10 @@ def is_bkgrROIs_present(images_path):
             return True
     return False
 
+# Number of frames read in the background before and after the current one 
+# when the image data is memory-mapped (see `loadData.loadChannelDataChunk`)
+LAZY_PREFETCH_NUM_FRAMES = 4
+
 class loadData:
     def __init__(self, imgPath, user_ch_name, relPathDepth=3, QParent=None):
         self.fluo_data_dict = {}
@@ -778,6 +1442,11 @@ class loadData:
         self.manualBackgroundLab = None
         self.frame_i = 0
         self.clickEntryPointsDfs = {}
+        self.rotationalVolumeCache = {}
+        self.savedAcdcDfCache = {}
+        self.savedMetricsSignature = None
+        self.initEditedFrames()
+        self.resetAutosaveJournalState()
         path_li = os.path.normpath(imgPath).split(os.sep)
         self.relPath = f'{f"{os.sep}".join(path_li[-relPathDepth:])}'
         filename_ext = os.path.basename(imgPath)
@@ -902,11 +1571,26 @@ class loadData:
         )
         self.basename = selector.basename
 
-    def loadImgData(self, imgPath=None, signals=None):
+    def loadImgData(self, imgPath=None, signals=None, memmap=True):
+        """Load image data from `imgPath` (default `self.imgPath`).
+
+        Parameters
+        ----------
+        imgPath : str, optional
+            Path of the image file. Default is None, i.e., `self.imgPath`
+        signals : object, optional
+            Signals used to report invalid files. Default is None
+        memmap : bool, optional
+            If True, .npy and uncompressed .tif files are memory-mapped. 
+            Pass False when the file will be overwritten while the data 
+            is still in use (e.g., cropping in data prep), since a 
+            memory-mapped file cannot be replaced on Windows. Default is True
+        """
         if imgPath is None:
             imgPath = self.imgPath
         self.z0_window = 0
         self.t0_window = 0
+        self.isImgDataMemmap = False
         if self.ext == '.h5':
             self.h5f = h5py.File(imgPath, 'r')
             self.dset = self.h5f['data']
@@ -947,12 +1631,23 @@ class loadData:
             self.dset = self.img_data
             self.img_data_shape = self.img_data.shape
         elif self.ext == '.npy':
-            self.img_data = np.squeeze(np.load(imgPath))
+            # Memory-mapped data is read from disk only when accessed
+            img_data = imread_memmap(imgPath) if memmap else None
+            if img_data is None:
+                img_data = np.load(imgPath)
+            else:
+                self.isImgDataMemmap = True
+            self.img_data = np.squeeze(img_data)
             self.dset = self.img_data
             self.img_data_shape = self.img_data.shape
         else:
             try:
-                self.img_data = np.squeeze(imread(imgPath))
+                img_data = imread_memmap(imgPath) if memmap else None
+                if img_data is None:
+                    img_data = imread(imgPath)
+                else:
+                    self.isImgDataMemmap = True
+                self.img_data = np.squeeze(img_data)
                 self.dset = self.img_data
                 self.img_data_shape = self.img_data.shape
             except ValueError:
@@ -963,6 +1658,47 @@ class loadData:
                 traceback.print_exc()
                 self.criticalExtNotValid(signals=signals)
     
+    def loadChannelDataChunk(
+            self, current_idx, axis=0, worker=None, num_frames=None
+        ):
+        """Read the frames around `current_idx` of memory-mapped image data 
+        so that they are already in the OS page cache when visited.
+
+        Parameters
+        ----------
+        current_idx : int
+            Index of the current frame.
+        axis : int, optional
+            Axis of `img_data` along which to prefetch. Default is 0
+        worker : workers.LazyLoader, optional
+            Worker calling this method. If not None, prefetching stops as 
+            soon as `worker.exit` is True. Default is None
+        num_frames : int, optional
+            Number of frames to read before and after `current_idx`. 
+            Default is None, i.e., `LAZY_PREFETCH_NUM_FRAMES`.
+        """
+        if not getattr(self, 'isImgDataMemmap', False):
+            return
+        
+        if getattr(self, 'SizeT', 1) == 1:
+            return
+        
+        if num_frames is None:
+            num_frames = LAZY_PREFETCH_NUM_FRAMES
+        
+        size = self.img_data.shape[axis]
+        start_idx = max(0, current_idx-num_frames)
+        stop_idx = min(size, current_idx+num_frames+1)
+        # Read the frames closest to the current one first
+        indices = sorted(
+            range(start_idx, stop_idx), key=lambda i: abs(i-current_idx)
+        )
+        for idx in indices:
+            if worker is not None and worker.exit:
+                return
+            # Summing forces reading the pages from disk
+            np.take(self.img_data, idx, axis=axis).sum()
+    
     def loadChannelData(self, channelName):
         if channelName == self.user_ch_name:
             return self.img_data
@@ -1044,7 +1780,8 @@ class loadData:
             getTifPath=False,
             end_filename_segm='',
             new_endname='',
-            labelBoolSegm=None
+            labelBoolSegm=None,
+            lazy_segm_data=False
         ):
 
         self.segmFound = False if load_segm_data else None
@@ -1115,9 +1852,12 @@ class loadData:
             if load_segm_data and is_segm_file and not create_new_segm:
                 self.segmFound = True
                 self.segm_npz_path = filePath
-                archive = np.load(filePath)
-                file = archive.files[0]
-                self.segm_data = archive[file].astype(np.uint32)
+                if lazy_segm_data and is_segm_chunks_file_valid(filePath):
+                    self.openSegmChunks()
+                    self.loadManualBackgroundData()
+                    continue
+                
+                self.segm_data = read_segm_data(filePath).astype(np.uint32)
                 self.loadManualBackgroundData()
                 if self.segm_data.dtype == bool:
                     if self.labelBoolSegm is None:
@@ -1219,6 +1959,108 @@ class loadData:
         self.getCustomAnnotatedIDs()
         self.setNotFoundData()
     
+    def initEditedFrames(self):
+        # Version of the last edit of each frame (see `setFramesEdited`)
+        self.editVersion = 0
+        self.framesEditVersions = {}
+        # Value of `editVersion` at last save (None if never saved)
+        self.savedEditVersion = None
+    
+    def setFramesEdited(self, frames_i=None):
+        """Mark the data of `frames_i` (default current frame) as edited. 
+        Autosave and save process only the frames edited since they last 
+        ran (see `getFramesEditedSince`). Call this after storing the data 
+        in `allData_li`.
+        """
+        if frames_i is None:
+            frames_i = (self.frame_i,)
+        # Publish the new version only after the frames are marked, so 
+        # that a reader in another thread never sees the version without 
+        # the frames
+        version = self.editVersion + 1
+        for frame_i in frames_i:
+            self.framesEditVersions[frame_i] = version
+        self.editVersion = version
+    
+    def getFrameEditVersion(self, frame_i):
+        return self.framesEditVersions.get(frame_i, 0)
+    
+    def getFramesEditedSince(self, version):
+        """Sorted list of the frames edited after `version` (i.e., the 
+        value of `editVersion` when the caller last processed the edits).
+        """
+        return sorted(
+            frame_i for frame_i, frame_version 
+            in list(self.framesEditVersions.items()) 
+            if frame_version > version
+        )
+    
+    def resetAutosaveJournalState(self):
+        # Last data of each frame written to the autosave journal
+        self.journaledLabHashes = {}
+        self.journaledAcdcDfs = {}
+        self.autosaveJournalNumRecords = 0
+        # Edits up to this version are in the journal or were saved
+        self.journaledEditVersion = self.editVersion
+    
+    def discardAutosaveJournal(self):
+        """Discard the autosave journal of a previous session that the user 
+        did not recover (see `discard_autosave_journal`).
+        """
+        with get_autosave_journal_lock():
+            discard_autosave_journal(self.autosave_journal_path)
+            self.resetAutosaveJournalState()
+    
+    def loadAutosaveJournal(self):
+        """Apply the unsaved changes recorded in the autosave journal to 
+        `segm_data` and `acdc_df`.
+        """
+        saved_acdc_dfs = None
+        if getattr(self, 'acdc_df', None) is not None:
+            saved_acdc_dfs = {
+                frame_i: df.droplevel(0) 
+                for frame_i, df in self.acdc_df.groupby(level=0)
+            }
+        labels, acdc_dfs = read_autosave_journal(
+            self.autosave_journal_path, base_acdc_dfs=saved_acdc_dfs
+        )
+        if labels:
+            if self.SizeT == 1:
+                self.segm_data = labels[0]
+            else:
+                num_frames = max(max(labels)+1, len(self.segm_data))
+                if num_frames > len(self.segm_data):
+                    segm_data = np.zeros(
+                        (num_frames, *self.segm_data.shape[1:]), 
+                        dtype=self.segm_data.dtype
+                    )
+                    segm_data[:len(self.segm_data)] = self.segm_data
+                    self.segm_data = segm_data
+                for frame_i, lab in labels.items():
+                    self.segm_data[frame_i] = lab
+        
+        if not acdc_dfs:
+            return
+        
+        journal_acdc_df = pd.concat(
+            acdc_dfs.values(), keys=acdc_dfs.keys(), names=['frame_i']
+        ).reset_index()
+        journal_acdc_df = journal_acdc_df.drop(
+            columns=['time_seconds'], errors='ignore'
+        )
+        journal_acdc_df = _parse_loaded_acdc_df(journal_acdc_df)
+        if getattr(self, 'acdc_df', None) is not None:
+            # Frames that are not in the journal did not change
+            saved_acdc_df = self.acdc_df.drop(
+                index=list(acdc_dfs.keys()), level=0, errors='ignore'
+            )
+            journal_acdc_df = pd.concat(
+                [saved_acdc_df, journal_acdc_df]
+            ).sort_index()
+        self.acdc_df = journal_acdc_df
+        self.acdc_df_found = True
+        self.last_tracked_i = max(self.acdc_df.index.get_level_values(0))
+    
     def loadMostRecentUnsavedAcdcDf(self):
         acdc_df = get_last_stored_unsaved_acdc_df(self)
         if acdc_df is None:
@@ -1329,25 +2171,40 @@ class loadData:
         acdc_df['was_manually_edited'] = 0
         acdc_df['x_centroid'] = 0
         acdc_df['y_centroid'] = 0
-        for i, lab in enumerate(tracked_video):
-            frame_i = start_frame_i + i
+        
+        # Index the frames one by one so that on-disk stores (e.g., the 
+        # memory-mapped stack of the streamed segmentation) are never 
+        # read entirely into memory
+        centroids_dfs = []
+        centroids_keys = []
+        for i in range(len(tracked_video)):
+            lab = np.asarray(tracked_video[i])
             rp = skimage.measure.regionprops(lab)
-            for obj in rp:
-                centroid = obj.centroid
-                yc, xc = obj.centroid[-2:]
-                acdc_df.at[(frame_i, obj.label), 'x_centroid'] = int(xc)
-                acdc_df.at[(frame_i, obj.label), 'y_centroid'] = int(yc)
-                if len(centroid) == 3:
-                    if 'z_centroid' not in acdc_df.columns:
-                        acdc_df['z_centroid'] = 0
-                    zc = obj.centroid[0]
-                    acdc_df.at[(frame_i, obj.label), 'z_centroid'] = int(zc)                
+            if not rp:
+                continue
+            centroids = np.array([obj.centroid for obj in rp]).astype(int)
+            frame_centroids = {
+                'x_centroid': centroids[:, -1], 
+                'y_centroid': centroids[:, -2]
+            }
+            if centroids.shape[1] == 3:
+                frame_centroids['z_centroid'] = centroids[:, 0]
+            IDs = pd.Index([obj.label for obj in rp], name='Cell_ID')
+            centroids_dfs.append(pd.DataFrame(frame_centroids, index=IDs))
+            centroids_keys.append(start_frame_i + i)
+        
+        if centroids_dfs:
+            centroids_df = pd.concat(
+                centroids_dfs, keys=centroids_keys, names=['frame_i']
+            ).reindex(acdc_df.index).fillna(0).astype(int)
+            for col in centroids_df.columns:
+                acdc_df[col] = centroids_df[col].values
 
         if not save:
             return acdc_df
 
         acdc_df = pd_bool_to_int(acdc_df, inplace=False)
-        acdc_df.to_csv(self.acdc_output_csv_path)
+        save_acdc_df_file(acdc_df, self.acdc_output_csv_path)
         self.loadAcdcDf(self.acdc_output_csv_path)
 
     def getAcdcDfEndname(self):
@@ -1586,6 +2443,24 @@ class loadData:
         filepath = self.getManualBackgroudDataFilepath()
         np.savez_compressed(filepath, data)
 
+    def openSegmChunks(self):
+        """Set `segm_data` to the read-only dataset of the chunked 
+        segmentation file (see `open_segm_chunks`). Frames are read from 
+        disk only when indexed (e.g., `segm_data[frame_i]`). Call 
+        `closeSegmChunks` when done.
+        """
+        self.segmChunksFile, self.segm_data = open_segm_chunks(
+            self.segm_npz_path
+        )
+    
+    def closeSegmChunks(self):
+        segmChunksFile = getattr(self, 'segmChunksFile', None)
+        if segmChunksFile is None:
+            return
+        
+        segmChunksFile.close()
+        self.segmChunksFile = None
+    
     def loadManualBackgroundData(self):
         filepath = self.getManualBackgroudDataFilepath()
         if not os.path.exists(filepath):
@@ -1907,6 +2782,9 @@ class loadData:
         self.unsaved_acdc_df_autosave_path = os.path.join(
             temp_folder, unsaved_acdc_df_filename
         )
+        self.autosave_journal_path = os.path.join(
+            temp_folder, segm_filename.replace('.npz', '_autosave.journal')
+        )
         
     def buildPaths(self):
         if self.basename.endswith('_'):
@@ -7,6 +7,7 @@ import os
 import traceback
 import shutil
 from importlib import import_module
+import scipy.ndimage
 import skimage.measure
 from tqdm import tqdm
 
@@ -1004,32 +1005,32 @@ def get_foregr_data(foregr_img, isSegm3D, z):
 
 def get_cell_volumes_areas(df):
     try:
-        cell_vol_vox = df.loc['cell_vol_vox']
+        cell_vol_vox = df['cell_vol_vox'].to_list()
     except Exception as e:
         cell_vol_vox = [np.nan]*len(df)
     
     try:
-        cell_vol_fl = df.loc['cell_vol_fl']
+        cell_vol_fl = df['cell_vol_fl'].to_list()
     except Exception as e:
         cell_vol_fl = [np.nan]*len(df)
     
     try:
-        cell_vol_vox_3D = df.loc['cell_vol_vox_3D']
+        cell_vol_vox_3D = df['cell_vol_vox_3D'].to_list()
     except Exception as e:
         cell_vol_vox_3D = [np.nan]*len(df)
     
     try:
-        cell_vol_fl_3D = df.loc['cell_vol_fl_3D']
+        cell_vol_fl_3D = df['cell_vol_fl_3D'].to_list()
     except Exception as e:
         cell_vol_fl_3D = [np.nan]*len(df)
     
     try:
-        cell_area_pxl = df.loc['cell_area_pxl']
+        cell_area_pxl = df['cell_area_pxl'].to_list()
     except Exception as e:
         cell_area_pxl = [np.nan]*len(df)
     
     try:
-        cell_area_um2 = df.loc['cell_vol_fl_3D']
+        cell_area_um2 = df['cell_area_um2'].to_list()
     except Exception as e:
         cell_area_um2 = [np.nan]*len(df)
     
@@ -1422,6 +1423,135 @@ def add_size_metrics(
             df.at[obj.label, col] = val
     return df
 
+def _get_labels_sorted_values(foregr_arr, lab, IDs):
+    """Sort the pixels values of all the objects by (label, value) and get 
+    where each object starts and ends in the sorted values.
+    """
+    IDs = np.asarray(IDs)
+    lab_mask = lab > 0
+    labels = lab[lab_mask]
+    values = foregr_arr[lab_mask]
+    sort_idx = np.lexsort((values, labels))
+    labels = labels[sort_idx]
+    sorted_values = values[sort_idx]
+    starts = np.searchsorted(labels, IDs, side='left')
+    ends = np.searchsorted(labels, IDs, side='right')
+    return sorted_values, starts, ends
+
+def _labels_quantile(sorted_values, starts, ends, q):
+    """Linear interpolation quantile of each object (same as `np.quantile`)
+    from the sorted values returned by `_get_labels_sorted_values`.
+    """
+    counts = ends - starts
+    quantiles = np.full(len(counts), np.nan)
+    is_not_empty = counts > 0
+    starts = starts[is_not_empty]
+    counts = counts[is_not_empty]
+    pos = q*(counts-1)
+    lower_pos = np.floor(pos).astype(np.int64)
+    upper_pos = np.ceil(pos).astype(np.int64)
+    lower_vals = sorted_values[starts+lower_pos].astype(np.float64)
+    upper_vals = sorted_values[starts+upper_pos].astype(np.float64)
+    quantiles[is_not_empty] = (
+        lower_vals + (upper_vals-lower_vals)*(pos-lower_pos)
+    )
+    return quantiles
+
+_VECTORIZED_QUANTILES = {
+    'median': 0.5, 'q25': 0.25, 'q75': 0.75, 'q05': 0.05, 'q95': 0.95
+}
+
+_VECTORIZED_METRICS = {
+    'sum', 'mean', 'min', 'max', 'amount_autoBkgr', 'amount_dataPrepBkgr',
+    'amount_manualBkgr', 'mean_manualBkgr', *_VECTORIZED_QUANTILES.keys()
+}
+
+def _get_bkgr_col_values(df, IDs, bkgr_col):
+    try:
+        return df.loc[IDs, bkgr_col].to_numpy(dtype=np.float64)
+    except Exception as e:
+        return np.full(len(IDs), np.nan)
+
+def add_foregr_standard_metrics_vectorized(
+        df, IDs, channel, foregr_data, foregr_metrics_params, lab
+    ):
+    """Compute the standard foreground metrics of all objects at once with 
+    label-indexed reductions. Only the metrics whose foreground data has 
+    the same shape of `lab` are computed (i.e., 2D masks on 2D data and 
+    3D masks on 3D data).
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, set)
+        The DataFrame with the computed metrics and the set of computed 
+        columns. Columns that were not computed must be computed per-object.
+    """
+    computed_cols = set()
+    if not IDs:
+        return df, computed_cols
+    
+    IDs_arr = np.asarray(IDs)
+    cache = {}
+    def get_stat(how, stat):
+        key = (how, stat)
+        if key in cache:
+            return cache[key]
+        foregr_arr = foregr_data[how]
+        if stat == 'sum':
+            val = scipy.ndimage.sum_labels(foregr_arr, lab, IDs_arr)
+        elif stat == 'mean':
+            val = scipy.ndimage.mean(foregr_arr, lab, IDs_arr)
+        elif stat == 'min':
+            val = scipy.ndimage.minimum(foregr_arr, lab, IDs_arr)
+        elif stat == 'max':
+            val = scipy.ndimage.maximum(foregr_arr, lab, IDs_arr)
+        elif stat == 'area':
+            val = scipy.ndimage.sum_labels(lab > 0, lab, IDs_arr)
+        elif stat == 'sorted':
+            val = _get_labels_sorted_values(foregr_arr, lab, IDs_arr)
+        else:
+            sorted_values, starts, ends = get_stat(how, 'sorted')
+            q = _VECTORIZED_QUANTILES[stat]
+            val = _labels_quantile(sorted_values, starts, ends, q)
+        cache[key] = val
+        return val
+    
+    for col, (func_name, how) in foregr_metrics_params.items():
+        if func_name not in _VECTORIZED_METRICS:
+            continue
+        
+        if foregr_data[how].shape != lab.shape:
+            continue
+        
+        is_manual_bkgr_metric = func_name.find('manualBkgr') != -1
+        is_amount_metric = func_name.find('amount_') != -1
+        if is_amount_metric and not is_manual_bkgr_metric:
+            bkgr_type = func_name[len('amount_'):]
+            if how:
+                bkgr_col = f'{channel}_{bkgr_type}_bkgrVal_median_{how}'
+            else:
+                bkgr_col = f'{channel}_{bkgr_type}_bkgrVal_median'
+        elif is_manual_bkgr_metric:
+            if how:
+                bkgr_col = f'{channel}_manualBkgr_bkgrVal_mean_{how}'
+            else:
+                bkgr_col = f'{channel}_dataPrepBkgr_bkgrVal_mean'
+        
+        if is_amount_metric:
+            bkgr_vals = _get_bkgr_col_values(df, IDs, bkgr_col)
+            areas = get_stat(how, 'area')
+            vals = (get_stat(how, 'mean') - bkgr_vals)*areas
+        elif is_manual_bkgr_metric:
+            bkgr_vals = _get_bkgr_col_values(df, IDs, bkgr_col)
+            vals = get_stat(how, 'mean') - bkgr_vals
+        else:
+            vals = get_stat(how, func_name)
+        
+        df.loc[IDs, col] = vals
+        computed_cols.add(col)
+    
+    return df, computed_cols
+
 def add_foregr_metrics(
         df, rp, channel, foregr_data, foregr_metrics_params, metrics_func,
         custom_metrics_params, isSegm3D, lab, foregr_img, z_slice=None,
@@ -1430,56 +1560,89 @@ def add_foregr_metrics(
     if manualBackgrRp is not None:
         manualBackgrRp = {obj.label for obj in manualBackgrRp}
     custom_errors = ''
-    # Iterate objects and compute foreground metrics
-    for o, obj in enumerate(tqdm(rp, ncols=100, leave=False)):
-        for col, (func_name, how) in foregr_metrics_params.items():
-            func_name, how = foregr_metrics_params[col]
-            foregr_arr = foregr_data[how]
-            foregr_obj_arr, obj_area = get_foregr_obj_array(
-                foregr_arr, obj, isSegm3D, z_slice=z_slice, how=how
-            )
-            is_manual_bkgr_metric = func_name.find('manualBkgr') != -1
-            is_amount_metric = func_name.find('amount_') != -1
-            if is_amount_metric and not is_manual_bkgr_metric:
-                bkgr_type = func_name[len('amount_'):]
-                try:
-                    bkgr_val = get_bkgrVals(
-                        df, channel, how, obj.label, bkgr_type=bkgr_type
+
+    # Compute standard metrics of all objects at once where possible
+    IDs = [obj.label for obj in rp]
+    df, computed_cols = add_foregr_standard_metrics_vectorized(
+        df, IDs, channel, foregr_data, foregr_metrics_params, lab
+    )
+    foregr_metrics_params = {
+        col: params for col, params in foregr_metrics_params.items()
+        if col not in computed_cols
+    }
+    if not foregr_metrics_params and not custom_metrics_params:
+        return df
+    
+    # Iterate objects and compute remaining foreground metrics
+    if foregr_metrics_params:
+        for obj in tqdm(rp, ncols=100, leave=False):
+            for col, (func_name, how) in foregr_metrics_params.items():
+                foregr_arr = foregr_data[how]
+                foregr_obj_arr, obj_area = get_foregr_obj_array(
+                    foregr_arr, obj, isSegm3D, z_slice=z_slice, how=how
+                )
+                is_manual_bkgr_metric = func_name.find('manualBkgr') != -1
+                is_amount_metric = func_name.find('amount_') != -1
+                if is_amount_metric and not is_manual_bkgr_metric:
+                    bkgr_type = func_name[len('amount_'):]
+                    try:
+                        bkgr_val = get_bkgrVals(
+                            df, channel, how, obj.label, bkgr_type=bkgr_type
+                        )
+                        func = metrics_func[func_name]
+                        val = func(foregr_obj_arr, bkgr_val, obj_area)
+                    except Exception as e:
+                        val = np.nan
+                elif is_manual_bkgr_metric:
+                    bkgr_val = get_manualBkgr_bkgrVal(
+                        df, channel, how, obj.label
                     )
                     func = metrics_func[func_name]
                     val = func(foregr_obj_arr, bkgr_val, obj_area)
-                except Exception as e:
-                    val = np.nan
-            elif is_manual_bkgr_metric:
-                bkgr_val = get_manualBkgr_bkgrVal(df, channel, how, obj.label)
-                func = metrics_func[func_name]
-                val = func(foregr_obj_arr, bkgr_val, obj_area)
-            else:
-                func = metrics_func[func_name]
-                val = func(foregr_obj_arr)
-            df.at[obj.label, col] = val
-
-        for col, (custom_func, how) in custom_metrics_params.items():   
-            foregr_arr = foregr_data[how]
-            foregr_obj_arr, obj_area = get_foregr_obj_array(
-                foregr_arr, obj, isSegm3D, z_slice=z_slice, how=how
-            )
-            ID = obj.label
-            autoBkgrVal, dataPrepBkgrVal = get_bkgrVals(df, channel, how, ID)
-            metrics_values = df.to_dict('list')
-            items = get_cell_volumes_areas(df)
-            (cell_vols_vox, cell_vols_fl, cell_vols_vox_3D, cell_vols_fl_3D,
-            cell_areas_pxl, cell_areas_um2) = items
-            custom_error, custom_val = get_custom_metric_value(
-                custom_func, foregr_obj_arr, autoBkgrVal, dataPrepBkgrVal, obj,
-                o, metrics_values, cell_vols_vox, cell_vols_fl, cell_areas_pxl, 
-                cell_areas_um2, foregr_img, lab, isSegm3D, 
-                cell_vols_vox_3D=cell_vols_vox_3D, 
-                cell_vols_fl_3D=cell_vols_fl_3D
+                else:
+                    func = metrics_func[func_name]
+                    val = func(foregr_obj_arr)
+                df.at[obj.label, col] = val
+    
+    if not custom_metrics_params:
+        return df
+
+    # Build the context of the custom metrics only once per frame and channel
+    metrics_values, cell_vols_areas = get_custom_metrics_context(df)
+    (cell_vols_vox, cell_vols_fl, cell_vols_vox_3D, cell_vols_fl_3D,
+    cell_areas_pxl, cell_areas_um2) = cell_vols_areas
+    for col, (custom_func, how) in custom_metrics_params.items():
+        foregr_arr = foregr_data[how]
+        if is_custom_metric_vectorized(custom_func):
+            custom_error, custom_vals = get_custom_metric_values_vectorized(
+                custom_func, df, rp, channel, how, foregr_arr, lab, 
+                metrics_values, isSegm3D
             )
-            df.at[ID, col] = custom_val
+            df.loc[IDs, col] = custom_vals
             if customMetricsCritical is not None and custom_error:
                 customMetricsCritical.emit(custom_error, col)
+        else:
+            for o, obj in enumerate(tqdm(rp, ncols=100, leave=False)):
+                foregr_obj_arr, obj_area = get_foregr_obj_array(
+                    foregr_arr, obj, isSegm3D, z_slice=z_slice, how=how
+                )
+                ID = obj.label
+                autoBkgrVal, dataPrepBkgrVal = get_bkgrVals(
+                    df, channel, how, ID
+                )
+                custom_error, custom_val = get_custom_metric_value(
+                    custom_func, foregr_obj_arr, autoBkgrVal, dataPrepBkgrVal, 
+                    obj, o, metrics_values, cell_vols_vox, cell_vols_fl, 
+                    cell_areas_pxl, cell_areas_um2, foregr_img, lab, isSegm3D, 
+                    cell_vols_vox_3D=cell_vols_vox_3D, 
+                    cell_vols_fl_3D=cell_vols_fl_3D
+                )
+                df.at[ID, col] = custom_val
+                if customMetricsCritical is not None and custom_error:
+                    customMetricsCritical.emit(custom_error, col)
+        
+        # Next custom metrics can use the values of this one
+        metrics_values[col] = df[col].to_list()
     return df
 
 def add_bkgr_values(
@@ -1529,6 +1692,63 @@ def add_regionprops_metrics(df, lab, regionprops_to_save, logger_func=None):
     df = df.join(df_rp)
     return df, rp_errors
 
+def get_custom_metrics_context(df):
+    """Get the values passed to the custom metrics functions. Build it only 
+    once per frame and channel and do not modify it in the custom metrics.
+
+    Returns
+    -------
+    tuple of (dict, tuple)
+        The first element is a dictionary with the columns of `df` as keys 
+        and the list of values as values. The second element are the items 
+        returned by `get_cell_volumes_areas`.
+    """
+    metrics_values = df.to_dict('list')
+    cell_vols_areas = get_cell_volumes_areas(df)
+    return metrics_values, cell_vols_areas
+
+def is_custom_metric_vectorized(custom_func):
+    """Custom metrics can declare that they compute all the objects of a 
+    frame at once by setting the attribute `vectorized = True` on the 
+    function (e.g., `my_metric.vectorized = True` after the definition).
+    
+    The signature of a vectorized custom metric is 
+    `func(image, lab, rp, autoBkgrVals, dataPrepBkgrVals, metrics_values, 
+    isSegm3D=False)` and it must return one value for each object in `rp` 
+    (in the same order). `autoBkgrVals` and `dataPrepBkgrVals` are numpy 
+    arrays with one value per object while `metrics_values` is a dictionary 
+    of lists with one value per object.
+    """
+    return getattr(custom_func, 'vectorized', False)
+
+def get_custom_metric_values_vectorized(
+        custom_func, df, rp, channel, how, foregr_arr, lab, metrics_values,
+        isSegm3D
+    ):
+    IDs = [obj.label for obj in rp]
+    if how:
+        autoBkgr_col = f'{channel}_autoBkgr_bkgrVal_median_{how}'
+        dataPrepBkgr_col = f'{channel}_dataPrepBkgr_bkgrVal_median_{how}'
+    else:
+        autoBkgr_col = f'{channel}_autoBkgr_bkgrVal_median'
+        dataPrepBkgr_col = f'{channel}_dataPrepBkgr_bkgrVal_median'
+    autoBkgrVals = _get_bkgr_col_values(df, IDs, autoBkgr_col)
+    dataPrepBkgrVals = _get_bkgr_col_values(df, IDs, dataPrepBkgr_col)
+    try:
+        custom_vals = custom_func(
+            foregr_arr, lab, rp, autoBkgrVals, dataPrepBkgrVals, 
+            metrics_values, isSegm3D=isSegm3D
+        )
+        custom_vals = np.asarray(custom_vals, dtype=np.float64)
+        if len(custom_vals) != len(IDs):
+            raise ValueError(
+                f'The custom metric returned {len(custom_vals)} values '
+                f'but there are {len(IDs)} objects.'
+            )
+        return '', custom_vals
+    except Exception as e:
+        return traceback.format_exc(), np.full(len(IDs), np.nan)
+
 def get_custom_metric_value(
         custom_func, foregr_obj_arr, autoBkgrVal, dataPrepBkgrVal, obj,
         i, metrics_values, cell_vols_vox, cell_vols_fl, cell_areas_pxl, 
@@ -1659,4 +1879,311 @@ def get_regionprops_columns(existing_colnames, selected_props_names):
             m = re.match(fr'{selected_prop}-\d', col)
             if m is not None:
                 selected_rp_cols.append(col)
-    return selected_rp_cols
\ No newline at end of file
+    return selected_rp_cols
+
+def get_default_metrics_to_save(posData, isSegm3D):
+    """Get all the standard and custom metrics of the loaded channels. 
+    Used when the user did not select the measurements to save.
+    """
+    metrics_to_save = {chName:[] for chName in posData.loadedChNames}
+    isManualBackgrPresent = posData.manualBackgroundLab is not None
+    for chName in posData.loadedChNames:
+        metrics_desc, bkgr_val_desc = standard_metrics_desc(
+            posData.SizeZ>1, chName, isSegm3D=isSegm3D,
+            isManualBackgrPresent=isManualBackgrPresent
+        )
+        metrics_to_save[chName].extend(metrics_desc.keys())
+        metrics_to_save[chName].extend(bkgr_val_desc.keys())
+
+        channel_custom_metrics_desc = custom_metrics_desc(
+            posData.SizeZ>1, chName, posData=posData, 
+            isSegm3D=isSegm3D, return_combine=False
+        )
+        metrics_to_save[chName].extend(channel_custom_metrics_desc.keys())
+    return metrics_to_save
+
+def add_metrics_acdc_df(
+        stored_df, rp, frame_i, lab, posData, isSegm3D, 
+        all_channels_metrics, size_metrics_to_save, regionprops_to_save, 
+        metrics_func, bkgr_metrics_params, foregr_metrics_params, 
+        concentration_metrics_params, custom_metrics_params, 
+        logger_func=print, customMetricsCritical=None, 
+        regionPropsCritical=None
+    ):
+    """Compute all the measurements of one frame. GUI-free, the signals 
+    are optional and when None the errors are logged with `logger_func`.
+    """
+    yx_pxl_to_um2 = posData.PhysicalSizeY*posData.PhysicalSizeX
+    vox_to_fl_3D = (
+        posData.PhysicalSizeY*posData.PhysicalSizeX*posData.PhysicalSizeZ
+    )
+
+    manualBackgrLab = posData.manualBackgroundLab
+    manualBackgrRp = None
+    if manualBackgrLab is not None:
+        manualBackgrRp = skimage.measure.regionprops(manualBackgrLab)
+
+    # Pre-populate columns with zeros
+    all_columns = list(size_metrics_to_save)
+    for channel, metrics in all_channels_metrics.items():
+        all_columns.extend(metrics)
+    all_columns.extend(regionprops_to_save)
+
+    df_shape = (len(stored_df), len(all_columns))
+    data = np.zeros(df_shape)
+    df = pd.DataFrame(data=data, index=stored_df.index, columns=all_columns)
+    df = df.combine_first(stored_df)
+
+    df = add_size_metrics(
+        df, rp, size_metrics_to_save, isSegm3D, yx_pxl_to_um2, 
+        vox_to_fl_3D
+    )
+    
+    # Get background masks
+    autoBkgr_masks = get_autoBkgr_mask(lab, isSegm3D, posData, frame_i)
+    autoBkgr_mask, autoBkgr_mask_proj = autoBkgr_masks
+    dataPrepBkgrROI_mask = get_bkgrROI_mask(posData, isSegm3D)
+
+    # Iterate channels
+    iter_channels = zip(posData.loadedChNames, posData.fluo_data_dict.items())
+    for channel, (filename, channel_data) in iter_channels:
+        foregr_img = channel_data[frame_i]
+
+        # Get the z-slice if we have z-stacks
+        z = posData.zSliceSegmentation(filename, frame_i)
+        
+        # Get the background data
+        bkgr_data = get_bkgr_data(
+            foregr_img, posData, filename, frame_i, autoBkgr_mask, z,
+            autoBkgr_mask_proj, dataPrepBkgrROI_mask, isSegm3D, lab
+        )
+        
+        foregr_data = get_foregr_data(foregr_img, isSegm3D, z)
+
+        # Compute background values
+        df = add_bkgr_values(
+            df, bkgr_data, bkgr_metrics_params[channel], metrics_func,
+            manualBackgrRp=manualBackgrRp, foregr_data=foregr_data
+        )
+
+        # Iterate objects and compute foreground metrics
+        df = add_foregr_metrics(
+            df, rp, channel, foregr_data, foregr_metrics_params[channel], 
+            metrics_func, custom_metrics_params[channel], isSegm3D, 
+            lab, foregr_img, manualBackgrRp=manualBackgrRp,
+            customMetricsCritical=customMetricsCritical,
+            z_slice=z
+        )
+
+    df = add_concentration_metrics(df, concentration_metrics_params)
+
+    # Add region properties
+    try:
+        df, rp_errors = add_regionprops_metrics(
+            df, lab, regionprops_to_save, logger_func=logger_func
+        )
+        if rp_errors:
+            logger_func(
+                'WARNING: Some objects had the following errors:\n'
+                f'{rp_errors}\n'
+                'Region properties with errors were saved as `Not A Number`.'
+            )
+    except Exception as error:
+        traceback_format = traceback.format_exc()
+        if regionPropsCritical is None:
+            logger_func(traceback_format)
+        else:
+            regionPropsCritical.emit(traceback_format, str(error))
+
+    # Remove 0s columns
+    df = df.loc[:, (df != -2).any(axis=0)]
+
+    return df
+
+def add_volume_metrics(df, rp, posData, isSegm3D):
+    PhysicalSizeY = posData.PhysicalSizeY
+    PhysicalSizeX = posData.PhysicalSizeX
+    yx_pxl_to_um2 = PhysicalSizeY*PhysicalSizeX
+    vox_to_fl_3D = PhysicalSizeY*PhysicalSizeX*posData.PhysicalSizeZ
+
+    init_list = [-2]*len(rp)
+    IDs = init_list.copy()
+    IDs_vol_vox = init_list.copy()
+    IDs_area_pxl = init_list.copy()
+    IDs_vol_fl = init_list.copy()
+    IDs_area_um2 = init_list.copy()
+    if isSegm3D:
+        IDs_vol_vox_3D = init_list.copy()
+        IDs_vol_fl_3D = init_list.copy()
+
+    for i, obj in enumerate(rp):
+        IDs[i] = obj.label
+        IDs_vol_vox[i] = obj.vol_vox
+        IDs_vol_fl[i] = obj.vol_fl
+        IDs_area_pxl[i] = obj.area
+        IDs_area_um2[i] = obj.area*yx_pxl_to_um2
+        if isSegm3D:
+            IDs_vol_vox_3D[i] = obj.area
+            IDs_vol_fl_3D[i] = obj.area*vox_to_fl_3D
+
+    df['cell_area_pxl'] = pd.Series(data=IDs_area_pxl, index=IDs, dtype=float)
+    df['cell_vol_vox'] = pd.Series(data=IDs_vol_vox, index=IDs, dtype=float)
+    df['cell_area_um2'] = pd.Series(data=IDs_area_um2, index=IDs, dtype=float)
+    df['cell_vol_fl'] = pd.Series(data=IDs_vol_fl, index=IDs, dtype=float)
+    if isSegm3D:
+        df['cell_vol_vox_3D'] = pd.Series(
+            data=IDs_vol_vox_3D, index=IDs, dtype=float
+        )
+        df['cell_vol_fl_3D'] = pd.Series(
+            data=IDs_vol_fl_3D, index=IDs, dtype=float
+        )
+
+    return df
+
+def _get_velocity_spacing(posData, isSegm3D, size_metrics_to_save):
+    if 'velocity_um' not in size_metrics_to_save:
+        return
+    
+    if isSegm3D:
+        return np.array([
+            posData.PhysicalSizeZ, 
+            posData.PhysicalSizeY, 
+            posData.PhysicalSizeX
+        ])
+    else:
+        return np.array([
+            posData.PhysicalSizeY, 
+            posData.PhysicalSizeX
+        ])
+
+def add_velocity_measurement(
+        acdc_df, prev_lab, lab, posData, isSegm3D, size_metrics_to_save,
+        prev_labels_table=None, labels_table=None
+    ):
+    if 'velocity_pixel' not in size_metrics_to_save:
+        return acdc_df
+    
+    spacing = _get_velocity_spacing(posData, isSegm3D, size_metrics_to_save)
+    velocities_pxl, velocities_um = core.compute_twoframes_velocity(
+        prev_lab, lab, spacing=spacing, prev_table=prev_labels_table, 
+        table=labels_table
+    )
+    acdc_df['velocity_pixel'] = velocities_pxl
+    acdc_df['velocity_um'] = velocities_um
+    return acdc_df
+
+def add_video_velocity_measurements(
+        acdc_dfs, segm_data, posData, isSegm3D, size_metrics_to_save
+    ):
+    """Add velocity columns to the acdc_df of multiple frames computing 
+    the centroids of each required frame only once.
+
+    Parameters
+    ----------
+    acdc_dfs : dict of {int: pd.DataFrame}
+        Mapping of frame index to acdc_df with 'Cell_ID' as index. 
+        DataFrames are modified in place.
+    segm_data : sequence of numpy.ndarray of ints
+        Labelled frames indexed by frame index.
+    posData : cellacdc.load.loadData
+        Position data used to get the physical sizes.
+    isSegm3D : bool
+        Whether the segmentation is 3D.
+    size_metrics_to_save : iterable of str
+        Names of the size metrics to save.
+    """
+    if 'velocity_pixel' not in size_metrics_to_save:
+        return
+    
+    acdc_dfs = {
+        frame_i: acdc_df for frame_i, acdc_df in acdc_dfs.items() 
+        if frame_i > 0
+    }
+    if not acdc_dfs:
+        return
+    
+    frames = set(acdc_dfs.keys())
+    frames.update([frame_i-1 for frame_i in acdc_dfs.keys()])
+    centroids_df = core.get_video_centroids_df(segm_data, frames=sorted(frames))
+    spacing = _get_velocity_spacing(posData, isSegm3D, size_metrics_to_save)
+    velocity_df = core.compute_video_velocity(centroids_df, spacing=spacing)
+    frames_idx = velocity_df.index.get_level_values('frame_i')
+    for frame_i, acdc_df in acdc_dfs.items():
+        frame_velocity_df = (
+            velocity_df[frames_idx == frame_i]
+            .droplevel('frame_i')
+            .reindex(acdc_df.index, fill_value=0)
+        )
+        acdc_df['velocity_pixel'] = frame_velocity_df['velocity_pixel']
+        acdc_df['velocity_um'] = frame_velocity_df['velocity_um']
+
+def _eval_combine_metric_equation(df, newColName, expr, logger_func=print):
+    try:
+        df[newColName] = df.eval(expr)
+    except Exception as error:
+        logger_func(traceback.format_exc())
+
+def add_combine_metrics_acdc_df(
+        df, combineMetricsConfig, loadedChNames, metricsToSkip=None, 
+        mixedChCombineMetricsToSkip=None, eval_equation_func=None
+    ):
+    """Add channel specifc combined metrics (from equations and from 
+    user_path_equations sections) and mixed channels combined metrics.
+
+    `eval_equation_func` is called with `(df, newColName, equation)` and 
+    it defaults to `df.eval` with errors logged to the terminal.
+    """
+    if metricsToSkip is None:
+        metricsToSkip = {}
+    if mixedChCombineMetricsToSkip is None:
+        mixedChCombineMetricsToSkip = []
+    if eval_equation_func is None:
+        eval_equation_func = _eval_combine_metric_equation
+    
+    config = combineMetricsConfig
+    for chName in loadedChNames:
+        metricsToSkipChannel = metricsToSkip.get(chName, [])
+        posDataEquations = config['equations']
+        userPathChEquations = config['user_path_equations']
+        for newColName, equation in posDataEquations.items():
+            if not newColName.startswith(chName):
+                continue
+            if newColName in metricsToSkipChannel:
+                continue
+            eval_equation_func(df, newColName, equation)
+        for newColName, equation in userPathChEquations.items():
+            if not newColName.startswith(chName):
+                continue
+            if newColName in metricsToSkipChannel:
+                continue
+            eval_equation_func(df, newColName, equation)
+
+    # Add mixed channels combined metrics
+    mixedChannelsEquations = config['mixed_channels_equations']
+    for newColName, equation in mixedChannelsEquations.items():
+        if newColName in mixedChCombineMetricsToSkip:
+            continue
+        cols = re.findall(r'[A-Za-z0-9]+_[A-Za-z0-9_]+', equation)
+        if all([col in df.columns for col in cols]):
+            eval_equation_func(df, newColName, equation)
+
+def add_additional_metadata(additionalMetadataValues, df):
+    for col, val in additionalMetadataValues.items():
+        if col in df.columns:
+            df.pop(col)
+        df.insert(0, col, val)
+    
+    try:
+        df.pop('time_minutes')
+    except Exception as e:
+        pass
+    try:
+        df.pop('time_hours')
+    except Exception as e:
+        pass
+    try:
+        time_seconds = df.index.get_level_values('time_seconds')
+        df.insert(0, 'time_minutes', time_seconds/60)
+        df.insert(1, 'time_hours', time_seconds/3600)
+    except Exception as e:
+        pass
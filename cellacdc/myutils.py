@@ -69,7 +69,9 @@ def get_pos_status(pos_path):
     else:
         return ''
     
-    acdc_df = pd.read_csv(acdc_df_path)
+    acdc_df = load.read_acdc_df_file(
+        acdc_df_path, columns=['frame_i', 'cell_cycle_stage']
+    )
     last_tracked_i = acdc_df['frame_i'].max()
     last_cca_i = 0
     if 'cell_cycle_stage' in acdc_df.columns:
@@ -234,9 +236,25 @@ def _bytes_to_GB(size_bytes):
     size_GB = round(size_bytes*factor, 2)
     return size_GB
 
+def _is_memory_mappable(filepath):
+    if filepath.endswith('.npy'):
+        return True
+    
+    if not filepath.endswith('.tif'):
+        return False
+    
+    try:
+        with tifffile.TiffFile(filepath) as tif:
+            # Only uncompressed and contiguous data can be memory-mapped
+            return tif.series[0].dataoffset is not None
+    except Exception as err:
+        return False
+
 def getMemoryFootprint(files_list):
+    # .h5 and memory-mapped files are not loaded into memory
     required_memory = sum([
-        48 if file.endswith('.h5') else os.path.getsize(file)
+        48 if file.endswith('.h5') or _is_memory_mappable(file) 
+        else os.path.getsize(file)
         for file in files_list
     ])
     return required_memory
@@ -3,15 +3,11 @@ import sys
 import traceback
 
 import numpy as np
-import pandas as pd
 
 import btrack
 from btrack.constants import BayesianUpdates
 
-from skimage.measure import regionprops
-from ..CellACDC import CellACDC_tracker
-
-from cellacdc import printl
+from cellacdc import core, printl
 
 from tqdm import tqdm
 
@@ -94,56 +90,44 @@ class tracker:
         if signals is not None:
             signals.progress.emit('Applying BayesianTracker tracks...')
 
-        # Label the segm_video according to tracks
-        tracked_video = np.zeros_like(segm_video)
-        for frame_i, lab in enumerate(tqdm(segm_video, ncols=100)):
-            rp = regionprops(lab.copy())
-            IDs_curr_untracked = [obj.label for obj in rp]
-            if not IDs_curr_untracked:
-                # No cells segmented
-                continue
-
-            old_IDs = []
-            tracked_IDs = []
-            for track in tracks:
-                track_dict = track.to_dict()
-                if frame_i not in track_dict['t']:
-                    continue
-
-                df = pd.DataFrame(track.to_dict()).set_index('t').loc[frame_i]
-
-                yc, xc = df['y'], df['x']
-                try:
-                    old_ID = lab[int(yc), int(xc)]
-                except Exception as e:
-                    # btrack sometimes finds cells that are not existing
-                    # skip them
-                    # traceback.print_exc()
-                    continue
-
-                old_IDs.append(old_ID)
-                tracked_IDs.append(df['ID'])
-
-            if not tracked_IDs:
-                # No cells tracked
-                continue
-
-            uniqueID = max((max(tracked_IDs), max(IDs_curr_untracked)))+1
-
-            if verbose:
-                print('-------------------------')
-                print(f'Tracking frame n. {frame_i+1}')
-                for old_ID, tracked_ID in zip(old_IDs, tracked_IDs):
-                    print(f'Tracking ID {old_ID} --> {tracked_ID}')
-                print('-------------------------')
-
-            tracked_lab = CellACDC_tracker.indexAssignment(
-                old_IDs, tracked_IDs, IDs_curr_untracked,
-                lab.copy(), rp, uniqueID
-            )
-            tracked_video[frame_i] = tracked_lab
+        # Flatten all the tracks into one (t, ID, y, x) table
+        tracks_t = []
+        tracks_IDs = []
+        tracks_yx = []
+        for track in tracks:
+            track_t = track.t
+            tracks_t.extend(track_t)
+            tracks_IDs.extend([track.ID]*len(track_t))
+            tracks_yx.extend(zip(track.y, track.x))
+        
+        tracks_yx = np.array(tracks_yx, dtype=float).reshape(-1, 2)
+        if segm_video.ndim == 4:
+            tracks_z = [z for track in tracks for z in track.z]
+            points_coords = np.column_stack((tracks_z, tracks_yx))
+        else:
+            points_coords = tracks_yx
+        
+        if verbose:
+            print('-------------------------')
+            for frame_i, ID, (yc, xc) in zip(tracks_t, tracks_IDs, tracks_yx):
+                print(
+                    f'Frame n. {frame_i+1}: tracking object at '
+                    f'(y, x) = ({yc:.1f}, {xc:.1f}) --> {ID}'
+                )
+            print('-------------------------')
+        
+        # btrack sometimes finds cells that are not existing --> points 
+        # outside of the objects are ignored by the conversion
+        pbar = tqdm(total=len(segm_video), ncols=100)
+        def progress_callback():
+            pbar.update()
             self.updateGuiProgressBar(signals)
-
+        
+        tracked_video = core.apply_tracks_to_segm_video(
+            segm_video, tracks_t, tracks_IDs, points_coords=points_coords, 
+            progress_callback=progress_callback
+        )
+        pbar.close()
         return tracked_video
     
     def updateGuiProgressBar(self, signals):
@@ -10,28 +10,20 @@ from cellacdc import core, printl
 
 DEBUG = False
 
-def calc_IoA_matrix(lab, prev_lab, rp, prev_rp, IDs_curr_untracked=None):
-    IDs_prev = []
+def calc_IoA_matrix(
+        lab, prev_lab, rp, prev_rp, IDs_curr_untracked=None, 
+        return_sparse=False
+    ):
     if IDs_curr_untracked is None:
         IDs_curr_untracked = [obj.label for obj in rp]
+    
+    IDs_prev = [obj.label for obj in prev_rp]
 
-    IoA_matrix = np.zeros((len(rp), len(prev_rp)))
-
-    # For each ID in previous frame get IoA with all current IDs
     # Rows: IDs in current frame, columns: IDs in previous frame
-    for j, obj_prev in enumerate(prev_rp):
-        ID_prev = obj_prev.label
-        A_IDprev = obj_prev.area
-        IDs_prev.append(ID_prev)
-        mask_ID_prev = prev_lab==ID_prev
-        intersect_IDs, intersects = np.unique(
-            lab[mask_ID_prev], return_counts=True
-        )
-        for intersect_ID, I in zip(intersect_IDs, intersects):
-            if intersect_ID != 0:
-                i = IDs_curr_untracked.index(intersect_ID)
-                IoA = I/A_IDprev
-                IoA_matrix[i, j] = IoA
+    IoA_matrix, _, _ = core.compute_IoA_matrix(
+        lab, prev_lab, IDs=IDs_curr_untracked, prev_IDs=IDs_prev, 
+        return_sparse=return_sparse
+    )
     return IoA_matrix, IDs_curr_untracked, IDs_prev
 
 def assign(IoA_matrix, IDs_curr_untracked, IDs_prev, IoA_thresh=0.4, aggr_track=None, IoA_thresh_aggr=0.4, Record_lineage=False, IoA_thresh_daughter=None, Min_daughter=None, Max_daughter=None):
@@ -141,9 +133,16 @@ def indexAssignment(
     )
     
     # Replace untracked IDs with tracked IDs and new IDs with increasing num
-    new_untracked_IDs = [ID for ID in IDs_curr_untracked if ID not in old_IDs]
+    old_IDs_set = set(old_IDs)
+    new_untracked_IDs = [
+        ID for ID in IDs_curr_untracked if ID not in old_IDs_set
+    ]
     tracked_lab = lab
     assignments = {}
+    # All the replacements are collected and applied in one pass at the end. 
+    # Note that new untracked IDs and old IDs are disjoint sets
+    replaced_IDs = []
+    replacing_IDs = []
     log_debugging(
         'assign_unique', 
         assign_unique_new_IDs=assign_unique_new_IDs
@@ -156,9 +155,8 @@ def indexAssignment(
             new_tracked_IDs = [
                 uniqueID+i for i in range(len(new_untracked_IDs))
             ]
-        core.lab_replace_values(
-            tracked_lab, rp, new_untracked_IDs, new_tracked_IDs
-        )
+        replaced_IDs.extend(new_untracked_IDs)
+        replacing_IDs.extend(new_tracked_IDs)
         assignments = dict(zip(new_untracked_IDs, new_tracked_IDs))
         log_debugging(
             'new_untracked_and_assign_unique', 
@@ -170,15 +168,15 @@ def indexAssignment(
     elif new_untracked_IDs and tracked_IDs:
         # If we don't replace unique new IDs we check that tracked IDs are
         # not already existing to avoid duplicates
+        tracked_IDs_set = set(tracked_IDs)
         new_IDs_in_trackedIDs = [
-            ID for ID in new_untracked_IDs if ID in tracked_IDs
+            ID for ID in new_untracked_IDs if ID in tracked_IDs_set
         ]
         new_tracked_IDs = [
             uniqueID+i for i in range(len(new_IDs_in_trackedIDs))
         ]
-        core.lab_replace_values(
-            tracked_lab, rp, new_IDs_in_trackedIDs, new_tracked_IDs
-        )
+        replaced_IDs.extend(new_IDs_in_trackedIDs)
+        replacing_IDs.extend(new_tracked_IDs)
         log_debugging(
             'new_untracked_and_tracked', 
             new_IDs_in_trackedIDs=new_IDs_in_trackedIDs,
@@ -187,14 +185,15 @@ def indexAssignment(
             new_tracked_IDs=new_tracked_IDs
         )
     if tracked_IDs:
-        core.lab_replace_values(
-            tracked_lab, rp, old_IDs, tracked_IDs, in_place=True
-        )
+        replaced_IDs.extend(old_IDs)
+        replacing_IDs.extend(tracked_IDs)
         log_debugging(
             'tracked', 
             tracked_IDs=tracked_IDs,
             old_IDs=old_IDs,
         )
+    
+    core.relabel_IDs(tracked_lab, replaced_IDs, replacing_IDs, in_place=True)
 
     if not return_assignments:
         return tracked_lab
@@ -254,29 +253,54 @@ class tracker:
 
     def track(self, segm_video, signals=None, export_to: os.PathLike=None):
         tracked_video = np.zeros_like(segm_video)
-        pbar = tqdm(total=len(segm_video), desc='Tracking', ncols=100)
-        for frame_i, lab in enumerate(segm_video):
-            if frame_i == 0:
-                tracked_video[frame_i] = lab
+        tracked_frames = self.track_iter(segm_video, signals=signals)
+        for frame_i, tracked_lab in enumerate(tracked_frames):
+            tracked_video[frame_i] = tracked_lab
+        # tracked_video = relabel_sequential(tracked_video)[0]
+        return tracked_video
+    
+    def track_iter(self, frames, signals=None):
+        """Track frames one by one yielding the tracked frame as soon as 
+        it is ready. Only the previous tracked frame is kept in memory.
+
+        Parameters
+        ----------
+        frames : iterable of (Y, X) or (Z, Y, X) numpy.ndarray of ints
+            Iterable (e.g., generator) of segmentation masks of each frame.
+        signals : object, optional
+            Object with GUI signals used to update progress bars. 
+            Default is None
+
+        Yields
+        ------
+        numpy.ndarray
+            Tracked segmentation masks of each frame.
+        """        
+        try:
+            total = len(frames)
+        except TypeError:
+            total = None
+        IoA_thresh = self.params.get('IoA_thresh', 0.4)
+        pbar = tqdm(total=total, desc='Tracking', ncols=100)
+        prev_lab = None
+        for frame_i, lab in enumerate(frames):
+            if prev_lab is None:
+                prev_lab = lab
                 pbar.update()
+                yield lab
                 continue
 
-            prev_lab = tracked_video[frame_i-1]
-
             prev_rp = regionprops(prev_lab)
             rp = regionprops(lab.copy())
 
-            IoA_thresh = self.params.get('IoA_thresh', 0.4)
             tracked_lab = track_frame(
                 prev_lab, prev_rp, lab, rp, IoA_thresh=IoA_thresh
             )
-
-            tracked_video[frame_i] = tracked_lab
+            prev_lab = tracked_lab
             self.updateGuiProgressBar(signals)
             pbar.update()
+            yield tracked_lab
         pbar.close()
-        # tracked_video = relabel_sequential(tracked_video)[0]
-        return tracked_video
     
     def updateGuiProgressBar(self, signals):
         if signals is None:
@@ -203,10 +203,58 @@ class tracker:
         if record_lineage:
             self.cca_dfs = tree.lineage_list
 
-        tracked_video = tracker.tracked_video            
+        tracked_video = tracker.tracked_video
         pbar.close()
         return tracked_video
-    
+
+    def track_iter(self,
+                   frames,
+                   signals=None,
+                   IoA_thresh = 0.8,
+                   IoA_thresh_daughter = 0.25,
+                   IoA_thresh_aggressive = 0.5,
+                   min_daughter = 2,
+                   max_daughter = 2,
+                   record_lineage = True
+        ):
+        # Same as `track` but yields the tracked frames one by one keeping
+        # only the previous tracked frame in memory
+        try:
+            total = len(frames)
+        except TypeError:
+            total = None
+        pbar = tqdm(total=total, desc='Tracking', ncols=100)
+        prev_lab = None
+        for frame_i, lab in enumerate(frames):
+            if prev_lab is None:
+                if record_lineage:
+                    tree = normal_division_lineage_tree(lab, max_daughter)
+                    # NOTE: the lineage list is updated in-place by the tree
+                    self.cca_dfs = tree.lineage_list
+                prev_lab = lab
+                pbar.update()
+                yield lab
+                continue
+
+            tracker = normal_division_tracker(
+                [prev_lab, lab], IoA_thresh_daughter, min_daughter,
+                max_daughter, IoA_thresh, IoA_thresh_aggressive
+            )
+            tracker.track_frame(1)
+
+            if record_lineage:
+                tree.create_tracked_frame_tree(
+                    frame_i, tracker.mother_daughters, tracker.IDs_prev,
+                    tracker.IDs_curr_untracked, tracker.assignments
+                )
+
+            prev_lab = tracker.tracked_lab
+            self.updateGuiProgressBar(signals)
+            pbar.update()
+            yield prev_lab
+
+        pbar.close()
+
     def track_frame(self, 
                     previous_frame_labels, 
                     current_frame_labels, 
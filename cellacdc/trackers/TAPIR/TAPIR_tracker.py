@@ -7,6 +7,7 @@ import jax
 import numpy as np
 import pandas as pd
 from scipy.ndimage import distance_transform_edt
+from scipy.spatial import cKDTree
 
 import skimage.transform
 import skimage.measure
@@ -14,9 +15,8 @@ import skimage.color
 
 from cellacdc import printl
 from cellacdc.transformation import resize_lab
-from cellacdc.core import nearest_nonzero_2D, get_obj_contours
-
-from ..CellACDC import CellACDC_tracker
+from cellacdc import core
+from cellacdc.core import get_obj_contours
 
 from . import TAPIR_CHECKPOINT_PATH
 from .tracking import build_model, inference
@@ -138,38 +138,54 @@ class tracker:
         df = pd.DataFrame(data=napari_tracks, columns=['ID', 'T', 'Y', 'X'])
         df.to_csv(napari_tracks_path, index=False)
     
+    def _get_points_segm_IDs(self, lab, yy, xx):
+        # Vectorized lookup of the IDs at the points. Points that are 
+        # on the background get the nearest ID within `self.max_dist` 
+        # (see `nearest_nonzero_2D`)
+        Y, X = lab.shape
+        yy_int = np.clip(np.round(yy).astype(int), 0, Y-1)
+        xx_int = np.clip(np.round(xx).astype(int), 0, X-1)
+        segm_IDs = lab[yy_int, xx_int]
+        is_background = segm_IDs == 0
+        if not np.any(is_background) or not np.any(lab):
+            return segm_IDs
+        
+        r, c = np.nonzero(lab)
+        nonzero_tree = cKDTree(np.column_stack((r, c)))
+        yx_background = np.column_stack(
+            (yy[is_background], xx[is_background])
+        )
+        dist, nearest_idx = nonzero_tree.query(yx_background)
+        nearest_IDs = lab[r[nearest_idx], c[nearest_idx]]
+        if self.max_dist is not None:
+            # NOTE: `nearest_nonzero_2D` compares squared distances
+            nearest_IDs[dist**2 > self.max_dist] = 0
+        segm_IDs[is_background] = nearest_IDs
+        return segm_IDs
+    
     def _build_tracks_table(self):
         tracks = self.reversed_tracks[:, ::-1]
         visibles = self.reversed_visibles[:, ::-1]
         resized_segm = self.reversed_resized_segm[::-1]
-        track_IDs = []
-        frames = []
-        xx = []
-        yy = []
-        visibles_li = []
-        segm_IDs = []
-        for tr, track in enumerate(tqdm(tracks, ncols=100)):
-            track_ID = self._get_track_ID(resized_segm, track)
-            for frame_i, (x, y) in enumerate(track):                  
-                yc = y*self.resize_ratio_height
-                xc = x*self.resize_ratio_width
-                visible = visibles[tr, frame_i]
-                track_IDs.append(track_ID)
-                frames.append(frame_i)
-                xx.append(xc)
-                yy.append(yc)
-                visibles_li.append(visible)
-                segm_ID = nearest_nonzero_2D(
-                    resized_segm[frame_i], y, x, max_dist=self.max_dist
-                )
-                segm_IDs.append(segm_ID)
+        num_tracks, num_frames = tracks.shape[:2]
+        
+        # Flatten all the tracks into one row per (track, frame)
+        tracks_IDs = self._get_tracks_IDs(resized_segm, tracks)
+        xx = tracks[:, :, 0]
+        yy = tracks[:, :, 1]
+        segm_IDs = np.zeros((num_tracks, num_frames), dtype=np.int64)
+        for frame_i in tqdm(range(num_frames), ncols=100):
+            segm_IDs[:, frame_i] = self._get_points_segm_IDs(
+                resized_segm[frame_i], yy[:, frame_i], xx[:, frame_i]
+            )
+        
         df = pd.DataFrame({
-            'frame_i': frames, 
-            'track_ID': segm_IDs,
-            'segm_ID': track_IDs,
-            'y_point': yy, 
-            'x_point': xx,
-            'visible': visibles_li
+            'frame_i': np.tile(np.arange(num_frames), num_tracks), 
+            'track_ID': segm_IDs.ravel(),
+            'segm_ID': np.repeat(tracks_IDs, num_frames),
+            'y_point': (yy*self.resize_ratio_height).ravel(), 
+            'x_point': (xx*self.resize_ratio_width).ravel(),
+            'visible': visibles.ravel()
         }).set_index(['frame_i', 'track_ID']).sort_index()
         return df
     
@@ -183,8 +199,11 @@ class tracker:
         num_frames = len(self.reversed_resized_segm)
         Y, X = self.reversed_resized_segm.shape[-2:]
         resized_segm = self.reversed_resized_segm[::-1]
+        tracks_IDs = self._get_tracks_IDs(
+            resized_segm, self.reversed_tracks[:, ::-1]
+        )
         for tr, track in enumerate(tqdm(self.reversed_tracks, ncols=100)):
-            track_ID = self._get_track_ID(resized_segm, track[::-1])
+            track_ID = tracks_IDs[tr]
             for reversed_frame_i, (x, y) in enumerate(track):
                 visible = self.reversed_visibles[tr, reversed_frame_i]
                 if not visible and self._use_visibile_information:
@@ -214,19 +233,13 @@ class tracker:
             xc = x*self.resize_ratio_width
             napari_tracks.append((track_ID, frame_i, yc, xc))
     
-    def _get_track_ID(self, resized_segm, track, max_dist=None):
+    def _get_tracks_IDs(self, resized_segm, tracks):
         Y, X = resized_segm.shape[-2:]
-        x, y = track[-1]
-        # frame_i = self.tracks_start_frames[(round(y), round(x))]
-        # I still don't know how to get the start frame of each track 
-        # because TAPIR returns a float even for the initialized query 
-        # point of each track
-        frame_i = -1
-        y_int, x_int = round(y), round(x)
-        y_int = max(0, min(y_int, Y-1))
-        x_int = max(0, min(x_int, X-1))
-        track_ID = resized_segm[frame_i, y_int, x_int]
-        return track_ID
+        x, y = tracks[:, -1, 0], tracks[:, -1, 1]
+        y_int = np.clip(np.round(y).astype(int), 0, Y-1)
+        x_int = np.clip(np.round(x).astype(int), 0, X-1)
+        tracks_IDs = resized_segm[-1, y_int, x_int]
+        return tracks_IDs
     
     def _apply_tracks(self):
         print('Applying tracks data...')
@@ -234,39 +247,25 @@ class tracker:
         self.df_tracks = self._build_tracks_table()        
         self.df_tracks = self.df_tracks[self.df_tracks.visible>0]
         
-        # Iterate tracks and determine tracked IDs
-        old_IDs_tracks = {}
-        tracked_IDs_tracks = {}
-        for (frame_i, track_ID), df in self.df_tracks.groupby(level=(0,1)):
-            if track_ID == 0:
-                continue
-            
-            oldID = df['segm_ID'].mode().iloc[0]
-            if oldID == 0:
-                continue
-            
-            if frame_i not in old_IDs_tracks:
-                old_IDs_tracks[frame_i] = [oldID]
-                tracked_IDs_tracks[frame_i] = [track_ID]
-            else:
-                old_IDs_tracks[frame_i].append(oldID)
-                tracked_IDs_tracks[frame_i].append(track_ID)
-
-        tracked_video = self.segm_video.copy()
-        for frame_i in old_IDs_tracks.keys():
-            tracked_IDs = tracked_IDs_tracks[frame_i]
-            old_IDs = old_IDs_tracks[frame_i]
-            
-            lab = self.segm_video[frame_i]
-            rp = skimage.measure.regionprops(lab)
-            IDs_curr_untracked = [obj.label for obj in rp]
-            
-            uniqueID = max((max(tracked_IDs), max(IDs_curr_untracked)))+1
-            tracked_lab = CellACDC_tracker.indexAssignment(
-                old_IDs, tracked_IDs, IDs_curr_untracked,
-                lab.copy(), rp, uniqueID
+        # The old ID of each (frame_i, track_ID) is the most common segm_ID 
+        # (smallest one in case of ties like `pd.Series.mode`)
+        df = self.df_tracks.reset_index()
+        df = df[df['track_ID'] != 0]
+        counts = (
+            df.groupby(['frame_i', 'track_ID', 'segm_ID']).size()
+            .rename('count').reset_index()
+            .sort_values(
+                ['frame_i', 'track_ID', 'count', 'segm_ID'], 
+                ascending=[True, True, False, True]
             )
-            tracked_video[frame_i] = tracked_lab
+            .drop_duplicates(['frame_i', 'track_ID'])
+        )
+        counts = counts[counts['segm_ID'] != 0]
+        
+        tracked_video = core.apply_tracks_to_segm_video(
+            self.segm_video, counts['frame_i'], counts['track_ID'], 
+            old_IDs=counts['segm_ID'], keep_untracked_frames=True
+        )
         return tracked_video
     
     def _initialize_query_points(
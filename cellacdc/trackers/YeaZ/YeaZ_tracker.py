@@ -12,6 +12,9 @@ class tracker:
             segm_video, signals=signals
         ).astype(np.uint32)
         return tracked_stack
+    
+    def track_iter(self, frames, signals=None):
+        yield from tracking.correspondence_iter(frames, signals=signals)
 
     def save_output(self):
         pass
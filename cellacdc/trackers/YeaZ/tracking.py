@@ -103,6 +103,25 @@ def correspondence_stack(stack, signals=None):
     # tracked_stack = relabel_sequential(tracked_stack)[0]
     return tracked_stack
 
+def correspondence_iter(frames, signals=None):
+    """
+    Same as `correspondence_stack` but yields the tracked frames one by one 
+    without materializing the entire stack in memory
+    """
+    try:
+        total = len(frames)
+    except TypeError:
+        total = None
+    prev = None
+    for curr in tqdm(frames, total=total, ncols=100):
+        if prev is None:
+            prev = curr.astype(np.uint32)
+            yield prev
+            continue
+        prev = correspondence(prev, curr).astype(np.uint32)
+        updateGuiProgressBar(signals)
+        yield prev
+
 def hungarian_align(m1, m2, acdc_yeaz=True):
     """
     source: YeaZ
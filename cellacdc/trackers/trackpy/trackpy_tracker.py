@@ -2,10 +2,7 @@ import pandas as pd
 import numpy as np
 import trackpy as tp
 
-import skimage.measure
-from ..CellACDC import CellACDC_tracker
-
-from cellacdc import apps, printl
+from cellacdc import apps, core
 
 DEBUG = False
 
@@ -14,13 +11,13 @@ class tracker:
         pass
 
     def _set_frame_features(self, lab, frame_i, tp_df):
-        rp = skimage.measure.regionprops(lab)
-        for obj in rp:
-            yc, xc = obj.centroid
-            tp_df['x'].append(xc)
-            tp_df['y'].append(yc)
-            tp_df['frame'].append(frame_i)
-            tp_df['ID'].append(obj.label)
+        table = core.get_labels_table(lab)
+        IDs = table['label']
+        centroids = table['centroid']
+        tp_df['x'].extend(centroids[:, -1])
+        tp_df['y'].extend(centroids[:, -2])
+        tp_df['frame'].extend([frame_i]*len(IDs))
+        tp_df['ID'].extend(IDs)
 
     def track(
             self, segm_video,
@@ -68,52 +65,84 @@ class tracker:
         
         tp_df['particle'] += 1 # trackpy starts from 0 with tracked ids
 
-        # Generate tracked video data
-        tracked_video = np.zeros_like(segm_video)
-        for frame_i, lab in enumerate(segm_video):
-            rp = skimage.measure.regionprops(lab)
-            tracked_lab = lab.copy()
-            tp_df_frame = tp_df.loc[frame_i]
-
-            IDs_curr_untracked = [obj.label for obj in rp]
-
-            if DEBUG:
-                printl(f'Current untracked IDs: {IDs_curr_untracked}')
+        if DEBUG:
+            print('-------------------------')
+            tracks = tp_df[['ID', 'particle']].itertuples()
+            for frame_i, old_ID, tracked_ID in tracks:
+                print(
+                    f'Frame n. {frame_i+1}: tracking ID {old_ID} --> '
+                    f'{tracked_ID}'
+                )
+            print('-------------------------')
 
-            if not IDs_curr_untracked:
-                # No cells segmented
-                continue
-            
-            try:
-                tracked_IDs = tp_df_frame['particle'].astype(int).to_list()
-                old_IDs = tp_df_frame['ID'].astype(int).to_list()
-            except AttributeError:
-                # Single cell
-                tracked_IDs = [int(tp_df_frame['particle'])]
-                old_IDs = [int(tp_df_frame['ID'])]
-            
-            if not tracked_IDs:
-                # No cells tracked
-                continue
-
-            uniqueID = max((max(tracked_IDs), max(IDs_curr_untracked)))+1
+        # Generate tracked video data
+        tracked_video = core.apply_tracks_to_segm_video(
+            segm_video, tp_df.index, tp_df['particle'].astype(int), 
+            old_IDs=tp_df['ID'].astype(int), 
+            progress_callback=lambda: self.updateGuiProgressBar(signals)
+        )
+        return tracked_video
+    
+    def track_iter(
+            self, frames,
+            search_range=10.0,
+            memory=0,
+            adaptive_stop: float=None, 
+            adaptive_step=0.95,
+            dynamic_predictor=False,
+            neighbor_strategy='KDTree',
+            link_strategy = 'recursive',
+            signals=None, 
+            export_to=None,
+            export_to_extension='.csv'
+        ):
+        """Same as `track` but links the frames one by one with 
+        `trackpy.link_df_iter` and yields the tracked frames as soon as 
+        they are linked.
+        """
+        if isinstance(adaptive_stop, str):
+            if adaptive_stop == 'None':
+                adaptive_stop = None
+            else:
+                adaptive_stop = float(adaptive_stop)
+        
+        labs = []
+        def iter_features():
+            for frame_i, lab in enumerate(frames):
+                tp_df = {'x': [], 'y': [], 'frame': [], 'ID': []}
+                self._set_frame_features(lab, frame_i, tp_df)
+                labs.append(lab)
+                yield pd.DataFrame(tp_df)
 
-            if DEBUG:
-                print('-------------------------')
-                print(f'Tracking frame n. {frame_i+1}')
-                for old_ID, tracked_ID in zip(old_IDs, tracked_IDs):
-                    print(f'Tracking ID {old_ID} --> {tracked_ID}')
-                print('-------------------------')
+        if dynamic_predictor:
+            predictor = tp.predict.NearestVelocityPredict()
+        else:
+            predictor = tp
+        
+        linked_dfs = predictor.link_df_iter(
+            iter_features(), search_range,
+            memory=int(memory),
+            adaptive_stop=adaptive_stop, 
+            adaptive_step=adaptive_step,
+            neighbor_strategy=neighbor_strategy,
+            link_strategy=link_strategy,
+        )
+        for frame_i, tp_df_frame in enumerate(linked_dfs):
+            lab = labs.pop(0)
+            if export_to is not None:
+                tp_df_frame.set_index('frame').to_csv(
+                    export_to, mode='w' if frame_i == 0 else 'a', 
+                    header=frame_i == 0
+                )
             
-            tracked_lab = CellACDC_tracker.indexAssignment(
-                old_IDs, tracked_IDs, IDs_curr_untracked,
-                lab.copy(), rp, uniqueID
-            )
-            tracked_video[frame_i] = tracked_lab
-
+            # trackpy starts from 0 with tracked ids
+            tracked_lab = core.apply_tracks_to_segm_video(
+                lab[np.newaxis], np.zeros(len(tp_df_frame), dtype=int), 
+                tp_df_frame['particle'].astype(int) + 1, 
+                old_IDs=tp_df_frame['ID'].astype(int)
+            )[0]
             self.updateGuiProgressBar(signals)
-        
-        return tracked_video
+            yield tracked_lab
     
     def updateGuiProgressBar(self, signals):
         if signals is None:
@@ -1,3 +1,4 @@
+import array
 import xml.etree.ElementTree as ET 
 
 import pandas as pd
@@ -55,30 +56,55 @@ def del_objs_outside_segm_roi(segm_roi, segm):
     return cleared_segm, clearedIDs
 
 def trackmate_xml_to_df(xml_file):
-    IDs = []
-    xx = []
-    yy = []
-    zz = []
-    frame_idxs = []
-    tree = ET.parse(xml_file)
-    Tracks = tree.getroot()
+    """Read the tracks exported by TrackMate (simple XML format) into a 
+    DataFrame with columns ['frame_i', 'ID', 'x', 'y', 'z'].
 
-    for i, particle in enumerate(Tracks):
-        ID = i+1
-        for t, detection in enumerate(particle):
-            attrib = detection.attrib
+    The file is parsed incrementally with `ElementTree.iterparse` and each 
+    track element is cleared as soon as it is read, so that also 
+    multi-GB files can be parsed with constant memory.
+    """
+    IDs = array.array('q')
+    xx = array.array('d')
+    yy = array.array('d')
+    zz = array.array('d')
+    frame_idxs = array.array('d')
+    
+    depth = 0
+    ID = 0
+    root = None
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            depth += 1
+            if depth == 2:
+                # New particle (i.e., track)
+                ID += 1
+            continue
+        
+        depth -= 1
+        if depth == 2:
+            # Detection of the current particle
+            attrib = elem.attrib
             IDs.append(ID)
-            xx.append(attrib['x'])
-            yy.append(attrib['y'])
-            zz.append(attrib['z'])
-            frame_idxs.append(attrib['t'])
+            xx.append(float(attrib['x']))
+            yy.append(float(attrib['y']))
+            zz.append(float(attrib['z']))
+            frame_idxs.append(float(attrib['t']))
+        elif depth == 1:
+            # End of particle --> free memory
+            elem.clear()
+            root.clear()
+    
+    frame_idxs = np.frombuffer(frame_idxs, dtype=np.float64)
+    if np.all(frame_idxs == np.round(frame_idxs)):
+        frame_idxs = frame_idxs.astype(np.int64)
     
     df = pd.DataFrame({
         'frame_i': frame_idxs,
-        'ID': IDs, 
-        'x': xx,
-        'y': yy,
-        'z': zz
+        'ID': np.frombuffer(IDs, dtype=np.int64), 
+        'x': np.frombuffer(xx, dtype=np.float64),
+        'y': np.frombuffer(yy, dtype=np.float64),
+        'z': np.frombuffer(zz, dtype=np.float64)
     })
     return df
-        
\ No newline at end of file
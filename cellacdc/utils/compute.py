@@ -13,7 +13,7 @@ from qtpy.QtWidgets import (
 
 from .. import (
     widgets, apps, workers, html_utils, myutils,
-    gui, cca_functions, load, printl
+    gui, load, printl, _core
 )
 
 from .. import cellacdc_path, settings_folderpath
@@ -310,9 +310,6 @@ class computeMeasurmentsUtilWin(QDialog):
         if 'cell_vol_vox' not in self.gui.sizeMetricsToSave:
             return
 
-        # We compute the cell volume in the main thread because calling
-        # skimage.transform.rotate in a separate thread causes crashes
-        # with segmentation fault on macOS. I don't know why yet.
         self.logger.info('Computing cell volume...')
         PhysicalSizeY = posData.PhysicalSizeY
         PhysicalSizeX = posData.PhysicalSizeX
@@ -320,13 +317,10 @@ class computeMeasurmentsUtilWin(QDialog):
         for frame_i, data_dict in iterable:
             lab = data_dict['labels']
             rp = data_dict['regionprops']
-            obj_iter = tqdm(rp, ncols=100, position=1, leave=False)
-            for i, obj in enumerate(obj_iter):
-                vol_vox, vol_fl = cca_functions._calc_rot_vol(
-                    obj, PhysicalSizeY, PhysicalSizeX
-                )
-                obj.vol_vox = vol_vox
-                obj.vol_fl = vol_fl
+            rp = _core.compute_rotational_volumes(
+                rp, PhysicalSizeY, PhysicalSizeX, frame_i=frame_i, 
+                cache=posData.rotationalVolumeCache
+            )
             posData.allData_li[frame_i]['regionprops'] = rp
         self.worker.waitCond.wakeAll()
 
@@ -158,10 +158,12 @@ class ConcatWin(NewThreadMultipleExpBaseUtil):
         self.worker.waitCond.wakeAll()
     
     def showEvent(self, event):
-        formats = (
+        formats = [
             'CSV (Comma Separated Values)', 
             'XLS (Excel)'
-        )
+        ]
+        if self.worker_func == workers.ConcatAcdcDfsWorker:
+            formats.append('Parquet (compressed columnar format)')
         selectFormatWin = widgets.QDialogListbox(
             'Select output file format',
             'Select format of the output file\n',
@@ -171,11 +173,20 @@ class ConcatWin(NewThreadMultipleExpBaseUtil):
         if selectFormatWin.cancel:
             return
         
-        if selectFormatWin.selectedItemsText[0].startswith('CSV'):
+        selectedFormat = selectFormatWin.selectedItemsText[0]
+        if selectedFormat.startswith('CSV'):
             self._ext = '.csv'
+        elif selectedFormat.startswith('Parquet'):
+            try:
+                myutils.check_install_package(
+                    'pyarrow', parent=self, logger_func=self.logger.info
+                )
+            except ModuleNotFoundError:
+                return
+            self._ext = '.parquet'
         else:
             self._ext = '.xlsx'
-        self.runWorker(format=selectFormatWin.selectedItemsText[0])
+        self.runWorker(format=selectedFormat)
     
     def askAppendName(self, basename, existingEndnames):
         win = apps.filenameDialog(
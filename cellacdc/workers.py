@@ -34,6 +34,7 @@ from . import transformation
 from .path import copy_or_move_tree
 from . import features
 from . import core
+from . import concat_tables
 from . import cca_df_colnames, lineage_tree_cols
 
 DEBUG = False
@@ -511,6 +512,8 @@ class AutoSaveWorker(QObject):
         self.isPaused = False
         self.dataQ = deque(maxlen=5)
         self.isAutoSaveON = False
+        # Number of journal records after which the journal is compacted
+        self.compactJournalEvery = 200
     
     def pause(self):
         if DEBUG:
@@ -573,18 +576,6 @@ class AutoSaveWorker(QObject):
         if DEBUG:
             self.logger.log('Autosave finished signal emitted')
     
-    def getLastTrackedFrame(self, posData):
-        last_tracked_i = 0
-        for frame_i, data_dict in enumerate(posData.allData_li):
-            lab = data_dict['labels']
-            if lab is None:
-                frame_i -= 1
-                break
-        if frame_i > 0:
-            return frame_i
-        else:
-            return last_tracked_i
-    
     def saveData(self, posData):
         if DEBUG:
             self.logger.log('Started autosaving...')
@@ -599,64 +590,70 @@ class AutoSaveWorker(QObject):
             )
             self.sigAutoSaveCannotProceed.emit()
             return
-        segm_npz_path = posData.segm_npz_temp_path
-
-        end_i = self.getLastTrackedFrame(posData)
-        
-        if self.isAutoSaveON:
-            if end_i < len(posData.segm_data):
-                saved_segm_data = posData.segm_data
-            else:
-                frame_shape = posData.segm_data.shape[1:]
-                segm_shape = (end_i+1, *frame_shape)
-                saved_segm_data = np.zeros(segm_shape, dtype=np.uint32)
         
-        keys = []
-        acdc_df_li = []
-
-        for frame_i, data_dict in enumerate(posData.allData_li[:end_i+1]):
-            if self.abortSaving:
-                break
-            
-            # Build saved_segm_data
-            lab = data_dict['labels']
-            if lab is None:
-                break
+        # Append to the journal only the frames edited since last autosave 
+        # (see `posData.setFramesEdited`) and only the acdc_df rows that 
+        # changed. The lock is held while comparing with the journal state 
+        # so that saving cannot remove the journal and reset the state in 
+        # between (see `saveDataWorker.run`)
+        with load.get_autosave_journal_lock():
+            journal_path = posData.autosave_journal_path
+            editVersion = posData.editVersion
+            editedFrames = posData.getFramesEditedSince(
+                posData.journaledEditVersion
+            )
+            records = []
+            journaledLabHashes = {}
+            journaledAcdcDfs = {}
+            for frame_i in editedFrames:
+                if self.abortSaving:
+                    break
+                
+                if frame_i >= len(posData.allData_li):
+                    continue
+                
+                data_dict = posData.allData_li[frame_i]
+                lab = data_dict['labels']
+                if lab is None:
+                    continue
             
-            if self.isAutoSaveON:
-                if posData.SizeT > 1:
-                    saved_segm_data[frame_i] = lab
-                else:
-                    saved_segm_data = lab
+                if self.isAutoSaveON:
+                    labels_record, lab_hash = self._getLabelsRecord(
+                        posData, frame_i, lab
+                    )
+                    journaledLabHashes[frame_i] = lab_hash
+                    if labels_record is not None:
+                        records.append(labels_record)
 
-            acdc_df = data_dict['acdc_df']
+                acdc_df = data_dict['acdc_df']
             
-            if acdc_df is None:
-                continue
-
-            if not np.any(lab):
-                continue
+                if acdc_df is None:
+                    continue
 
-            acdc_df = load.pd_bool_to_int(acdc_df, inplace=False)
-            acdc_df_li.append(acdc_df)
-            key = (frame_i, posData.TimeIncrement*frame_i)
-            keys.append(key)
+                if not np.any(lab):
+                    continue
 
-            if self.abortSaving:
-                break
-        
-        if not self.abortSaving:            
-            if self.isAutoSaveON:
-                segm_data = np.squeeze(saved_segm_data)
-                self._saveSegm(segm_npz_path, posData.segm_npz_path, segm_data)
-            
-            if acdc_df_li:
-                all_frames_acdc_df = pd.concat(
-                    acdc_df_li, keys=keys,
-                    names=['frame_i', 'time_seconds', 'Cell_ID']
+                acdc_df = load.pd_bool_to_int(acdc_df, inplace=False)
+                acdc_df_record = load.encode_journal_acdc_df_record(
+                    frame_i, acdc_df, 
+                    prev_acdc_df=posData.journaledAcdcDfs.get(frame_i)
                 )
-                h5_filepath = posData.unsaved_acdc_df_autosave_path
-                self._save_acdc_df(all_frames_acdc_df, posData)
+                journaledAcdcDfs[frame_i] = acdc_df
+                if acdc_df_record is not None:
+                    records.append(acdc_df_record)
+        
+            if not self.abortSaving:
+                if records:
+                    # Only the changes since last autosave are appended
+                    load.append_autosave_journal(journal_path, records)
+                    posData.autosaveJournalNumRecords += len(records)
+                posData.journaledLabHashes.update(journaledLabHashes)
+                posData.journaledAcdcDfs.update(journaledAcdcDfs)
+                posData.journaledEditVersion = editVersion
+                numRecords = posData.autosaveJournalNumRecords
+                if numRecords >= self.compactJournalEvery:
+                    load.compact_autosave_journal_async(journal_path)
+                    posData.autosaveJournalNumRecords = 0
 
         if DEBUG:
             self.logger.log(f'Autosaving done.')
@@ -665,73 +662,24 @@ class AutoSaveWorker(QObject):
         self.abortSaving = False
         self.isSaving = False
     
-    def _saveSegm(self, recovery_path, main_segm_path, data):
-        if np.all(self.savedSegmData == data):
-            return
-        else:
-            np.savez_compressed(recovery_path, np.squeeze(data))
-    
-    def _save_acdc_df(self, recovery_acdc_df, posData):
-        if not os.path.exists(posData.acdc_output_csv_path):
-            load.store_unsaved_acdc_df(posData, recovery_acdc_df)
-            return
-
-        saved_acdc_df = pd.read_csv(
-            posData.acdc_output_csv_path
-        ).set_index(['frame_i', 'Cell_ID'])
-        
-        recovery_acdc_df = (
-            recovery_acdc_df.reset_index().set_index(['frame_i', 'Cell_ID'])
-        )
-        try:
-            # Try to insert into the recovery_acdc_df any column that was saved
-            # but is not in the recovered df (e.g., metrics)
-            df_left = recovery_acdc_df
-            existing_cols = df_left.columns.intersection(saved_acdc_df.columns)
-            df_right = saved_acdc_df.drop(columns=existing_cols)
-            recovery_acdc_df = df_left.join(df_right, how='left')
-        except Exception as error:
-            self.logger.log(f'[WARNING]: {error}')
-                
-        equals = []
-        for col in recovery_acdc_df.columns:
-            if col not in saved_acdc_df.columns:
-                # recovery_acdc_df has a new col --> definitely not the same
-                equals = [False]
-                break
-            
+    def _getLabelsRecord(self, posData, frame_i, lab):
+        lab_hash = hash(lab.tobytes())
+        prev_lab_hash = posData.journaledLabHashes.get(frame_i)
+        if prev_lab_hash is None:
+            # Frame never journaled --> compare with the saved data
             try:
-                col_equals = (saved_acdc_df[col] == recovery_acdc_df[col]).all()
-            except Exception as e:
-                equals = [False]
-                break
-            
-            equals.append(col_equals)
+                if posData.SizeT > 1:
+                    saved_lab = self.savedSegmData[frame_i]
+                else:
+                    saved_lab = self.savedSegmData
+                if np.array_equal(saved_lab, lab):
+                    return None, lab_hash
+            except IndexError:
+                pass
+        elif prev_lab_hash == lab_hash:
+            return None, lab_hash
         
-        # Check if last stored acdc_df is equal
-        last_unsaved_acdc_df = load.get_last_stored_unsaved_acdc_df(
-            posData
-        )
-        if all(equals) and last_unsaved_acdc_df is not None:
-            equals = []
-            for col in last_unsaved_acdc_df.columns:
-                if col not in saved_acdc_df.columns:
-                    # recovery_acdc_df has a new col --> definitely not the same
-                    equals = [False]
-                    break
-                
-                try:
-                    col_equals = (
-                        saved_acdc_df[col] == last_unsaved_acdc_df[col]).all()
-                except Exception as e:
-                    equals = [False]
-                    break
-                
-                equals.append(col_equals)
-
-        if not all(equals):
-            load.store_unsaved_acdc_df(posData, recovery_acdc_df)
-            # recovery_acdc_df.to_csv(recovery_path)
+        return load.encode_journal_labels_record(frame_i, lab), lab_hash
 
 
 class segmWorker(QObject):
@@ -894,6 +842,8 @@ class calcMetricsWorker(QObject):
         self.mutex = QMutex()
         self.waitCond = QWaitCondition()
         self.mainWin = mainWin
+        # None means as many processes as the number of processors
+        self.maxWorkers = None
 
     def emitSelectSegmFiles(self, exp_path, pos_foldernames):
         self.mutex.lock()
@@ -908,7 +858,6 @@ class calcMetricsWorker(QObject):
     @worker_exception_handler
     def run(self):
         np.seterr(invalid='ignore')
-        debugging = False
         expPaths = self.mainWin.expPaths
         tot_exp = len(expPaths)
         self.signals.initProgressBar.emit(0)
@@ -987,17 +936,18 @@ class calcMetricsWorker(QObject):
                 for p, posData in enumerate(posDatas):
                     self.allPosDataInputs[p]['stopFrameNum'] = 1
             
-            # Iterate pos and calculate metrics
+            # Load the first position with a segm. file to let the user 
+            # select the measurements to save
             numPos = len(self.allPosDataInputs)
+            posData = None
             for p, posDataInputs in enumerate(self.allPosDataInputs):
                 self.logger.log('='*40)
                 file_path = posDataInputs['file_path']
                 chName = posDataInputs['chName']
-                stopFrameNum = posDataInputs['stopFrameNum']
 
                 posData = load.loadData(file_path, chName)
 
-                self.signals.sigUpdatePbarDesc.emit(f'Processing {posData.pos_path}')
+                self.signals.sigUpdatePbarDesc.emit(f'Loading {posData.pos_path}')
 
                 posData.getBasenameAndChNames(useExt=('.tif', '.h5'))
                 posData.buildPaths()
@@ -1019,216 +969,101 @@ class calcMetricsWorker(QObject):
                     load_dataPrep_ROIcoords=True
                 )
                 posData.labelSegmData()
-                if not posData.segmFound:
-                    relPath = (
-                        f'...{os.sep}{expFoldername}'
-                        f'{os.sep}{posData.pos_foldername}'
-                    )
-                    self.logger.log(
-                        f'Skipping "{relPath}" '
-                        f'because segm. file was not found.'
-                    )
-                    continue
-
-                if posData.SizeT > 1:
-                    self.mainWin.gui.data = [None]*numPos
-                else:
-                    self.mainWin.gui.data = posDatas
-
-                self.mainWin.gui.pos_i = p
-                self.mainWin.gui.data[p] = posData
-                self.mainWin.gui.last_pos = numPos
-
-                self.mainWin.gui.isSegm3D = posData.getIsSegm3D()
-
-                # Allow single 2D/3D image
-                if posData.SizeT == 1:
-                    posData.img_data = posData.img_data[np.newaxis]
-                    posData.segm_data = posData.segm_data[np.newaxis]
-
-                self.logger.log(
-                    'Loaded paths:\n'
-                    f'Segmentation file name: {os.path.basename(posData.segm_npz_path)}\n'
-                    f'ACDC output file name: {os.path.basename(posData.acdc_output_csv_path)}'
-                )
-
-                if p == 0:
-                    self.mutex.lock()
-                    self.signals.sigInitAddMetrics.emit(
-                        posData, self.allPosDataInputs
-                    )
-                    self.waitCond.wait(self.mutex)
-                    self.mutex.unlock()
-                    if self.abort:
-                        self.signals.finished.emit(self)
-                        return
+                if posData.segmFound:
+                    break
                 
-                guiWin = self.mainWin.gui
-                guiWin.init_segmInfo_df()
-                addMetrics_acdc_df = guiWin.saveDataWorker.addMetrics_acdc_df
-                addVolumeMetrics = guiWin.saveDataWorker.addVolumeMetrics
-                addVelocityMeasurement = (
-                    guiWin.saveDataWorker.addVelocityMeasurement
+                relPath = (
+                    f'...{os.sep}{expFoldername}'
+                    f'{os.sep}{posData.pos_foldername}'
                 )
+                self.logger.log(
+                    f'Skipping "{relPath}" '
+                    f'because segm. file was not found.'
+                )
+                posData = None
+            
+            if posData is None:
+                continue
 
-                # Load the other channels
-                posData.loadedChNames = []
-                for fluoChName in posData.chNames:
-                    if fluoChName in self.mainWin.gui.chNamesToSkip:
-                        continue
-
-                    if fluoChName == chName:
-                        filename = posData.filename
-                        posData.fluo_data_dict[filename] = posData.img_data
-                        posData.fluo_bkgrData_dict[filename] = posData.bkgrData
-                        posData.loadedChNames.append(chName)
-                        continue
-
-                    fluo_path, filename = self.mainWin.gui.getPathFromChName(
-                        fluoChName, posData
-                    )
-                    if fluo_path is None:
-                        continue
-
-                    self.logger.log(f'Loading {fluoChName} data...')
-                    fluo_data, bkgrData = self.mainWin.gui.load_fluo_data(
-                        fluo_path, isGuiThread=False
-                    )
-                    if fluo_data is None:
-                        continue
-
-                    if posData.SizeT == 1:
-                        # Add single frame for snapshot data
-                        fluo_data = fluo_data[np.newaxis]
-
-                    posData.loadedChNames.append(fluoChName)
-                    posData.loadedFluoChannels.add(fluoChName)
-                    posData.fluo_data_dict[filename] = fluo_data
-                    posData.fluo_bkgrData_dict[filename] = bkgrData
-                
-                # Recreate allData_li attribute of the gui
-                posData.allData_li = []
-                for frame_i, lab in enumerate(posData.segm_data[:stopFrameNum]):
-                    data_dict = {
-                        'labels': lab,
-                        'regionprops': skimage.measure.regionprops(lab)
-                    }
-                    posData.allData_li.append(data_dict)
-
-                # Signal to compute volume in the main thread
-                self.mutex.lock()
-                self.signals.sigComputeVolume.emit(stopFrameNum, posData)
-                self.waitCond.wait(self.mutex)
-                self.mutex.unlock()
-
-                guiWin.initMetricsToSave(posData)
-
-                if not posData.fluo_data_dict:
-                    self.logger.log(
-                        'None of the signals were loaded from the path: '
-                        f'"{posData.pos_path}"'
-                    )
-
-                acdc_df_li = []
-                keys = []
-                self.signals.initProgressBar.emit(stopFrameNum)
-                for frame_i, data_dict in enumerate(posData.allData_li[:stopFrameNum]):
-                    if self.abort:
-                        self.signals.finished.emit(self)
-                        return
-
-                    lab = data_dict['labels']
-                    if not np.any(lab):
-                        # Empty segmentation mask --> skip
-                        continue
-
-                    rp = data_dict['regionprops']
-                    posData.lab = lab
-                    posData.rp = rp
-
-                    if posData.acdc_df is None:
-                        acdc_df = myutils.getBaseAcdcDf(rp)
-                    else:
-                        try:
-                            acdc_df = posData.acdc_df.loc[frame_i].copy()
-                        except:
-                            acdc_df = myutils.getBaseAcdcDf(rp)
-
-                    try:
-                        if posData.fluo_data_dict:
-                            acdc_df = addMetrics_acdc_df(
-                                acdc_df, rp, frame_i, lab, posData
-                            )
-                            if guiWin.saveDataWorker.abort:
-                                self.abort = True
-                                self.signals.finished.emit(self)
-                                return
-                        else:
-                            acdc_df = addVolumeMetrics(
-                                acdc_df, rp, posData
-                            )
-                        acdc_df_li.append(acdc_df)
-                        key = (frame_i, posData.TimeIncrement*frame_i)
-                        keys.append(key)
-                    except Exception as error:
-                        traceback_format = traceback.format_exc()
-                        print('-'*30)      
-                        self.logger.log(traceback_format)
-                        print('-'*30)
-                        self.standardMetricsErrors[str(error)] = traceback_format
-                    
-                    try:
-                        prev_data_dict = posData.allData_li[frame_i-1]
-                        prev_lab = prev_data_dict['labels']
-                        acdc_df = addVelocityMeasurement(
-                            acdc_df, prev_lab, lab, posData
-                        )
-                    except Exception as error:
-                        traceback_format = traceback.format_exc()
-                        print('-'*30)      
-                        self.logger.log(traceback_format)
-                        print('-'*30)
-                        self.standardMetricsErrors[str(error)] = traceback_format
+            self.mainWin.gui.data = [None]*numPos
+            self.mainWin.gui.pos_i = p
+            self.mainWin.gui.data[p] = posData
+            self.mainWin.gui.last_pos = numPos
+            self.mainWin.gui.isSegm3D = posData.getIsSegm3D()
 
-                    self.signals.progressBar.emit(1)
+            self.logger.log(
+                'Loaded paths:\n'
+                f'Segmentation file name: {os.path.basename(posData.segm_npz_path)}\n'
+                f'ACDC output file name: {os.path.basename(posData.acdc_output_csv_path)}'
+            )
 
-                if debugging:
-                    continue
+            self.mutex.lock()
+            self.signals.sigInitAddMetrics.emit(
+                posData, self.allPosDataInputs
+            )
+            self.waitCond.wait(self.mutex)
+            self.mutex.unlock()
+            if self.abort:
+                self.signals.finished.emit(self)
+                return
+            
+            del posData
+            
+            # Compute the positions in parallel processes. The combine 
+            # metrics config is re-loaded by each process from disk
+            guiWin = self.mainWin.gui
+            all_pos_inputs = []
+            for posDataInputs in self.allPosDataInputs:
+                all_pos_inputs.append({
+                    'file_path': posDataInputs['file_path'],
+                    'chName': posDataInputs['chName'],
+                    'stopFrameNum': posDataInputs['stopFrameNum'],
+                    'end_filename_segm': self.mainWin.endFilenameSegm,
+                    'metrics_to_save': guiWin.metricsToSave,
+                    'size_metrics_to_save': guiWin.sizeMetricsToSave,
+                    'regionprops_to_save': guiWin.regionPropsToSave,
+                    'chNamesToSkip': guiWin.chNamesToSkip
+                })
+            
+            self.signals.sigUpdatePbarDesc.emit(
+                f'Computing measurements of {numPos} positions...'
+            )
+            outputs = core.compute_measurements_multi_pos(
+                all_pos_inputs, max_workers=self.maxWorkers, 
+                metricsToSkip=guiWin.metricsToSkip,
+                mixedChCombineMetricsToSkip=guiWin.mixedChCombineMetricsToSkip,
+                logger_func=self.logger.log, signals=self.signals, save=False,
+                abort_func=lambda: self.abort
+            )
+            all_frames_acdc_dfs, acdc_output_csv_paths, errors = outputs
+            self.standardMetricsErrors.update(errors)
+            if self.abort:
+                self.signals.finished.emit(self)
+                return
 
-                if not acdc_df_li:
-                    print('-'*30)
-                    self.logger.log(
-                        'All selected positions in the experiment folder '
-                        f'{expFoldername} have EMPTY segmentation mask. '
-                        'Metrics will not be saved.'
-                    )
-                    print('-'*30)
+            iter_outputs = zip(all_frames_acdc_dfs, acdc_output_csv_paths)
+            for all_frames_acdc_df, acdc_output_csv_path in iter_outputs:
+                if all_frames_acdc_df is None:
                     continue
-
-                all_frames_acdc_df = pd.concat(
-                    acdc_df_li, keys=keys,
-                    names=['frame_i', 'time_seconds', 'Cell_ID']
-                )
-                self.mainWin.gui.saveDataWorker.addCombineMetrics_acdc_df(
-                    posData, all_frames_acdc_df
-                )
-                self.mainWin.gui.saveDataWorker.addAdditionalMetadata(
-                    posData, all_frames_acdc_df
-                )
+                
                 self.logger.log(
-                    f'Saving acdc_output to: "{posData.acdc_output_csv_path}"'
+                    f'Saving acdc_output to: "{acdc_output_csv_path}"'
                 )
                 try:
-                    all_frames_acdc_df.to_csv(posData.acdc_output_csv_path)
+                    load.save_acdc_df_file(
+                        all_frames_acdc_df, acdc_output_csv_path
+                    )
                 except PermissionError:
                     traceback_str = traceback.format_exc()
                     self.mutex.lock()
                     self.signals.sigPermissionError.emit(
-                        traceback_str, posData.acdc_output_csv_path
+                        traceback_str, acdc_output_csv_path
                     )
                     self.waitCond.wait(self.mutex)
                     self.mutex.unlock()
-                    all_frames_acdc_df.to_csv(posData.acdc_output_csv_path)
+                    load.save_acdc_df_file(
+                        all_frames_acdc_df, acdc_output_csv_path
+                    )
 
                 if self.abort:
                     self.signals.finished.emit(self)
@@ -1413,6 +1248,7 @@ class loadDataWorker(QObject):
             posData.setTempPaths(createFolder=False)
             isRecoveredDataPresent = (
                 os.path.exists(posData.segm_npz_temp_path)
+                or os.path.exists(posData.autosave_journal_path)
                 or posData.isRecoveredAcdcDfPresent()
             )
             if isRecoveredDataPresent and not self.mainWin.newSegmEndName:
@@ -1436,6 +1272,14 @@ class loadDataWorker(QObject):
                         )
                     
                     posData.loadMostRecentUnsavedAcdcDf()
+                    
+                    if os.path.exists(posData.autosave_journal_path):
+                        posData.loadAutosaveJournal()
+            
+            if not (isRecoveredDataPresent and self.loadUnsaved):
+                # The new session must not append to the journal of the 
+                # changes that the user did not recover
+                posData.discardAutosaveJournal()
 
             # Allow single 2D/3D image
             if posData.SizeT == 1:
@@ -1749,6 +1593,8 @@ class LazyLoader(QObject):
         self.H5readWait = False
         self.waitReadH5cond = waitReadH5cond
         self.readH5mutex = readH5mutex
+        # Background prefetching at every frame change is not logged
+        self.isLoggingState = True
 
     def setArgs(self, posData, current_idx, axis, updateImgOnFinished):
         self.wait = False
@@ -1776,14 +1622,17 @@ class LazyLoader(QObject):
                 )
                 break
             elif self.wait:
-                self.signals.progress.emit(
-                    'Lazy loader paused.', 'INFO'
-                )
+                if self.isLoggingState:
+                    self.signals.progress.emit(
+                        'Lazy loader paused.', 'INFO'
+                    )
                 self.pause()
             else:
-                self.signals.progress.emit(
-                    'Lazy loader resumed.', 'INFO'
-                )
+                self.isLoggingState = self.updateImgOnFinished
+                if self.isLoggingState:
+                    self.signals.progress.emit(
+                        'Lazy loader resumed.', 'INFO'
+                    )
                 self.posData.loadChannelDataChunk(
                     self.current_idx, axis=self.axis, worker=self
                 )
@@ -2156,6 +2005,7 @@ class PostProcessSegmWorker(QObject):
         self.customPostProcessGroupedFeatures = customPostProcessGroupedFeatures
         self.customPostProcessFeatures = customPostProcessFeatures
         self.mainWin = mainWin
+        self.maxWorkers = None
     
     @worker_exception_handler
     def run(self):
@@ -2180,6 +2030,8 @@ class PostProcessSegmWorker(QObject):
         for posData in data:
             current_frame_i = posData.frame_i
             data_li = posData.allData_li[current_frame_i:]
+            labs = []
+            visited_frames = []
             for i, data_dict in enumerate(data_li):
                 frame_i = current_frame_i + i
                 visited = True
@@ -2189,34 +2041,49 @@ class PostProcessSegmWorker(QObject):
                     try:
                         lab = posData.segm_data[frame_i]
                     except Exception as e:
-                        return
-
-                image = posData.img_data[frame_i]
-                
+                        break
+                labs.append(lab)
+                visited_frames.append(visited)
+            
+            def post_process_func(i, lab):
+                frame_i = current_frame_i + i
                 processed_lab = core.post_process_segm(
                     lab, return_delIDs=False, **kwargs
                 )
-                if self.customPostProcessFeatures:
-                    processed_lab = features.custom_post_process_segm(
-                        posData, 
-                        self.customPostProcessGroupedFeatures, 
-                        processed_lab, 
-                        image, 
-                        posData.frame_i, 
-                        posData.filename, 
-                        posData.user_ch_name, 
-                        self.customPostProcessFeatures
-                    )
-                if visited:
+                if not self.customPostProcessFeatures:
+                    return processed_lab
+                
+                image = posData.img_data[frame_i]
+                processed_lab = features.custom_post_process_segm(
+                    posData, 
+                    self.customPostProcessGroupedFeatures, 
+                    processed_lab, 
+                    image, 
+                    frame_i, 
+                    posData.filename, 
+                    posData.user_ch_name, 
+                    self.customPostProcessFeatures
+                )
+                return processed_lab
+            
+            # Frames are processed in parallel, while the GUI data is 
+            # updated sequentially below
+            processed_labs = core.post_process_segm_timelapse(
+                labs, post_process_func=post_process_func, 
+                max_workers=self.maxWorkers, 
+                progress_callback=lambda: self.signals.progressBar.emit(1)
+            )
+            
+            for i, processed_lab in enumerate(processed_labs):
+                frame_i = current_frame_i + i
+                if visited_frames[i]:
                     posData.allData_li[frame_i]['labels'] = processed_lab
                     # Get the rest of the stored metadata based on the new lab
                     posData.frame_i = frame_i
                     mainWin.get_data()
                     mainWin.store_data(autosave=False)
                 else:
-                    posData.segm_data[frame_i] = lab
-
-                self.signals.progressBar.emit(1)
+                    posData.segm_data[frame_i] = processed_lab
             
             posData.frame_i = current_frame_i
 
@@ -2424,7 +2291,7 @@ class ApplyTrackInfoWorker(BaseWorkerUtil):
             )     
         
         self.logger.log('Saving acdc_output table...')
-        acdc_df.to_csv(acdcFilePath)
+        load.save_acdc_df_file(acdc_df, acdcFilePath)
 
         self.signals.finished.emit(self)
 
@@ -2840,10 +2707,11 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
 
     def __init__(self, mainWin, format='CSV'):
         super().__init__(mainWin)
-        if format.startswith('CSV'):
-            self._to_format = 'to_csv'
-        elif format.startswith('XLS'):
-            self._to_format = 'to_excel'
+        # NOTE: the output format is determined by the extension of the 
+        # filename (see `concat_tables.concat_acdc_output_files`)
+        self.format = format
+        # Number of threads reading the tables of the Positions
+        self.maxWorkers = 4
     
     def emitSetMeasurements(self, kwargs):
         self.mutex.lock()
@@ -2864,11 +2732,9 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
         expPaths = self.mainWin.expPaths
         tot_exp = len(expPaths)
         self.signals.initProgressBar.emit(0)
-        acdc_dfs_allexp = []
-        keys_exp = []
+        allpos_tables = []
         for i, (exp_path, pos_foldernames) in enumerate(expPaths.items()):
             self.errors = {}
-            tot_pos = len(pos_foldernames)
             
             abort = self.emitSelectAcdcOutputFiles(
                 exp_path, pos_foldernames, infoText=' to combine',
@@ -2880,47 +2746,39 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
 
             selectedAcdcOutputEndname = self.mainWin.selectedAcdcOutputEndnames[0]
 
-            self.signals.initProgressBar.emit(len(pos_foldernames))
-            acdc_dfs = []
-            keys = []
-            for p, pos in enumerate(pos_foldernames):
-                if self.abort:
-                    self.sigAborted.emit()
-                    return
-
+            self.logger.log(
+                f'Processing experiment n. {i+1}/{tot_exp}...'
+            )
+            tables = concat_tables.get_acdc_output_filepaths(
+                exp_path, acdc_output_endname=selectedAcdcOutputEndname, 
+                pos_foldernames=pos_foldernames
+            )
+            tables_pos = {pos for pos, _ in tables}
+            for pos in pos_foldernames:
+                if pos in tables_pos:
+                    continue
                 self.logger.log(
-                    f'Processing experiment n. {i+1}/{tot_exp}, '
-                    f'{pos} ({p+1}/{tot_pos})'
+                    f'{pos} does not contain any '
+                    f'{selectedAcdcOutputEndname}.csv file. '
+                    'Skipping it.'
+                )
+            
+            if not tables:
+                continue
+            
+            # Only the headers are read here, the tables are read while 
+            # they are appended to the output file
+            images_path = os.path.dirname(tables[-1][1])
+            existing_colnames = list(
+                concat_tables.get_tables_columns(
+                    [filepath for _, filepath in tables]
                 )
-
-                images_path = os.path.join(exp_path, pos, 'Images')
-
-                ls = myutils.listdir(images_path)
-
-                acdc_output_file = [
-                    f for f in ls 
-                    if f.endswith(f'{selectedAcdcOutputEndname}.csv')
-                ]
-                if not acdc_output_file:
-                    self.logger.log(
-                        f'{pos} does not contain any '
-                        f'{selectedAcdcOutputEndname}.csv file. '
-                        'Skipping it.'
-                    )
-                    self.signals.progressBar.emit(1)
-                    continue
-                
-                acdc_df_filepath = os.path.join(images_path, acdc_output_file[0])
-                acdc_df = pd.read_csv(acdc_df_filepath).set_index('Cell_ID')
-                acdc_dfs.append(acdc_df)
-                keys.append(pos)
-
-                self.signals.progressBar.emit(1)
-
-            acdc_df_allpos = pd.concat(
-                acdc_dfs, keys=keys, names=['Position_n', 'Cell_ID']
             )
-            acdc_df_allpos['experiment_folderpath'] = exp_path
+            existing_colnames = [
+                col for col in existing_colnames if col != 'Cell_ID'
+            ]
+            existing_colnames.append('experiment_folderpath')
+            existing_colnames = pd.Index(existing_colnames)
             
             basename, chNames = myutils.getBasenameAndChNames(
                 images_path, useExt=('.tif', '.h5')
@@ -2928,7 +2786,6 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
             df_metadata = load.load_metadata_df(images_path)
             SizeZ = df_metadata.at['SizeZ', 'values']
             SizeZ = int(float(SizeZ))
-            existing_colnames = acdc_df_allpos.columns
             isSegm3D = any([col.endswith('3D') for col in existing_colnames])
             
             kwargs = {
@@ -2942,15 +2799,6 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
             if self.abort:
                 self.sigAborted.emit()
                 return
-            
-            selected_cols = [
-                col for col in self.selectedColumns 
-                if col in acdc_df_allpos.columns
-            ]
-            acdc_df_allpos = acdc_df_allpos[selected_cols]
-            acdc_dfs_allexp.append(acdc_df_allpos)
-            exp_name = os.path.basename(exp_path)
-            keys_exp.append(exp_name)
 
             allpos_dir = os.path.join(exp_path, 'AllPos_acdc_output')
             if not os.path.exists(allpos_dir):
@@ -2970,11 +2818,24 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
                 'Saving all positions concatenated file to '
                 f'"{acdc_dfs_allpos_filepath}"'
             )
-            to_format_func = getattr(acdc_df_allpos, self._to_format)
-            to_format_func(acdc_dfs_allpos_filepath)
+            self.signals.initProgressBar.emit(len(tables))
+            completed = concat_tables.concat_acdc_output_files(
+                tables, acdc_dfs_allpos_filepath, 
+                columns=self.selectedColumns,
+                constant_columns={'experiment_folderpath': exp_path},
+                max_workers=self.maxWorkers, logger_func=self.logger.log,
+                progress_callback=lambda: self.signals.progressBar.emit(1),
+                abort_callback=lambda: self.abort
+            )
+            if not completed:
+                self.sigAborted.emit()
+                return
+            
             self.acdc_dfs_allpos_filepath = acdc_dfs_allpos_filepath
+            exp_name = os.path.basename(exp_path)
+            allpos_tables.append((exp_name, acdc_dfs_allpos_filepath))
 
-        if len(keys_exp) > 1:
+        if len(allpos_tables) > 1:
             allExp_filename = f'multiExp_{self.concat_df_filename}'
             self.mutex.lock()
             self.sigAskFolder.emit(allExp_filename)
@@ -2984,9 +2845,6 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
                 self.sigAborted.emit()
                 return
             
-            acdc_df_allexp = pd.concat(
-                acdc_dfs_allexp, keys=keys_exp, names=['experiment_foldername']
-            )
             acdc_dfs_allexp_filepath = os.path.join(
                 self.allExpSaveFolder, allExp_filename
             )
@@ -2994,8 +2852,15 @@ class ConcatAcdcDfsWorker(BaseWorkerUtil):
                 'Saving multiple experiments concatenated file to '
                 f'"{acdc_dfs_allexp_filepath}"'
             )
-            to_format_func = getattr(acdc_df_allexp, self._to_format)
-            to_format_func(acdc_dfs_allexp_filepath)
+            # Stream the tables of each experiment saved above
+            self.signals.initProgressBar.emit(len(allpos_tables))
+            concat_tables.concat_acdc_output_files(
+                allpos_tables, acdc_dfs_allexp_filepath, 
+                key_name='experiment_foldername', 
+                leading_columns=('Position_n', 'Cell_ID'),
+                max_workers=self.maxWorkers, logger_func=self.logger.log,
+                progress_callback=lambda: self.signals.progressBar.emit(1)
+            )
 
         self.signals.finished.emit(self)
 
@@ -3230,7 +3095,9 @@ class ToSymDivWorker(QObject):
                     self.errors[error] = traceback_format
                 
                 try:
-                    posData.acdc_df.to_csv(posData.acdc_output_csv_path)
+                    load.save_acdc_df_file(
+                        posData.acdc_df, posData.acdc_output_csv_path
+                    )
                 except PermissionError:
                     traceback_str = traceback.format_exc()
                     self.mutex.lock()
@@ -3239,7 +3106,9 @@ class ToSymDivWorker(QObject):
                     )
                     self.waitCond.wait(self.mutex)
                     self.mutex.unlock()
-                    posData.acdc_df.to_csv(posData.acdc_output_csv_path)
+                    load.save_acdc_df_file(
+                        posData.acdc_df, posData.acdc_output_csv_path
+                    )
                 
                 self.signals.progressBar.emit(1)
                 
@@ -4171,6 +4040,7 @@ class CcaIntegrityCheckerWorker(QObject):
         self.isPaused = False
         self.debug = False
         self.dataQ = deque(maxlen=5)
+        self.videoCheckers = {}
     
     def pause(self):
         if self.debug:
@@ -4207,12 +4077,14 @@ class CcaIntegrityCheckerWorker(QObject):
             del data
         self._stop()
     
-    def _check_equality_num_mothers_buds_in_S(self, checker, frame_i):
-        num_moth_S, num_buds = checker.get_num_mothers_and_buds_in_S()
-        
-        if num_moth_S == num_buds:
+    def _check_equality_num_mothers_buds_in_S(self, violations, frame_i):
+        violations = violations[violations['check'] == 'num_mothers_buds_in_S']
+        if len(violations) == 0:
             return True
         
+        num_moth_S = int(violations['num_mothers_in_S'].iloc[0])
+        num_buds = int(violations['num_buds'].iloc[0])
+        
         category = 'number of buds different from number of mothers in S phase'
         ul_items = [
             f'Number of buds = {num_buds}', 
@@ -4226,9 +4098,13 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_mothers_multiple_buds(self, checker, frame_i):
-        mother_IDs_with_multiple_buds = (
-            checker.get_mother_IDs_with_multiple_buds()
+    def _get_violations_IDs(self, violations, check):
+        violations = violations[violations['check'] == check]
+        return violations['Cell_ID'].astype(int).to_list()
+    
+    def _check_mothers_multiple_buds(self, violations, frame_i):
+        mother_IDs_with_multiple_buds = self._get_violations_IDs(
+            violations, 'mothers_with_multiple_buds'
         )
         if len(mother_IDs_with_multiple_buds) == 0:
             return True
@@ -4242,10 +4118,12 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_cells_without_G1(self, checker, global_cca_df):
-        IDs_cycles_without_G1 = (
-            checker.get_IDs_cycles_without_G1(global_cca_df)
-        )
+    def _check_cells_without_G1(self, violations):
+        violations = violations[violations['check'] == 'cycles_without_G1']
+        IDs_cycles_without_G1 = list(zip(
+            violations['Cell_ID'].astype(int), 
+            violations['generation_num'].astype(int)
+        ))
         if len(IDs_cycles_without_G1) == 0:
             return True
 
@@ -4260,9 +4138,9 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_buds_gen_num_zero(self, checker, frame_i):
-        bud_IDs_gen_num_nonzero = (
-            checker.get_bud_IDs_gen_num_nonzero()
+    def _check_buds_gen_num_zero(self, violations, frame_i):
+        bud_IDs_gen_num_nonzero = self._get_violations_IDs(
+            violations, 'buds_gen_num_nonzero'
         )
         if len(bud_IDs_gen_num_nonzero) == 0:
             return True
@@ -4276,9 +4154,9 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_mothers_gen_num_greater_one(self, checker, frame_i):
-        moth_IDs_gen_num_non_greater_one = (
-            checker.get_moth_IDs_gen_num_non_greater_one()
+    def _check_mothers_gen_num_greater_one(self, violations, frame_i):
+        moth_IDs_gen_num_non_greater_one = self._get_violations_IDs(
+            violations, 'mothers_gen_num_less_than_one'
         )
         if len(moth_IDs_gen_num_non_greater_one) == 0:
             return True
@@ -4292,10 +4170,8 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_buds_G1(self, checker, frame_i):
-        buds_G1 = (
-            checker.get_buds_G1()
-        )
+    def _check_buds_G1(self, violations, frame_i):
+        buds_G1 = self._get_violations_IDs(violations, 'buds_in_G1')
         if len(buds_G1) == 0:
             return True
 
@@ -4308,9 +4184,9 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_cell_S_rel_ID_zero(self, checker, frame_i):
-        cell_S_rel_ID_zero = (
-            checker.get_cell_S_rel_ID_zero()
+    def _check_cell_S_rel_ID_zero(self, violations, frame_i):
+        cell_S_rel_ID_zero = self._get_violations_IDs(
+            violations, 'cells_in_S_rel_ID_less_than_one'
         )
         if len(cell_S_rel_ID_zero) == 0:
             return True
@@ -4325,9 +4201,14 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_ID_rel_ID_mismatches(self, checker, frame_i):
-        ID_rel_ID_mismatches = checker.get_ID_rel_ID_mismatches()
-        if len(ID_rel_ID_mismatches) == 0:
+    def _check_ID_rel_ID_mismatches(self, violations, frame_i):
+        violations = violations[violations['check'] == 'ID_rel_ID_mismatches']
+        ID_rel_ID_mismatches = zip(
+            violations['Cell_ID'].astype(int), 
+            violations['relative_ID'].astype(int), 
+            violations['relative_ID_of_relative_ID'].astype(int)
+        )
+        if len(violations) == 0:
             return True
 
         items = [
@@ -4344,8 +4225,10 @@ class CcaIntegrityCheckerWorker(QObject):
         self.sigWarning.emit(txt, category)
         return False
     
-    def _check_lonely_cells_in_S(self, checker, frame_i):
-        lonely_cells_in_S = checker.get_lonely_cells_in_S()
+    def _check_lonely_cells_in_S(self, violations, frame_i):
+        lonely_cells_in_S = self._get_violations_IDs(
+            violations, 'lonely_cells_in_S'
+        )
         if len(lonely_cells_in_S) == 0:
             return True
 
@@ -4370,6 +4253,15 @@ class CcaIntegrityCheckerWorker(QObject):
         except KeyError as error:
             return 
         
+    def _get_video_checker(self, posData):
+        # One checker per position so that only the frames that changed 
+        # since the last check are re-checked
+        checker = self.videoCheckers.get(posData.pos_path)
+        if checker is None:
+            checker = core.VideoCcaIntegrityChecker()
+            self.videoCheckers[posData.pos_path] = checker
+        return checker
+    
     def check(self, posData):    
         self.isChecking = True
         checkpoints = (
@@ -4382,12 +4274,10 @@ class CcaIntegrityCheckerWorker(QObject):
             '_check_cell_S_rel_ID_zero',
             '_check_ID_rel_ID_mismatches'
         )
-        cca_dfs = []
-        keys = []
-        check_integrity_globally = True
+        cca_dfs = {}
+        frames_IDs = {}
         for frame_i, data_dict in enumerate(posData.allData_li):
             if self.abortChecking:
-                check_integrity_globally = False
                 break
             
             lab = data_dict['labels']
@@ -4399,31 +4289,34 @@ class CcaIntegrityCheckerWorker(QObject):
                 # There are no annotations at frame_i --> stop
                 break
             
-            IDs = data_dict['IDs']
-            checker = core.CcaIntegrityChecker(cca_df, lab, IDs)
-            
-            for checkpoint in checkpoints:
-                proceed = getattr(self, checkpoint)(checker, frame_i)
-                if not proceed:
-                    break
-            
-            if not proceed:
-                check_integrity_globally = False
-                break
-            
-            cca_dfs.append(cca_df)
-            keys.append(frame_i)
+            cca_dfs[frame_i] = cca_df
+            frames_IDs[frame_i] = data_dict['IDs']
         
-        if check_integrity_globally and len(cca_dfs)>1:
-            global_checkpoints = (
-                '_check_cells_without_G1',
-            )
-            # Check integrity globally
-            global_cca_df = pd.concat(cca_dfs, keys=keys, names=['frame_i'])
-            for checkpoint in global_checkpoints:
-                proceed = getattr(self, checkpoint)(checker, global_cca_df)
+        if self.abortChecking:
+            self.abortChecking = False
+            self.isChecking = False
+            return
+        
+        checker = self._get_video_checker(posData)
+        violations = checker.check(
+            cca_dfs, frames_IDs=frames_IDs, check_globally=len(cca_dfs)>1
+        )
+        is_frame_violation = violations['check'].isin(
+            core.CCA_INTEGRITY_FRAME_CHECKS
+        )
+        frames_violations = violations[is_frame_violation]
+        if len(frames_violations) > 0:
+            # Warn about the first frame with violations only
+            frame_i = int(frames_violations['frame_i'].iloc[0])
+            frame_violations = frames_violations[
+                frames_violations['frame_i'] == frame_i
+            ]
+            for checkpoint in checkpoints:
+                proceed = getattr(self, checkpoint)(frame_violations, frame_i)
                 if not proceed:
                     break
+        elif len(violations) > 0:
+            self._check_cells_without_G1(violations)
         
         self.abortChecking = False
         self.isChecking = False
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cellacdc import concat_tables
+
+def _save_table_with_late_strings(filepath, num_rows=1500):
+    df = pd.DataFrame({
+        'Cell_ID': np.arange(1, num_rows+1), 
+        'cell_area_pxl': np.ones(num_rows), 
+        'notes': np.nan
+    })
+    df['notes'] = df['notes'].astype(object)
+    df.loc[num_rows-1, 'notes'] = 'dividing'
+    df.to_csv(filepath, index=False)
+    return df
+
+def test_get_tables_columns_detects_late_strings(tmp_path):
+    filepath = str(tmp_path / 'acdc_output.csv')
+    _save_table_with_late_strings(filepath)
+    
+    columns = concat_tables.get_tables_columns([filepath])
+    
+    assert columns == {'Cell_ID': False, 'cell_area_pxl': False, 'notes': True}
+
+def test_concat_acdc_output_files_keeps_late_strings(tmp_path):
+    pytest.importorskip('pyarrow')
+    filepath = str(tmp_path / 'acdc_output.csv')
+    df = _save_table_with_late_strings(filepath)
+    output_filepath = str(tmp_path / 'AllPos_acdc_output.parquet')
+    
+    concat_tables.concat_acdc_output_files(
+        [('Position_1', filepath)], output_filepath, logger_func=print
+    )
+    
+    concat_df = pd.read_parquet(output_filepath)
+    assert concat_df['notes'].iloc[-1] == 'dividing'
+    assert len(concat_df) == len(df)
+
+def _save_table_with_late_non_numeric_values(filepath, num_rows=1500):
+    df = pd.DataFrame({
+        'Cell_ID': np.arange(1, num_rows+1), 
+        'notes': np.arange(num_rows).astype(float)
+    })
+    df['notes'] = df['notes'].astype(object)
+    df.loc[num_rows-1, 'notes'] = 'dividing'
+    df.to_csv(filepath, index=False)
+    return df
+
+def test_table_schema_scans_all_chunks(tmp_path):
+    filepath = str(tmp_path / 'acdc_output.csv')
+    _save_table_with_late_non_numeric_values(filepath)
+    
+    schema = concat_tables._get_table_schema(filepath, chunksize=1000)
+    
+    assert schema == {'Cell_ID': False, 'notes': True}
+
+def test_concat_acdc_output_files_mixed_types_to_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    filepath = str(tmp_path / 'acdc_output.csv')
+    df = _save_table_with_late_non_numeric_values(filepath)
+    output_filepath = str(tmp_path / 'AllPos_acdc_output.parquet')
+    
+    concat_tables.concat_acdc_output_files(
+        [('Position_1', filepath)], output_filepath, logger_func=print
+    )
+    
+    concat_df = pd.read_parquet(output_filepath)
+    assert concat_df['notes'].iloc[0] == '0.0'
+    assert concat_df['notes'].iloc[-1] == 'dividing'
+    assert len(concat_df) == len(df)
+
+def test_concat_acdc_output_files_refuses_too_large_excel(
+        tmp_path, monkeypatch
+    ):
+    pytest.importorskip('openpyxl')
+    filepath = str(tmp_path / 'acdc_output.csv')
+    _save_table_with_late_strings(filepath, num_rows=20)
+    output_filepath = str(tmp_path / 'AllPos_acdc_output.xlsx')
+    monkeypatch.setattr(concat_tables, '_EXCEL_MAX_NUM_ROWS', 10)
+    
+    with pytest.raises(ValueError):
+        concat_tables.concat_acdc_output_files(
+            [('Position_1', filepath)], output_filepath, logger_func=print
+        )
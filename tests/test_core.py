@@ -0,0 +1,625 @@
+import os
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+import skimage.measure
+import tifffile
+
+from cellacdc import core, load, _core
+
+def test_is_segm_file_complete_requires_completed_marker(tmp_path):
+    segm_npz_path = str(tmp_path / 'test_s01_segm.npz')
+    assert not core.is_segm_file_complete(segm_npz_path, 5, 5)
+
+    # NON-tracked masks saved before tracking are not complete
+    np.savez_compressed(segm_npz_path, np.zeros((5, 8, 8), dtype=np.uint32))
+    assert not core.is_segm_file_complete(segm_npz_path, 5, 5)
+
+    load.write_segm_completed_marker(segm_npz_path, 3)
+    assert core.is_segm_file_complete(segm_npz_path, 5, 3)
+    assert not core.is_segm_file_complete(segm_npz_path, 5, 5)
+
+    load.write_segm_completed_marker(segm_npz_path, 5)
+    assert core.is_segm_file_complete(segm_npz_path, 5, 5)
+
+    load.remove_segm_completed_marker(segm_npz_path)
+    assert not core.is_segm_file_complete(segm_npz_path, 5, 5)
+
+def _get_budding_segm_data(mother_frames, bud_frames, num_frames=5):
+    segm_data = np.zeros((num_frames, 40, 40), dtype=np.uint32)
+    for frame_i in mother_frames:
+        segm_data[frame_i, 5:15, 5:15] = 1
+    for frame_i in bud_frames:
+        segm_data[frame_i, 7:12, 16:20] = 2
+    return segm_data
+
+def _assert_no_buds_in_G1(cca_df_video):
+    violations = core.check_cca_integrity_frames(cca_df_video)
+    assert not (violations['check'] == 'buds_in_G1').any()
+
+def test_auto_cca_annotate_video_mother_disappears():
+    segm_data = _get_budding_segm_data(range(3), range(1, 5))
+
+    cca_df_video = core.auto_cca_annotate_video(segm_data)
+    
+    frame_1 = cca_df_video.loc[1]
+    assert frame_1.at[2, 'relationship'] == 'bud'
+    assert frame_1.at[2, 'relative_ID'] == 1
+    assert frame_1.at[2, 'will_divide'] == 1
+    assert frame_1.at[2, 'daughter_disappears_before_division'] == 1
+    assert frame_1.at[1, 'disappears_before_division'] == 1
+    
+    # Division is annotated at the last frame where both cells exist
+    for frame_i in range(2, 5):
+        bud_cca = cca_df_video.loc[(frame_i, 2)]
+        assert bud_cca['cell_cycle_stage'] == 'G1'
+        assert bud_cca['generation_num'] == 1
+        assert bud_cca['division_frame_i'] == 2
+        assert bud_cca['relationship'] == 'mother'
+    assert cca_df_video.at[(2, 1), 'generation_num'] == 3
+    _assert_no_buds_in_G1(cca_df_video)
+
+def test_auto_cca_annotate_video_bud_disappears():
+    segm_data = _get_budding_segm_data(range(5), range(1, 3))
+
+    cca_df_video = core.auto_cca_annotate_video(segm_data)
+    
+    assert cca_df_video.at[(1, 2), 'disappears_before_division'] == 1
+    assert cca_df_video.at[(1, 1), 'daughter_disappears_before_division'] == 1
+    for frame_i in range(2, 5):
+        moth_cca = cca_df_video.loc[(frame_i, 1)]
+        assert moth_cca['cell_cycle_stage'] == 'G1'
+        assert moth_cca['generation_num'] == 3
+        assert moth_cca['division_frame_i'] == 2
+        assert moth_cca['relationship'] == 'mother'
+    assert cca_df_video.at[(2, 2), 'relationship'] == 'mother'
+    _assert_no_buds_in_G1(cca_df_video)
+
+def _create_timelapse_position(
+        tmp_path, num_frames=4, pos_foldername='Position_1'
+    ):
+    images_path = tmp_path / pos_foldername / 'Images'
+    images_path.mkdir(parents=True)
+    img_path = images_path / 'test_s01_phase_contr.tif'
+    img_data = np.random.default_rng(0).integers(
+        0, 255, size=(num_frames, 32, 32), dtype=np.uint8
+    )
+    tifffile.imwrite(str(img_path), img_data)
+    segm_data = np.zeros((num_frames, 32, 32), dtype=np.uint32)
+    segm_data[:, 2:8, 2:8] = 1
+    segm_data[:, 15:25, 10:20] = 2
+    np.savez_compressed(str(images_path / 'test_s01_segm.npz'), segm_data)
+    pd.DataFrame({
+        'SizeT': num_frames, 'SizeZ': 1, 'PhysicalSizeX': 0.5, 
+        'PhysicalSizeY': 0.5, 'PhysicalSizeZ': 1, 'TimeIncrement': 60
+    }, index=[0]).T.rename(columns={0: 'values'}).rename_axis(
+        'Description'
+    ).to_csv(images_path / 'test_s01_metadata.csv')
+    return str(img_path), str(images_path / 'test_s01_acdc_output.csv')
+
+def test_compute_measurements_multi_pos(tmp_path):
+    img_path, acdc_output_csv_path = _create_timelapse_position(tmp_path)
+    pos_inputs = {'file_path': img_path, 'chName': 'phase_contr'}
+
+    outputs = core.compute_measurements_multi_pos(
+        [pos_inputs], max_workers=1, frames_chunk_size=2
+    )
+    
+    all_acdc_dfs, acdc_output_csv_paths, errors = outputs
+    acdc_df = all_acdc_dfs[0]
+    assert acdc_output_csv_paths == [acdc_output_csv_path]
+    assert acdc_df.index.get_level_values('frame_i').unique().to_list() == [
+        0, 1, 2, 3
+    ]
+    assert 'phase_contr_mean' in acdc_df.columns
+    assert os.path.exists(acdc_output_csv_path)
+
+class _CountSignal:
+    def __init__(self):
+        self.values = []
+    
+    def emit(self, value):
+        self.values.append(value)
+
+class _MeasurementsSignalsMock:
+    def __init__(self):
+        self.initProgressBar = _CountSignal()
+        self.progressBar = _CountSignal()
+
+def test_compute_measurements_multi_pos_chunks_load_only_their_frames(
+        tmp_path
+    ):
+    img_path, _ = _create_timelapse_position(tmp_path, num_frames=5)
+    images_path = os.path.dirname(img_path)
+    segm_npz_path = os.path.join(images_path, 'test_s01_segm.npz')
+    segm_data = np.load(segm_npz_path)['arr_0']
+    # Object 2 moves to test velocity across chunks
+    segm_data[3:, 15:25, 10:20] = 0
+    segm_data[3:, 18:28, 10:20] = 2
+    np.savez_compressed(segm_npz_path, segm_data)
+    pos_inputs = {'file_path': img_path, 'chName': 'phase_contr'}
+
+    signals = _MeasurementsSignalsMock()
+    outputs = core.compute_measurements_multi_pos(
+        [pos_inputs], max_workers=1, frames_chunk_size=2, save=False, 
+        signals=signals
+    )
+    chunked_acdc_df = outputs[0][0]
+    
+    # Progress is reported per chunk of frames
+    assert signals.initProgressBar.values == [3]
+    assert signals.progressBar.values == [1, 1, 1]
+    assert load.is_segm_chunks_file_valid(segm_npz_path)
+
+    posData = core.load_position_measurements_data(
+        img_path, 'phase_contr', frames_range=(1, 3)
+    )
+    assert np.array_equal(posData.segm_data[2], segm_data[2])
+    with pytest.raises(IndexError):
+        posData.segm_data[3]
+    posData.closeSegmChunks()
+
+    outputs = core.compute_measurements_multi_pos(
+        [pos_inputs], max_workers=1, save=False
+    )
+    acdc_df = outputs[0][0]
+    pd.testing.assert_frame_equal(chunked_acdc_df, acdc_df)
+    assert acdc_df.at[(3, 180, 2), 'velocity_pixel'] == 3
+
+def test_compute_measurements_multi_pos_parallel(tmp_path):
+    img_path_1, _ = _create_timelapse_position(
+        tmp_path, pos_foldername='Position_1'
+    )
+    img_path_2, _ = _create_timelapse_position(
+        tmp_path, pos_foldername='Position_2'
+    )
+    all_pos_inputs = [
+        {'file_path': img_path, 'chName': 'phase_contr'} 
+        for img_path in (img_path_1, img_path_2)
+    ]
+
+    outputs = core.compute_measurements_multi_pos(
+        all_pos_inputs, max_workers=2, frames_chunk_size=2, save=False
+    )
+    
+    all_acdc_dfs, _, errors = outputs
+    assert not errors
+    for acdc_df in all_acdc_dfs:
+        assert acdc_df.index.get_level_values('frame_i').unique().to_list() == [
+            0, 1, 2, 3
+        ]
+
+def test_compute_measurements_multi_pos_failed_chunk_not_saved(
+        tmp_path, monkeypatch
+    ):
+    img_path, acdc_output_csv_path = _create_timelapse_position(tmp_path)
+    with open(acdc_output_csv_path, 'w') as csv:
+        csv.write('frame_i,Cell_ID\n0,1\n')
+    compute_position_measurements = core.compute_position_measurements
+    
+    def failing_chunk(pos_inputs, logger_func=print):
+        if pos_inputs['frames_range'][0] == 2:
+            raise RuntimeError('Chunk failed')
+        return compute_position_measurements(
+            pos_inputs, logger_func=logger_func
+        )
+    
+    monkeypatch.setattr(core, 'compute_position_measurements', failing_chunk)
+    pos_inputs = {'file_path': img_path, 'chName': 'phase_contr'}
+
+    outputs = core.compute_measurements_multi_pos(
+        [pos_inputs], max_workers=1, frames_chunk_size=2
+    )
+    
+    all_acdc_dfs, _, errors = outputs
+    assert all_acdc_dfs == [None]
+    assert 'Chunk failed' in errors
+    with open(acdc_output_csv_path, 'r') as csv:
+        assert csv.read() == 'frame_i,Cell_ID\n0,1\n'
+
+def _failing_init_segm_worker(workflow_params, log_path):
+    raise RuntimeError('Model initialization failed')
+
+def _fake_init_segm_worker(workflow_params, log_path):
+    pass
+
+def _fake_run_segm_worker(ch_filepath, stop_frame_n, log_path):
+    return ch_filepath, f'{log_path}.pos', None
+
+def _get_segm_workflow_params(SizeT):
+    return {
+        'initialization': {'user_ch_name': 'phase_contr', 'segm_endname': ''}, 
+        'metadata': {'SizeT': SizeT}
+    }
+
+def test_run_segm_workflow_multi_pos_skips_complete_positions(
+        tmp_path, monkeypatch
+    ):
+    monkeypatch.setattr(core, '_init_segm_worker', _fake_init_segm_worker)
+    monkeypatch.setattr(core, '_run_segm_worker', _fake_run_segm_worker)
+    img_path_1, _ = _create_timelapse_position(
+        tmp_path, pos_foldername='Position_1'
+    )
+    img_path_2, _ = _create_timelapse_position(
+        tmp_path, pos_foldername='Position_2'
+    )
+    segm_npz_path_1 = os.path.join(
+        os.path.dirname(img_path_1), 'test_s01_segm.npz'
+    )
+    load.write_segm_completed_marker(segm_npz_path_1, 4)
+    logs = []
+
+    failed = core.run_segm_workflow_multi_pos(
+        _get_segm_workflow_params(4), [img_path_1, img_path_2], [4, 4], 
+        str(tmp_path / 'segm.log'), max_workers=2, resume=True, 
+        logger_func=logs.append
+    )
+    
+    assert failed == {}
+    assert any(log.startswith(f'Skipping "{img_path_1}"') for log in logs)
+    assert any(log.startswith(f'"{img_path_2}" done') for log in logs)
+    assert not any(log.startswith(f'"{img_path_1}" done') for log in logs)
+
+def test_run_segm_workflow_multi_pos_broken_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, '_init_segm_worker', _failing_init_segm_worker)
+    ch_filepaths = [
+        str(tmp_path / 'Position_1' / 'Images' / 'test_s01_phase_contr.tif'),
+        str(tmp_path / 'Position_2' / 'Images' / 'test_s01_phase_contr.tif')
+    ]
+    logs = []
+
+    failed = core.run_segm_workflow_multi_pos(
+        _get_segm_workflow_params(1), ch_filepaths, [1, 1], 
+        str(tmp_path / 'segm.log'), max_workers=2, logger_func=logs.append
+    )
+    
+    assert sorted(failed.keys()) == ch_filepaths
+    assert sum(log.startswith('[ERROR]') for log in logs) == 2
+
+def test_get_metric_base_name():
+    assert core._get_metric_base_name('mNeon_mean', 'mNeon') == 'mean'
+    assert core._get_metric_base_name('mNeon_mean_maxProj', 'mNeon') == 'mean'
+    assert core._get_metric_base_name('mNeon_median_zSlice', 'mNeon') == (
+        'median'
+    )
+    assert core._get_metric_base_name('mNeon_amount_autoBkgr_3D', 'mNeon') == (
+        'amount_autoBkgr'
+    )
+
+def test_measurements_kernel_expands_stop_frame_numbers(tmp_path):
+    exp_path = tmp_path / 'exp'
+    exp_path.mkdir()
+    for pos in ('Position_1', 'Position_2'):
+        _create_timelapse_position(exp_path, num_frames=4, pos_foldername=pos)
+    file_path, _ = _create_timelapse_position(tmp_path, num_frames=4)
+    workflow_params = {'paths_to_measure': {
+        'paths': [str(exp_path), file_path], 'stop_frame_numbers': ['2', '3']
+    }}
+    
+    kernel = core.ComputeMeasurementsKernel(None, None, is_cli=False)
+    kernel.is_cli = False
+    kernel.channels = None
+    ch_filepaths = kernel.parse_paths(workflow_params)
+    stop_frame_nums = kernel.parse_stop_frame_numbers(
+        workflow_params, len(ch_filepaths)
+    )
+    
+    assert len(ch_filepaths) == 3
+    assert stop_frame_nums == [2, 2, 3]
+    
+    workflow_params['paths_to_measure']['stop_frame_numbers'] = ['2']
+    with pytest.raises(ValueError):
+        kernel.parse_stop_frame_numbers(workflow_params, len(ch_filepaths))
+
+def _get_centroids_df(rows):
+    index = pd.MultiIndex.from_tuples(
+        [(frame_i, ID) for frame_i, ID, _, _ in rows], 
+        names=['frame_i', 'Cell_ID']
+    )
+    return pd.DataFrame(
+        [(y, x) for _, _, y, x in rows], index=index, 
+        columns=['y_centroid', 'x_centroid']
+    )
+
+def test_compute_video_velocity():
+    centroids_df = _get_centroids_df([
+        (0, 1, 0, 0), (1, 1, 3, 4), (0, 2, 5, 5), (2, 2, 5, 6)
+    ])
+    
+    velocity_df = core.compute_video_velocity(centroids_df, spacing=(2, 2))
+    
+    assert velocity_df.at[(0, 1), 'velocity_pixel'] == 0
+    assert velocity_df.at[(1, 1), 'velocity_pixel'] == 5
+    assert velocity_df.at[(1, 1), 'velocity_um'] == 10
+    # Not present in the previous frame
+    assert velocity_df.at[(2, 2), 'velocity_pixel'] == 0
+
+def test_compute_tracks_displacement_with_gaps():
+    centroids_df = _get_centroids_df([
+        (1, 1, 0, 0), (3, 1, 0, 2), 
+        (0, 2, 0, 0), (1, 2, 3, 4), (2, 2, 3, 4), (4, 2, 3, 0)
+    ])
+    
+    tracks_df, msd_df = core.compute_tracks_displacement(centroids_df)
+    
+    assert tracks_df.at[1, 'displacement_pixel'] == 2
+    assert tracks_df.at[1, 'path_length_pixel'] == 2
+    assert tracks_df.at[2, 'path_length_pixel'] == 9
+    assert tracks_df.at[2, 'num_frames'] == 4
+    
+    assert msd_df.loc[1].index.to_list() == [2]
+    assert msd_df.at[(1, 2), 'msd_pixel'] == 4
+    # Track 2 pairs with lag 2: (0, 2) and (2, 4)
+    assert msd_df.at[(2, 2), 'msd_pixel'] == (25 + 16)/2
+    assert msd_df.at[(2, 2), 'num_pairs'] == 2
+    assert msd_df.at[(2, 4), 'msd_pixel'] == 9
+    
+    _, msd_df = core.compute_tracks_displacement(centroids_df, max_lag=2)
+    
+    assert msd_df.index.get_level_values('lag').max() == 2
+
+def test_regionprops_cache():
+    lab = np.zeros((16, 16), dtype=np.uint32)
+    lab[2:5, 2:5] = 1
+    lab[8:12, 8:12] = 2
+    cache = core.RegionpropsCache(max_size=2)
+    
+    rp = cache.get_regionprops(lab, 0)
+    
+    assert [obj.label for obj in rp] == [1, 2]
+    # Same content in a different array is a cache hit
+    assert cache.get_regionprops(lab.copy(), 0)[0] is rp[0]
+    # Labels are not compared, only the mutation counter is checked
+    assert cache.get_regionprops(np.zeros_like(lab), 0)[0] is rp[0]
+    
+    lab[lab == 2] = 3
+    cache.invalidate(0)
+    
+    assert [obj.label for obj in cache.get_regionprops(lab, 0)] == [1, 3]
+    
+    # The labels table does not keep the labels in memory
+    table_lab = lab.copy()
+    table_lab_ref = weakref.ref(table_lab)
+    table = cache.get_labels_table(table_lab, 1)
+    del table_lab
+    
+    assert table_lab_ref() is None
+    assert cache.get_labels_table(lab.copy(), 1) is table
+    
+    cache.get_labels_table(lab, 2)
+    
+    assert 0 not in cache._cache
+
+class _ThresholdModel:
+    def segment(self, image):
+        return (image > 0).astype(np.uint32)
+
+class _ProgressSignal:
+    def emit(self, *args):
+        pass
+
+class _SignalsMock:
+    progressBar = _ProgressSignal()
+    innerProgressBar = _ProgressSignal()
+
+def test_segm_kernel_iter_segment_frames_without_postprocess():
+    kernel = core.SegmKernel.__new__(core.SegmKernel)
+    kernel.model = _ThresholdModel()
+    kernel.model_kwargs = {}
+    kernel.batch_size = 2
+    kernel.do_postprocess = True
+    kernel.innerPbar_available = False
+    kernel.signals = _SignalsMock()
+    img_data = np.zeros((5, 8, 8), dtype=np.uint8)
+    img_data[:, 2:4, 2:4] = 1
+    
+    def post_process_frame(*args):
+        raise AssertionError('Post-processing should be skipped')
+    
+    kernel._post_process_frame = post_process_frame
+    frames = kernel._iter_segment_frames(
+        img_data, None, None, None, do_postprocess=False
+    )
+    labs = list(frames)
+    
+    assert len(labs) == 5
+    assert all(lab.dtype == np.uint32 for lab in labs)
+    assert np.array_equal(labs[-1], img_data[-1].astype(np.uint32))
+    assert kernel.do_postprocess
+
+def test_encode_decode_labels_delta():
+    old_lab = np.zeros((3, 20, 20), dtype=np.uint32)
+    old_lab[0, 2:6, 2:6] = 1
+    old_lab[1, 10:15, 3:9] = 2
+    old_lab[2, 10:15, 10:12] = 3
+    new_lab = old_lab.copy()
+    new_lab[new_lab == 2] = 5
+    new_lab[2, 0:3, 0:3] = 4
+    new_lab[0, 3:4, 3:5] = 0
+    
+    delta = core.encode_labels_delta(old_lab, new_lab)
+    
+    assert delta['bbox'] is not None
+    decoded_lab = core.decode_labels_delta(new_lab.copy(), delta)
+    assert np.array_equal(decoded_lab, old_lab)
+    
+    assert core.encode_labels_delta(old_lab, old_lab.copy()) == {'bbox': None}
+    assert core.decode_labels_delta(new_lab, {'bbox': None}) is new_lab
+
+def test_relabel_IDs():
+    lab = np.zeros((2, 10, 10), dtype=np.uint32)
+    lab[:, 1:3, 1:3] = 1
+    lab[:, 5:8, 5:8] = 2
+    lab[1, 0, 9] = 7
+    
+    # Swapping IDs is allowed and duplicated old IDs use the first new ID
+    relabelled = core.relabel_IDs(lab, [1, 2, 1, 9], [2, 1, 5, 3], in_place=False)
+    
+    assert np.array_equal(relabelled == 2, lab == 1)
+    assert np.array_equal(relabelled == 1, lab == 2)
+    assert relabelled[1, 0, 9] == 7
+    assert lab[0, 1, 1] == 1
+    
+    core.relabel_IDs(lab[0], [2], [4])
+    
+    assert lab[0, 6, 6] == 4
+    assert lab[1, 6, 6] == 2
+
+def test_relabel_IDs_huge_IDs():
+    lab = np.zeros((10, 10), dtype=np.uint32)
+    lab[1:3, 1:3] = 2**30
+    lab[5:8, 5:8] = 2
+    
+    relabelled = core.relabel_IDs(lab, [2**30, 2], [2, 2**30+1], in_place=False)
+    
+    assert relabelled[1, 1] == 2
+    assert relabelled[6, 6] == 2**30+1
+    assert relabelled[0, 0] == 0
+
+def test_relabel_IDs_new_IDs_overflow_dtype():
+    lab = np.zeros((10, 10), dtype=np.uint16)
+    lab[1:3, 1:3] = 1
+    
+    with pytest.raises(ValueError):
+        core.relabel_IDs(lab, [1], [70000])
+    
+    with pytest.raises(ValueError):
+        core.relabel_IDs(lab, [1], [-1])
+    
+    assert lab[1, 1] == 1
+    
+    relabelled = core.relabel_IDs(lab, [1], [2**16-1], in_place=False)
+    
+    assert relabelled[1, 1] == 2**16-1
+
+def test_relabel_IDs_negative_labels():
+    lab = np.zeros((10, 10), dtype=np.int32)
+    lab[1:3, 1:3] = 1
+    lab[5:8, 5:8] = -2
+    
+    with pytest.raises(ValueError):
+        core.relabel_IDs(lab, [1], [3])
+    
+    assert lab[1, 1] == 1
+    assert lab[6, 6] == -2
+
+def test_get_labels_table_matches_regionprops():
+    lab = np.zeros((2, 30, 30), dtype=np.uint32)
+    lab[0, 2:6, 3:9] = 1
+    lab[1, 10:20, 12:15] = 4
+    lab[0:2, 25:28, 25:29] = 2**25
+    
+    for _lab in (lab, lab[0]):
+        table = core.get_labels_table(_lab)
+        rp = skimage.measure.regionprops(_lab)
+        
+        assert table['label'].tolist() == [obj.label for obj in rp]
+        assert table['area'].tolist() == [obj.area for obj in rp]
+        assert np.allclose(table['centroid'], [obj.centroid for obj in rp])
+        assert np.array_equal(table['bbox'], [obj.bbox for obj in rp])
+        assert table['slice'] == [obj.slice for obj in rp]
+    
+    empty_table = core.get_labels_table(np.zeros((5, 5), dtype=np.uint32))
+    
+    assert len(empty_table['label']) == 0
+
+def _get_undo_state(labels, crop_slice=None):
+    return {'labels': labels, 'crop_slice': crop_slice}
+
+def test_undo_redo_stores_share_memory_budget():
+    budget = core.UndoRedoMemoryBudget(max_bytes=3*100*8)
+    store_pos1 = core.UndoRedoStatesStore(2, budget=budget)
+    store_pos2 = core.UndoRedoStatesStore(2, budget=budget)
+    for frame_i in range(2):
+        store_pos1[frame_i].insert(0, _get_undo_state(np.zeros(100)))
+    store_pos2[0].insert(0, _get_undo_state(np.zeros(100)))
+    
+    assert budget.nbytes == 3*100*8
+    
+    # Exceeding the shared budget removes the least recently used frame
+    # of the other Position
+    store_pos2[1].insert(0, _get_undo_state(np.zeros(100)))
+    
+    assert budget.nbytes == 3*100*8
+    assert len(store_pos1[0]) == 0
+    assert len(store_pos1[1]) == 1
+    assert budget.nbytes == store_pos1.nbytes + store_pos2.nbytes
+
+def test_undo_redo_store_cropped_states_delta():
+    store = core.UndoRedoStatesStore(1)
+    lab = np.zeros((50, 50), dtype=np.uint32)
+    lab[10:20, 10:20] = 1
+    crop_slice = (slice(5, 30), slice(5, 30))
+    
+    cropped_states_labels = []
+    for ID in (2, 3):
+        cropped_labels = lab[crop_slice].copy()
+        cropped_states_labels.append(cropped_labels)
+        store[0].insert(0, _get_undo_state(cropped_labels, crop_slice))
+        lab[10:20, 10:20] = ID
+    store[0].insert(0, _get_undo_state(lab.copy()))
+    
+    entries = store._frames[0]
+    
+    assert [entry['delta'] is None for entry in entries] == [
+        True, False, False
+    ]
+    assert store.nbytes < lab.nbytes + 2*cropped_states_labels[0].nbytes
+    assert np.array_equal(store[0][0]['labels'], lab)
+    assert np.array_equal(store[0][1]['labels'], cropped_states_labels[1])
+    assert np.array_equal(store[0][2]['labels'], cropped_states_labels[0])
+    
+    # Cropped states are removed from the oldest without decoding errors
+    assert np.array_equal(
+        store[0].pop(-1)['labels'], cropped_states_labels[0]
+    )
+    assert len(store[0]) == 2
+
+def test_rotational_volumes_cache_drops_deleted_objects():
+    lab = np.zeros((40, 40), dtype=np.uint32)
+    lab[2:10, 2:14] = 1
+    lab[20:30, 20:26] = 2
+    cache = {}
+    rp = _core.compute_rotational_volumes(
+        skimage.measure.regionprops(lab), frame_i=3, cache=cache
+    )
+    vol_ID2 = rp[1].vol_vox
+    
+    assert set(cache[3].keys()) == {1, 2}
+    
+    lab[lab == 1] = 0
+    lab[30:35, 20:26] = 2
+    rp = _core.compute_rotational_volumes(
+        skimage.measure.regionprops(lab), frame_i=3, cache=cache
+    )
+    
+    assert list(cache.keys()) == [3]
+    assert set(cache[3].keys()) == {2}
+    assert rp[0].vol_vox > vol_ID2
+
+def test_obj_contours_cache_uses_version():
+    lab = np.zeros((30, 30), dtype=np.uint32)
+    lab[2:10, 2:10] = 1
+    lab[15:25, 15:25] = 2
+    cache = core.ObjContoursCache()
+    
+    contours = cache.get_contours(lab, (0, 0), version=0)
+    contours_mask = cache.get_contours_mask(lab, (0, 0), version=0)
+    
+    assert set(contours.keys()) == {1, 2}
+    assert np.array_equal(contours_mask, core.get_labels_contours_mask(lab))
+    
+    # Same version --> labels are not compared and cached results are used
+    lab[lab == 2] = 0
+    
+    assert cache.get_contours(lab, (0, 0), version=0) is contours
+    assert cache.get_contours_mask(lab, (0, 0), version=0) is contours_mask
+    
+    # New version --> both contours and mask are recomputed
+    contours = cache.get_contours(lab, (0, 0), version=1)
+    contours_mask = cache.get_contours_mask(lab, (0, 0), version=1)
+    
+    assert set(contours.keys()) == {1}
+    assert not np.any(contours_mask[15:25, 15:25])
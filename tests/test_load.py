@@ -0,0 +1,266 @@
+import os
+
+import numpy as np
+import pandas as pd
+import tifffile
+
+from cellacdc import load
+
+def _create_position(tmp_path, segm_data, basename='test_s01_'):
+    images_path = tmp_path / 'Position_1' / 'Images'
+    images_path.mkdir(parents=True)
+    img_path = images_path / f'{basename}phase_contr.tif'
+    img_data = np.zeros(segm_data.shape, dtype=np.uint8)
+    tifffile.imwrite(str(img_path), img_data)
+    segm_path = images_path / f'{basename}segm.npz'
+    np.savez_compressed(str(segm_path), segm_data)
+    return str(img_path)
+
+def test_load_position_with_segm_file(tmp_path):
+    segm_data = np.zeros((3, 32, 32), dtype=np.uint32)
+    segm_data[:, 2:8, 2:8] = 1
+    segm_data[1:, 15:25, 10:20] = 2
+    img_path = _create_position(tmp_path, segm_data)
+
+    posData = load.loadData(img_path, 'phase_contr')
+    posData.getBasenameAndChNames()
+    posData.buildPaths()
+    posData.loadOtherFiles(load_segm_data=True, load_metadata=True)
+
+    assert posData.segmFound
+    assert posData.segm_data.dtype == np.uint32
+    assert np.array_equal(posData.segm_data, segm_data)
+
+def _get_acdc_df(IDs, generation_num):
+    acdc_df = pd.DataFrame({
+        'Cell_ID': IDs, 
+        'generation_num': generation_num,
+        'is_cell_excluded': 0
+    }).set_index('Cell_ID')
+    return acdc_df
+
+def test_autosave_journal_replay(tmp_path):
+    journal_path = str(tmp_path / 'autosave_journal.bin')
+    lab = np.zeros((8, 8), dtype=np.uint32)
+    lab[2:5, 2:5] = 1
+    acdc_df = _get_acdc_df([1, 2, 3], [0, 1, 2])
+    new_acdc_df = _get_acdc_df([1, 3, 4], [5, 2, 0])
+    records = [
+        load.encode_journal_labels_record(0, lab),
+        load.encode_journal_acdc_df_record(0, acdc_df),
+        load.encode_journal_acdc_df_record(
+            0, new_acdc_df, prev_acdc_df=acdc_df
+        )
+    ]
+    load.append_autosave_journal(journal_path, records)
+    
+    labels, acdc_dfs = load.read_autosave_journal(journal_path)
+    
+    assert np.array_equal(labels[0], lab)
+    pd.testing.assert_frame_equal(acdc_dfs[0], new_acdc_df)
+
+    load.compact_autosave_journal(journal_path)
+    labels, acdc_dfs = load.read_autosave_journal(journal_path)
+    
+    assert np.array_equal(labels[0], lab)
+    pd.testing.assert_frame_equal(acdc_dfs[0], new_acdc_df)
+
+def test_autosave_journal_replay_delta_without_base(tmp_path):
+    journal_path = str(tmp_path / 'autosave_journal.bin')
+    saved_acdc_df = _get_acdc_df([1, 2, 3], [0, 1, 2])
+    new_acdc_df = _get_acdc_df([1, 3], [0, 3])
+    record = load.encode_journal_acdc_df_record(
+        1, new_acdc_df, prev_acdc_df=saved_acdc_df
+    )
+    load.append_autosave_journal(journal_path, [record])
+    
+    _, acdc_dfs = load.read_autosave_journal(journal_path)
+    
+    assert 1 not in acdc_dfs
+
+    _, acdc_dfs = load.read_autosave_journal(
+        journal_path, base_acdc_dfs={1: saved_acdc_df}
+    )
+    
+    pd.testing.assert_frame_equal(acdc_dfs[1], new_acdc_df)
+
+def _init_position_data(tmp_path, segm_data):
+    img_path = _create_position(tmp_path, segm_data)
+    posData = load.loadData(img_path, 'phase_contr')
+    posData.getBasenameAndChNames()
+    posData.buildPaths()
+    posData.setTempPaths()
+    return posData
+
+def test_discard_autosave_journal(tmp_path):
+    segm_data = np.zeros((2, 16, 16), dtype=np.uint32)
+    posData = _init_position_data(tmp_path, segm_data)
+    journal_path = posData.autosave_journal_path
+
+    old_lab = np.ones((16, 16), dtype=np.uint32)
+    load.append_autosave_journal(
+        journal_path, [load.encode_journal_labels_record(0, old_lab)]
+    )
+    posData.discardAutosaveJournal()
+
+    assert not os.path.exists(journal_path)
+    discarded_path = load.get_discarded_autosave_journal_path(journal_path)
+    labels, _ = load.read_autosave_journal(discarded_path)
+    assert np.array_equal(labels[0], old_lab)
+
+    # Records of the new session do not mix with the discarded ones
+    new_lab = np.full((16, 16), 2, dtype=np.uint32)
+    load.append_autosave_journal(
+        journal_path, [load.encode_journal_labels_record(1, new_lab)]
+    )
+    labels, _ = load.read_autosave_journal(journal_path)
+    assert list(labels.keys()) == [1]
+    assert np.array_equal(labels[1], new_lab)
+
+def test_frames_edited_since(tmp_path):
+    segm_data = np.zeros((4, 16, 16), dtype=np.uint32)
+    posData = _init_position_data(tmp_path, segm_data)
+    assert posData.getFramesEditedSince(posData.journaledEditVersion) == []
+
+    posData.frame_i = 2
+    posData.setFramesEdited()
+    posData.setFramesEdited((0, 3))
+    assert posData.getFramesEditedSince(0) == [0, 2, 3]
+
+    version = posData.editVersion
+    posData.setFramesEdited((2,))
+    assert posData.getFramesEditedSince(version) == [2]
+    assert posData.getFrameEditVersion(2) == posData.editVersion
+    assert posData.getFrameEditVersion(1) == 0
+
+    posData.resetAutosaveJournalState()
+    assert posData.getFramesEditedSince(posData.journaledEditVersion) == []
+
+def test_load_img_data_without_memmap(tmp_path):
+    segm_data = np.zeros((3, 32, 32), dtype=np.uint32)
+    img_path = _create_position(tmp_path, segm_data)
+
+    posData = load.loadData(img_path, 'phase_contr')
+    posData.getBasenameAndChNames()
+    posData.buildPaths()
+    posData.loadImgData(memmap=False)
+
+    assert not posData.isImgDataMemmap
+    assert not isinstance(posData.img_data, np.memmap)
+    
+    posData.loadImgData()
+    
+    assert posData.isImgDataMemmap
+
+def test_save_segm_data(tmp_path):
+    segm_npz_path = str(tmp_path / 'test_s01_segm.npz')
+    segm_data = np.zeros((4, 16, 16), dtype=np.uint32)
+    segm_data[:, 2:6, 2:6] = 1
+    load.save_segm_data(segm_npz_path, segm_data)
+
+    segm_data[2, 8:12, 8:12] = 2
+    load.save_segm_data(segm_npz_path, segm_data, frames_i=[2])
+    
+    # The .npz file is up to date as soon as the save returns
+    assert np.array_equal(np.load(segm_npz_path)['arr_0'], segm_data)
+    assert load.is_segm_chunks_file_valid(segm_npz_path)
+    assert np.array_equal(load.read_segm_data(segm_npz_path), segm_data)
+    assert np.array_equal(
+        load.read_segm_chunks(segm_npz_path, frames_i=[2])[0], segm_data[2]
+    )
+    # No temporary files left
+    assert sorted(os.listdir(tmp_path)) == [
+        'test_s01_segm.chunks.hdf5', 'test_s01_segm.npz'
+    ]
+
+def test_segm_chunks_stale_after_npz_modified(tmp_path):
+    segm_npz_path = str(tmp_path / 'test_s01_segm.npz')
+    segm_data = np.zeros((2, 16, 16), dtype=np.uint32)
+    load.save_segm_data(segm_npz_path, segm_data)
+
+    # e.g., segmentation workflow overwriting the .npz file
+    new_segm_data = np.ones((2, 16, 16), dtype=np.uint32)
+    load.save_npz_atomic(segm_npz_path, new_segm_data)
+
+    assert not load.is_segm_chunks_file_valid(segm_npz_path)
+    assert np.array_equal(load.read_segm_data(segm_npz_path), new_segm_data)
+
+def test_load_position_with_lazy_segm_data(tmp_path):
+    segm_data = np.zeros((3, 32, 32), dtype=np.uint32)
+    segm_data[1:, 15:25, 10:20] = 2
+    img_path = _create_position(tmp_path, segm_data)
+    images_path = os.path.dirname(img_path)
+    segm_npz_path = os.path.join(images_path, 'test_s01_segm.npz')
+    load.import_segm_npz_to_chunks(segm_npz_path)
+
+    posData = load.loadData(img_path, 'phase_contr')
+    posData.getBasenameAndChNames()
+    posData.buildPaths()
+    posData.loadOtherFiles(load_segm_data=True, lazy_segm_data=True)
+
+    # The chunked file is not detected as a channel
+    assert posData.chNames == ['phase_contr']
+    assert posData.segmFound
+    assert not isinstance(posData.segm_data, np.ndarray)
+    assert posData.segm_data.shape == segm_data.shape
+    assert np.array_equal(posData.segm_data[1], segm_data[1])
+    posData.closeSegmChunks()
+
+class _FramesOnlyStack:
+    # Tracked stack that can be indexed only one frame at a time
+    def __init__(self, data):
+        self._data = data
+        self.accessed_frames = []
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __getitem__(self, frame_i):
+        assert isinstance(frame_i, int)
+        self.accessed_frames.append(frame_i)
+        return self._data[frame_i]
+    
+    def __array__(self, *args, **kwargs):
+        raise AssertionError('The entire tracked stack was read')
+
+class _TrackerWithLineage:
+    def __init__(self, cca_dfs):
+        self.cca_dfs = cca_dfs
+
+def test_tracker_acdc_df_frame_by_frame(tmp_path):
+    segm_data = np.zeros((2, 32, 32), dtype=np.uint32)
+    segm_data[:, 2:8, 4:10] = 1
+    segm_data[1, 20:30, 10:20] = 2
+    posData = _init_position_data(tmp_path, segm_data)
+    tracked_video = _FramesOnlyStack(segm_data)
+    cca_dfs = [_get_acdc_df([1], [2]), _get_acdc_df([1, 2], [2, 1])]
+    tracker = _TrackerWithLineage(cca_dfs)
+
+    acdc_df = posData.fromTrackerToAcdcDf(tracker, tracked_video)
+
+    assert tracked_video.accessed_frames == [0, 1]
+    assert acdc_df.at[(0, 1), 'x_centroid'] == 6
+    assert acdc_df.at[(0, 1), 'y_centroid'] == 4
+    assert acdc_df.at[(1, 2), 'x_centroid'] == 14
+    assert acdc_df.at[(1, 2), 'y_centroid'] == 24
+    assert 'z_centroid' not in acdc_df.columns
+
+def test_pos_status_from_columnar_acdc_df(tmp_path):
+    from cellacdc import myutils
+    
+    images_path = tmp_path / 'Position_1' / 'Images'
+    images_path.mkdir(parents=True)
+    acdc_df = pd.DataFrame({
+        'frame_i': [0, 1, 2, 3],
+        'Cell_ID': [1, 1, 1, 1],
+        'cell_cycle_stage': ['G1', 'S', np.nan, np.nan]
+    }).set_index(['frame_i', 'Cell_ID'])
+    acdc_df_path = str(images_path / 'test_s01_acdc_output.csv')
+    load.save_acdc_df_file(acdc_df, acdc_df_path)
+    
+    assert load.is_columnar_acdc_df_available()
+    assert load.is_acdc_df_columnar_file_valid(acdc_df_path)
+    
+    status = myutils.get_pos_status(str(tmp_path / 'Position_1'))
+    
+    assert status == ' (last tracked frame = 4, last annotated frame = 2)'